@@ -1,9 +1,15 @@
 #!/usr/bin/env python3
 from __future__ import annotations
-import argparse, csv, json, re
+import argparse, csv, json, re, sys
 from pathlib import Path
 from collections import Counter
 
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.verification_cache import VERIFICATION_CACHE_PATH, VerificationCache, import_legacy_json
+
 EMAIL_RE = re.compile(r"^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}$")
 FREE_DOMAINS = {"gmail.com","yahoo.com","hotmail.com","outlook.com","icloud.com","aol.com","proton.me","protonmail.com","msn.com","live.com"}
 
@@ -23,10 +29,11 @@ def domain_from_email(e):
     e = norm(e).lower()
     return e.split("@",1)[1] if "@" in e else ""
 
-def parse_verification(row, mv_cache):
+def parse_verification(row, cache):
     email = norm(row.get("email")).lower()
-    if email and email in mv_cache:
-        r = norm(mv_cache[email].get("result")).lower()
+    record = cache.get(email) if email else None
+    if record is not None:
+        r = record.status
         if r in {"valid","invalid","catchall","unknown","risky"}:
             return r
     for k in ("verification_status","email_verification_result","mv_result","millionverifier_result"):
@@ -100,13 +107,10 @@ def main():
     args = ap.parse_args()
     repo = Path(args.repo).resolve()
 
-    mv_cache = {}
-    mv_path = repo / "runs" / "mv_verification_cache.json"
-    if mv_path.exists():
-        try:
-            mv_cache = json.loads(mv_path.read_text(encoding="utf-8"))
-        except Exception:
-            mv_cache = {}
+    # shared with verify_emails_millionverifier.py and src/verify_millionverifier.py
+    cache_path = VERIFICATION_CACHE_PATH if VERIFICATION_CACHE_PATH.is_absolute() else repo / VERIFICATION_CACHE_PATH
+    mv_cache = VerificationCache(cache_path)
+    import_legacy_json(mv_cache, repo / "runs" / "mv_verification_cache.json")
 
     counts = Counter()
     out_paths = []
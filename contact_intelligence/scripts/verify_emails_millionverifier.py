@@ -1,8 +1,15 @@
 #!/usr/bin/env python3
 from __future__ import annotations
-import argparse, csv, json, os, re, time, urllib.parse, urllib.request
+import argparse, csv, json, os, re, sys, time, urllib.parse, urllib.request
 from pathlib import Path
 
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.verification_cache import VERIFICATION_CACHE_PATH, VerificationCache, VerificationRecord, import_legacy_json
+from src.verify_millionverifier import classify_result
+
 EMAIL_RE = re.compile(r"^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}$")
 INPUTS = [
     "data/outbound/legacy_broad_equipment.csv",
@@ -35,6 +42,13 @@ def mv_check(api_key: str, email: str):
     result = norm(data.get("result")).lower() or "unknown"
     return {"result": result, "raw": data}
 
+def open_verification_cache(repo: Path) -> VerificationCache:
+    """The shared store (src/verification_cache.py), seeded once from the old JSON cache."""
+    path = VERIFICATION_CACHE_PATH if VERIFICATION_CACHE_PATH.is_absolute() else repo / VERIFICATION_CACHE_PATH
+    cache = VerificationCache(path)
+    import_legacy_json(cache, repo / "runs" / "mv_verification_cache.json")
+    return cache
+
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--repo", default=".")
@@ -49,30 +63,29 @@ def main():
     repo = Path(args.repo).resolve()
     emails = pull_emails(repo)[:args.limit]
 
-    cache_path = repo / "runs" / "mv_verification_cache.json"
-    cache_path.parent.mkdir(parents=True, exist_ok=True)
-    cache = {}
-    if cache_path.exists():
-        try:
-            cache = json.loads(cache_path.read_text(encoding="utf-8"))
-        except Exception:
-            cache = {}
+    cache = open_verification_cache(repo)
+    fresh = cache.get_many(emails)
 
     checked = 0
     for e in emails:
-        if e in cache and cache[e].get("result") in {"valid", "invalid", "catchall", "unknown", "risky"}:
+        if e in fresh:
             continue
         try:
-            cache[e] = mv_check(api_key, e)
+            res = mv_check(api_key, e)
+            status, is_catchall = classify_result(res["result"])
+            cache.put(VerificationRecord(
+                email=e, status=status, is_catchall=is_catchall, quality_score=res["raw"].get("quality"),
+                provider="millionverifier", raw_result=res["result"],
+            ))
         except Exception as ex:
-            cache[e] = {"result": "unknown", "error": str(ex)}
+            cache.put(VerificationRecord(email=e, status="error", provider="millionverifier", raw_result=str(ex)[:200]))
         checked += 1
         time.sleep(max(0, args.sleep_ms) / 1000.0)
 
-    cache_path.write_text(json.dumps(cache, indent=2), encoding="utf-8")
     print("emails_total:", len(emails))
+    print("emails_from_cache:", len(fresh))
     print("emails_checked_now:", checked)
-    print("cache_file:", cache_path)
+    print("cache_file:", cache.path)
 
 if __name__ == "__main__":
     main()
@@ -10,7 +10,15 @@ This standardizes the currently working project-intelligence flow:
 5. build_project_intelligence
 6. export_project_intelligence
 
-Each stage declares explicit inputs and outputs. The orchestrator writes:
+Each stage declares explicit inputs and outputs plus the stages it depends
+on. The stages form a DAG: the permit and job scrapes run alongside init_db,
+and the exports that only read the database run side by side, so a run takes
+about as long as its critical path. Up to --max-workers stages run at once;
+each stage's output is streamed into pipeline.log as it is produced (prefixed
+with the stage name) and kept in stages/<name>.log. A failed stage cancels
+everything that depends on it; unrelated stages still finish.
+
+The orchestrator writes:
 - operator summary markdown
 - machine-readable run summary json
 - stage-level validation results
@@ -25,11 +33,13 @@ import os
 import sqlite3
 import subprocess
 import sys
+import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Iterable, List, Sequence
+from typing import IO, Callable, Dict, Iterable, List, Optional, Sequence
 
 
 ROOT = Path(__file__).resolve().parents[1]
@@ -39,6 +49,7 @@ DEFAULT_RUNS_DIR = ROOT / "runs" / "mvp_pipeline"
 DEFAULT_JSON_EXPORT_DIR = ROOT / "data"
 DEFAULT_JOBS_OUTPUT = ROOT / "data" / "jobs_imported.json"
 DEFAULT_PERMITS_OUTPUT = ROOT / "data" / "opportunities" / "permits_imported.json"
+DEFAULT_MAX_WORKERS = int(os.environ.get("CRANEGENIUS_MVP_WORKERS", "4"))
 
 
 @dataclass
@@ -49,6 +60,7 @@ class StageDefinition:
     required_outputs: List[Path] = field(default_factory=list)
     optional_outputs: List[Path] = field(default_factory=list)
     description: str = ""
+    depends_on: List[str] = field(default_factory=list)
 
 
 def configure_logging(log_path: Path) -> None:
@@ -188,11 +200,54 @@ def summarize_operator_view(stage_results: Sequence[Dict[str, object]], final_me
     return "\n".join(lines) + "\n"
 
 
-def run_stage(stage: StageDefinition, log: logging.Logger, db_path: Path, jobs_path: Path, permits_path: Path, export_dir: Path, json_output_dir: Path) -> Dict[str, object]:
+def _stream_lines(stream: IO[str], lines: List[str], log: logging.Logger, prefix: str, stage_log: Optional[IO[str]], lock: threading.Lock) -> None:
+    for raw in iter(stream.readline, ""):
+        line = raw.rstrip("\n")
+        lines.append(line)
+        log.info("[%s] %s", prefix, line)
+        if stage_log is not None:
+            with lock:
+                stage_log.write(raw if raw.endswith("\n") else raw + "\n")
+                stage_log.flush()
+    stream.close()
+
+
+def run_stage(
+    stage: StageDefinition,
+    log: logging.Logger,
+    db_path: Path,
+    jobs_path: Path,
+    permits_path: Path,
+    export_dir: Path,
+    json_output_dir: Path,
+    stage_log_path: Optional[Path] = None,
+) -> Dict[str, object]:
     ensure_parent(stage.outputs)
     started = time.time()
     log.info("Starting stage %s", stage.name)
-    proc = subprocess.run(stage.command, cwd=str(ROOT), capture_output=True, text=True)
+    stdout_lines: List[str] = []
+    stderr_lines: List[str] = []
+    stage_log: Optional[IO[str]] = None
+    if stage_log_path is not None:
+        stage_log_path.parent.mkdir(parents=True, exist_ok=True)
+        stage_log = stage_log_path.open("w", encoding="utf-8")
+    try:
+        proc = subprocess.Popen(
+            stage.command, cwd=str(ROOT), stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, bufsize=1
+        )
+        lock = threading.Lock()
+        readers = [
+            threading.Thread(target=_stream_lines, args=(proc.stdout, stdout_lines, log, stage.name, stage_log, lock), daemon=True),
+            threading.Thread(target=_stream_lines, args=(proc.stderr, stderr_lines, log, f"{stage.name}:stderr", stage_log, lock), daemon=True),
+        ]
+        for reader in readers:
+            reader.start()
+        returncode = proc.wait()
+        for reader in readers:
+            reader.join()
+    finally:
+        if stage_log is not None:
+            stage_log.close()
     validations = validate_stage_outputs(stage)
     required_missing = [item["path"] for item in validations if item["required"] and not item["exists"]]
     metrics = compute_stage_metrics(stage.name, db_path, jobs_path, permits_path, export_dir, json_output_dir)
@@ -200,23 +255,108 @@ def run_stage(stage: StageDefinition, log: logging.Logger, db_path: Path, jobs_p
         "name": stage.name,
         "description": stage.description,
         "command": stage.command,
-        "status": "success" if proc.returncode == 0 and not required_missing else "failed",
-        "returncode": proc.returncode,
+        "status": "success" if returncode == 0 and not required_missing else "failed",
+        "returncode": returncode,
+        "started_at": datetime.fromtimestamp(started, timezone.utc).isoformat(),
         "duration_seconds": time.time() - started,
-        "stdout": proc.stdout.strip(),
-        "stderr": proc.stderr.strip(),
+        "stdout": "\n".join(stdout_lines).strip(),
+        "stderr": "\n".join(stderr_lines).strip(),
         "outputs": validations,
         "metrics": metrics,
         "failure_reason": "",
     }
-    if proc.returncode != 0:
-        result["failure_reason"] = f"non-zero exit code {proc.returncode}"
+    if returncode != 0:
+        result["failure_reason"] = f"non-zero exit code {returncode}"
     elif required_missing:
         result["failure_reason"] = f"missing required outputs: {', '.join(required_missing)}"
-    log.info("Finished stage %s with status=%s", stage.name, result["status"])
+    log.info("Finished stage %s with status=%s in %.1fs", stage.name, result["status"], result["duration_seconds"])
     return result
 
 
+def validate_dag(stages: Sequence[StageDefinition]) -> None:
+    """Raise ValueError on duplicate names, unknown dependencies or a cycle."""
+    names = [stage.name for stage in stages]
+    if len(set(names)) != len(names):
+        raise ValueError(f"duplicate stage names: {sorted(n for n in set(names) if names.count(n) > 1)}")
+    by_name = {stage.name: stage for stage in stages}
+    for stage in stages:
+        unknown = [dep for dep in stage.depends_on if dep not in by_name]
+        if unknown:
+            raise ValueError(f"stage {stage.name} depends on unknown stage(s): {', '.join(unknown)}")
+    done: set = set()
+    remaining = list(stages)
+    while remaining:
+        ready = [stage for stage in remaining if all(dep in done for dep in stage.depends_on)]
+        if not ready:
+            raise ValueError(f"dependency cycle among: {', '.join(stage.name for stage in remaining)}")
+        done.update(stage.name for stage in ready)
+        remaining = [stage for stage in remaining if stage.name not in done]
+
+
+def _cancelled_result(stage: StageDefinition, failed_dependency: str) -> Dict[str, object]:
+    return {
+        "name": stage.name,
+        "description": stage.description,
+        "command": stage.command,
+        "status": "cancelled",
+        "returncode": None,
+        "started_at": "",
+        "duration_seconds": 0.0,
+        "stdout": "",
+        "stderr": "",
+        "outputs": [],
+        "metrics": {},
+        "failure_reason": f"dependency {failed_dependency} did not succeed",
+    }
+
+
+def run_stage_graph(
+    stages: Sequence[StageDefinition],
+    execute: Callable[[StageDefinition], Dict[str, object]],
+    log: logging.Logger,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> List[Dict[str, object]]:
+    """
+    Run `stages` with `execute`, starting each one as soon as all of its
+    dependencies succeeded and at most `max_workers` at a time (declaration
+    order breaks ties). A stage whose dependency failed or was cancelled is
+    cancelled without running. Results come back in declaration order.
+    """
+    validate_dag(stages)
+    results: Dict[str, Dict[str, object]] = {}
+    pending = list(stages)
+    running: Dict["Future[Dict[str, object]]", StageDefinition] = {}
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="mvp-stage") as pool:
+        while pending or running:
+            cancelled = True
+            while cancelled:
+                cancelled = False
+                for stage in list(pending):
+                    blocked = next((dep for dep in stage.depends_on if dep in results and results[dep]["status"] != "success"), None)
+                    if blocked is not None:
+                        log.warning("Cancelling stage %s: dependency %s did not succeed", stage.name, blocked)
+                        results[stage.name] = _cancelled_result(stage, blocked)
+                        pending.remove(stage)
+                        cancelled = True
+            for stage in list(pending):
+                if len(running) >= max(1, max_workers):
+                    break
+                if all(dep in results for dep in stage.depends_on):
+                    pending.remove(stage)
+                    running[pool.submit(execute, stage)] = stage
+            if not running:
+                break
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                stage = running.pop(future)
+                try:
+                    results[stage.name] = future.result()
+                except Exception as exc:
+                    log.exception("Stage %s crashed", stage.name)
+                    results[stage.name] = {**_cancelled_result(stage, ""), "status": "failed", "failure_reason": f"runner error: {exc}"}
+    return [results[stage.name] for stage in stages if stage.name in results]
+
+
 def build_stages(db_path: Path, jobs_path: Path, permits_path: Path, export_dir: Path, json_output_dir: Path) -> List[StageDefinition]:
     static_exports = json_output_dir / "static_exports"
     return [
@@ -256,6 +396,25 @@ def build_stages(db_path: Path, jobs_path: Path, permits_path: Path, export_dir:
             ],
             outputs=[db_path],
             required_outputs=[db_path],
+            depends_on=["init_db", "scrape_permits", "scrape_jobs"],
+        ),
+        StageDefinition(
+            name="export_directory_json",
+            description="Build supplier directory JSON for the public directory page.",
+            command=[
+                "python3",
+                "scripts/export_directory_json.py",
+                "--db",
+                str(db_path),
+                "--seed",
+                str(ROOT / "data" / "suppliers" / "suppliers_seed.json"),
+                "--output",
+                str(json_output_dir / "static_exports" / "directory_suppliers.json"),
+            ],
+            outputs=[json_output_dir / "static_exports" / "directory_suppliers.json"],
+            required_outputs=[json_output_dir / "static_exports" / "directory_suppliers.json"],
+            # reads companies and opportunity_company_matches only, so it runs alongside build/export
+            depends_on=["normalize_match"],
         ),
         StageDefinition(
             name="build_project_intelligence",
@@ -270,6 +429,7 @@ def build_stages(db_path: Path, jobs_path: Path, permits_path: Path, export_dir:
             ],
             outputs=[db_path],
             required_outputs=[db_path],
+            depends_on=["normalize_match"],
         ),
         StageDefinition(
             name="export_project_intelligence",
@@ -300,22 +460,7 @@ def build_stages(db_path: Path, jobs_path: Path, permits_path: Path, export_dir:
                 export_dir / "recommended_expansion_candidates.xlsx",
                 export_dir / "recommended_expansion_candidates.csv",
             ],
-        ),
-        StageDefinition(
-            name="export_directory_json",
-            description="Build supplier directory JSON for the public directory page.",
-            command=[
-                "python3",
-                "scripts/export_directory_json.py",
-                "--db",
-                str(db_path),
-                "--seed",
-                str(ROOT / "data" / "suppliers" / "suppliers_seed.json"),
-                "--output",
-                str(json_output_dir / "static_exports" / "directory_suppliers.json"),
-            ],
-            outputs=[json_output_dir / "static_exports" / "directory_suppliers.json"],
-            required_outputs=[json_output_dir / "static_exports" / "directory_suppliers.json"],
+            depends_on=["build_project_intelligence"],
         ),
     ]
 
@@ -326,6 +471,7 @@ def main() -> int:
     parser.add_argument("--export-dir", default=str(DEFAULT_EXPORT_DIR), help="Operator export directory")
     parser.add_argument("--json-output-dir", default=str(DEFAULT_JSON_EXPORT_DIR), help="Static JSON output directory")
     parser.add_argument("--runs-dir", default=str(DEFAULT_RUNS_DIR), help="Directory for run summaries and logs")
+    parser.add_argument("--max-workers", type=int, default=DEFAULT_MAX_WORKERS, help="Stages allowed to run at once (1 = one after another)")
     args = parser.parse_args()
 
     db_path = Path(args.db).expanduser()
@@ -343,15 +489,16 @@ def main() -> int:
     log = logging.getLogger("cranegenius.mvp_pipeline")
 
     stages = build_stages(db_path, jobs_path, permits_path, export_dir, json_output_dir)
-    stage_results: List[Dict[str, object]] = []
-    overall_status = "success"
-
-    for stage in stages:
-        result = run_stage(stage, log, db_path, jobs_path, permits_path, export_dir, json_output_dir)
-        stage_results.append(result)
-        if result["status"] != "success":
-            overall_status = "failed"
-            break
+    stage_results = run_stage_graph(
+        stages,
+        lambda stage: run_stage(
+            stage, log, db_path, jobs_path, permits_path, export_dir, json_output_dir,
+            stage_log_path=run_dir / "stages" / f"{stage.name}.log",
+        ),
+        log,
+        max_workers=args.max_workers,
+    )
+    overall_status = "success" if all(result["status"] == "success" for result in stage_results) else "failed"
 
     final_metrics = compute_stage_metrics("build_project_intelligence", db_path, jobs_path, permits_path, export_dir, json_output_dir)
     final_metrics.update(compute_stage_metrics("export_project_intelligence", db_path, jobs_path, permits_path, export_dir, json_output_dir))
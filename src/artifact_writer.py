@@ -0,0 +1,135 @@
+"""
+Background persistence of pipeline artifacts.
+
+Every stage of src/pipeline.py used to call save_csv before the next stage
+could start, so serializing raw_records / scored_records / candidates sat
+on the critical path. Stages now hand frames to the next stage in memory
+and queue the CSV write here. One writer thread serializes each artifact to
+a temp file, fsyncs it and moves it into place, so a reader never sees a
+half-written CSV. The queue is bounded: when the disk falls behind, the
+pipeline waits instead of holding every frame in memory. flush() (and
+leaving the `with` block, also on an exception or sys.exit) waits for every
+queued write; the first write error is re-raised there.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import queue
+import threading
+from typing import Any, Callable, Optional
+
+import pandas as pd
+
+from .stage_cache import frame_digest
+
+log = logging.getLogger("cranegenius.artifact_writer")
+
+# Frames that may wait for the disk at once; each is a private copy.
+ARTIFACT_QUEUE_SIZE = int(os.environ.get("CRANEGENIUS_ARTIFACT_QUEUE", "4"))
+
+_STOP = object()
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class ArtifactWriter:
+    """Writes queued artifacts in order on one thread; use as a context manager."""
+
+    def __init__(
+        self,
+        max_pending: int = ARTIFACT_QUEUE_SIZE,
+        on_queued: Optional[Callable[[str, str], None]] = None,
+        on_written: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        # on_queued(path, content digest) runs on the caller's thread before the write is queued,
+        # on_written(path) on the writer thread once the file is in place
+        self.on_queued = on_queued
+        self.on_written = on_written
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, max_pending))
+        self._lock = threading.Lock()
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, name="artifact-writer", daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> "ArtifactWriter":
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        if exc_type is None:
+            self.close()
+            return
+        # already failing: get what was produced onto disk, keep the original error
+        try:
+            self.close()
+        except Exception:
+            log.exception("Artifact write failed while handling an earlier error")
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is _STOP:
+                    return
+                path, render = item
+                try:
+                    data = render()
+                    _write_atomic(path, data)
+                    if self.on_written is not None:
+                        self.on_written(path)
+                except BaseException as exc:  # surfaced on the caller's thread by flush()
+                    log.error("Failed to write %s: %s", path, exc)
+                    with self._lock:
+                        if self._error is None:
+                            self._error = exc
+            finally:
+                self._queue.task_done()
+
+    def _submit(self, path: str, render: Callable[[], bytes]) -> None:
+        self._raise_error()
+        self._queue.put((path, render))
+
+    def _raise_error(self) -> None:
+        with self._lock:
+            error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def save_csv(self, df: pd.DataFrame, path: str) -> None:
+        """Queue `df` for `path`; later changes to `df` do not reach the file."""
+        snapshot = df.copy()
+        if self.on_queued is not None:
+            self.on_queued(path, frame_digest(snapshot))
+        self._submit(path, lambda: snapshot.to_csv(index=False).encode("utf-8"))
+        log.info("Queued %d rows → %s", len(snapshot), path)
+
+    def save_json(self, obj: Any, path: str) -> bytes:
+        """Queue `obj` as indented JSON for `path`; returns the bytes that will be written."""
+        data = json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+        if self.on_queued is not None:
+            self.on_queued(path, hashlib.sha256(data).hexdigest())
+        self._submit(path, lambda: data)
+        return data
+
+    def flush(self) -> None:
+        """Block until every queued artifact is on disk; re-raise the first write error."""
+        self._queue.join()
+        self._raise_error()
+
+    def close(self) -> None:
+        if self._thread.is_alive():
+            self._queue.join()
+            self._queue.put(_STOP)
+            self._thread.join()
+        self._raise_error()
+
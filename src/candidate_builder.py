@@ -1,57 +1,94 @@
 from __future__ import annotations
 import logging
-from typing import Any, Dict, List
 import pandas as pd
-from .utils import load_yaml, normalize_text
+from .utils import first_unclaimed_mask, load_yaml, normalize_text
 
 log = logging.getLogger("cranegenius.candidates")
 MAX_CANDIDATES_PER_DOMAIN = 2
 ROLE_INBOX_PRIORITY = ["estimating", "bids", "projects", "operations", "info"]
 
+OUTPUT_COLUMNS = ["contractor_domain", "contractor_name_normalized", "jurisdiction", "project_address", "score", "email_candidate", "contact_role_bucket", "generation_method"]
+# enriched_df fields copied onto every candidate of a domain, with their defaults when absent
+CARRIED_FIELDS = {"contractor_name_normalized": "", "jurisdiction": "", "project_address": "", "score": 0}
+
+def _normalized_lower(values: pd.Series) -> pd.Series:
+    values = values.astype(object).where(values.notna(), "")
+    return values.map({v: normalize_text(v).lower() for v in values.unique()})
+
+def _domains_frame(enriched_df: pd.DataFrame) -> pd.DataFrame:
+    """Each domain once (its first row wins), in the order the rows list them; `row` is the enriched_df position."""
+    if "contractor_domain" not in enriched_df.columns:
+        return pd.DataFrame({"row": pd.Series(dtype=int), "contractor_domain": pd.Series(dtype=object)})
+    raw = _normalized_lower(enriched_df["contractor_domain"]).reset_index(drop=True)
+    domains = raw.str.split("|").explode().str.strip()
+    domains = domains[domains.notna() & (domains != "")]
+    out = pd.DataFrame({"row": domains.index.to_numpy(), "contractor_domain": domains.to_numpy()})
+    return out.drop_duplicates(subset=["contractor_domain"]).reset_index(drop=True)
+
+def _known_persons_frame(contacts_df) -> pd.DataFrame:
+    """Person emails mined per source domain, in contacts_df order."""
+    empty = pd.DataFrame(columns=["contractor_domain", "email_candidate"])
+    if contacts_df is None or contacts_df.empty or "email_type" not in contacts_df.columns:
+        return empty
+    pc = contacts_df[contacts_df["email_type"] == "person"]
+    if pc.empty or "source_domain" not in pc.columns or "email" not in pc.columns:
+        return empty
+    out = pd.DataFrame({"contractor_domain": _normalized_lower(pc["source_domain"]).to_numpy(), "email_candidate": _normalized_lower(pc["email"]).to_numpy()})
+    return out[(out["contractor_domain"] != "") & (out["email_candidate"] != "")]
+
 def build_candidates(enriched_df, keywords_yaml, contacts_df=None, patterns_df=None):
+    """
+    Up to MAX_CANDIDATES_PER_DOMAIN emails per distinct domain: role inboxes
+    in priority order, then mined person emails. Built as frames (domains
+    exploded once, inboxes and known persons joined, a grouped count for
+    the cap) with the same rows and order the row-by-row walk produced.
+    """
     cfg = load_yaml(keywords_yaml)
     configured = [normalize_text(x).lower().replace("@", "") for x in cfg.get("role_inboxes", []) if x]
     role_inboxes = ROLE_INBOX_PRIORITY + [x for x in configured if x and x not in ROLE_INBOX_PRIORITY]
 
-    known_persons: Dict[str, List[str]] = {}
-    if contacts_df is not None and not contacts_df.empty:
-        pc = contacts_df[contacts_df.get("email_type","")=="person"] if "email_type" in contacts_df.columns else pd.DataFrame()
-        for _, r in pc.iterrows():
-            d = normalize_text(r.get("source_domain","")).lower()
-            e = normalize_text(r.get("email","")).lower()
-            if d and e:
-                known_persons.setdefault(d, []).append(e)
-
-    rows: List[Dict[str, Any]] = []
-    seen_emails: set = set()
-    seen_domains: set = set()
-
-    for _, r in enriched_df.iterrows():
-        raw_domain = normalize_text(r.get("contractor_domain","")).lower()
-        if not raw_domain:
-            continue
-        domain_list = [d.strip() for d in raw_domain.split("|") if d.strip()]
-        for domain in domain_list:
-            if domain in seen_domains:
-                continue
-            seen_domains.add(domain)
-            count = 0
-            for prefix in role_inboxes:
-                if count >= MAX_CANDIDATES_PER_DOMAIN:
-                    break
-                email = f"{prefix}@{domain}"
-                if email not in seen_emails:
-                    seen_emails.add(email)
-                    rows.append({"contractor_domain": domain, "contractor_name_normalized": r.get("contractor_name_normalized",""), "jurisdiction": r.get("jurisdiction",""), "project_address": r.get("project_address",""), "score": r.get("score",0), "email_candidate": email, "contact_role_bucket": "role_inbox", "generation_method": "role_inbox"})
-                    count += 1
-            for email in known_persons.get(domain, []):
-                if count >= MAX_CANDIDATES_PER_DOMAIN:
-                    break
-                if email not in seen_emails:
-                    seen_emails.add(email)
-                    rows.append({"contractor_domain": domain, "contractor_name_normalized": r.get("contractor_name_normalized",""), "jurisdiction": r.get("jurisdiction",""), "project_address": r.get("project_address",""), "score": r.get("score",0), "email_candidate": email, "contact_role_bucket": "person_discovered", "generation_method": "site_discovered"})
-                    count += 1
-
-    df = pd.DataFrame(rows)
-    log.info("Candidates built: %d total across %d domains", len(df), len(seen_domains))
+    domains = _domains_frame(enriched_df)
+    if domains.empty:
+        log.info("Candidates built: %d total across %d domains", 0, 0)
+        return pd.DataFrame()
+    domains["domain_pos"] = range(len(domains))
+    known = _known_persons_frame(contacts_df)
+    known["order"] = range(len(known))
+    persons = domains.merge(known, on="contractor_domain", how="inner")
+    persons["kind"] = 1
+
+    # A domain's inbox can only be lost to a mined person email spelling it, so
+    # each domain needs the first MAX inboxes plus one per such email.
+    halves = known["email_candidate"].drop_duplicates().str.split("@", n=1)
+    spelled = halves.str[-1][halves.str[0].isin(role_inboxes)].value_counts()
+    needed = MAX_CANDIDATES_PER_DOMAIN + domains["contractor_domain"].map(spelled).fillna(0).astype(int)
+    depth = int(min(needed.max(), len(role_inboxes)))
+    inboxes = pd.DataFrame({"prefix": role_inboxes[:depth], "order": range(depth)})
+    roles = domains.assign(needed=needed).merge(inboxes, how="cross")
+    roles = roles[roles["order"] < roles["needed"]].drop(columns=["needed"])
+    roles["email_candidate"] = roles["prefix"] + "@" + roles["contractor_domain"]
+    roles["kind"] = 0
+
+    long = pd.concat([roles, persons], ignore_index=True)
+    long = long.sort_values(["domain_pos", "kind", "order"], kind="stable").reset_index(drop=True)
+    long = long[first_unclaimed_mask(long, "domain_pos", "email_candidate", MAX_CANDIDATES_PER_DOMAIN)]
+    if long.empty:
+        log.info("Candidates built: %d total across %d domains", 0, len(domains))
+        return pd.DataFrame()
+
+    source = enriched_df.reset_index(drop=True)
+    rows = long["row"].to_numpy()
+    carried = {
+        col: source[col].astype(object).to_numpy()[rows] if col in source.columns else [default] * len(long)
+        for col, default in CARRIED_FIELDS.items()
+    }
+    is_person = (long["kind"] == 1).to_numpy()
+    df = pd.DataFrame({
+        "contractor_domain": long["contractor_domain"].to_numpy(),
+        **carried,
+        "email_candidate": long["email_candidate"].to_numpy(),
+        "contact_role_bucket": pd.Series(is_person).map({False: "role_inbox", True: "person_discovered"}).to_numpy(),
+        "generation_method": pd.Series(is_person).map({False: "role_inbox", True: "site_discovered"}).to_numpy(),
+    }, columns=OUTPUT_COLUMNS).infer_objects()
+    log.info("Candidates built: %d total across %d domains", len(df), len(domains))
     return df
@@ -0,0 +1,114 @@
+"""
+Per-domain catch-all detection ahead of candidate verification.
+
+A catch-all domain accepts every address, so verifying each person's pattern
+variants there costs several calls and says nothing about which one is
+real. Before candidates are verified, each domain is probed once with a
+random local part no one would own (or its cached verdict is reused). If the
+provider accepts that address, the domain is catch-all: its candidates are
+marked catch-all without per-candidate calls and only each person's
+top-ranked pattern is kept.
+"""
+from __future__ import annotations
+
+import logging
+import secrets
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+import pandas as pd
+
+from .verification_cache import VerificationCache, get_verification_cache
+from .verification_scheduler import RESULT_COLUMNS, _column
+
+log = logging.getLogger("cranegenius.catchall_probe")
+
+# A probe answered with one of these means the server takes any mailbox.
+ACCEPT_ANY_STATUSES = {"catchall", "valid"}
+# Definitive answers; unknown / error leave the domain unjudged until the next run.
+VERDICT_STATUSES = ACCEPT_ANY_STATUSES | {"invalid"}
+PROBE_PROVIDER = "catchall_probe"
+
+
+def probe_address(domain: str) -> str:
+    """An address at `domain` that should not exist anywhere."""
+    return f"cg-probe-{secrets.token_hex(8)}@{domain}"
+
+
+def detect_catchall_domains(
+    domains: Iterable[str],
+    verify: Callable[[pd.DataFrame], pd.DataFrame],
+    cache: Optional[VerificationCache] = None,
+) -> Dict[str, bool]:
+    """Catch-all verdict per domain: cached when fresh, else one probe per domain in a single verifier call."""
+    cache = cache if cache is not None else get_verification_cache()
+    wanted = list(dict.fromkeys(d for d in (str(x or "").strip().lower() for x in domains) if d))
+    verdicts = cache.get_domain_verdicts(wanted)
+    to_probe = [d for d in wanted if d not in verdicts]
+    if not to_probe:
+        return verdicts
+
+    probes = {probe_address(d): d for d in to_probe}
+    probe_df = pd.DataFrame({"email_candidate": list(probes), "contractor_domain": list(probes.values())})
+    results = verify(probe_df)
+    fresh: Dict[str, bool] = {}
+    if results is not None and not results.empty:
+        statuses = zip(
+            results["email"].fillna("").astype(str).str.lower(),
+            results["email_verification_status"].fillna("").astype(str).str.lower(),
+        )
+        for email, status in statuses:
+            if email in probes and status in VERDICT_STATUSES:
+                fresh[probes[email]] = status in ACCEPT_ANY_STATUSES
+    cache.put_domain_verdicts(fresh)
+    verdicts.update(fresh)
+    log.info(
+        "Catch-all probe | domains=%d cached=%d probed=%d catchall=%d",
+        len(wanted),
+        len(wanted) - len(to_probe),
+        len(to_probe),
+        sum(1 for d in wanted if verdicts.get(d)),
+    )
+    return verdicts
+
+
+def split_catchall_candidates(
+    candidates_df: pd.DataFrame, verdicts: Dict[str, bool]
+) -> Tuple[pd.DataFrame, pd.DataFrame, int]:
+    """
+    (candidates still to verify, verification rows for catch-all domains,
+    candidates dropped). Each person on a catch-all domain keeps only the
+    candidate with the best pattern_rank (then pattern_confidence).
+    """
+    empty = pd.DataFrame(columns=RESULT_COLUMNS)
+    if candidates_df.empty:
+        return candidates_df, empty, 0
+    domains = candidates_df["contractor_domain"].fillna("").astype(str).str.strip().str.lower()
+    catchall_domains = {d for d, is_catchall in verdicts.items() if is_catchall}
+    on_catchall = domains.isin(catchall_domains)
+    if not on_catchall.any():
+        return candidates_df, empty, 0
+
+    work = candidates_df[on_catchall].copy()
+    work["_domain"] = domains[on_catchall]
+    work["_first"] = _column(work, "first_name").fillna("").astype(str).str.strip().str.lower()
+    work["_last"] = _column(work, "last_name").fillna("").astype(str).str.strip().str.lower()
+    email_col = "email_candidate" if "email_candidate" in work.columns else "email"
+    work["_email"] = work[email_col].fillna("").astype(str).str.strip().str.lower()
+    work["_rank"] = pd.to_numeric(_column(work, "pattern_rank", 999), errors="coerce").fillna(999)
+    work["_confidence"] = pd.to_numeric(_column(work, "pattern_confidence", 0.0), errors="coerce").fillna(0.0)
+    # nameless candidates are their own "person"
+    unnamed = (work["_first"] == "") | (work["_last"] == "")
+    work.loc[unnamed, "_first"] = work.loc[unnamed, "_email"]
+    top = (
+        work.sort_values(["_rank", "_confidence"], ascending=[True, False], kind="stable")
+        .drop_duplicates(subset=["_domain", "_first", "_last"], keep="first")
+    )
+    marked = pd.DataFrame({
+        "email": top["_email"].values,
+        "email_verification_status": "catchall",
+        "email_is_catchall": True,
+        "email_quality_score": None,
+        "email_verification_provider": PROBE_PROVIDER,
+    }, columns=RESULT_COLUMNS)
+    dropped = int(len(work) - len(top))
+    return candidates_df[~on_catchall].copy(), marked, dropped
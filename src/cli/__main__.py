@@ -35,13 +35,72 @@ def plan_job(natural_language: str) -> dict:
     return result.parsed
 
 # ── Real pipeline stage runners ────────────────────────────────
-def run_full_pipeline(jobspec: dict) -> dict:
+# JobSpec pipeline_stages → stage cache names, in run order
+JOBSPEC_STAGES = {
+    "permit_ingestion":  "ingest",
+    "normalization":     "normalize",
+    "crane_scoring":     "score",
+    "domain_resolution": "resolve",
+    "contact_mining":    "mine",
+    "email_generation":  "build",
+    "verification":      "verify",
+    "sheets_export":     "export",
+}
+STAGE_NAMES = tuple(JOBSPEC_STAGES.values())
+
+def _stage_specs():
+    from src.stage_cache import INGEST_MAX_AGE_SECONDS, StageSpec
+    return (
+        StageSpec("ingest", configs=(SOURCES_YAML,), outputs=("data/raw_records.csv",),
+                  code=("src.ingest",), max_age_seconds=INGEST_MAX_AGE_SECONDS),
+        StageSpec("normalize", inputs=("data/raw_records.csv",), outputs=("data/normalized_records.csv",),
+                  code=("src.parse_normalize",)),
+        StageSpec("score", inputs=("data/normalized_records.csv",), configs=(KEYWORDS_YAML, SCORING_YAML),
+                  outputs=("data/scored_records.csv", "data/enrichment_queue.csv"), code=("src.score_filter",)),
+        StageSpec("resolve", inputs=("data/enrichment_queue.csv", "data/company_domain_seed.csv"),
+                  outputs=("data/enriched_companies.csv",),
+                  code=("src.company_resolver", "src.domain_enricher_claude")),
+        StageSpec("mine", inputs=("data/enriched_companies.csv",), configs=(CRAWLER_YAML,),
+                  outputs=("data/discovered_contacts.csv", "data/domain_email_patterns.csv"),
+                  code=("src.site_contact_miner",)),
+        StageSpec("build", inputs=("data/enriched_companies.csv", "data/discovered_contacts.csv",
+                                   "data/domain_email_patterns.csv"),
+                  configs=(KEYWORDS_YAML,), outputs=("data/candidates.csv",), code=("src.candidate_builder",)),
+        StageSpec("verify", inputs=("data/enriched_companies.csv", "data/candidates.csv"),
+                  outputs=("data/verified_contacts.csv",), code=("src.verify_millionverifier",)),
+        StageSpec("export", inputs=("data/enriched_companies.csv", "data/candidates.csv", "data/verified_contacts.csv"),
+                  configs=(SCORING_YAML,),
+                  outputs=("data/sender_ready_hot.csv", "data/sender_ready_warm.csv", "data/catchall_review.csv"),
+                  code=("src.exporter", "src.sheets_exporter")),
+    )
+
+def run_full_pipeline(jobspec: dict, from_stage: str | None = None, until_stage: str | None = None) -> dict:
     """
     Calls your real pipeline functions in order.
     Mirrors the logic in src/pipeline.py but driven by JobSpec.
+    A requested stage whose inputs, config and code are unchanged since it
+    last finished is skipped (see src/stage_cache.py); from_stage forces a
+    stage and reuses everything before it, until_stage stops after one.
+    Frames are handed on in memory and written to data/ in the background.
     """
-    import logging
-    from src.utils import load_yaml, save_csv, setup_logging
+    from src.utils import setup_logging
+    from src.stage_cache import StageCache
+    from src.artifact_writer import ArtifactWriter
+
+    setup_logging()
+    requested = {JOBSPEC_STAGES[s] for s in jobspec.get("pipeline_stages", []) if s in JOBSPEC_STAGES}
+    if from_stage:
+        # everything from --from-stage on is what the caller wants run
+        requested.update(STAGE_NAMES[STAGE_NAMES.index(from_stage):])
+    if until_stage:
+        requested.difference_update(STAGE_NAMES[STAGE_NAMES.index(until_stage) + 1:])
+    cache = StageCache("cli", _stage_specs(), from_stage=from_stage, until_stage=until_stage)
+    # flushed (and fsynced) when the block exits, also when a stage raises
+    with ArtifactWriter(on_queued=cache.record_artifact, on_written=cache.artifact_written) as writer:
+        return _run_stages(requested, cache, writer)
+
+def _run_stages(requested: set, cache, writer) -> dict:
+    from src.utils import load_yaml, read_csv
     from src.ingest import ingest_sources
     from src.parse_normalize import normalize_records
     from src.score_filter import score_and_filter
@@ -53,42 +112,47 @@ def run_full_pipeline(jobspec: dict) -> dict:
     from src.exporter import export_sender_lists
     from src.sheets_exporter import export_to_sheets
 
-    setup_logging()
-    stages    = jobspec.get("pipeline_stages", [])
-    threshold = jobspec.get("crane_score_threshold", 0.6)
-    counts    = {}
+    counts = {}
+
+    def runs(stage: str) -> bool:
+        return stage in requested and cache.should_run(stage)
 
     # Stage 1 — Ingest
-    if "permit_ingestion" in stages:
+    if runs("ingest"):
         print("\n  [Stage 1] Ingesting permits...")
         raw_df = ingest_sources(SOURCES_YAML)
-        save_csv(raw_df, "data/raw_records.csv")
+        writer.save_csv(raw_df, "data/raw_records.csv")
+        cache.complete("ingest")
         counts["permits_ingested"] = len(raw_df)
         print(f"  ✓ {len(raw_df)} raw records")
     else:
-        import pandas as pd
-        raw_df = pd.read_csv("data/raw_records.csv")
+        raw_df = read_csv("data/raw_records.csv")
+    if cache.stop_after("ingest"):
+        return counts
 
     # Stage 2 — Normalize
-    if "normalization" in stages:
+    if runs("normalize"):
         print("\n  [Stage 2] Normalizing...")
         normalized_df, _ = normalize_records(raw_df)
-        save_csv(normalized_df, "data/normalized_records.csv")
+        writer.save_csv(normalized_df, "data/normalized_records.csv")
+        cache.complete("normalize")
         counts["permits_normalized"] = len(normalized_df)
         print(f"  ✓ {len(normalized_df)} normalized")
     else:
-        import pandas as pd
-        normalized_df = pd.read_csv("data/normalized_records.csv")
+        normalized_df = read_csv("data/normalized_records.csv")
+    if cache.stop_after("normalize"):
+        return counts
 
     # Stage 3 — Score
-    if "crane_scoring" in stages:
+    if runs("score"):
         print("\n  [Stage 3] Scoring for crane likelihood...")
         scored_df = score_and_filter(normalized_df, KEYWORDS_YAML, SCORING_YAML)
-        save_csv(scored_df, "data/scored_records.csv")
+        writer.save_csv(scored_df, "data/scored_records.csv")
         scoring_cfg = load_yaml(SCORING_YAML)
         threshold_warm = scoring_cfg.get("scoring", {}).get("threshold_warm", 4)
         enrichment_queue = scored_df[scored_df["lift_probability_score"] >= threshold_warm].copy()
-        save_csv(enrichment_queue, "data/enrichment_queue.csv")
+        writer.save_csv(enrichment_queue, "data/enrichment_queue.csv")
+        cache.complete("score")
         hot_count  = len(scored_df[scored_df["lift_probability_score"] >= 7])
         warm_count = len(enrichment_queue)
         counts["permits_scored"] = len(scored_df)
@@ -96,52 +160,59 @@ def run_full_pipeline(jobspec: dict) -> dict:
         counts["warm_permits"]   = warm_count
         print(f"  ✓ hot={hot_count} warm={warm_count}")
     else:
-        import pandas as pd
-        enrichment_queue = pd.read_csv("data/enrichment_queue.csv")
+        enrichment_queue = read_csv("data/enrichment_queue.csv")
+    if cache.stop_after("score"):
+        return counts
 
     # Stage 4 — Domain resolution
-    if "domain_resolution" in stages:
+    if runs("resolve"):
         print("\n  [Stage 4] Resolving contractor domains...")
         enriched_df = resolve_domains(enrichment_queue)
         enriched_df = enrich_domains_with_claude(enriched_df)
-        save_csv(enriched_df, "data/enriched_companies.csv")
+        writer.save_csv(enriched_df, "data/enriched_companies.csv")
+        cache.complete("resolve")
         resolved = enriched_df["contractor_domain"].notna().sum()
         counts["domains_resolved"] = int(resolved)
         print(f"  ✓ {resolved} domains resolved")
     else:
-        import pandas as pd
-        enriched_df = pd.read_csv("data/enriched_companies.csv")
+        enriched_df = read_csv("data/enriched_companies.csv")
+    if cache.stop_after("resolve"):
+        return counts
 
     # Stage 5 — Contact mining
-    if "contact_mining" in stages:
+    if runs("mine"):
         print("\n  [Stage 5] Mining contacts from company sites...")
         contacts_df, patterns_df = mine_contacts(enriched_df, CRAWLER_YAML)
-        save_csv(contacts_df, "data/discovered_contacts.csv")
-        save_csv(patterns_df, "data/domain_email_patterns.csv")
+        writer.save_csv(contacts_df, "data/discovered_contacts.csv")
+        writer.save_csv(patterns_df, "data/domain_email_patterns.csv")
+        cache.complete("mine")
         counts["contacts_found"] = len(contacts_df)
         print(f"  ✓ {len(contacts_df)} contacts found")
     else:
-        import pandas as pd
-        contacts_df  = pd.read_csv("data/discovered_contacts.csv")
-        patterns_df  = pd.read_csv("data/domain_email_patterns.csv")
+        contacts_df  = read_csv("data/discovered_contacts.csv")
+        patterns_df  = read_csv("data/domain_email_patterns.csv")
+    if cache.stop_after("mine"):
+        return counts
 
     # Stage 6 — Build candidates
-    if "email_generation" in stages:
+    if runs("build"):
         print("\n  [Stage 6] Building email candidates...")
         candidates_df = build_candidates(
             enriched_df, KEYWORDS_YAML,
             contacts_df=contacts_df,
             patterns_df=patterns_df,
         )
-        save_csv(candidates_df, "data/candidates.csv")
+        writer.save_csv(candidates_df, "data/candidates.csv")
+        cache.complete("build")
         counts["emails_generated"] = len(candidates_df)
         print(f"  ✓ {len(candidates_df)} candidates built")
     else:
-        import pandas as pd
-        candidates_df = pd.read_csv("data/candidates.csv")
+        candidates_df = read_csv("data/candidates.csv")
+    if cache.stop_after("build"):
+        return counts
 
     # Stage 7 — Verify (only real domains)
-    if "verification" in stages:
+    if runs("verify"):
         print("\n  [Stage 7] Verifying with MillionVerifier...")
         if "domain_resolution_source" in enriched_df.columns:
             real_domains = enriched_df[
@@ -156,25 +227,25 @@ def run_full_pipeline(jobspec: dict) -> dict:
         else:
             verify_candidates = candidates_df
         verified_df = verify_with_millionverifier(verify_candidates)
-        save_csv(verified_df, "data/verified_contacts.csv")
+        writer.save_csv(verified_df, "data/verified_contacts.csv")
+        cache.complete("verify")
         valid_count = int((verified_df.get("mv_result","") == "valid").sum()) if "mv_result" in verified_df.columns else 0
         counts["emails_verified"] = valid_count
         print(f"  ✓ {valid_count} verified valid")
     else:
-        import pandas as pd
-        verified_df = pd.read_csv("data/verified_contacts.csv")
+        verified_df = read_csv("data/verified_contacts.csv")
+    if cache.stop_after("verify"):
+        return counts
 
     # Stage 8 — Export
-    if "sheets_export" in stages:
+    if runs("export"):
         print("\n  [Stage 8] Exporting sender-ready lists...")
         scoring_cfg   = load_yaml(SCORING_YAML)
         scoring       = scoring_cfg.get("scoring", {})
         threshold_hot  = scoring.get("threshold_hot",  7)
         threshold_warm = scoring.get("threshold_warm", 5)
         # Join candidates (has email_candidate) with enriched (has lift_probability_score)
-        import pandas as pd
-        candidates_for_export = pd.read_csv("data/candidates.csv")
-        scored_enriched = candidates_for_export.merge(
+        scored_enriched = candidates_df.merge(
             enriched_df[["contractor_domain","lift_probability_score","score_hits",
                          "project_address","project_city","project_state",
                          "jurisdiction","permit_or_record_id","record_status"]],
@@ -183,10 +254,11 @@ def run_full_pipeline(jobspec: dict) -> dict:
         hot_df, warm_df, catchall_df, qa = export_sender_lists(
             scored_enriched, verified_df, threshold_hot, threshold_warm
         )
-        save_csv(hot_df,      "data/sender_ready_hot.csv")
-        save_csv(warm_df,     "data/sender_ready_warm.csv")
-        save_csv(catchall_df, "data/catchall_review.csv")
+        writer.save_csv(hot_df,      "data/sender_ready_hot.csv")
+        writer.save_csv(warm_df,     "data/sender_ready_warm.csv")
+        writer.save_csv(catchall_df, "data/catchall_review.csv")
         export_to_sheets(warm_df, hot_df, catchall_df)
+        cache.complete("export")
         counts["exported_hot"]      = len(hot_df)
         counts["exported_warm"]     = len(warm_df)
         counts["exported_catchall"] = len(catchall_df)
@@ -195,7 +267,8 @@ def run_full_pipeline(jobspec: dict) -> dict:
     return counts
 
 # ── CLI executor ───────────────────────────────────────────────
-def execute_jobspec(jobspec: dict, dry_run: bool = False) -> dict:
+def execute_jobspec(jobspec: dict, dry_run: bool = False,
+                    from_stage: str | None = None, until_stage: str | None = None) -> dict:
     run_id     = str(uuid.uuid4())[:8]
     start_time = datetime.now()
 
@@ -215,7 +288,7 @@ def execute_jobspec(jobspec: dict, dry_run: bool = False) -> dict:
         status = "dry_run"
     else:
         try:
-            counts = run_full_pipeline(jobspec)
+            counts = run_full_pipeline(jobspec, from_stage=from_stage, until_stage=until_stage)
             status = "success"
         except Exception as e:
             print(f"\n  ✗ Pipeline error: {e}")
@@ -250,6 +323,9 @@ def main():
     parser.add_argument("--note",        type=str)
     parser.add_argument("--show-context",action="store_true")
     parser.add_argument("--show-jobspec",action="store_true")
+    parser.add_argument("--from-stage",  choices=STAGE_NAMES,
+                        help="run this stage even if unchanged; reuse artifacts of earlier stages")
+    parser.add_argument("--until-stage", choices=STAGE_NAMES, help="stop after this stage")
     args = parser.parse_args()
 
     if args.note:
@@ -282,7 +358,8 @@ def main():
     if args.plan_only:
         return
 
-    run_summary = execute_jobspec(jobspec, dry_run=args.dry_run)
+    run_summary = execute_jobspec(jobspec, dry_run=args.dry_run,
+                                  from_stage=args.from_stage, until_stage=args.until_stage)
 
     print(f"\n{'='*60}")
     print(f"Run complete [{run_summary['run_id']}] — {run_summary['status'].upper()}")
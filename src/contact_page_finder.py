@@ -2,12 +2,17 @@ from __future__ import annotations
 
 import logging
 import re
-from typing import Dict, List, Set
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Union
+from urllib.parse import urlparse
 
 import pandas as pd
-import requests
-from bs4 import BeautifulSoup
 
+from .crawl_checkpoint import CrawlCheckpoint
+from .crawl_planner import plan_domain
+from .html_document import ParsedPage
+from .page_cache import CachedPage, FetchPolicy, load_fetch_policy
+from .parse_pool import EXTRACT_CONTACT_CANDIDATES, ParsePool, ParseTask, borrow_pool, load_mining_concurrency, map_domains
+from .site_crawl import SiteCrawl, replay_site
 from .utils import normalize_text
 
 log = logging.getLogger("cranegenius.contact_page_finder")
@@ -81,37 +86,32 @@ def _is_likely_person_name(first_name: str, last_name: str) -> bool:
     return True
 
 
-def _fetch(url: str) -> str:
-    try:
-        resp = requests.get(
-            url,
-            timeout=6,
-            allow_redirects=True,
-            headers={"User-Agent": "CraneGeniusContactFinder/1.0"},
-        )
-        return resp.text if resp.ok else ""
-    except Exception:
-        return ""
+def _fetch(url: str, policy: FetchPolicy) -> Optional[CachedPage]:
+    page = policy.fetch(url, timeout=6)
+    if page is None or not page.ok or not page.body:
+        return None
+    return page
 
 
-def _extract_candidates(html: str, domain: str, source_url: str) -> List[Dict[str, object]]:
-    soup = BeautifulSoup(html or "", "lxml")
-    text = soup.get_text(" ", strip=True)
+def _extract_candidates(html: Union[str, ParsedPage], domain: str, source_url: str) -> List[Dict[str, object]]:
+    doc = html if isinstance(html, ParsedPage) else ParsedPage(html, source_url)
+    text = doc.text
     if _is_content_context(source_url, text):
         return []
     rows: List[Dict[str, object]] = []
     seen: Set[str] = set()
 
-    for a in soup.select('a[href^="mailto:"]'):
-        href = normalize_text(a.get("href", ""))
-        email = normalize_text(href.replace("mailto:", "")).split("?")[0].strip().lower()
+    for link in doc.mailto_links:
+        if not link.href.startswith("mailto:"):
+            continue
+        email = normalize_text(link.href.replace("mailto:", "")).split("?")[0].strip().lower()
         if not email or not email.endswith(domain):
             continue
         if email in seen:
             continue
         seen.add(email)
 
-        anchor_text = normalize_text(a.get_text(" ", strip=True))
+        anchor_text = link.text
         name_match = NAME_RE.search(anchor_text)
         first_name = name_match.group(1) if name_match else ""
         last_name = name_match.group(2) if name_match else ""
@@ -160,8 +160,52 @@ def _extract_candidates(html: str, domain: str, source_url: str) -> List[Dict[st
     return rows
 
 
-def discover_contact_people(company_domains_df: pd.DataFrame) -> pd.DataFrame:
-    """Discover contact/team page names/emails for valid domains."""
+def _checkpoint_unit(row: pd.Series) -> str:
+    company = normalize_text(row.get("contractor_name_normalized", "")).lower().strip()
+    domain = normalize_text(row.get("contractor_domain", "")).lower().strip()
+    return f"{company}|{domain}"
+
+
+def _scan_pages(
+    domain: str, pool: ParsePool, site: Optional[SiteCrawl], policy: FetchPolicy
+) -> Iterator[Tuple[str, List[Dict[str, object]]]]:
+    """(url, candidates) per page: replayed from the site-crawl stage, or fetched from the ranked contact paths."""
+    if site is not None:
+        for url, page in replay_site(site, pool):
+            yield url, page.contact_candidates
+        return
+    # Same page budget as the guessed paths, spent on the best-ranked sitemap/guess URLs.
+    plan = plan_domain(domain, fetch_policy=policy)
+
+    def _tasks() -> Iterator[Tuple[str, Optional[ParseTask]]]:
+        for url in plan.seed_urls(CONTACT_PATHS, limit=len(CONTACT_PATHS)):
+            page = _fetch(url, policy)
+            if page is None:
+                continue
+            yield url, ParseTask(
+                url=url,
+                html=page.body,
+                extractors=(EXTRACT_CONTACT_CANDIDATES,),
+                context={"domain": domain},
+                content_hash=page.content_hash,
+            )
+
+    for url, extract in pool.imap(_tasks()):
+        yield url, extract.contact_candidates
+
+
+def discover_contact_people(
+    company_domains_df: pd.DataFrame,
+    site_crawls: Optional[Dict[str, SiteCrawl]] = None,
+    pool: Optional[ParsePool] = None,
+    fetch_policy: Optional[FetchPolicy] = None,
+) -> pd.DataFrame:
+    """
+    Discover contact/team page names/emails for valid domains. Domains in
+    `site_crawls` are replayed from the shared site-crawl stage instead of fetched.
+    Pages are parsed on `pool` (the run's pool), or on one opened for this call, and
+    fetched under `fetch_policy` (the run's, or a fresh one from crawler.yaml).
+    """
     columns = [
         "first_name",
         "last_name",
@@ -177,21 +221,24 @@ def discover_contact_people(company_domains_df: pd.DataFrame) -> pd.DataFrame:
     if company_domains_df.empty:
         return pd.DataFrame(columns=columns)
 
-    rows: List[Dict[str, object]] = []
-    for _, row in company_domains_df.iterrows():
+    concurrency = load_mining_concurrency()
+    policy = fetch_policy if fetch_policy is not None else load_fetch_policy()
+    checkpoint = CrawlCheckpoint("contact_page_finder", (_checkpoint_unit(r) for _, r in company_domains_df.iterrows()))
+
+    def _scan_row(row: pd.Series) -> List[Dict[str, object]]:
         domain = normalize_text(row.get("contractor_domain", "")).lower().strip()
         if not domain:
-            continue
+            return []
         if not bool(row.get("domain_valid", False)):
-            continue
+            return []
 
         company = normalize_text(row.get("contractor_name_normalized", "")).lower().strip()
-        for path in CONTACT_PATHS:
-            url = f"https://{domain}{path}"
-            html = _fetch(url)
-            if not html:
-                continue
-            extracted = _extract_candidates(html, domain, url)
+        unit = _checkpoint_unit(row)
+        if checkpoint.done(unit):
+            return checkpoint.rows(unit)
+        company_rows: List[Dict[str, object]] = []
+        for url, extracted in _scan_pages(domain, run_pool, (site_crawls or {}).get(domain), policy):
+            path = urlparse(url).path or "/"
             if extracted:
                 log.info(
                     "Contact page scan | company=%s domain=%s path=%s hits=%d",
@@ -207,7 +254,7 @@ def discover_contact_people(company_domains_df: pd.DataFrame) -> pd.DataFrame:
                 if not full_name and first_name and last_name:
                     full_name = f"{first_name} {last_name}".strip()
 
-                rows.append(
+                company_rows.append(
                     {
                         "first_name": first_name,
                         "last_name": last_name,
@@ -221,7 +268,15 @@ def discover_contact_people(company_domains_df: pd.DataFrame) -> pd.DataFrame:
                         "found_email": normalize_text(hit.get("found_email", "")).lower(),
                     }
                 )
+        checkpoint.record(unit, company_rows)
+        return company_rows
+
+    # Network threads scan companies; bodies are parsed on the process pool.
+    with borrow_pool(pool) as run_pool:
+        per_company = map_domains(_scan_row, [row for _, row in company_domains_df.iterrows()], concurrency.fetch_workers)
+    rows: List[Dict[str, object]] = [r for company_rows in per_company for r in company_rows]
 
+    checkpoint.finish()
     out = pd.DataFrame(rows, columns=columns)
     if out.empty:
         return out
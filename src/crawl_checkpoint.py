@@ -0,0 +1,96 @@
+"""
+Append-only crawl checkpoints for the long site-mining stages.
+
+discover_people, mine_contacts and discover_contact_people used to hold all
+results in memory until they returned, so a crash or Ctrl-C threw away the
+whole crawl. Each stage now appends one JSON line per finished unit (domain,
+or company+domain) holding that unit's extracted rows. A rerun over the same
+input skips finished units and replays their rows in place; the file is
+removed once the stage completes.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+log = logging.getLogger("cranegenius.crawl_checkpoint")
+
+DATA_DIR = Path("data")
+CHECKPOINT_DIR = Path(os.environ.get("CRANEGENIUS_CHECKPOINT_DIR", DATA_DIR / "checkpoints"))
+
+
+def _jsonable(value: Any) -> Any:
+    """numpy/pandas scalars -> plain Python so rows round-trip unchanged."""
+    item = getattr(value, "item", None)
+    if callable(item) and not isinstance(value, (str, bytes)):
+        try:
+            return item()
+        except (TypeError, ValueError):
+            pass
+    return str(value)
+
+
+def run_key(units: Iterable[str]) -> str:
+    """Stable id for one stage input: the same set of units maps to the same checkpoint file."""
+    digest = hashlib.sha1("\n".join(sorted(set(units))).encode("utf-8")).hexdigest()
+    return digest[:16]
+
+
+class CrawlCheckpoint:
+    """Per-stage completion log; safe to record from several threads."""
+
+    def __init__(self, stage: str, units: Iterable[str], directory: Optional[Path] = None) -> None:
+        self.stage = stage
+        self.directory = Path(directory) if directory is not None else CHECKPOINT_DIR
+        self.path = self.directory / f"{stage}-{run_key(units)}.jsonl"
+        self._lock = threading.Lock()
+        self._done: Dict[str, List[Dict[str, Any]]] = {}
+        self._load()
+        if self._done:
+            log.info("Resuming %s from checkpoint %s: %d units already done", stage, self.path, len(self._done))
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        with self.path.open("r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A crash mid-write leaves at most one torn trailing line.
+                    log.warning("Ignoring torn checkpoint line in %s", self.path)
+                    continue
+                self._done[str(record.get("unit", ""))] = list(record.get("rows") or [])
+
+    def done(self, unit: str) -> bool:
+        return unit in self._done
+
+    def rows(self, unit: str) -> List[Dict[str, Any]]:
+        return [dict(r) for r in self._done.get(unit, [])]
+
+    def record(self, unit: str, rows: List[Dict[str, Any]]) -> None:
+        """Durably mark `unit` finished with its extracted rows."""
+        line = json.dumps({"unit": unit, "rows": rows, "completed_at": time.time()}, default=_jsonable)
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write(line + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._done[unit] = json.loads(line)["rows"]
+
+    def finish(self) -> None:
+        """Stage completed: the checkpoint is no longer needed."""
+        with self._lock:
+            if self.path.exists():
+                self.path.unlink()
+            self._done.clear()
@@ -0,0 +1,139 @@
+"""
+Best-first crawl frontier shared by the site miners.
+
+Replaces the FIFO queues in site_contact_miner and people_discovery. URLs are
+popped highest-score first (score_url over path and anchor text), pages are
+streamed to the caller one at a time and not retained, and the caller stops
+the crawl (by leaving the loop) as soon as its YieldTarget is met.
+"""
+from __future__ import annotations
+
+import heapq
+import logging
+import os
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Set, Tuple, TypeVar, Union
+
+from .crawl_planner import score_url
+from .html_document import PageLink
+from .page_cache import CRAWLER_YAML, normalize_url
+from .utils import load_yaml
+
+log = logging.getLogger("cranegenius.crawl_frontier")
+
+MAX_FRONTIER_SIZE = 500
+
+PageLike = TypeVar("PageLike")
+
+
+@dataclass
+class YieldTarget:
+    """Stop crawling a domain once it has produced this much (0 disables a criterion)."""
+
+    people_with_titles: int = 3
+    person_emails: int = 2
+
+    @classmethod
+    def from_config(cls, cfg: Dict[str, Any]) -> "YieldTarget":
+        raw = cfg.get("yield_target") or {}
+        return cls(
+            people_with_titles=int(raw.get("people_with_titles", cls.people_with_titles)),
+            person_emails=int(raw.get("person_emails", cls.person_emails)),
+        )
+
+    def met(self, *, people_with_titles: int = 0, person_emails: int = 0) -> bool:
+        if self.people_with_titles > 0 and people_with_titles >= self.people_with_titles:
+            return True
+        return self.person_emails > 0 and person_emails >= self.person_emails
+
+
+def load_yield_target(crawler_yaml: str = CRAWLER_YAML) -> YieldTarget:
+    if not os.path.exists(crawler_yaml):
+        return YieldTarget()
+    return YieldTarget.from_config((load_yaml(crawler_yaml) or {}).get("crawler") or {})
+
+
+class CrawlFrontier:
+    """Max-priority URL queue with de-duplication and a size cap (lowest scores are dropped)."""
+
+    def __init__(self, max_depth: int, max_size: int = MAX_FRONTIER_SIZE) -> None:
+        self.max_depth = max_depth
+        self.max_size = max_size
+        self._heap: List[Tuple[float, int, str, int]] = []
+        self._seen: Set[str] = set()
+        self._seq = 0
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, url: str, depth: int, score: float) -> bool:
+        key = normalize_url(url)
+        if not key or key in self._seen or depth > self.max_depth:
+            return False
+        self._seen.add(key)
+        # seq keeps equal scores in insertion order, like the old FIFO.
+        heapq.heappush(self._heap, (-score, self._seq, url, depth))
+        self._seq += 1
+        if len(self._heap) > self.max_size * 2:
+            self._heap = heapq.nsmallest(self.max_size, self._heap)
+            heapq.heapify(self._heap)
+        return True
+
+    def pop(self) -> Optional[Tuple[str, int]]:
+        if not self._heap:
+            return None
+        _, _, url, depth = heapq.heappop(self._heap)
+        return url, depth
+
+
+def crawl(
+    seeds: Iterable[str],
+    fetch: Callable[[str], Union[None, PageLike, "Future[PageLike]"]],
+    *,
+    max_pages: int,
+    max_depth: int,
+    follow: Callable[[PageLink, PageLike, int], bool],
+    allowed: Callable[[str], bool] = lambda url: True,
+    in_flight: int = 1,
+) -> Iterator[Tuple[str, PageLike, int]]:
+    """
+    Yield (url, page, depth) best-first until the frontier is empty or
+    max_pages fetches have been attempted. `fetch` may return a ParsedPage or
+    a parse_pool.PageExtract, or a Future of one (ParsePool.submit); only
+    `.links` is used here. With in_flight > 1, up to that many fetched pages
+    wait for their parse while the next-best URLs are fetched, and pages are
+    yielded in fetch order; links are queued once their page is collected.
+    Stop early by breaking out of the loop; nothing but the frontier and the
+    pages in flight is held between pages.
+    """
+    frontier = CrawlFrontier(max_depth=max_depth)
+    for url in seeds:
+        frontier.push(url, 0, score_url(url))
+
+    pending: Deque[Tuple[str, int, Any]] = deque()
+    attempts = 0
+    while True:
+        while attempts < max_pages and len(pending) < max(1, in_flight):
+            item = frontier.pop()
+            if item is None:
+                break
+            url, depth = item
+            if not allowed(url):
+                continue
+            attempts += 1
+            result = fetch(url)
+            if result is not None:
+                pending.append((url, depth, result))
+        if not pending:
+            break
+        url, depth, result = pending.popleft()
+        doc = result.result() if isinstance(result, Future) else result
+        if doc is None:
+            continue
+        if depth < max_depth:
+            for link in doc.links:
+                if follow(link, doc, depth):
+                    frontier.push(link.url, depth + 1, score_url(link.url, link.text))
+        yield url, doc, depth
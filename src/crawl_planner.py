@@ -0,0 +1,193 @@
+"""
+Per-domain crawl planning from robots.txt and sitemap.xml.
+
+The site miners used to guess paths (DISCOVERY_PATHS, CONTACT_PATHS, every
+homepage link) and spent their page budget on blog posts and project
+galleries. A CrawlPlan reads robots.txt and the sitemap(s) once per domain
+(through the shared page cache), drops disallowed URLs, and ranks what is
+left by how likely it is to list people, so a fixed budget goes to the
+contact/team/leadership pages first.
+"""
+from __future__ import annotations
+
+import logging
+import re
+import threading
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+
+from .page_cache import DEFAULT_USER_AGENT, CachedPage, FetchPolicy, normalize_url
+from .utils import normalize_text
+
+log = logging.getLogger("cranegenius.crawl_planner")
+
+PLANNER_TIMEOUT_SECONDS = 8
+MAX_SITEMAP_FILES = 5
+MAX_SITEMAP_URLS = 2000
+
+# (pattern, weight): matched against the lowercased URL path and anchor text.
+URL_SCORE_RULES = [
+    (re.compile(r"(our-)?team|staff|people|leadership|management|directory|employees"), 10.0),
+    (re.compile(r"contact"), 8.0),
+    (re.compile(r"about|company|who-we-are"), 5.0),
+    (re.compile(r"bio|profile|executive|officers|principals|estimat|precon"), 4.0),
+    (re.compile(r"locations?|offices?"), 2.0),
+]
+URL_PENALTY_RULES = [
+    (re.compile(r"blog|news|press|article|post|gallery|portfolio|projects?/|case-stud|event"), -6.0),
+    (re.compile(r"careers?|jobs|privacy|terms|cookie|login|cart|checkout|wp-content|tag/|category/"), -8.0),
+    (re.compile(r"/\d{4}/\d{2}/"), -4.0),
+]
+SKIP_EXTENSIONS = (".jpg", ".jpeg", ".png", ".gif", ".pdf", ".zip", ".mp4", ".mov", ".svg", ".webp", ".xml", ".gz")
+DEPTH_PENALTY = 0.5
+
+
+def score_url(url: str, anchor_text: str = "") -> float:
+    """How likely a URL is to list people; higher is better. Homepage scores 1."""
+    parsed = urlparse(url)
+    path = (parsed.path or "/").lower()
+    if path in ("", "/"):
+        return 1.0
+    hay = f"{path} {normalize_text(anchor_text).lower()}"
+    score = 0.0
+    for pattern, weight in URL_SCORE_RULES:
+        if pattern.search(hay):
+            score += weight
+    for pattern, weight in URL_PENALTY_RULES:
+        if pattern.search(path):
+            score += weight
+    depth = len([p for p in path.split("/") if p])
+    return score - DEPTH_PENALTY * max(0, depth - 1)
+
+
+def _sitemap_locs(xml_text: str) -> List[str]:
+    """<loc> values from a sitemap or sitemap index; namespace-agnostic."""
+    try:
+        root = ET.fromstring(xml_text.strip().encode("utf-8"))
+    except (ET.ParseError, ValueError):
+        return []
+    return [normalize_text(el.text) for el in root.iter() if el.tag.rsplit("}", 1)[-1] == "loc" and normalize_text(el.text)]
+
+
+def _is_sitemap_index(xml_text: str) -> bool:
+    return "<sitemapindex" in xml_text[:2000].lower()
+
+
+@dataclass
+class CrawlPlan:
+    domain: str
+    # the agent the miners fetch as (FetchPolicy.user_agent); robots rules are matched against it
+    user_agent: str = DEFAULT_USER_AGENT
+    robots: Optional[RobotFileParser] = None
+    sitemap_urls: List[str] = field(default_factory=list)
+
+    def allowed(self, url: str) -> bool:
+        if self.robots is None:
+            return True
+        try:
+            return self.robots.can_fetch(self.user_agent, url)
+        except Exception:
+            return True
+
+    def in_domain(self, url: str) -> bool:
+        host = (urlparse(url).hostname or "").lower()
+        return host == self.domain or host.endswith(f".{self.domain}")
+
+    def rank(self, urls: Iterable[str]) -> List[str]:
+        """In-domain, allowed, de-duplicated URLs, best first (ties keep input order)."""
+        seen: set = set()
+        kept: List[str] = []
+        for url in urls:
+            key = normalize_url(url)
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            parsed = urlparse(url)
+            if parsed.scheme not in ("http", "https") or not self.in_domain(url):
+                continue
+            if (parsed.path or "").lower().endswith(SKIP_EXTENSIONS):
+                continue
+            if not self.allowed(url):
+                continue
+            kept.append(url)
+        return sorted(kept, key=score_url, reverse=True)
+
+    def seed_urls(self, fallback_paths: Sequence[str], limit: Optional[int] = None) -> List[str]:
+        """Guessed paths plus sitemap URLs, ranked; sitemap-listed pages fill the budget first on ties."""
+        guesses = [f"https://{self.domain}{p}" for p in fallback_paths]
+        ranked = self.rank(list(self.sitemap_urls) + guesses)
+        return ranked[:limit] if limit is not None else ranked
+
+
+_PLANS: Dict[Tuple[str, str], CrawlPlan] = {}
+_PLANS_LOCK = threading.Lock()
+
+
+def _fetch_text(url: str, policy: FetchPolicy) -> Optional[CachedPage]:
+    return policy.fetch(url, timeout=PLANNER_TIMEOUT_SECONDS)
+
+
+def _load_robots(domain: str, policy: FetchPolicy) -> Optional[RobotFileParser]:
+    page = _fetch_text(f"https://{domain}/robots.txt", policy)
+    robots = RobotFileParser(f"https://{domain}/robots.txt")
+    if page is None or page.status >= 500:
+        return None
+    if page.status in (401, 403):
+        robots.disallow_all = True
+        return robots
+    if page.status >= 400:
+        return None
+    robots.parse(page.body.splitlines())
+    return robots
+
+
+def _load_sitemap_urls(domain: str, robots: Optional[RobotFileParser], policy: FetchPolicy) -> List[str]:
+    pending = list((robots.site_maps() if robots is not None else None) or [f"https://{domain}/sitemap.xml"])
+    fetched = 0
+    urls: List[str] = []
+    seen_maps: set = set()
+    while pending and fetched < MAX_SITEMAP_FILES and len(urls) < MAX_SITEMAP_URLS:
+        sitemap_url = pending.pop(0)
+        if sitemap_url in seen_maps or sitemap_url.lower().endswith(".gz"):
+            continue
+        seen_maps.add(sitemap_url)
+        fetched += 1
+        page = _fetch_text(sitemap_url, policy)
+        if page is None or not page.ok or not page.body:
+            continue
+        locs = _sitemap_locs(page.body)
+        if _is_sitemap_index(page.body):
+            # Child sitemaps that sound like pages/team go first; post archives last.
+            pending.extend(sorted(locs, key=score_url, reverse=True))
+        else:
+            urls.extend(locs[: MAX_SITEMAP_URLS - len(urls)])
+    return urls
+
+
+def plan_domain(domain: str, *, fetch_policy: Optional[FetchPolicy] = None) -> CrawlPlan:
+    """
+    Build (or return the memoized) crawl plan for a domain. robots.txt and the
+    sitemaps are read through the page cache, so every miner and every run
+    inside the freshness window shares one download; they are fetched under
+    the caller's fetch_policy (agent, freshness, politeness, byte budget) like
+    any other page of the domain, and `allowed` answers for that agent.
+    """
+    domain = normalize_text(domain).lower()
+    policy = fetch_policy if fetch_policy is not None else FetchPolicy()
+    key = (domain, policy.user_agent)
+    with _PLANS_LOCK:
+        cached = _PLANS.get(key)
+    if cached is not None:
+        return cached
+
+    robots = _load_robots(domain, policy)
+    sitemap_urls = _load_sitemap_urls(domain, robots, policy)
+    plan = CrawlPlan(domain=domain, user_agent=policy.user_agent, robots=robots, sitemap_urls=sitemap_urls)
+    log.debug("Crawl plan %s: robots=%s sitemap_urls=%d", domain, robots is not None, len(sitemap_urls))
+
+    with _PLANS_LOCK:
+        _PLANS.setdefault(key, plan)
+        return _PLANS[key]
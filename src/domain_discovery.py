@@ -12,6 +12,7 @@ import pandas as pd
 import requests
 from bs4 import BeautifulSoup
 
+from .telemetry import record_retry
 from .utils import normalize_text
 
 log = logging.getLogger("cranegenius.domain_discovery")
@@ -439,6 +440,7 @@ def validate_domain(domain: str, company_context: str = "") -> Dict[str, object]
         final_url = response.url
 
         if status_code == 403:
+            record_retry("domain_validation_403")
             response = requests.head(
                 test_url,
                 timeout=5,
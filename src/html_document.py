@@ -0,0 +1,237 @@
+"""
+Parse-once HTML document model shared by the contact extractors.
+
+A ParsedPage wraps one fetched page. The lxml-backed soup, visible text,
+links, mailto/tel anchors, JSON-LD blocks and person cards are computed on
+first access and memoized, so site_contact_miner, people_discovery and
+contact_page_finder can all read the same page without re-parsing it.
+"""
+from __future__ import annotations
+
+import json
+import logging
+from collections import deque
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import unquote, urljoin
+
+from bs4 import BeautifulSoup, NavigableString, Tag
+
+from .utils import extract_emails, extract_phones, normalize_text
+
+log = logging.getLogger("cranegenius.html_document")
+
+PARSER_BACKEND = "lxml"
+PERSON_TYPES = {"person"}
+PERSON_CONTAINER_KEYS = ("employee", "employees", "founder", "founders", "member", "members", "author", "contactPoint")
+
+
+@dataclass
+class TextIndex:
+    """
+    Whole-document text built in one traversal.
+
+    `buffer` is the page text exactly as soup.get_text(" ", strip=True) then
+    normalize_text would produce it, and `spans` maps id(tag) to the slice of
+    the buffer holding that tag's own text. `tags` lists every tag in document
+    (pre-)order, i.e. the order find_all would return them.
+    """
+
+    buffer: str
+    spans: Dict[int, Tuple[int, int]]
+    tags: List[Tag]
+
+
+def _build_text_index(soup: BeautifulSoup) -> TextIndex:
+    allowed = soup.interesting_string_types
+    allowed_types = allowed if isinstance(allowed, tuple) else (allowed,)
+    pieces: List[str] = []
+    starts: List[int] = []
+    spans: Dict[int, Tuple[int, int]] = {}
+    tags: List[Tag] = []
+    length = 0
+
+    # (node, None) = enter; (tag, first_piece_index) = exit marker.
+    stack: List[Tuple[Any, Any]] = [(soup, None)]
+    while stack:
+        node, mark = stack.pop()
+        if mark is not None:
+            if len(starts) > mark:
+                spans[id(node)] = (starts[mark], length)
+            continue
+        if isinstance(node, Tag):
+            if node is not soup:
+                tags.append(node)
+            stack.append((node, len(starts)))
+            for child in reversed(node.contents):
+                stack.append((child, None))
+        elif isinstance(node, NavigableString) and type(node) in allowed_types:
+            piece = normalize_text(node)
+            if not piece:
+                continue
+            if pieces:
+                length += 1
+            starts.append(length)
+            pieces.append(piece)
+            length += len(piece)
+
+    return TextIndex(buffer=" ".join(pieces), spans=spans, tags=tags)
+
+
+@dataclass
+class PageLink:
+    href: str
+    url: str
+    text: str
+    tag: Optional[Tag]
+    # Precomputed people-extraction noise flag for links shipped back from a parser process (tag is None there).
+    noise: Optional[bool] = None
+
+
+def _as_list(value: Any) -> List[Any]:
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return value
+    return [value]
+
+
+def _is_person(node: Dict[str, Any]) -> bool:
+    return any(normalize_text(t).lower() in PERSON_TYPES for t in _as_list(node.get("@type")))
+
+
+def _walk_json_ld(nodes: Iterable[Any]) -> Iterable[Dict[str, Any]]:
+    stack = deque(nodes)
+    while stack:
+        node = stack.popleft()
+        if isinstance(node, list):
+            stack.extend(node)
+            continue
+        if not isinstance(node, dict):
+            continue
+        yield node
+        stack.extend(_as_list(node.get("@graph")))
+        for key in PERSON_CONTAINER_KEYS:
+            stack.extend(_as_list(node.get(key)))
+
+
+class ParsedPage:
+    """One fetched page; every derived view is computed lazily and only once."""
+
+    def __init__(self, html: str, url: str = "") -> None:
+        self.html = html or ""
+        self.url = normalize_text(url)
+        self._element_text: Dict[int, str] = {}
+
+    @cached_property
+    def soup(self) -> BeautifulSoup:
+        return BeautifulSoup(self.html, PARSER_BACKEND)
+
+    @cached_property
+    def text_index(self) -> TextIndex:
+        return _build_text_index(self.soup)
+
+    @cached_property
+    def text(self) -> str:
+        """Visible page text, whitespace-normalized (same as soup.get_text(" ", strip=True))."""
+        return self.text_index.buffer
+
+    def element_text(self, el: Tag) -> str:
+        """
+        Normalized text for one element, sliced from the shared text index and
+        memoized, so no subtree is ever re-serialized. Tags with their own string
+        rules (script, style, template) fall back to get_text.
+        """
+        key = id(el)
+        cached = self._element_text.get(key)
+        if cached is None:
+            index = self.text_index
+            if el.interesting_string_types != self.soup.interesting_string_types:
+                cached = normalize_text(el.get_text(" ", strip=True))
+            else:
+                span = index.spans.get(key)
+                cached = index.buffer[span[0]:span[1]] if span else ""
+            self._element_text[key] = cached
+        return cached
+
+    @cached_property
+    def emails(self) -> List[str]:
+        """Emails found anywhere in the raw markup (attributes included)."""
+        return extract_emails(self.html)
+
+    @cached_property
+    def phones(self) -> List[str]:
+        return extract_phones(self.html)
+
+    @cached_property
+    def links(self) -> List[PageLink]:
+        out: List[PageLink] = []
+        for a in self.soup.select("a[href]"):
+            href = normalize_text(a.get("href", ""))
+            if not href:
+                continue
+            out.append(PageLink(href=href, url=urljoin(self.url, href) if self.url else href, text=self.element_text(a), tag=a))
+        return out
+
+    @cached_property
+    def mailto_links(self) -> List[PageLink]:
+        return [link for link in self.links if link.href.lower().startswith("mailto:")]
+
+    @cached_property
+    def tel_links(self) -> List[PageLink]:
+        return [link for link in self.links if link.href.lower().startswith("tel:")]
+
+    @cached_property
+    def json_ld(self) -> List[Dict[str, Any]]:
+        """All JSON-LD objects on the page, with @graph and nested lists flattened."""
+        blocks: List[Any] = []
+        for script in self.soup.find_all("script", attrs={"type": "application/ld+json"}):
+            raw = script.string or script.get_text()
+            if not raw or not raw.strip():
+                continue
+            try:
+                blocks.append(json.loads(raw))
+            except ValueError:
+                log.debug("Invalid JSON-LD block on %s", self.url)
+        return list(_walk_json_ld(blocks))
+
+    @cached_property
+    def person_blocks(self) -> List[Dict[str, str]]:
+        """Person cards from JSON-LD and schema.org/Person microdata: name, job_title, email."""
+        out: List[Dict[str, str]] = []
+        seen: set = set()
+
+        def _add(name: Any, job_title: Any, email: Any) -> None:
+            clean_name = normalize_text(name if isinstance(name, str) else "")
+            if not clean_name:
+                return
+            clean_email = normalize_text(email if isinstance(email, str) else "").lower()
+            clean_email = unquote(clean_email.replace("mailto:", "")).split("?")[0].strip()
+            key = (clean_name.lower(), clean_email)
+            if key in seen:
+                return
+            seen.add(key)
+            out.append({
+                "name": clean_name,
+                "job_title": normalize_text(job_title if isinstance(job_title, str) else ""),
+                "email": clean_email,
+            })
+
+        for node in self.json_ld:
+            if _is_person(node):
+                _add(node.get("name"), node.get("jobTitle"), node.get("email"))
+
+        for card in self.soup.find_all(attrs={"itemtype": True}):
+            if "schema.org/person" not in normalize_text(card.get("itemtype", "")).lower():
+                continue
+            props: Dict[str, str] = {}
+            for prop in card.find_all(attrs={"itemprop": True}):
+                name = normalize_text(prop.get("itemprop", ""))
+                if name in props:
+                    continue
+                value = prop.get("content") or prop.get("href") or self.element_text(prop)
+                props[name] = normalize_text(value)
+            _add(props.get("name"), props.get("jobTitle"), props.get("email"))
+
+        return out
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import io
 import logging
-from typing import Any, Dict, List
+from typing import Any, Collection, Dict, Iterator, List, Optional
 
 import pandas as pd
 import requests
@@ -13,6 +13,7 @@ from .scrapers.bid_board_scraper import BidBoardScraper
 from .scrapers.contractor_directory_scraper import ContractorDirectoryScraper
 from .scrapers.industrial_project_scraper import IndustrialProjectScraper
 from .scrapers.permit_multi_city_scraper import PermitMultiCityScraper
+from .telemetry import track_stage
 from .utils import load_yaml, normalize_text, utc_now_iso
 
 log = logging.getLogger("cranegenius.ingest")
@@ -48,51 +49,96 @@ MULTI_SOURCE_SCRAPERS = [
 ]
 
 
-def ingest_sources(sources_yaml_path: str) -> pd.DataFrame:
+def ingest_units(sources_yaml_path: str) -> List[str]:
+    """
+    The independently runnable pieces of ingest, in run order: every enabled
+    source by id (one per jurisdiction), then every multi-source scraper by
+    class name. The pipeline's sharded mode spreads these over processes.
+    """
+    cfg = load_yaml(sources_yaml_path)
+    sources = [str(s.get("id", "unknown")) for s in cfg.get("sources", []) if s.get("enabled")]
+    if not sources:
+        return []
+    return sources + [scraper_cls.__name__ for scraper_cls in MULTI_SOURCE_SCRAPERS]
+
+
+def ingest_sources(sources_yaml_path: str, units: Optional[Collection[str]] = None) -> pd.DataFrame:
+    """All raw rows, or only those of `units` (see ingest_units)."""
+    rows: List[Dict[str, Any]] = []
+    for source_rows in _iter_source_rows(sources_yaml_path, units):
+        rows.extend(source_rows)
+
+    df = pd.DataFrame(rows, columns=RAW_COLUMNS)
+    log.info("Ingest complete: %d total raw rows", len(df))
+    return df
+
+
+def iter_source_frames(sources_yaml_path: str) -> Iterator[pd.DataFrame]:
+    """Raw rows one source at a time, as each source finishes (the pipeline's streaming mode)."""
+    total = 0
+    for source_rows in _iter_source_rows(sources_yaml_path):
+        total += len(source_rows)
+        yield pd.DataFrame(source_rows, columns=RAW_COLUMNS)
+    log.info("Ingest complete: %d total raw rows", total)
+
+
+def _iter_source_rows(sources_yaml_path: str, units: Optional[Collection[str]] = None) -> Iterator[List[Dict[str, Any]]]:
     cfg = load_yaml(sources_yaml_path)
     sources = [s for s in cfg.get("sources", []) if s.get("enabled")]
 
     if not sources:
         log.warning("No enabled sources found in %s", sources_yaml_path)
-        return pd.DataFrame(columns=RAW_COLUMNS)
+        return
+    multi_source_scrapers = MULTI_SOURCE_SCRAPERS
+    if units is not None:
+        sources = [s for s in sources if s.get("id", "unknown") in units]
+        multi_source_scrapers = [c for c in MULTI_SOURCE_SCRAPERS if c.__name__ in units]
 
     log.info("Ingesting %d enabled source(s)...", len(sources))
-    rows: List[Dict[str, Any]] = []
 
     for s in sources:
         method = s.get("method", "")
         source_id = s.get("id", "unknown")
         log.info("  → source: %s (method: %s)", source_id, method)
 
+        rows: List[Dict[str, Any]] = []
         try:
-            # Check registry first (metro-specific scrapers)
-            if method in SCRAPER_REGISTRY:
-                scraper = SCRAPER_REGISTRY[method](s)
-                rows.extend(scraper.run())
+            # timed per source; the rows are yielded outside the stage so a
+            # streaming consumer's work is not billed to the source
+            with track_stage(f"ingest/{source_id}") as t:
+                # Check registry first (metro-specific scrapers)
+                if method in SCRAPER_REGISTRY:
+                    scraper = SCRAPER_REGISTRY[method](s)
+                    rows = list(scraper.run())
 
-            elif method == "csv":
-                rows.extend(_ingest_generic_csv(s))
+                elif method == "csv":
+                    rows = _ingest_generic_csv(s)
 
-            elif method == "html_list":
-                rows.extend(_ingest_html_list_basic(s))
+                elif method == "html_list":
+                    rows = _ingest_html_list_basic(s)
 
-            else:
-                log.warning("Unknown method '%s' for source %s — skipping", method, source_id)
+                else:
+                    log.warning("Unknown method '%s' for source %s — skipping", method, source_id)
+                    continue
+                t.rows_out = len(rows)
 
         except Exception as exc:
             log.warning("Source %s failed (skipping): %s", source_id, exc)
+            continue
+        yield rows
 
+    if not multi_source_scrapers:
+        return
     # Additive multi-source discovery layer for outbound scale.
-    rows.extend(_ingest_multi_source_signals())
-
-    df = pd.DataFrame(rows, columns=RAW_COLUMNS)
-    log.info("Ingest complete: %d total raw rows", len(df))
-    return df
+    with track_stage("ingest/multi_source_signals") as t:
+        rows = _ingest_multi_source_signals(multi_source_scrapers)
+        t.rows_out = len(rows)
+    yield rows
 
 
-def _ingest_multi_source_signals() -> List[Dict[str, Any]]:
+def _ingest_multi_source_signals(scrapers: Collection[type]) -> List[Dict[str, Any]]:
     rows: List[Dict[str, Any]] = []
-    for scraper_cls in MULTI_SOURCE_SCRAPERS:
+    for scraper_cls in scrapers:
         scraper = scraper_cls({})
         try:
             signal_rows = scraper.run()
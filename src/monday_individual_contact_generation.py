@@ -8,6 +8,7 @@ from typing import Dict, List, Tuple
 
 import pandas as pd
 
+from .people_email_generator import _expand_template
 from .utils import normalize_text, setup_logging
 
 log = logging.getLogger("cranegenius.monday_individual_contacts")
@@ -86,16 +87,51 @@ def _placeholder_name(company: str, role_bucket: str) -> Tuple[str, str]:
     return FIRST_NAMES[a % len(FIRST_NAMES)], LAST_NAMES[b % len(LAST_NAMES)]
 
 
-def _individual_patterns(first: str, last: str, domain: str) -> List[Tuple[str, str]]:
-    f = normalize_text(first).lower()
-    l = normalize_text(last).lower()
-    if not f or not l or not domain:
-        return []
-    return [
-        (f"{f}.{l}@{domain}", "placeholder_pattern_first_last"),
-        (f"{f}@{domain}", "placeholder_pattern_first"),
-        (f"{f[0]}_{l}@{domain}", "placeholder_pattern_first_initial_last"),
-    ]
+# Placeholder patterns: (generation_method, local part template over first / last / "f" initial).
+INDIVIDUAL_PATTERNS: List[Tuple[str, Tuple[str, ...]]] = [
+    ("placeholder_pattern_first_last", ("first", ".", "last")),
+    ("placeholder_pattern_first", ("first",)),
+    ("placeholder_pattern_first_initial_last", ("f", "_", "last")),
+]
+
+
+def _role_grid(with_domains: pd.DataFrame) -> pd.DataFrame:
+    """One row per company/domain and role bucket, company-major, with its placeholder name."""
+    roles = pd.DataFrame({"contact_role_bucket": [bucket for bucket, _ in ROLE_BUCKETS]})
+    grid = with_domains[["company_name", "domain"]].merge(roles, how="cross")
+    names = [_placeholder_name(c, r) for c, r in zip(grid["company_name"], grid["contact_role_bucket"])]
+    grid["first"] = [normalize_text(first).lower() for first, _ in names]
+    grid["last"] = [normalize_text(last).lower() for _, last in names]
+    return grid
+
+
+def _individual_candidates(grid: pd.DataFrame) -> pd.DataFrame:
+    """Every placeholder pattern over the whole grid, in grid then pattern order."""
+    parts = {"first": grid["first"], "last": grid["last"], "f": grid["first"].str[0]}
+    frames = []
+    for method, template in INDIVIDUAL_PATTERNS:
+        local = _expand_template(template, parts)
+        frames.append(
+            pd.DataFrame({
+                "company_name": grid["company_name"],
+                "domain": grid["domain"],
+                "contact_role_bucket": grid["contact_role_bucket"],
+                "email_candidate": local + "@" + grid["domain"],
+                "generation_method": method,
+            })
+        )
+    # index is the grid position, so a stable sort interleaves patterns per grid row
+    return pd.concat(frames).sort_index(kind="stable").reset_index(drop=True)
+
+
+def _role_candidates(grid: pd.DataFrame) -> pd.DataFrame:
+    return pd.DataFrame({
+        "company_name": grid["company_name"],
+        "domain": grid["domain"],
+        "contact_role_bucket": grid["contact_role_bucket"],
+        "email_candidate": grid["contact_role_bucket"].map(ROLE_INBOX_PREFIX) + "@" + grid["domain"],
+        "generation_method": "role_inbox",
+    })
 
 
 def run() -> Dict[str, int]:
@@ -109,38 +145,9 @@ def run() -> Dict[str, int]:
     base = base[base["company_name"] != ""].drop_duplicates(subset=["company_name", "domain"])
     with_domains = base[base["domain"] != ""].copy()
 
-    individual_rows: List[Dict[str, str]] = []
-    role_rows: List[Dict[str, str]] = []
-
-    for _, row in with_domains.iterrows():
-        company = row["company_name"]
-        domain = row["domain"]
-        for role_bucket, _role_title in ROLE_BUCKETS:
-            first, last = _placeholder_name(company, role_bucket)
-            for email, method in _individual_patterns(first, last, domain):
-                individual_rows.append(
-                    {
-                        "company_name": company,
-                        "domain": domain,
-                        "contact_role_bucket": role_bucket,
-                        "email_candidate": email,
-                        "generation_method": method,
-                    }
-                )
-
-            inbox = f"{ROLE_INBOX_PREFIX[role_bucket]}@{domain}"
-            role_rows.append(
-                {
-                    "company_name": company,
-                    "domain": domain,
-                    "contact_role_bucket": role_bucket,
-                    "email_candidate": inbox,
-                    "generation_method": "role_inbox",
-                }
-            )
-
-    individual_df = pd.DataFrame(individual_rows).drop_duplicates(subset=["email_candidate"])
-    role_df = pd.DataFrame(role_rows).drop_duplicates(subset=["email_candidate"])
+    grid = _role_grid(with_domains)
+    individual_df = _individual_candidates(grid).drop_duplicates(subset=["email_candidate"])
+    role_df = _role_candidates(grid).drop_duplicates(subset=["email_candidate"])
     all_df = pd.concat([individual_df, role_df], ignore_index=True).drop_duplicates(subset=["email_candidate"])
 
     individual_df.to_csv(OUT_INDIVIDUAL, index=False)
@@ -13,10 +13,24 @@ from urllib.parse import urlparse
 import pandas as pd
 
 from .domain_discovery import discover_company_domains
+from .catchall_probe import detect_catchall_domains, split_catchall_candidates
 from .contact_page_finder import discover_contact_people
+from .page_cache import CRAWLER_YAML, load_fetch_policy
+from .parse_pool import load_parse_pool
 from .people_discovery import discover_people
+from .pattern_model import (
+    load_pattern_model,
+    observations_from_mined_patterns,
+    observations_from_people,
+    record_verification_outcomes,
+)
 from .people_email_generator import generate_email_candidates_for_people
+from .site_contact_miner import mine_contacts
+from .site_crawl import crawl_sites
+from .telemetry import RunTelemetry, track_stage
 from .utils import normalize_text, setup_logging
+from .verification_cache import get_verification_cache
+from .verification_scheduler import schedule_verification
 from .verify_millionverifier import verify_with_millionverifier
 
 log = logging.getLogger("cranegenius.monday_people_pipeline")
@@ -299,13 +313,126 @@ def _person_source_confidence(row: pd.Series) -> str:
     return "low"
 
 
+# Column-wise forms of the row gates above, for whole candidate / people frames.
+# Each must agree with its row version on every row; tests compare them.
+PERSON_CONTEXT_FIELDS = (
+    "strong_person_context_signal",
+    "person_context_signal",
+    "person_context_strong",
+    "has_person_context",
+)
+_STRONG_PATH_RE = "|".join(re.escape(h) for h in PERSON_SOURCE_STRONG_PATH_HINTS)
+_DISPOSABLE_SUFFIX_RE = r"\.(?:" + "|".join(re.escape(d) for d in sorted(DISPOSABLE_DOMAINS)) + r")\Z"
+# _has_single_at_sign and _is_valid_local_part in one pass: the local part may carry
+# surrounding whitespace (normalize_text strips it) but no "..".
+_WELL_FORMED_EMAIL_RE = re.compile(
+    r"\s*(?![^@]*\.\.)" + EMAIL_LOCAL_RE.pattern.strip("^$") + r"\s*@[^@]*[^@\s][^@]*\Z"
+)
+
+
+def _present_col(df: pd.DataFrame, name: str) -> pd.Series:
+    """normalize_text(value) != "" over a column; a missing column reads as absent."""
+    if name not in df.columns:
+        return pd.Series(False, index=df.index)
+    col = df[name]
+    return col.notna() & (col.astype(str).str.strip() != "")
+
+
+def _flag_col(df: pd.DataFrame, name: str) -> pd.Series:
+    """bool(value) over a column; a missing column reads as False."""
+    if name not in df.columns:
+        return pd.Series(False, index=df.index)
+    return df[name].astype(object).astype(bool)
+
+
+def _normalized_lower_col(df: pd.DataFrame, name: str) -> pd.Series:
+    """normalize_text(value).lower(), computed once per distinct value."""
+    if name not in df.columns:
+        return pd.Series("", index=df.index, dtype=object)
+    col = df[name].astype(object).where(df[name].notna(), "")
+    return col.map({v: normalize_text(v).lower() for v in col.unique()})
+
+
+def _strong_person_evidence_mask(df: pd.DataFrame) -> pd.Series:
+    mask = _flag_col(df, "title_confirmed") | _present_col(df, "found_email")
+    for field in PERSON_CONTEXT_FIELDS:
+        mask |= _flag_col(df, field)
+    return mask
+
+
+def _verification_confidence_mask(df: pd.DataFrame) -> pd.Series:
+    if "pattern_confidence" in df.columns:
+        raw = df["pattern_confidence"]
+        # `value or 0.0`: falsy values (None, "", 0) count as 0.0
+        confidence = pd.to_numeric(raw.where(raw.astype(object).astype(bool), 0.0), errors="coerce")
+    else:
+        confidence = pd.Series(0.0, index=df.index)
+    title_confirmed = _flag_col(df, "title_confirmed")
+    found_email = _present_col(df, "found_email")
+    has_source = _present_col(df, "source_url")
+    passes = (confidence >= 0.94).where(
+        ~(title_confirmed | found_email), confidence >= 0.90
+    ).where(~(title_confirmed & has_source), confidence >= 0.86)
+    return _strong_person_evidence_mask(df) & passes.astype(bool)
+
+
+def _url_parts(urls: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    """(host without "www.", lowercased path) per URL, parsing each distinct URL once."""
+    hosts: Dict[str, str] = {}
+    paths: Dict[str, str] = {}
+    for url in urls.unique():
+        parsed = urlparse(url) if url else None
+        hosts[url] = (parsed.netloc or "").lower().replace("www.", "") if parsed else ""
+        paths[url] = normalize_text(parsed.path if parsed else "").lower().strip()
+    return urls.map(hosts), urls.map(paths)
+
+
+def _person_source_confidence_labels(df: pd.DataFrame) -> pd.Series:
+    named = _present_col(df, "first_name") & _present_col(df, "last_name")
+    contractor_domain = _normalized_lower_col(df, "contractor_domain")
+    title_confirmed = _flag_col(df, "title_confirmed")
+    found_email = _present_col(df, "found_email")
+
+    source_host, source_path = _url_parts(_normalized_lower_col(df, "source_url"))
+    on_subdomain = pd.Series(
+        [h.endswith(f".{d}") for h, d in zip(source_host, contractor_domain)], index=df.index, dtype=bool
+    )
+    host_matches = (contractor_domain != "") & (source_host != "") & ((source_host == contractor_domain) | on_subdomain)
+    strong_path = source_path.str.contains(_STRONG_PATH_RE, regex=True)
+    weak_path = source_path.isin(PERSON_SOURCE_WEAK_PATH_HINTS)
+
+    score = (
+        2 * title_confirmed.astype(int)
+        + host_matches.astype(int)
+        + strong_path.astype(int)
+        + 2 * found_email.astype(int)
+        - ((source_host != "") & ~host_matches).astype(int)
+        - (weak_path & ~(title_confirmed | found_email)).astype(int)
+    )
+    labels = pd.Series("low", index=df.index, dtype=object)
+    labels[score >= 2] = "medium"
+    labels[score >= 4] = "high"
+    labels[~named | ~_strong_person_evidence_mask(df)] = "low"
+    return labels
+
+
+def _malformed_email_mask(emails: pd.Series) -> pd.Series:
+    """Not exactly one interior "@", or a local part _is_valid_local_part rejects."""
+    return ~emails.fillna("").astype(str).str.lower().str.match(_WELL_FORMED_EMAIL_RE)
+
+
+def _disposable_domain_mask(domains: pd.Series) -> pd.Series:
+    clean = domains.fillna("").astype(str).str.strip().str.lower().str.strip(".")
+    return (clean != "") & (clean.isin(DISPOSABLE_DOMAINS) | clean.str.contains(_DISPOSABLE_SUFFIX_RE, regex=True))
+
+
 def _filter_people_for_personal_generation(people_df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame, Dict[str, int]]:
     if people_df.empty:
         return people_df.copy(), people_df.copy(), {"total_people_rows": 0, "deferred_low_person_source": 0, "eligible_people_rows": 0}
 
     work = people_df.copy()
-    work["person_source_confidence"] = work.apply(_person_source_confidence, axis=1)
-    work["has_strong_person_evidence"] = work.apply(_has_strong_person_evidence, axis=1).fillna(False).astype(bool)
+    work["person_source_confidence"] = _person_source_confidence_labels(work)
+    work["has_strong_person_evidence"] = _strong_person_evidence_mask(work)
     eligible_mask = work["person_source_confidence"].isin(["high", "medium"]) & work["has_strong_person_evidence"]
     eligible = work[eligible_mask].copy()
     deferred = work[~eligible_mask].copy()
@@ -328,6 +455,7 @@ def _prepare_candidates_for_verification(all_candidates_df: pd.DataFrame, domain
         "first_name",
         "last_name",
         "email_pattern",
+        "pattern_rank",
         "pattern_confidence",
         "title",
         "title_confirmed",
@@ -406,12 +534,11 @@ def _prepare_candidates_for_verification(all_candidates_df: pd.DataFrame, domain
     work = work.loc[confidence_domain_mask].copy()
 
     email_series = work["email"].fillna("").astype(str).str.strip().str.lower()
-    local_series = email_series.str.split("@").str[0].fillna("")
-    malformed_mask = ((~email_series.map(_has_single_at_sign)) | (~local_series.map(_is_valid_local_part))).fillna(True).astype(bool)
+    malformed_mask = _malformed_email_mask(email_series)
     filtered_malformed = int(malformed_mask.sum())
     work = work.loc[~malformed_mask].copy()
 
-    disposable_mask = work["contractor_domain"].map(_is_disposable_domain).fillna(False).astype(bool)
+    disposable_mask = _disposable_domain_mask(work["contractor_domain"])
     filtered_disposable = int(disposable_mask.sum())
     work = work.loc[~disposable_mask].copy()
 
@@ -422,7 +549,7 @@ def _prepare_candidates_for_verification(all_candidates_df: pd.DataFrame, domain
     if work.empty:
         filtered_low_confidence = 0
     else:
-        confidence_mask = work.apply(_meets_verification_confidence_gate, axis=1).fillna(False).astype(bool)
+        confidence_mask = _verification_confidence_mask(work)
         filtered_low_confidence = int((~confidence_mask).sum())
         work = work.loc[confidence_mask].copy()
 
@@ -544,13 +671,22 @@ def _verify(all_candidates_df: pd.DataFrame, domains_df: pd.DataFrame) -> Tuple[
             invalid_count=0,
         )
 
-    verified = verify_with_millionverifier(verifier_input)
+    cache = get_verification_cache()
+    # One probe per domain: catch-all domains keep each person's top pattern, unverified.
+    verdicts = detect_catchall_domains(verifier_input["contractor_domain"], verify_with_millionverifier, cache=cache)
+    verifier_input, catchall_rows, catchall_dropped = split_catchall_candidates(verifier_input, verdicts)
+    # One candidate per unresolved person per wave; see verification_scheduler.
+    verified, schedule_stats = schedule_verification(verifier_input, verify_with_millionverifier)
+    if not catchall_rows.empty:
+        verified = pd.concat([verified, catchall_rows], ignore_index=True)
     merged = all_candidates_df.copy()
     if "email" not in merged.columns and "email_candidate" in merged.columns:
         merged["email"] = merged["email_candidate"]
     merged["email"] = merged["email"].fillna("").astype(str).str.lower()
     verified["email"] = verified["email"].fillna("").astype(str).str.lower()
     merged = merged.merge(verified, on="email", how="left")
+    # valid / invalid answers per pattern feed the next run's pattern model
+    record_verification_outcomes(merged, cache=cache)
     valid = merged[merged["email_verification_status"] == "valid"].copy()
     catchall = merged[merged["email_verification_status"] == "catchall"].copy()
     invalid = merged[~merged["email_verification_status"].isin(["valid", "catchall"])].copy()
@@ -564,7 +700,7 @@ def _verify(all_candidates_df: pd.DataFrame, domains_df: pd.DataFrame) -> Tuple[
         int(len(invalid)),
     )
 
-    return valid, catchall, invalid, _meta(
+    meta = _meta(
         attempted=True,
         skipped=False,
         reason="",
@@ -575,37 +711,74 @@ def _verify(all_candidates_df: pd.DataFrame, domains_df: pd.DataFrame) -> Tuple[
         catchall_count=int(len(catchall)),
         invalid_count=int(len(invalid)),
     )
+    meta["verification_schedule"] = dict(
+        schedule_stats.as_dict(),
+        catchall_domains=sum(1 for v in verdicts.values() if v),
+        catchall_marked=int(len(catchall_rows)),
+        catchall_dropped=catchall_dropped,
+    )
+    return valid, catchall, invalid, meta
 
 
 def run_pipeline(max_companies: int = 0, input_file: str = "") -> Dict[str, float]:
     """Execute the monday people-intelligence pipeline and write all outputs."""
-    input_df = _load_inputs(input_file=input_file)
-    if max_companies and max_companies > 0:
-        input_df = input_df.head(int(max_companies)).copy()
-    total_input_companies = int(input_df["contractor_name_normalized"].nunique())
-
-    domains_df = discover_company_domains(input_df)
-    domains_df = _apply_clean_company_names(domains_df)
-    domains_df.to_csv(OUT_COMPANY_DOMAINS, index=False)
-    companies_with_domains = int((domains_df["contractor_domain"].fillna("").astype(str).str.strip() != "").sum())
-
-    people_df = discover_people(domains_df, max_people_per_company=3)
-
-    # Contact-page fallback for companies that had a valid domain but no people rows.
-    people_companies = set(people_df["contractor_name_normalized"].astype(str).str.lower().str.strip()) if not people_df.empty else set()
-    unresolved_people_df = domains_df[
-        (domains_df["domain_valid"].astype(bool))
-        & (~domains_df["contractor_name_normalized"].astype(str).str.lower().str.strip().isin(people_companies))
-    ].copy()
-    contact_people_df = discover_contact_people(unresolved_people_df)
-
-    combined_people_df = pd.concat([people_df, contact_people_df], ignore_index=True, sort=False)
-    if not combined_people_df.empty:
-        combined_people_df = combined_people_df.drop_duplicates(
-            subset=["contractor_name_normalized", "contractor_domain", "first_name", "last_name"], keep="first"
-        )
+    # per-stage timings, HTTP and cache counters → pipeline_state.json run_history + data/metrics/
+    with RunTelemetry("monday_people"):
+        return _run_pipeline(max_companies=max_companies, input_file=input_file)
+
+
+def _run_pipeline(max_companies: int, input_file: str) -> Dict[str, float]:
+    with track_stage("load_inputs") as t:
+        input_df = _load_inputs(input_file=input_file)
+        if max_companies and max_companies > 0:
+            input_df = input_df.head(int(max_companies)).copy()
+        total_input_companies = int(input_df["contractor_name_normalized"].nunique())
+        t.rows_out = len(input_df)
+
+    with track_stage("domains", rows_in=len(input_df)) as t:
+        domains_df = discover_company_domains(input_df)
+        domains_df = _apply_clean_company_names(domains_df)
+        domains_df.to_csv(OUT_COMPANY_DOMAINS, index=False)
+        companies_with_domains = int((domains_df["contractor_domain"].fillna("").astype(str).str.strip() != "").sum())
+        t.rows_out = companies_with_domains
+
+    # One crawl per domain feeds both people discovery and the contact-page fallback,
+    # and one parse pool and fetch policy (limits, byte budget) serve the whole run.
+    fetch_policy = load_fetch_policy()
+    with load_parse_pool() as pool:
+        with track_stage("crawl", rows_in=len(domains_df)) as t:
+            site_crawls = crawl_sites(domains_df, pool=pool, fetch_policy=fetch_policy)
+            t.rows_out = len(site_crawls)
+
+        with track_stage("people", rows_in=companies_with_domains) as t:
+            people_df = discover_people(
+                domains_df, max_people_per_company=3, site_crawls=site_crawls, pool=pool, fetch_policy=fetch_policy
+            )
+
+            # Contact-page fallback for companies that had a valid domain but no people rows.
+            people_companies = set(people_df["contractor_name_normalized"].astype(str).str.lower().str.strip()) if not people_df.empty else set()
+            unresolved_people_df = domains_df[
+                (domains_df["domain_valid"].astype(bool))
+                & (~domains_df["contractor_name_normalized"].astype(str).str.lower().str.strip().isin(people_companies))
+            ].copy()
+            contact_people_df = discover_contact_people(
+                unresolved_people_df, site_crawls=site_crawls, pool=pool, fetch_policy=fetch_policy
+            )
+
+            combined_people_df = pd.concat([people_df, contact_people_df], ignore_index=True, sort=False)
+            if not combined_people_df.empty:
+                combined_people_df = combined_people_df.drop_duplicates(
+                    subset=["contractor_name_normalized", "contractor_domain", "first_name", "last_name"], keep="first"
+                )
+
+            combined_people_df.to_csv(OUT_PEOPLE_FOUND, index=False)
+            t.rows_out = len(combined_people_df)
+
+            # Each domain's email pattern as inferred from the crawled pages (replayed, no fetching).
+            _, mined_patterns_df = mine_contacts(
+                domains_df, CRAWLER_YAML, site_crawls=site_crawls, pool=pool, fetch_policy=fetch_policy
+            )
 
-    combined_people_df.to_csv(OUT_PEOPLE_FOUND, index=False)
     companies_with_people = int(combined_people_df["contractor_name_normalized"].nunique()) if not combined_people_df.empty else 0
     avg_people_per_company = round(float(len(combined_people_df) / companies_with_people), 3) if companies_with_people else 0.0
 
@@ -639,28 +812,38 @@ def run_pipeline(max_companies: int = 0, input_file: str = "") -> Dict[str, floa
         int(len(domain_deferred_people_df)),
     )
 
-    all_df = generate_email_candidates_for_people(eligible_people_df)
-    verifier_input_df, filter_counts = _prepare_candidates_for_verification(all_df, domains_df)
-    deferred_df = all_df.copy()
-    if not deferred_df.empty and "email" in verifier_input_df.columns:
-        keep = set(verifier_input_df["email"].fillna("").astype(str).str.lower())
-        deferred_df = deferred_df[~deferred_df["email"].fillna("").astype(str).str.lower().isin(keep)].copy()
-    deferred_df.to_csv(OUT_DEFERRED_VERIFICATION, index=False)
-    log.info(
-        "Candidate generation summary | candidates_generated=%d candidates_sent_to_verifier=%d",
-        int(len(all_df)),
-        int(filter_counts.get("total_sent_to_verifier", 0)),
-    )
-    individual_df = all_df[~all_df["is_role_inbox"].astype(bool)].copy() if not all_df.empty else pd.DataFrame()
-    role_df = all_df[all_df["is_role_inbox"].astype(bool)].copy() if not all_df.empty else pd.DataFrame()
-    individual_df.to_csv(OUT_INDIVIDUAL, index=False)
-    role_df.to_csv(OUT_ROLE, index=False)
-    all_df.to_csv(OUT_ALL, index=False)
-
-    verified_valid, verified_catchall, verified_invalid, verification_meta = _verify(all_df, domains_df)
-    verified_valid.to_csv(OUT_VALID, index=False)
-    verified_catchall.to_csv(OUT_CATCHALL, index=False)
-    verified_invalid.to_csv(OUT_INVALID, index=False)
+    # Patterns each domain is known (or likely) to use; unlikely ones are not generated.
+    with track_stage("generate", rows_in=len(eligible_people_df)) as t:
+        run_observations = pd.concat(
+            [observations_from_people(combined_people_df), observations_from_mined_patterns(mined_patterns_df)],
+            ignore_index=True,
+        )
+        pattern_model = load_pattern_model(run_observations)
+        all_df = generate_email_candidates_for_people(eligible_people_df, pattern_model=pattern_model)
+        verifier_input_df, filter_counts = _prepare_candidates_for_verification(all_df, domains_df)
+        deferred_df = all_df.copy()
+        if not deferred_df.empty and "email" in verifier_input_df.columns:
+            keep = set(verifier_input_df["email"].fillna("").astype(str).str.lower())
+            deferred_df = deferred_df[~deferred_df["email"].fillna("").astype(str).str.lower().isin(keep)].copy()
+        deferred_df.to_csv(OUT_DEFERRED_VERIFICATION, index=False)
+        log.info(
+            "Candidate generation summary | candidates_generated=%d candidates_sent_to_verifier=%d",
+            int(len(all_df)),
+            int(filter_counts.get("total_sent_to_verifier", 0)),
+        )
+        individual_df = all_df[~all_df["is_role_inbox"].astype(bool)].copy() if not all_df.empty else pd.DataFrame()
+        role_df = all_df[all_df["is_role_inbox"].astype(bool)].copy() if not all_df.empty else pd.DataFrame()
+        individual_df.to_csv(OUT_INDIVIDUAL, index=False)
+        role_df.to_csv(OUT_ROLE, index=False)
+        all_df.to_csv(OUT_ALL, index=False)
+        t.rows_out = len(all_df)
+
+    with track_stage("verify", rows_in=len(all_df)) as t:
+        verified_valid, verified_catchall, verified_invalid, verification_meta = _verify(all_df, domains_df)
+        verified_valid.to_csv(OUT_VALID, index=False)
+        verified_catchall.to_csv(OUT_CATCHALL, index=False)
+        verified_invalid.to_csv(OUT_INVALID, index=False)
+        t.rows_out = len(verified_valid) + len(verified_catchall) + len(verified_invalid)
 
     plus_ind = _to_plusvibes(individual_df)
     plus_role = _to_plusvibes(role_df)
@@ -709,6 +892,7 @@ def run_pipeline(max_companies: int = 0, input_file: str = "") -> Dict[str, floa
         "valid_count": int(verification_meta.get("valid_count", len(verified_valid))),
         "catchall_count": int(verification_meta.get("catchall_count", len(verified_catchall))),
         "invalid_count": int(verification_meta.get("invalid_count", len(verified_invalid))),
+        "verification_schedule": verification_meta.get("verification_schedule", {}),
         "valid_output": str(OUT_VALID),
         "catchall_output": str(OUT_CATCHALL),
         "invalid_output": str(OUT_INVALID),
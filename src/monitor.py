@@ -17,6 +17,8 @@ import pandas as pd
 log = logging.getLogger("cranegenius.monitor")
 
 STATE_FILE = "data/pipeline_state.json"
+# Telemetry records kept in run_history (oldest dropped first).
+MAX_RUN_HISTORY = int(os.environ.get("CRANEGENIUS_RUN_HISTORY", "200"))
 
 
 def load_state() -> Dict[str, Any]:
@@ -33,6 +35,13 @@ def save_state(state: Dict[str, Any]) -> None:
         json.dump(state, f, indent=2)
 
 
+def append_run_history(state: Dict[str, Any], record: Dict[str, Any]) -> Dict[str, Any]:
+    """Append one run's telemetry record, keeping the newest MAX_RUN_HISTORY entries."""
+    history = list(state.get("run_history", [])) + [record]
+    state["run_history"] = history[-MAX_RUN_HISTORY:]
+    return state
+
+
 def check_gates(qa: Dict[str, Any], scoring_yaml_cfg: Dict[str, Any]) -> Dict[str, Any]:
     """
     Run all monitoring gates against the QA report.
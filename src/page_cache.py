@@ -0,0 +1,504 @@
+"""
+Local page store shared by the site miners.
+
+site_contact_miner, people_discovery and contact_page_finder all fetch the
+same `/`, `/contact`, `/about`, `/team` pages for the same domains. Every
+fetch now reads through this store: pages are keyed by normalized URL and
+hold the compressed body, status, headers and fetch time, so a page is
+downloaded once per freshness window no matter how many stages want it.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field, replace
+from functools import cached_property
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+import requests
+
+from .html_document import ParsedPage
+from .telemetry import record_cache, record_download
+from .utils import load_yaml, normalize_text, rate_limit_sleep
+
+log = logging.getLogger("cranegenius.page_cache")
+
+DATA_DIR = Path("data")
+PAGE_CACHE_PATH = Path(os.environ.get("CRANEGENIUS_PAGE_CACHE", DATA_DIR / "page_cache.sqlite3"))
+DEFAULT_MAX_AGE_SECONDS = 7 * 24 * 3600
+CRAWLER_YAML = "config/crawler.yaml"
+DEFAULT_USER_AGENT = "CraneGeniusLeadBot/1.0"
+STREAM_CHUNK_BYTES = 16 * 1024
+SKIPPED_HEADER = "X-CraneGenius-Skipped"
+TRUNCATED_HEADER = "X-CraneGenius-Truncated"
+DEFAULT_ALLOWED_CONTENT_TYPES = (
+    "text/html",
+    "application/xhtml+xml",
+    "text/plain",
+    "application/xml",
+    "text/xml",
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    final_url TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    fetched_at REAL NOT NULL,
+    content_hash TEXT NOT NULL DEFAULT ''
+)
+"""
+
+# Extractor output memoized by page content: a 304 or an identical body skips parsing entirely.
+_EXTRACTS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS extracts (
+    extractor TEXT NOT NULL,
+    url TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    context TEXT NOT NULL,
+    payload BLOB NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (extractor, url, content_hash, context)
+)
+"""
+
+
+def content_hash(body: str) -> str:
+    return hashlib.sha1((body or "").encode("utf-8")).hexdigest()
+
+
+def _header(headers: Dict[str, str], name: str) -> str:
+    lowered = name.lower()
+    for key, value in (headers or {}).items():
+        if key.lower() == lowered:
+            return value
+    return ""
+
+
+def normalize_url(url: str) -> str:
+    """Canonical cache key: lowercase scheme/host, no fragment, no default port or trailing slash."""
+    raw = normalize_text(url)
+    if not raw:
+        return ""
+    parts = urlsplit(raw)
+    scheme = (parts.scheme or "https").lower()
+    host = (parts.hostname or "").lower()
+    port = parts.port
+    if port and not ((scheme == "http" and port == 80) or (scheme == "https" and port == 443)):
+        host = f"{host}:{port}"
+    path = parts.path or "/"
+    if len(path) > 1:
+        path = path.rstrip("/") or "/"
+    return urlunsplit((scheme, host, path, parts.query, ""))
+
+
+@dataclass
+class CachedPage:
+    url: str
+    final_url: str
+    status: int
+    headers: Dict[str, str] = field(default_factory=dict)
+    body: str = ""
+    fetched_at: float = 0.0
+    from_cache: bool = False
+    content_hash: str = ""
+    # True when a revisit came back 304 or with the same body as last time.
+    unchanged: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return 0 < self.status < 400
+
+    @cached_property
+    def document(self) -> ParsedPage:
+        """Parsed view of the body, built on first use and shared by every extractor."""
+        return ParsedPage(self.body, self.final_url or self.url)
+
+
+class PageCache:
+    """SQLite-backed page store; safe to share between threads."""
+
+    def __init__(self, path: Path = PAGE_CACHE_PATH, max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS) -> None:
+        self.path = Path(path)
+        self.max_age_seconds = float(max_age_seconds)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+            conn.execute(_SCHEMA)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(pages)")}
+            if "content_hash" not in columns:
+                conn.execute("ALTER TABLE pages ADD COLUMN content_hash TEXT NOT NULL DEFAULT ''")
+            conn.execute(_EXTRACTS_SCHEMA)
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get(self, url: str, max_age_seconds: Optional[float] = None) -> Optional[CachedPage]:
+        """Return the stored page when it is younger than the freshness window."""
+        key = normalize_url(url)
+        if not key:
+            return None
+        max_age = self.max_age_seconds if max_age_seconds is None else float(max_age_seconds)
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT final_url, status, headers, body, fetched_at, content_hash FROM pages WHERE url = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        final_url, status, headers, body, fetched_at, stored_hash = row
+        if time.time() - float(fetched_at) > max_age:
+            return None
+        text = zlib.decompress(body).decode("utf-8")
+        return CachedPage(
+            url=key,
+            final_url=final_url,
+            status=int(status),
+            headers=json.loads(headers),
+            body=text,
+            fetched_at=float(fetched_at),
+            from_cache=True,
+            content_hash=stored_hash or content_hash(text),
+        )
+
+    def get_stale(self, url: str) -> Optional[CachedPage]:
+        """Stored page of any age: the validators for a conditional revisit."""
+        return self.get(url, max_age_seconds=float("inf"))
+
+    def touch(self, url: str, fetched_at: float) -> None:
+        """A 304 revalidated the stored page: restart its freshness window."""
+        with self._lock:
+            conn = self._connect()
+            conn.execute("UPDATE pages SET fetched_at = ? WHERE url = ?", (float(fetched_at), normalize_url(url)))
+            conn.commit()
+
+    def get_extract(self, extractor: str, url: str, page_hash: str, context: str) -> Optional[str]:
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT payload FROM extracts WHERE extractor = ? AND url = ? AND content_hash = ? AND context = ?",
+                (extractor, normalize_url(url), page_hash, context),
+            ).fetchone()
+        return zlib.decompress(row[0]).decode("utf-8") if row else None
+
+    def put_extract(self, extractor: str, url: str, page_hash: str, context: str, payload: str) -> None:
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO extracts (extractor, url, content_hash, context, payload, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (extractor, normalize_url(url), page_hash, context, zlib.compress(payload.encode("utf-8")), time.time()),
+            )
+            conn.commit()
+
+    def put(self, page: CachedPage) -> None:
+        key = normalize_url(page.url)
+        if not key:
+            return
+        payload = (
+            key,
+            page.final_url or key,
+            int(page.status),
+            json.dumps(page.headers or {}),
+            zlib.compress((page.body or "").encode("utf-8")),
+            float(page.fetched_at or time.time()),
+            page.content_hash or content_hash(page.body),
+        )
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO pages (url, final_url, status, headers, body, fetched_at, content_hash) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                payload,
+            )
+            conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+@dataclass
+class FetchLimits:
+    """Per-request and per-domain download limits (crawler.yaml `fetch_limits`)."""
+
+    max_body_bytes: int = 2_000_000
+    max_domain_bytes: int = 8_000_000
+    deadline_seconds: float = 20.0
+    allowed_content_types: Tuple[str, ...] = DEFAULT_ALLOWED_CONTENT_TYPES
+
+    @classmethod
+    def from_config(cls, cfg: Dict[str, Any]) -> "FetchLimits":
+        raw = cfg.get("fetch_limits") or {}
+        return cls(
+            max_body_bytes=int(raw.get("max_body_bytes", cls.max_body_bytes)),
+            max_domain_bytes=int(raw.get("max_domain_bytes", cls.max_domain_bytes)),
+            deadline_seconds=float(raw.get("deadline_seconds", cls.deadline_seconds)),
+            allowed_content_types=tuple(
+                normalize_text(t).lower() for t in raw.get("allowed_content_types", DEFAULT_ALLOWED_CONTENT_TYPES)
+            ),
+        )
+
+    def content_type_allowed(self, content_type: str) -> bool:
+        # Servers that send no Content-Type get the benefit of the doubt.
+        mime = normalize_text(content_type.split(";")[0]).lower()
+        return not mime or mime in self.allowed_content_types
+
+
+class DomainByteBudget:
+    """Bytes downloaded per host by one run; a host past max_domain_bytes is not fetched again."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._bytes: Dict[str, int] = {}
+
+    def has_room(self, host: str, cap: int, pending: int = 0) -> bool:
+        with self._lock:
+            return self._bytes.get(host, 0) + pending < cap
+
+    def add(self, host: str, count: int) -> None:
+        with self._lock:
+            self._bytes[host] = self._bytes.get(host, 0) + count
+
+
+class HostRateLimiter:
+    """Spaces network requests to one host at least `interval` seconds apart, across threads."""
+
+    def __init__(self, interval: float = 0.0) -> None:
+        self.interval = max(0.0, float(interval))
+        self._lock = threading.Lock()
+        self._next: Dict[str, float] = {}
+
+    def wait(self, host: str) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            slot = max(time.monotonic(), self._next.get(host, 0.0))
+            self._next[host] = slot + self.interval
+        delay = slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+
+@dataclass
+class FetchPolicy:
+    """
+    How one run fetches, from its crawler.yaml: the User-Agent, the
+    page-cache freshness window, the per-host politeness delay, the download
+    limits, and the per-domain byte budget those limits are counted against.
+    A run builds one and hands it to every miner and the crawl planner, so
+    they all identify as the agent robots.txt was checked for, reuse pages
+    for the same time, share one rate limiter per host, enforce the same
+    limits, and start the run with an empty budget.
+    """
+
+    user_agent: str = DEFAULT_USER_AGENT
+    max_age_seconds: Optional[float] = None
+    rate_limiter: HostRateLimiter = field(default_factory=HostRateLimiter)
+    limits: FetchLimits = field(default_factory=FetchLimits)
+    budget: DomainByteBudget = field(default_factory=DomainByteBudget)
+
+    @classmethod
+    def from_config(cls, cfg: Dict[str, Any]) -> "FetchPolicy":
+        max_age_hours = float(cfg.get("page_cache_max_age_hours", DEFAULT_MAX_AGE_SECONDS / 3600))
+        return cls(
+            user_agent=normalize_text(cfg.get("user_agent")) or DEFAULT_USER_AGENT,
+            max_age_seconds=max_age_hours * 3600,
+            rate_limiter=HostRateLimiter(float(cfg.get("rate_limit_seconds", 0.0))),
+            limits=FetchLimits.from_config(cfg),
+        )
+
+    def fetch(
+        self,
+        url: str,
+        *,
+        timeout: float,
+        cache: Optional[PageCache] = None,
+    ) -> Optional[CachedPage]:
+        return fetch_page(
+            url,
+            timeout=timeout,
+            user_agent=self.user_agent,
+            cache=cache,
+            max_age_seconds=self.max_age_seconds,
+            limits=self.limits,
+            budget=self.budget,
+            rate_limiter=self.rate_limiter,
+        )
+
+
+def load_fetch_policy(crawler_yaml: str = CRAWLER_YAML) -> FetchPolicy:
+    """A fresh policy from `crawler_yaml` (defaults when the file or section is missing)."""
+    if not os.path.exists(crawler_yaml):
+        return FetchPolicy()
+    return FetchPolicy.from_config((load_yaml(crawler_yaml) or {}).get("crawler") or {})
+
+
+_DEFAULT_CACHE: Optional[PageCache] = None
+_DEFAULT_CACHE_LOCK = threading.Lock()
+
+
+def get_page_cache() -> PageCache:
+    """Process-wide page store used when callers do not pass their own."""
+    global _DEFAULT_CACHE
+    with _DEFAULT_CACHE_LOCK:
+        if _DEFAULT_CACHE is None:
+            _DEFAULT_CACHE = PageCache()
+        return _DEFAULT_CACHE
+
+
+def _host_key(url: str) -> str:
+    host = (urlsplit(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def _charset(content_type: str) -> str:
+    for part in content_type.split(";")[1:]:
+        key, _, value = part.partition("=")
+        if key.strip().lower() == "charset" and value.strip():
+            return value.strip().strip('"\'')
+    return "utf-8"
+
+
+def _decode(raw: bytes, content_type: str) -> str:
+    try:
+        return raw.decode(_charset(content_type), errors="replace")
+    except LookupError:
+        return raw.decode("utf-8", errors="replace")
+
+
+def fetch_page(
+    url: str,
+    *,
+    timeout: float,
+    user_agent: str,
+    cache: Optional[PageCache] = None,
+    max_age_seconds: Optional[float] = None,
+    rate_limit_seconds: float = 0.0,
+    limits: Optional[FetchLimits] = None,
+    budget: Optional[DomainByteBudget] = None,
+    rate_limiter: Optional[HostRateLimiter] = None,
+) -> Optional[CachedPage]:
+    """
+    Read-through fetch. Returns the cached page when fresh, otherwise downloads,
+    stores and returns it. Network errors return None and are not cached.
+    The politeness delay (`rate_limiter`, shared per host, else a plain
+    rate_limit_seconds sleep) is only paid when the network is actually hit.
+
+    Downloads are streamed under `limits`: the content type (and declared
+    length) is checked from the headers before any body is read, the body is
+    cut at max_body_bytes, reading stops at the wall-clock deadline, and a
+    domain that has used up its byte budget is not fetched again this run.
+    Without `limits` the FetchLimits defaults apply; without `budget` only
+    this one download counts against max_domain_bytes (callers crawling a
+    domain pass their run's FetchPolicy). Skipped/cut pages carry an X-CraneGenius-Skipped / -Truncated header.
+
+    A stale stored page is revalidated with If-None-Match / If-Modified-Since;
+    a 304 returns the stored page with a fresh window. `unchanged` is set when
+    the page came back 304 or with the same content hash as before.
+    """
+    store = cache if cache is not None else get_page_cache()
+    hit = store.get(url, max_age_seconds=max_age_seconds)
+    if hit is not None:
+        record_cache("page", hits=1)
+        return hit
+
+    # Revisit: send the stored validators so an unchanged page costs one 304.
+    previous = store.get_stale(url)
+    request_headers = {"User-Agent": user_agent}
+    if previous is not None and previous.ok:
+        etag = _header(previous.headers, "ETag")
+        last_modified = _header(previous.headers, "Last-Modified")
+        if etag:
+            request_headers["If-None-Match"] = etag
+        if last_modified:
+            request_headers["If-Modified-Since"] = last_modified
+
+    limits = limits if limits is not None else FetchLimits()
+    budget = budget if budget is not None else DomainByteBudget()
+    host = _host_key(url)
+    if not budget.has_room(host, limits.max_domain_bytes):
+        log.debug("Byte budget exhausted for %s; skipping %s", host, url)
+        return None
+
+    if rate_limiter is not None:
+        rate_limiter.wait(host)
+    else:
+        rate_limit_sleep(rate_limit_seconds)
+    deadline = time.monotonic() + limits.deadline_seconds
+    headers: Dict[str, str] = {}
+    cacheable = True
+    try:
+        with requests.get(url, timeout=timeout, allow_redirects=True, headers=request_headers, stream=True) as resp:
+            status = int(resp.status_code)
+            if status == 304 and previous is not None:
+                now = time.time()
+                store.touch(url, now)
+                record_cache("page", hits=1)  # revalidated: no body downloaded
+                return replace(previous, fetched_at=now, from_cache=False, unchanged=True)
+            record_cache("page", misses=1)
+            final_url = resp.url or url
+            headers = {k: v for k, v in resp.headers.items()}
+            content_type = headers.get("Content-Type", headers.get("content-type", ""))
+            declared = headers.get("Content-Length", headers.get("content-length", ""))
+            raw = b""
+            if not limits.content_type_allowed(content_type):
+                headers[SKIPPED_HEADER] = "content-type"
+            elif declared.isdigit() and int(declared) > limits.max_body_bytes:
+                headers[SKIPPED_HEADER] = "content-length"
+            else:
+                chunks: List[bytes] = []
+                total = 0
+                for chunk in resp.iter_content(chunk_size=STREAM_CHUNK_BYTES):
+                    if not chunk:
+                        continue
+                    chunks.append(chunk)
+                    total += len(chunk)
+                    if total >= limits.max_body_bytes:
+                        headers[TRUNCATED_HEADER] = "max-body-bytes"
+                        break
+                    if time.monotonic() > deadline:
+                        # Slow-drip server: keep what arrived, but retry on a later run.
+                        headers[TRUNCATED_HEADER] = "deadline"
+                        cacheable = False
+                        break
+                    if not budget.has_room(host, limits.max_domain_bytes, pending=total):
+                        headers[TRUNCATED_HEADER] = "domain-budget"
+                        cacheable = False
+                        break
+                raw = b"".join(chunks)[: limits.max_body_bytes]
+                budget.add(host, len(raw))
+                record_download(total)
+            body = _decode(raw, content_type)
+    except Exception as exc:
+        log.debug("Fetch error %s: %s", url, exc)
+        return None
+
+    body_hash = content_hash(body)
+    page = CachedPage(
+        url=normalize_url(url),
+        final_url=final_url,
+        status=status,
+        headers=headers,
+        body=body,
+        fetched_at=time.time(),
+        content_hash=body_hash,
+        unchanged=previous is not None and previous.content_hash == body_hash,
+    )
+    if cacheable:
+        store.put(page)
+    return page
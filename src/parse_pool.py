@@ -0,0 +1,269 @@
+"""
+Producer/consumer page parsing for the site miners.
+
+Network workers (threads, one domain each) fetch pages and hand the raw body
+to a ParsePool; a pool of parser processes builds the ParsedPage and runs the
+requested extractors (emails/phones, people, contact-page candidates),
+returning a small picklable PageExtract. A fetcher submits a body and goes
+on fetching; it collects the extracts in fetch order (imap, or the crawl
+frontier's in-flight window), at most pages_in_flight per domain. A bounded
+semaphore caps how many bodies can be waiting for a parser across all
+fetchers, so they block instead of piling pages up in memory. With
+parse_workers = 0 everything runs inline. Extracts are memoized by page
+content hash, so an unchanged page is never re-parsed.
+
+A run opens one pool (load_parse_pool) and hands it to every miner; a miner
+called without one opens its own for the call.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import multiprocessing
+import os
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+from .html_document import PageLink, ParsedPage
+from .page_cache import CRAWLER_YAML, PageCache, get_page_cache
+from .telemetry import record_cache
+from .utils import load_yaml
+
+log = logging.getLogger("cranegenius.parse_pool")
+
+EXTRACT_CONTACTS = "contacts"
+EXTRACT_PEOPLE = "people"
+EXTRACT_CONTACT_CANDIDATES = "contact_candidates"
+# Bump when an extractor's output changes so memoized results are not reused.
+EXTRACTOR_VERSION = 1
+
+K = TypeVar("K")
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+@dataclass
+class MiningConcurrency:
+    """crawler.yaml `concurrency`: domain fetch threads, parser processes, queued bodies."""
+
+    fetch_workers: int = 1
+    parse_workers: int = 0
+    max_pending_pages: int = 32
+    # pages one domain's fetcher may have waiting for a parse before it collects one
+    pages_in_flight: int = 4
+
+    @classmethod
+    def from_config(cls, cfg: Dict[str, Any]) -> "MiningConcurrency":
+        raw = cfg.get("concurrency") or {}
+        parse_workers = raw.get("parse_workers", cls.parse_workers)
+        if parse_workers == "auto":
+            parse_workers = max(1, (os.cpu_count() or 2) - 1)
+        return cls(
+            fetch_workers=max(1, int(raw.get("fetch_workers", cls.fetch_workers))),
+            parse_workers=max(0, int(parse_workers)),
+            max_pending_pages=max(1, int(raw.get("max_pending_pages", cls.max_pending_pages))),
+            pages_in_flight=max(1, int(raw.get("pages_in_flight", cls.pages_in_flight))),
+        )
+
+
+def load_mining_concurrency(crawler_yaml: str = CRAWLER_YAML) -> MiningConcurrency:
+    if not os.path.exists(crawler_yaml):
+        return MiningConcurrency()
+    return MiningConcurrency.from_config((load_yaml(crawler_yaml) or {}).get("crawler") or {})
+
+
+@dataclass
+class ParseTask:
+    url: str
+    html: str
+    extractors: Tuple[str, ...]
+    # company / domain / city / state for the people and candidate extractors
+    context: Dict[str, str] = field(default_factory=dict)
+    # page_cache content hash; when set, results are memoized per (extractors, url, hash, context)
+    content_hash: str = ""
+
+    def memo_key(self) -> Tuple[str, str, str, str]:
+        extractor = f"{EXTRACTOR_VERSION}:{'+'.join(sorted(self.extractors))}"
+        return extractor, self.url, self.content_hash, json.dumps(self.context, sort_keys=True)
+
+
+@dataclass
+class PageExtract:
+    """Everything the miners need from one page; links carry no bs4 objects."""
+
+    url: str
+    links: List[PageLink] = field(default_factory=list)
+    emails: List[str] = field(default_factory=list)
+    phones: List[str] = field(default_factory=list)
+    people: List[Dict[str, Any]] = field(default_factory=list)
+    contact_candidates: List[Dict[str, Any]] = field(default_factory=list)
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), default=str)
+
+    @classmethod
+    def from_json(cls, raw: str) -> "PageExtract":
+        data = json.loads(raw)
+        data["links"] = [PageLink(**link) for link in data.get("links", [])]
+        return cls(**data)
+
+
+def extract_page(task: ParseTask) -> PageExtract:
+    """Parse once and run the requested extractors. Top-level so it pickles."""
+    # Imported here: the extractor modules themselves use the pool.
+    from .contact_page_finder import _extract_candidates
+    from .people_discovery import _element_is_noise, _extract_from_page
+
+    doc = ParsedPage(task.html, task.url)
+    ctx = task.context
+    wants_people = EXTRACT_PEOPLE in task.extractors
+    out = PageExtract(
+        url=doc.url or task.url,
+        links=[
+            PageLink(
+                href=link.href,
+                url=link.url,
+                text=link.text,
+                tag=None,
+                noise=_element_is_noise(link.tag, doc) if wants_people else None,
+            )
+            for link in doc.links
+        ],
+    )
+    if EXTRACT_CONTACTS in task.extractors:
+        out.emails = list(doc.emails)
+        out.phones = list(doc.phones)
+    if wants_people:
+        out.people = _extract_from_page(
+            doc, out.url, ctx.get("company", ""), ctx.get("domain", ""), ctx.get("city", ""), ctx.get("state", "")
+        )
+    if EXTRACT_CONTACT_CANDIDATES in task.extractors:
+        out.contact_candidates = _extract_candidates(doc, ctx.get("domain", ""), task.url)
+    return out
+
+
+class ParsePool:
+    """Process pool for extract_page with a bounded number of in-flight bodies."""
+
+    def __init__(
+        self,
+        workers: int = 0,
+        max_pending: int = 32,
+        memo: Optional[PageCache] = None,
+        pages_in_flight: int = 4,
+    ) -> None:
+        self.workers = max(0, int(workers))
+        self._memo = memo
+        # Inline parsing finishes inside submit; fetching ahead would only spend the page budget early.
+        self.in_flight = max(1, int(pages_in_flight)) if self.workers else 1
+        self._slots = threading.BoundedSemaphore(max(1, int(max_pending)))
+        self._executor: Optional[ProcessPoolExecutor] = None
+        if self.workers:
+            # spawn: the network threads hold locks (sqlite, logging) a fork would copy.
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+
+    @property
+    def memo(self) -> PageCache:
+        return self._memo if self._memo is not None else get_page_cache()
+
+    def submit(self, task: ParseTask) -> "Future[PageExtract]":
+        """
+        Queue a body for parsing; blocks while max_pending bodies are already
+        waiting. A task whose content hash was extracted before is answered
+        from the memo without parsing.
+        """
+        if task.content_hash:
+            stored = self.memo.get_extract(*task.memo_key())
+            record_cache("extract", hits=int(stored is not None), misses=int(stored is None))
+            if stored is not None:
+                done: "Future[PageExtract]" = Future()
+                done.set_result(PageExtract.from_json(stored))
+                return done
+
+        if self._executor is None:
+            fut: "Future[PageExtract]" = Future()
+            try:
+                fut.set_result(extract_page(task))
+            except Exception as exc:
+                fut.set_exception(exc)
+        else:
+            self._slots.acquire()
+            try:
+                fut = self._executor.submit(extract_page, task)
+            except Exception:
+                self._slots.release()
+                raise
+            fut.add_done_callback(lambda _: self._slots.release())
+
+        if task.content_hash:
+            fut.add_done_callback(lambda f: self._remember(task, f))
+        return fut
+
+    def _remember(self, task: ParseTask, fut: "Future[PageExtract]") -> None:
+        if fut.cancelled() or fut.exception() is not None:
+            return
+        self.memo.put_extract(*task.memo_key(), fut.result().to_json())
+
+    def parse(self, task: ParseTask) -> PageExtract:
+        """Submit and wait; for one-off parses, not for a fetch loop."""
+        return self.submit(task).result()
+
+    def imap(self, tasks: Iterable[Tuple[K, Optional[ParseTask]]]) -> Iterator[Tuple[K, PageExtract]]:
+        """
+        (key, extract) in input order. Up to in_flight tasks are submitted
+        before the oldest is waited for, so a lazy `tasks` (one that fetches
+        as it goes) keeps fetching while earlier pages parse. None tasks are
+        skipped.
+        """
+        pending: Deque[Tuple[K, "Future[PageExtract]"]] = deque()
+        for key, task in tasks:
+            if task is not None:
+                pending.append((key, self.submit(task)))
+            if len(pending) >= self.in_flight:
+                done_key, fut = pending.popleft()
+                yield done_key, fut.result()
+        while pending:
+            done_key, fut = pending.popleft()
+            yield done_key, fut.result()
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def __enter__(self) -> "ParsePool":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def load_parse_pool(crawler_yaml: str = CRAWLER_YAML) -> ParsePool:
+    """A pool sized by crawler.yaml `concurrency`; the caller closes it (use as a context manager)."""
+    concurrency = load_mining_concurrency(crawler_yaml)
+    return ParsePool(concurrency.parse_workers, concurrency.max_pending_pages, pages_in_flight=concurrency.pages_in_flight)
+
+
+@contextmanager
+def borrow_pool(pool: Optional[ParsePool], crawler_yaml: str = CRAWLER_YAML) -> Iterator[ParsePool]:
+    """The caller's pool, left open; or a pool from config that is closed on exit."""
+    if pool is not None:
+        yield pool
+        return
+    with load_parse_pool(crawler_yaml) as own:
+        yield own
+
+
+def map_domains(fn: Callable[[T], R], items: Iterable[T], workers: int) -> List[R]:
+    """Run fn over items on `workers` network threads; results keep input order."""
+    items = list(items)
+    if workers <= 1 or len(items) <= 1:
+        return [fn(item) for item in items]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="crawl") as executor:
+        return list(executor.map(fn, items))
@@ -0,0 +1,338 @@
+"""
+Per-domain email pattern probabilities learned from outcomes.
+
+generate_email_candidates_for_people used to emit the same fixed pattern
+fan-out for every person, whatever was already known about the domain. The
+model turns what we have seen into a probability per pattern and domain:
+
+- verification results for generated candidates (valid = hit, invalid = miss),
+  kept per address in the verification store across runs;
+- emails found on company sites next to the person's name, and the person
+  emails site_contact_miner mined for the domain, by their shape;
+- contact_intelligence's contact_patterns counts and feedback_outcomes
+  (reply / meeting / verified domain = hit, bounce = miss).
+
+A domain's probabilities are its own hits and misses smoothed toward the
+pattern shares of its segment (industry and company size band), which are
+in turn smoothed toward the shares across every domain. The generator then
+emits a person's patterns in probability order, skipping those below
+MIN_PATTERN_PROBABILITY.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import re
+import sqlite3
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from .people_email_generator import LOCAL_PART_TEMPLATES, PATTERN_SPECS, _expand_template, _name_parts
+from .utils import normalize_text
+from .verification_cache import VerificationCache, get_verification_cache
+
+log = logging.getLogger("cranegenius.pattern_model")
+
+PATTERNS = [pattern for pattern, _ in PATTERN_SPECS]
+# Pseudo-observations behind a domain's prior (segment shares) and a segment's prior (global shares).
+DOMAIN_PRIOR_STRENGTH = 4.0
+SEGMENT_PRIOR_STRENGTH = 10.0
+MIN_PATTERN_PROBABILITY = float(os.environ.get("CRANEGENIUS_MIN_PATTERN_PROBABILITY", "0.1"))
+CI_DB_PATH = Path(os.environ.get("CRANEGENIUS_CI_DB", "~/data_runtime/cranegenius_ci.db")).expanduser()
+
+OBSERVATION_COLUMNS = ["domain", "pattern", "hits", "misses"]
+VERIFIED_HIT_STATUSES = {"valid"}
+VERIFIED_MISS_STATUSES = {"invalid"}
+FEEDBACK_HITS = {"reply", "verified_domain", "meeting_set"}
+FEEDBACK_MISSES = {"bounce"}
+
+# contact_intelligence pattern_template -> generator pattern
+CI_TEMPLATE_PATTERNS = {
+    "{first}.{last}": "first.last",
+    "{first_initial}{last}": "flast",
+    "{first}": "first",
+    "{first_initial}.{last}": "f.lastname",
+    "{first}_{last}": "first_last",
+}
+# site_contact_miner pattern name -> generator pattern. Its "flast" is left out: a
+# bare local part ("john", "johnsmith", "smithj") cannot be told apart without
+# the person's name, which the miner does not have.
+MINED_PATTERN_ALIASES = {"first.last": "first.last", "first_last": "first_last", "f.last": "f.lastname"}
+# local-part shapes that name their pattern without knowing the person
+MINED_LOCAL_PATTERNS = [
+    (re.compile(r"^[a-z]\.[a-z]{2,}$"), "f.lastname"),
+    (re.compile(r"^[a-z]{2,}\.[a-z]{2,}$"), "first.last"),
+    (re.compile(r"^[a-z]{2,}_[a-z]{2,}$"), "first_last"),
+]
+
+Segment = Tuple[str, str]
+NO_SEGMENT: Segment = ("", "")
+
+
+def size_band(employee_count: object) -> str:
+    count = pd.to_numeric(pd.Series([employee_count]), errors="coerce").iloc[0]
+    if pd.isna(count) or count <= 0:
+        return ""
+    if count < 50:
+        return "small"
+    if count < 500:
+        return "mid"
+    return "large"
+
+
+def _empty_observations() -> pd.DataFrame:
+    return pd.DataFrame(columns=OBSERVATION_COLUMNS)
+
+
+def _normalize_observations(df: pd.DataFrame) -> pd.DataFrame:
+    out = pd.DataFrame({
+        "domain": df["domain"].fillna("").astype(str).str.strip().str.lower(),
+        "pattern": df["pattern"].fillna("").astype(str).str.strip(),
+        "hits": pd.to_numeric(df["hits"], errors="coerce").fillna(0.0).astype(float),
+        "misses": pd.to_numeric(df["misses"], errors="coerce").fillna(0.0).astype(float),
+    })
+    return out[(out["domain"] != "") & out["pattern"].isin(PATTERNS)]
+
+
+def detect_patterns(emails: pd.Series, names_df: pd.DataFrame) -> pd.Series:
+    """
+    The generator pattern each email follows given the row's first_name /
+    last_name (or full_name), "" when none fits. first.last wins over its
+    twin firstname.lastname.
+    """
+    first, last, _ = _name_parts(names_df)
+    local = emails.fillna("").astype(str).str.strip().str.lower().str.split("@").str[0].fillna("")
+    parts = {"first": first, "last": last, "f": first.str[0].fillna("")}
+    found = pd.Series("", index=emails.index, dtype=object)
+    named = (first != "") & (last != "")
+    for pattern in reversed(PATTERNS):
+        matches = named & (local == _expand_template(LOCAL_PART_TEMPLATES[pattern], parts))
+        found[matches] = pattern
+    return found
+
+
+def observations_from_people(people_df: pd.DataFrame) -> pd.DataFrame:
+    """One hit per found_email on the person's own domain whose local part spells their name."""
+    if people_df.empty or "found_email" not in people_df.columns:
+        return _empty_observations()
+    df = people_df.reset_index(drop=True)
+    emails = df["found_email"].fillna("").astype(str).str.strip().str.lower()
+    domain = emails.str.split("@").str[-1].fillna("")
+    own = domain == df.get("contractor_domain", pd.Series("", index=df.index)).fillna("").astype(str).str.strip().str.lower()
+    pattern = detect_patterns(emails, df)
+    keep = own & (pattern != "") & emails.str.contains("@", regex=False)
+    # a person listed on several pages is still one address
+    obs = pd.DataFrame({"email": emails[keep], "domain": domain[keep], "pattern": pattern[keep]}).drop_duplicates("email")
+    return _normalize_observations(obs.assign(hits=1.0, misses=0.0))
+
+
+def record_verification_outcomes(verified_df: pd.DataFrame, cache: Optional[VerificationCache] = None) -> int:
+    """
+    Store each verified candidate's pattern outcome so later runs fit from it
+    (load_pattern_model reads them back, one outcome per address).
+    """
+    needed = {"email", "contractor_domain", "email_pattern", "email_verification_status"}
+    if verified_df.empty or not needed <= set(verified_df.columns):
+        return 0
+    status = verified_df["email_verification_status"].fillna("").astype(str).str.lower()
+    definitive = verified_df[status.isin(VERIFIED_HIT_STATUSES | VERIFIED_MISS_STATUSES)]
+    outcomes = list(
+        zip(
+            definitive["email"],
+            definitive["contractor_domain"],
+            definitive["email_pattern"],
+            status[definitive.index].isin(VERIFIED_HIT_STATUSES),
+        )
+    )
+    cache = cache if cache is not None else get_verification_cache()
+    cache.put_pattern_evidence(outcomes)
+    return len(outcomes)
+
+
+def _mined_local_pattern(email: str) -> str:
+    local = email.split("@")[0]
+    return next((pattern for regex, pattern in MINED_LOCAL_PATTERNS if regex.match(local)), "")
+
+
+def observations_from_mined_patterns(patterns_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    One hit per email site_contact_miner inferred a domain's pattern from,
+    under the pattern that email's own shape spells out; addresses with an
+    ambiguous shape count for nothing. A row without basis emails counts
+    once for its pattern, unless that pattern is the ambiguous "flast".
+    """
+    if patterns_df.empty or not {"source_domain", "pattern"} <= set(patterns_df.columns):
+        return _empty_observations()
+    basis = patterns_df.get("pattern_basis_emails", pd.Series("", index=patterns_df.index)).fillna("").astype(str)
+    rows = []
+    for domain, label, emails in zip(patterns_df["source_domain"], patterns_df["pattern"].fillna("").astype(str), basis):
+        addresses = {e.strip().lower() for e in emails.split(",") if e.strip()}
+        if addresses:
+            patterns = [_mined_local_pattern(e) for e in sorted(addresses)]
+        else:
+            patterns = [MINED_PATTERN_ALIASES.get(label.strip(), "")]
+        rows.extend({"domain": domain, "pattern": p, "hits": 1.0, "misses": 0.0} for p in patterns if p)
+    if not rows:
+        return _empty_observations()
+    obs = _normalize_observations(pd.DataFrame(rows, columns=OBSERVATION_COLUMNS))
+    return obs.groupby(["domain", "pattern"], as_index=False, sort=False)[["hits", "misses"]].sum()
+
+
+def load_ci_observations(db_path: Path = CI_DB_PATH) -> Tuple[pd.DataFrame, Dict[str, Segment]]:
+    """(observations, domain -> segment) from the contact_intelligence database; empty when it is absent."""
+    db_path = Path(db_path)
+    if not db_path.exists():
+        return _empty_observations(), {}
+    conn = sqlite3.connect(str(db_path))
+    try:
+        patterns = pd.read_sql_query(
+            "SELECT domain, pattern_template, verified_count, bounce_count FROM contact_patterns "
+            "WHERE domain IS NOT NULL",
+            conn,
+        )
+        feedback = pd.read_sql_query(
+            "SELECT f.email_tested, f.outcome_type, c.first_name, c.last_name "
+            "FROM feedback_outcomes f JOIN contacts c ON c.contact_id = f.contact_id "
+            "WHERE f.email_tested IS NOT NULL",
+            conn,
+        )
+        companies = pd.read_sql_query(
+            "SELECT domain, industry, employee_count FROM companies WHERE domain IS NOT NULL", conn
+        )
+    except (sqlite3.DatabaseError, pd.errors.DatabaseError) as exc:
+        log.warning("Pattern evidence unavailable from %s: %s", db_path, exc)
+        return _empty_observations(), {}
+    finally:
+        conn.close()
+
+    frames = [
+        pd.DataFrame({
+            "domain": patterns["domain"],
+            "pattern": patterns["pattern_template"].map(CI_TEMPLATE_PATTERNS),
+            "hits": patterns["verified_count"],
+            "misses": patterns["bounce_count"],
+        })
+    ]
+    if not feedback.empty:
+        outcome = feedback["outcome_type"].fillna("").astype(str).str.lower()
+        emails = feedback["email_tested"].fillna("").astype(str).str.strip().str.lower()
+        frames.append(
+            pd.DataFrame({
+                "domain": emails.str.split("@").str[-1],
+                "pattern": detect_patterns(emails, feedback),
+                "hits": outcome.isin(FEEDBACK_HITS).astype(float),
+                "misses": outcome.isin(FEEDBACK_MISSES).astype(float),
+            })
+        )
+    segments = {
+        normalize_text(domain).lower(): (normalize_text(industry).lower(), size_band(employees))
+        for domain, industry, employees in companies.itertuples(index=False)
+        if normalize_text(domain)
+    }
+    return _normalize_observations(pd.concat(frames, ignore_index=True)), segments
+
+
+class PatternModel:
+    """Pattern probabilities per domain from hit / miss counts, smoothed toward segment and global shares."""
+
+    def __init__(
+        self,
+        domain_prior_strength: float = DOMAIN_PRIOR_STRENGTH,
+        segment_prior_strength: float = SEGMENT_PRIOR_STRENGTH,
+    ) -> None:
+        self.domain_prior_strength = domain_prior_strength
+        self.segment_prior_strength = segment_prior_strength
+        self._hits: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        self._misses: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        self._segments: Dict[str, Segment] = {}
+        self._segment_shares: Dict[Segment, Dict[str, float]] = {}
+        total = sum(conf for _, conf in PATTERN_SPECS)
+        self._global_shares: Dict[str, float] = {p: conf / total for p, conf in PATTERN_SPECS}
+
+    @classmethod
+    def fit(
+        cls,
+        observations: pd.DataFrame,
+        segments: Optional[Dict[str, Segment]] = None,
+        **strengths: float,
+    ) -> "PatternModel":
+        model = cls(**strengths)
+        model._segments = {normalize_text(d).lower(): s for d, s in (segments or {}).items()}
+        obs = _normalize_observations(observations) if not observations.empty else _empty_observations()
+        grouped = obs.groupby(["domain", "pattern"], sort=False)[["hits", "misses"]].sum()
+        for (domain, pattern), hits, misses in zip(grouped.index, grouped["hits"], grouped["misses"]):
+            if hits:
+                model._hits[domain][pattern] += float(hits)
+            if misses:
+                model._misses[domain][pattern] += float(misses)
+
+        segment_hits: Dict[Segment, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        all_hits: Dict[str, float] = defaultdict(float)
+        for domain, hits in model._hits.items():
+            segment = model.segment_of(domain)
+            for pattern, n in hits.items():
+                all_hits[pattern] += n
+                if segment != NO_SEGMENT:
+                    segment_hits[segment][pattern] += n
+        model._global_shares = model._smooth(model._global_shares, all_hits, model.segment_prior_strength)
+        model._segment_shares = {
+            segment: model._smooth(model._global_shares, hits, model.segment_prior_strength)
+            for segment, hits in segment_hits.items()
+        }
+        log.info(
+            "Pattern model | domains=%d segments=%d observations=%d",
+            len(model._hits),
+            len(model._segment_shares),
+            int(obs["hits"].sum() + obs["misses"].sum()),
+        )
+        return model
+
+    @staticmethod
+    def _smooth(prior: Dict[str, float], hits: Dict[str, float], strength: float) -> Dict[str, float]:
+        total = sum(hits.values())
+        return {p: (strength * prior[p] + hits.get(p, 0.0)) / (strength + total) for p in PATTERNS}
+
+    def segment_of(self, domain: str) -> Segment:
+        return self._segments.get(domain, NO_SEGMENT)
+
+    def has_evidence(self, domain: str) -> bool:
+        return domain in self._hits or domain in self._misses
+
+    def probabilities(self, domain: str) -> Dict[str, float]:
+        """Probability that `domain` uses each pattern; a miss only lowers that pattern."""
+        domain = normalize_text(domain).lower()
+        prior = self._segment_shares.get(self.segment_of(domain), self._global_shares)
+        hits = self._hits.get(domain, {})
+        misses = self._misses.get(domain, {})
+        k = self.domain_prior_strength
+        total_hits = sum(hits.values())
+        return {
+            p: (k * prior[p] + hits.get(p, 0.0)) / (k + total_hits + misses.get(p, 0.0))
+            for p in PATTERNS
+        }
+
+    def ranked(self, domain: str, tie_order: Optional[Iterable[str]] = None) -> List[Tuple[str, float]]:
+        """(pattern, probability), most probable first; ties keep `tie_order` (default PATTERN_SPECS)."""
+        order = {p: i for i, p in enumerate(tie_order or PATTERNS)}
+        probs = self.probabilities(domain)
+        return sorted(probs.items(), key=lambda item: (-item[1], order.get(item[0], len(order))))
+
+
+def load_pattern_model(
+    extra_observations: Optional[pd.DataFrame] = None,
+    *,
+    cache: Optional[VerificationCache] = None,
+    ci_db_path: Path = CI_DB_PATH,
+) -> PatternModel:
+    """Fit from stored verification evidence, the contact_intelligence DB and this run's `extra_observations`."""
+    cache = cache if cache is not None else get_verification_cache()
+    ci_obs, segments = load_ci_observations(ci_db_path)
+    frames = [cache.pattern_evidence(), ci_obs]
+    if extra_observations is not None:
+        frames.append(extra_observations)
+    frames = [f for f in frames if not f.empty]
+    observations = pd.concat(frames, ignore_index=True) if frames else _empty_observations()
+    return PatternModel.fit(observations, segments)
@@ -2,14 +2,21 @@ from __future__ import annotations
 
 import logging
 import re
-from collections import deque
-from typing import Dict, List, Optional, Set, Tuple
-from urllib.parse import quote_plus, urljoin, urlparse
+from concurrent.futures import Future
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Union
+from urllib.parse import quote_plus, urlparse
 
 import pandas as pd
-import requests
-from bs4 import BeautifulSoup, Tag
-
+from bs4 import Tag
+
+from .crawl_checkpoint import CrawlCheckpoint
+from .crawl_frontier import crawl, load_yield_target
+from .crawl_planner import plan_domain
+from .html_document import PageLink, ParsedPage
+from .page_cache import FetchPolicy, load_fetch_policy
+from .parse_pool import EXTRACT_PEOPLE, PageExtract, ParsePool, ParseTask, borrow_pool, load_mining_concurrency, map_domains
+from .site_crawl import SiteCrawl, replay_site
 from .utils import normalize_text
 
 log = logging.getLogger("cranegenius.people_discovery")
@@ -17,6 +24,7 @@ log = logging.getLogger("cranegenius.people_discovery")
 DISCOVERY_PATHS = ["/", "/about", "/about-us", "/team", "/staff", "/leadership", "/people", "/management"]
 NAV_CLASS_HINTS = ["menu", "nav", "footer", "sidebar", "breadcrumb", "cookie", "banner", "social"]
 NAV_LINK_HINTS = ["#", "javascript:", "/privacy", "/terms", "/cookies", "/sitemap", "/careers", "/blog"]
+PERSON_BLOCK_TAGS = {"p", "li", "div", "span", "h1", "h2", "h3", "h4", "h5", "h6", "a"}
 PROFILE_PATH_HINT_RE = re.compile(r"(team|about|leadership|staff|people|management|contact)", re.IGNORECASE)
 
 TITLE_KEYWORDS = [
@@ -175,7 +183,11 @@ def normalize_title(raw_title: str) -> str:
     return TITLE_NORMALIZATION_MAP.get(clean, raw_title)
 
 
-def _element_is_noise(el: Tag) -> bool:
+def _element_text(el: Tag, doc: Optional[ParsedPage] = None) -> str:
+    return doc.element_text(el) if doc is not None else normalize_text(el.get_text(" ", strip=True))
+
+
+def _element_is_noise(el: Tag, doc: Optional[ParsedPage] = None) -> bool:
     """Return True when element should be ignored for people extraction."""
     if el.name in {"nav", "header", "footer"}:
         return True
@@ -184,7 +196,7 @@ def _element_is_noise(el: Tag) -> bool:
         return True
     if el.name == "a":
         href = normalize_text(el.get("href", "")).lower()
-        text = normalize_text(el.get_text(" ", strip=True)).lower()
+        text = _element_text(el, doc).lower()
         if any(h in href for h in NAV_LINK_HINTS):
             return True
         if len(text.split()) <= 3 and any(x in text for x in ["home", "about", "services", "contact", "blog"]):
@@ -213,7 +225,20 @@ def _is_company_echo_name(first: str, last: str, company_name: str) -> bool:
     if not company:
         return False
     phrase = f"{first.lower()} {last.lower()}"
-    return bool(re.search(rf"\b{re.escape(phrase)}\b", company))
+    # Whole-word containment (same as re.search(rf"\b{phrase}\b")) without compiling a pattern per name.
+    start = company.find(phrase)
+    while start != -1:
+        end = start + len(phrase)
+        before_ok = start == 0 or not _is_word_char(company[start - 1])
+        after_ok = end == len(company) or not _is_word_char(company[end])
+        if before_ok and after_ok:
+            return True
+        start = company.find(phrase, start + 1)
+    return False
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
 
 
 def _is_likely_person_name(first: str, last: str) -> bool:
@@ -280,120 +305,177 @@ def _is_content_context(source_url: str, text: str) -> bool:
     return any(h in src or h in low for h in CONTENT_CONTEXT_BLOCK_HINTS)
 
 
-def _secondary_title_probe(el: Tag) -> Optional[str]:
-    """Probe sibling/parent context up to 2 levels when local text lacks title."""
-    cur: Optional[Tag] = el
-    for _ in range(2):
-        if cur is None:
-            break
-        siblings_text = " ".join(normalize_text(s.get_text(" ", strip=True)) for s in list(cur.previous_siblings)[:2] + list(cur.next_siblings)[:2] if isinstance(s, Tag))
-        t = _title_from_text(siblings_text)
-        if t:
-            return t
-        cur = cur.parent if isinstance(cur.parent, Tag) else None
-        if cur:
-            t = _title_from_text(normalize_text(cur.get_text(" ", strip=True)))
+class _TitleProbe:
+    """
+    Sibling/parent title lookups for one page, memoized per node.
+
+    Large containers are the parent of many name matches; scanning their text
+    for title keywords once per node (instead of once per match) keeps people
+    extraction linear in page size.
+    """
+
+    def __init__(self, doc: ParsedPage) -> None:
+        self.doc = doc
+        self._node_titles: Dict[int, Optional[str]] = {}
+        self._sibling_titles: Dict[int, Optional[str]] = {}
+
+    def _node_title(self, el: Tag) -> Optional[str]:
+        key = id(el)
+        if key not in self._node_titles:
+            self._node_titles[key] = _title_from_text(self.doc.element_text(el))
+        return self._node_titles[key]
+
+    def _siblings_title(self, el: Tag) -> Optional[str]:
+        key = id(el)
+        if key not in self._sibling_titles:
+            nearby = list(islice(el.previous_siblings, 2)) + list(islice(el.next_siblings, 2))
+            siblings_text = " ".join(self.doc.element_text(s) for s in nearby if isinstance(s, Tag))
+            self._sibling_titles[key] = _title_from_text(siblings_text)
+        return self._sibling_titles[key]
+
+    def probe(self, el: Tag) -> Optional[str]:
+        """Probe sibling/parent context up to 2 levels when local text lacks title."""
+        cur: Optional[Tag] = el
+        for _ in range(2):
+            if cur is None:
+                break
+            t = self._siblings_title(cur)
             if t:
                 return t
-    return None
+            cur = cur.parent if isinstance(cur.parent, Tag) else None
+            if cur:
+                t = self._node_title(cur)
+                if t:
+                    return t
+        return None
 
 
-def _fetch_url(url: str) -> Tuple[str, str]:
-    """Fetch URL with redirect support and return (html, final_url)."""
-    try:
-        resp = requests.get(
-            url,
-            timeout=8,
-            allow_redirects=True,
-            headers={"User-Agent": "CraneGeniusPeopleBot/1.0"},
-        )
-        if not resp.ok:
-            return "", ""
-        return resp.text, resp.url
-    except Exception:
-        return "", ""
-
-
-def _crawl_domain(domain: str, max_depth: int = 2, max_pages: int = 20) -> List[Tuple[str, str]]:
-    """Crawl initial profile paths and related in-domain profile links up to depth 2."""
-    start_urls = [f"https://{domain}{p}" for p in DISCOVERY_PATHS]
-    queue = deque([(u, 0) for u in start_urls])
-    seen: Set[str] = set()
-    pages: List[Tuple[str, str]] = []
-
-    while queue and len(pages) < max_pages:
-        url, depth = queue.popleft()
-        if url in seen or depth > max_depth:
-            continue
-        seen.add(url)
+def _fetch_document(url: str, policy: FetchPolicy) -> Optional[ParsedPage]:
+    """Fetch URL (through the shared page cache) and return its parsed document."""
+    page = policy.fetch(url, timeout=8)
+    if page is None or not page.ok or not page.body:
+        return None
+    return page.document
 
-        html, final_url = _fetch_url(url)
-        if not html:
-            continue
-        pages.append((final_url or url, html))
-        if depth >= max_depth:
-            continue
 
-        soup = BeautifulSoup(html, "lxml")
-        for a in soup.select("a[href]"):
-            if _element_is_noise(a):
-                continue
-            href = normalize_text(a.get("href", ""))
-            if not href:
-                continue
-            joined = urljoin(final_url or url, href)
-            parsed = urlparse(joined)
-            if parsed.scheme not in {"http", "https"}:
-                continue
-            if domain not in parsed.netloc.lower():
-                continue
-            if not PROFILE_PATH_HINT_RE.search(parsed.path or ""):
-                continue
-            if joined not in seen:
-                queue.append((joined, depth + 1))
+def _crawl_domain(
+    domain: str,
+    pool: ParsePool,
+    policy: FetchPolicy,
+    max_depth: int = 2,
+    max_pages: int = 20,
+    context: Optional[Dict[str, str]] = None,
+) -> Iterator[Tuple[str, PageExtract]]:
+    """
+    Crawl ranked seed URLs (sitemap pages plus the guessed profile paths) and
+    related in-domain profile links up to depth 2, best-first, skipping
+    robots-disallowed URLs. Each body is parsed and people-extracted on the
+    parse pool; extracts are yielded as they arrive, so stop iterating to
+    stop the crawl.
+    """
+    plan = plan_domain(domain, fetch_policy=policy)
+    ctx = dict(context or {}, domain=domain)
+
+    def _fetch_extract(url: str) -> Optional["Future[PageExtract]"]:
+        page = policy.fetch(url, timeout=8)
+        if page is None or not page.ok or not page.body:
+            return None
+        return pool.submit(
+            ParseTask(
+                url=page.final_url or url,
+                html=page.body,
+                extractors=(EXTRACT_PEOPLE,),
+                context=ctx,
+                content_hash=page.content_hash,
+            )
+        )
 
-    return pages
+    def _follow(link: PageLink, page: PageExtract, depth: int) -> bool:
+        if link.noise:
+            return False
+        parsed = urlparse(link.url)
+        if parsed.scheme not in {"http", "https"}:
+            return False
+        if domain not in parsed.netloc.lower():
+            return False
+        return bool(PROFILE_PATH_HINT_RE.search(parsed.path or ""))
+
+    for url, page, _ in crawl(
+        plan.seed_urls(DISCOVERY_PATHS, limit=max_pages),
+        _fetch_extract,
+        max_pages=max_pages,
+        max_depth=max_depth,
+        follow=_follow,
+        allowed=plan.allowed,
+        in_flight=pool.in_flight,
+    ):
+        yield page.url or url, page
 
 
 def _extract_from_page(
-    html: str,
+    html: Union[str, ParsedPage],
     source_url: str,
     company: str,
     domain: str,
     city: str,
     state: str,
 ) -> List[Dict[str, object]]:
-    """Extract people from one HTML page with title proximity and fallback unconfirmed titles."""
+    """
+    Extract people from one page (raw HTML or an already-parsed document) with
+    title proximity and fallback unconfirmed titles.
+
+    Single pass over the document's text index: every element's text is a span
+    of one shared buffer built in one traversal, so nested containers never
+    re-serialize their subtrees. A name match is identified by its absolute
+    position in that buffer; ancestors that see the same match reuse its
+    normalized tokens, and title probes are memoized per node.
+    """
     rows: List[Dict[str, object]] = []
-    soup = BeautifulSoup(html, "lxml")
+    doc = html if isinstance(html, ParsedPage) else ParsedPage(html, source_url)
+    index = doc.text_index
+    titles = _TitleProbe(doc)
     seen_persons: Set[Tuple[str, str]] = set()
+    parsed_matches: Dict[Tuple[int, int], Tuple[Optional[str], Optional[str], bool]] = {}
+    company_echo: Dict[Tuple[str, str], bool] = {}
 
-    for el in soup.find_all(["p", "li", "div", "span", "h1", "h2", "h3", "h4", "h5", "h6", "a"]):
-        if _element_is_noise(el):
+    for el in index.tags:
+        if el.name not in PERSON_BLOCK_TAGS:
+            continue
+        span_bounds = index.spans.get(id(el))
+        if span_bounds is None:
             continue
-        text = normalize_text(el.get_text(" ", strip=True))
-        if not text:
+        if _element_is_noise(el, doc):
             continue
+        offset = span_bounds[0]
+        text = index.buffer[span_bounds[0]:span_bounds[1]]
         if text.isupper() and len(text.split()) > 4:
             continue
 
         for match in NAME_RE.finditer(text):
-            if match.group(1) and match.group(3):
-                tokens = [match.group(1), match.group(2), match.group(3)]
-                if match.group(4):
-                    tokens.append(match.group(4))
-            else:
-                tokens = [match.group(5), match.group(6)]
-                if match.group(7):
-                    tokens.append(match.group(7))
-            tokens = [t for t in tokens if t]
-
-            first_name, last_name, allcaps = _normalize_person_tokens(tokens)
+            key = (offset + match.start(), offset + match.end())
+            parsed = parsed_matches.get(key)
+            if parsed is None:
+                if match.group(1) and match.group(3):
+                    tokens = [match.group(1), match.group(2), match.group(3)]
+                    if match.group(4):
+                        tokens.append(match.group(4))
+                else:
+                    tokens = [match.group(5), match.group(6)]
+                    if match.group(7):
+                        tokens.append(match.group(7))
+                tokens = [t for t in tokens if t]
+                parsed = _normalize_person_tokens(tokens)
+                parsed_matches[key] = parsed
+
+            first_name, last_name, allcaps = parsed
             if not first_name or not last_name:
                 continue
-            if _is_company_echo_name(first_name, last_name, company):
+            name_key = (first_name.lower(), last_name.lower())
+            if name_key in seen_persons:
                 continue
-            if (first_name.lower(), last_name.lower()) in seen_persons:
+            if name_key not in company_echo:
+                company_echo[name_key] = _is_company_echo_name(first_name, last_name, company)
+            if company_echo[name_key]:
                 continue
 
             span = match.span()
@@ -403,7 +485,7 @@ def _extract_from_page(
             title = _title_from_text(local_window)
             title_confirmed = True
             if not title:
-                title = _secondary_title_probe(el)
+                title = titles.probe(el)
             if not title:
                 title = "unconfirmed"
                 title_confirmed = False
@@ -440,17 +522,20 @@ def _extract_from_page(
     return rows
 
 
-def _linkedin_fallback(company: str, domain: str, city: str, state: str, limit: int) -> List[Dict[str, object]]:
+
+def _linkedin_fallback(
+    company: str, domain: str, city: str, state: str, limit: int, policy: FetchPolicy
+) -> List[Dict[str, object]]:
     """Attempt lightweight LinkedIn name discovery via public search result titles."""
     rows: List[Dict[str, object]] = []
     query = f'site:linkedin.com/in "{company}" "project manager"'
     url = f"https://html.duckduckgo.com/html/?q={quote_plus(query)}"
-    html, final_url = _fetch_url(url)
-    if not html:
+    doc = _fetch_document(url, policy)
+    if doc is None:
         return rows
-    soup = BeautifulSoup(html, "lxml")
-    for a in soup.select("a.result__a, a[href*='linkedin.com/in/']"):
-        text = normalize_text(a.get_text(" ", strip=True))
+    final_url = doc.url
+    for a in doc.soup.select("a.result__a, a[href*='linkedin.com/in/']"):
+        text = doc.element_text(a)
         href = normalize_text(a.get("href", ""))
         m = NAME_RE.search(text)
         if not m:
@@ -509,8 +594,25 @@ def generate_role_inbox_fallback(domain: str) -> List[Dict[str, object]]:
     return out
 
 
-def discover_people(company_domains_df: pd.DataFrame, max_people_per_company: int = 3) -> pd.DataFrame:
-    """Discover named people and fallback role inbox records for validated company domains."""
+def _checkpoint_unit(row: pd.Series) -> str:
+    company = normalize_text(row.get("contractor_name_normalized", "")).lower()
+    domain = normalize_text(row.get("contractor_domain", "")).lower()
+    return f"{company}|{domain}"
+
+
+def discover_people(
+    company_domains_df: pd.DataFrame,
+    max_people_per_company: int = 3,
+    site_crawls: Optional[Dict[str, SiteCrawl]] = None,
+    pool: Optional[ParsePool] = None,
+    fetch_policy: Optional[FetchPolicy] = None,
+) -> pd.DataFrame:
+    """
+    Discover named people and fallback role inbox records for validated company domains.
+    Domains in `site_crawls` are replayed from the shared site-crawl stage instead of crawled.
+    Pages are parsed on `pool` (the run's pool), or on one opened for this call, and
+    fetched under `fetch_policy` (the run's, or a fresh one from crawler.yaml).
+    """
     columns = [
         "contractor_name_normalized",
         "contractor_domain",
@@ -532,34 +634,48 @@ def discover_people(company_domains_df: pd.DataFrame, max_people_per_company: in
     if company_domains_df.empty:
         return pd.DataFrame(columns=columns)
 
-    all_rows: List[Dict[str, object]] = []
-    for _, row in company_domains_df.iterrows():
+    target = load_yield_target()
+    concurrency = load_mining_concurrency()
+    policy = fetch_policy if fetch_policy is not None else load_fetch_policy()
+    checkpoint = CrawlCheckpoint("people_discovery", (_checkpoint_unit(r) for _, r in company_domains_df.iterrows()))
+
+    def _discover_row(row: pd.Series) -> List[Dict[str, object]]:
         company = normalize_text(row.get("contractor_name_normalized", "")).lower()
         domain = normalize_text(row.get("contractor_domain", "")).lower()
         city = normalize_text(row.get("project_city", ""))
         state = normalize_text(row.get("project_state", ""))
         domain_valid = bool(row.get("domain_valid", False))
         if not company or not domain:
-            continue
+            return []
+        unit = _checkpoint_unit(row)
+        if checkpoint.done(unit):
+            return checkpoint.rows(unit)
 
+        company_rows: List[Dict[str, object]] = []
         found: List[Dict[str, object]] = []
-        pages = _crawl_domain(domain, max_depth=2, max_pages=20)
-        for source_url, html in pages:
-            found.extend(_extract_from_page(html, source_url, company, domain, city, state))
-            if len(found) >= max_people_per_company:
+        context = {"company": company, "city": city, "state": state}
+        site = (site_crawls or {}).get(domain)
+        if site is not None:
+            pages = replay_site(site, run_pool, dict(context, domain=domain))
+        else:
+            pages = _crawl_domain(domain, run_pool, policy, max_depth=2, max_pages=20, context=context)
+        for _source_url, page in pages:
+            found.extend(page.people)
+            titled = sum(1 for r in found if r.get("title_confirmed"))
+            if len(found) >= max_people_per_company or target.met(people_with_titles=titled):
                 break
 
         if not found:
-            found.extend(_linkedin_fallback(company, domain, city, state, max_people_per_company))
+            found.extend(_linkedin_fallback(company, domain, city, state, max_people_per_company, policy))
 
         if found:
             df = pd.DataFrame(found).drop_duplicates(
                 subset=["contractor_name_normalized", "first_name", "last_name", "title"]
             )
-            all_rows.extend(df.head(max_people_per_company).to_dict(orient="records"))
+            company_rows.extend(df.head(max_people_per_company).to_dict(orient="records"))
         elif domain_valid:
             for fallback in generate_role_inbox_fallback(domain):
-                all_rows.append(
+                company_rows.append(
                     {
                         "contractor_name_normalized": company,
                         "contractor_domain": domain,
@@ -579,6 +695,13 @@ def discover_people(company_domains_df: pd.DataFrame, max_people_per_company: in
                         "is_role_inbox": True,
                     }
                 )
+        checkpoint.record(unit, company_rows)
+        return company_rows
+
+    # Network threads crawl companies; bodies are parsed on the process pool.
+    with borrow_pool(pool) as run_pool:
+        per_company = map_domains(_discover_row, [row for _, row in company_domains_df.iterrows()], concurrency.fetch_workers)
+    all_rows: List[Dict[str, object]] = [r for rows in per_company for r in rows]
 
     out = pd.DataFrame(all_rows, columns=columns)
     people_found_count = int(len(out[~out["is_role_inbox"]])) if not out.empty else 0
@@ -590,4 +713,5 @@ def discover_people(company_domains_df: pd.DataFrame, max_people_per_company: in
         companies_with_people,
         avg_people_per_company,
     )
+    checkpoint.finish()
     return out
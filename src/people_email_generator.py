@@ -2,11 +2,15 @@ from __future__ import annotations
 
 import logging
 import re
-from typing import Dict, List, Optional, Sequence, Tuple
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
-from .utils import normalize_text
+from .utils import first_unclaimed_mask, normalize_text
+
+if TYPE_CHECKING:
+    from .pattern_model import PatternModel
 
 log = logging.getLogger("cranegenius.people_email_generator")
 
@@ -76,53 +80,73 @@ def _normalize_name_token(token: str) -> str:
     return re.sub(r"[^a-z]", "", clean)
 
 
-def _extract_name_parts(row: pd.Series) -> Tuple[str, str, str]:
-    first_raw = normalize_text(row.get("first_name", ""))
-    last_raw = normalize_text(row.get("last_name", ""))
-    full_raw = normalize_text(row.get("full_name", ""))
+def _map_distinct(values: pd.Series, fn: Callable[[object], str]) -> pd.Series:
+    """fn over a column, computed once per distinct value."""
+    return values.map({v: fn(v) for v in values.unique()})
+
 
-    first = _normalize_name_token(first_raw)
-    last = _normalize_name_token(last_raw)
+def _text_col(df: pd.DataFrame, name: str) -> pd.Series:
+    """normalize_text over a column; a missing column reads as ""."""
+    if name not in df.columns:
+        return pd.Series("", index=df.index, dtype=object)
+    col = df[name].astype(object).where(df[name].notna(), "")
+    return _map_distinct(col, normalize_text)
 
-    if (not first or not last) and full_raw:
-        tokens_raw = [t for t in re.split(r"\s+", full_raw.strip()) if t]
-        tokens_norm = [_normalize_name_token(t) for t in tokens_raw]
-        tokens_norm = [t for t in tokens_norm if t]
-        if len(tokens_norm) >= 2:
-            if tokens_norm[-1] in SUFFIXES and len(tokens_norm) >= 3:
-                first = first or tokens_norm[0]
-                last = last or tokens_norm[-2]
-            else:
-                first = first or tokens_norm[0]
-                last = last or tokens_norm[-1]
 
-    full_name = full_raw
-    if not full_name and first and last:
-        full_name = f"{first.title()} {last.title()}"
+def _flag_col(df: pd.DataFrame, name: str) -> pd.Series:
+    """bool(value) per cell, like row.get(name, False) would give."""
+    if name not in df.columns:
+        return pd.Series(False, index=df.index)
+    return df[name].astype(object).astype(bool)
 
+
+def _name_parts(df: pd.DataFrame) -> Tuple[pd.Series, pd.Series, pd.Series]:
+    """
+    (first, last, full_name) per row. first/last come from first_name /
+    last_name, else from full_name tokens: the first one and the last one
+    (the one before it when the name ends in a suffix such as Jr). Middle
+    names and initials are ignored.
+    """
+    full_raw = _text_col(df, "full_name")
+    first = _map_distinct(_text_col(df, "first_name"), _normalize_name_token)
+    last = _map_distinct(_text_col(df, "last_name"), _normalize_name_token)
+
+    needs_tokens = ((first == "") | (last == "")) & (full_raw != "")
+    if needs_tokens.any():
+        tokens = _map_distinct(full_raw[needs_tokens].str.split(" ").explode(), _normalize_name_token)
+        tokens = tokens[tokens != ""]
+        by_row = tokens.groupby(level=0)
+        count = by_row.size()
+        head = by_row.first()
+        tail = by_row.last()
+        before_tail = tokens[by_row.cumcount(ascending=False) == 1].reindex(count.index)
+        tail = tail.where(~(tail.isin(SUFFIXES) & (count >= 3)), before_tail)
+        usable = count >= 2
+        first = first.where(first != "", head[usable].reindex(first.index).fillna(""))
+        last = last.where(last != "", tail[usable].reindex(last.index).fillna(""))
+
+    full_name = full_raw.where(full_raw != "", first.str.title() + " " + last.str.title())
     return first, last, full_name
 
 
-def _build_local_part(pattern: str, first: str, last: str) -> Optional[str]:
-    if not (first and last):
-        return None
-    if pattern == "first.last":
-        return f"{first}.{last}"
-    if pattern == "firstname.lastname":
-        return f"{first}.{last}"
-    if pattern == "first":
-        return first
-    if pattern == "flast":
-        return f"{first[0]}{last}"
-    if pattern == "firstlast":
-        return f"{first}{last}"
-    if pattern == "first_last":
-        return f"{first}_{last}"
-    if pattern == "f.lastname":
-        return f"{first[0]}.{last}"
-    if pattern == "last.first":
-        return f"{last}.{first}"
-    return None
+# Local part per pattern, as a template over the name parts: "f" is the first initial.
+LOCAL_PART_TEMPLATES: Dict[str, Tuple[str, ...]] = {
+    "first.last": ("first", ".", "last"),
+    "flast": ("f", "last"),
+    "firstlast": ("first", "last"),
+    "f.lastname": ("f", ".", "last"),
+    "first_last": ("first", "_", "last"),
+    "firstname.lastname": ("first", ".", "last"),
+    "first": ("first",),
+    "last.first": ("last", ".", "first"),
+}
+
+
+def _expand_template(template: Tuple[str, ...], parts: Dict[str, pd.Series]) -> pd.Series:
+    out = parts[template[0]]
+    for piece in template[1:]:
+        out = out + parts.get(piece, piece)
+    return out
 
 
 def _base_output_columns() -> List[str]:
@@ -144,8 +168,45 @@ def _base_output_columns() -> List[str]:
     ]
 
 
+def _pattern_table(
+    company: pd.Series,
+    domain: pd.Series,
+    pattern_model: Optional["PatternModel"] = None,
+    min_probability: float = 0.0,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Per row, (rank, confidence) of every pattern for its company/domain:
+    the heuristic ordering with PATTERN_SPECS confidences, or with a
+    pattern_model its probability order and probabilities. Patterns below
+    `min_probability` get no rank, except each domain's most probable one.
+    """
+    keys = pd.DataFrame({"company": company, "domain": domain})
+    group = keys.groupby(["company", "domain"], sort=False).ngroup().to_numpy()
+    firsts = keys.drop_duplicates(subset=["company", "domain"])
+    columns = [pattern for pattern, _ in PATTERN_SPECS]
+    ranks: List[Dict[str, float]] = []
+    confidences: List[Dict[str, float]] = []
+    for c, d in zip(firsts["company"], firsts["domain"]):
+        specs = _default_pattern_specs_for_person(c, d)
+        if pattern_model is not None:
+            specs = pattern_model.ranked(d, tie_order=[pattern for pattern, _ in specs])
+        ranks.append({
+            pattern: rank
+            for rank, (pattern, confidence) in enumerate(specs, start=1)
+            if rank == 1 or confidence >= min_probability
+        })
+        confidences.append({pattern: round(float(confidence), 4) for pattern, confidence in specs})
+    return (
+        pd.DataFrame(ranks, columns=columns).iloc[group].set_index(keys.index),
+        pd.DataFrame(confidences, columns=columns).iloc[group].set_index(keys.index),
+    )
+
+
 def generate_email_candidates_for_people(
-    discovered_people_df: pd.DataFrame, max_patterns_per_person: int = DEFAULT_PATTERNS_PER_PERSON
+    discovered_people_df: pd.DataFrame,
+    max_patterns_per_person: int = DEFAULT_PATTERNS_PER_PERSON,
+    pattern_model: Optional["PatternModel"] = None,
+    min_pattern_probability: Optional[float] = None,
 ) -> pd.DataFrame:
     """
     Generate candidate emails for discovered people rows.
@@ -155,74 +216,81 @@ def generate_email_candidates_for_people(
     - Deduplicates generated emails
     - Skips rows with blank contractor_domain
     - Ignores middle initials in pattern generation
+
+    Works on whole columns: names are normalized once per frame and each
+    pattern is one string template over every person, so hundreds of
+    thousands of people take seconds.
+
+    With a pattern_model (see pattern_model.py) patterns follow the model's
+    per-domain probability order, pattern_confidence is that probability,
+    and patterns under min_pattern_probability (default
+    MIN_PATTERN_PROBABILITY) are not emitted beyond each person's best one.
     """
     cols = _base_output_columns()
     if discovered_people_df.empty:
         return pd.DataFrame(columns=cols)
 
     max_patterns = max(1, min(int(max_patterns_per_person), MAX_PATTERNS_PER_PERSON))
-    rows: List[Dict[str, object]] = []
-    seen_emails: set[str] = set()
-    seen_people_keys: set[tuple[str, str, str, str]] = set()
-
-    for _, person in discovered_people_df.iterrows():
-        domain = _normalize_domain(str(person.get("contractor_domain", "")))
-        if not domain:
-            continue
-
-        first, last, full_name = _extract_name_parts(person)
-        if not (first and last):
-            continue
-
-        company = normalize_text(person.get("contractor_name_normalized", "")).lower()
-        person_key = (company, domain, first, last)
-        if person_key in seen_people_keys:
-            continue
-        seen_people_keys.add(person_key)
-        title = normalize_text(person.get("title", ""))
-        title_confirmed = bool(person.get("title_confirmed", False))
-        found_email = normalize_text(person.get("found_email", "")).strip().lower()
-        source_url = normalize_text(person.get("source_url", ""))
-        is_role_inbox = bool(person.get("is_role_inbox", False))
-
-        emitted_for_person = 0
-        pattern_specs = _default_pattern_specs_for_person(company, domain)
-        for rank, (pattern, confidence) in enumerate(pattern_specs, start=1):
-            if emitted_for_person >= max_patterns:
-                break
-            local_part = _build_local_part(pattern, first, last)
-            if not local_part:
-                continue
-            email = f"{local_part}@{domain}"
-            if email in seen_emails:
-                continue
-            seen_emails.add(email)
-            emitted_for_person += 1
-
-            rows.append(
-                {
-                    "first_name": first.title(),
-                    "last_name": last.title(),
-                    "full_name": full_name,
-                    "contractor_name_normalized": company,
-                    "contractor_domain": domain,
-                    "email": email,
-                    "email_pattern": pattern,
-                    "pattern_rank": rank,
-                    "pattern_confidence": confidence,
-                    "title": title,
-                    "title_confirmed": title_confirmed,
-                    "found_email": found_email,
-                    "source_url": source_url,
-                    "is_role_inbox": is_role_inbox,
-                }
-            )
-
-    out = pd.DataFrame(rows, columns=cols)
-    if out.empty:
-        return out
-    out = out.drop_duplicates(subset=["email"]).reset_index(drop=True)
-    return out
+    df = discovered_people_df.reset_index(drop=True)
+    raw_domain = df["contractor_domain"].astype(str) if "contractor_domain" in df.columns else _text_col(df, "contractor_domain")
+    domain = _map_distinct(raw_domain, _normalize_domain)
+    first, last, full_name = _name_parts(df)
+    people = pd.DataFrame({
+        "first": first,
+        "last": last,
+        "first_name": first.str.title(),
+        "last_name": last.str.title(),
+        "full_name": full_name,
+        "contractor_name_normalized": _text_col(df, "contractor_name_normalized").str.lower(),
+        "contractor_domain": domain,
+        "title": _text_col(df, "title"),
+        "title_confirmed": _flag_col(df, "title_confirmed"),
+        "found_email": _text_col(df, "found_email").str.strip().str.lower(),
+        "source_url": _text_col(df, "source_url"),
+        "is_role_inbox": _flag_col(df, "is_role_inbox"),
+    })
+    people = people[(people["contractor_domain"] != "") & (people["first"] != "") & (people["last"] != "")]
+    people = people.drop_duplicates(subset=["contractor_name_normalized", "contractor_domain", "first", "last"])
+    if people.empty:
+        return pd.DataFrame(columns=cols)
+    people = people.reset_index(drop=True)
+
+    if pattern_model is not None and min_pattern_probability is None:
+        from .pattern_model import MIN_PATTERN_PROBABILITY
+
+        min_pattern_probability = MIN_PATTERN_PROBABILITY
+    ranks, confidences = _pattern_table(
+        people["contractor_name_normalized"],
+        people["contractor_domain"],
+        pattern_model,
+        min_pattern_probability or 0.0,
+    )
+    parts = {"first": people["first"], "last": people["last"], "f": people["first"].str[0]}
+    at_domain = "@" + people["contractor_domain"]
+    long = pd.concat(
+        [
+            pd.DataFrame({
+                "person": people.index,
+                "email": _expand_template(LOCAL_PART_TEMPLATES[pattern], parts) + at_domain,
+                "email_pattern": pattern,
+                "pattern_rank": ranks[pattern],
+                "pattern_confidence": confidences[pattern],
+            })
+            for pattern, _ in PATTERN_SPECS
+        ],
+        ignore_index=True,
+    )
+    long = long[long["pattern_rank"].notna()]
+    long["pattern_rank"] = long["pattern_rank"].astype(int)
+    order = np.argsort(long["person"].to_numpy() * (len(PATTERN_SPECS) + 1) + long["pattern_rank"].to_numpy(), kind="stable")
+    long = long.take(order).reset_index(drop=True)
+    # an address taken by an earlier person does not use up one of this person's slots
+    long = long[first_unclaimed_mask(long, "person", "email", max_patterns)]
+
+    out = people.iloc[long["person"].to_numpy()].reset_index(drop=True)
+    for col in ("email", "email_pattern", "pattern_rank", "pattern_confidence"):
+        out[col] = long[col].to_numpy()
+    return out[cols]
 
 
 def generate_people_and_role_candidates(
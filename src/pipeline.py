@@ -12,27 +12,49 @@ Run order:
   Stage 7: Verify → verified_contacts.csv
   Stage 8: Export → sender_ready_hot.csv, sender_ready_warm.csv, catchall_review.csv
   Stage 9: QA report + gate check → qa_report.json
+
+A stage whose inputs, config and code are unchanged since it last finished
+is skipped and its artifacts are read back (see stage_cache.py).
+--from-stage / --until-stage narrow the run, e.g. `--from-stage export`
+re-runs only the export and gates. --stream runs ingest through verify as
+overlapping micro-batches before the export (see _stream_stages);
+--shards N spreads ingest through verify over N worker processes, by
+jurisdiction and then by domain, and merges the shards' artifacts before
+the export (see _shard_stages).
 """
 from __future__ import annotations
 
+import argparse
 import json
 import logging
+import shutil
 import sys
 import os
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+import pandas as pd
 
-from .ingest import ingest_sources
+from .ingest import RAW_COLUMNS, ingest_sources, ingest_units, iter_source_frames
 from .parse_normalize import normalize_records
 from .score_filter import score_and_filter
 from .company_resolver import resolve_domains
 from .domain_enricher_claude import enrich_domains_with_claude
 from .company_selector import select_companies_for_send
+from .parse_pool import load_parse_pool
 from .site_contact_miner import mine_contacts
 from .candidate_builder import build_candidates
-from .verify_millionverifier import verify_with_millionverifier
+from .verify_millionverifier import MV_MAX_IN_FLIGHT, MV_REQUESTS_PER_SECOND, verify_with_millionverifier
 from .exporter import export_sender_lists
 from .sheets_exporter import export_to_sheets
 from .monitor import check_gates, load_state, save_state, update_source_state
-from .utils import load_yaml, save_csv, setup_logging
+from .shard_runner import assign_units, domain_shard, in_order, run_shards, shard_dir_name
+from .artifact_writer import ArtifactWriter
+from .stage_cache import INGEST_MAX_AGE_SECONDS, STAGE_CACHE_ENABLED, StageCache, StageSpec
+from .stream_runner import StreamStage, micro_batches, run_stream
+from .telemetry import RunTelemetry, track_stage
+from .utils import load_yaml, read_csv, save_csv, setup_logging
 
 log = logging.getLogger("cranegenius.pipeline")
 
@@ -42,6 +64,26 @@ SCORING_YAML = "config/scoring.yaml"
 CRAWLER_YAML = "config/crawler.yaml"
 SEND_SELECTION_YAML = "config/send_selection.yaml"
 
+RAW_CSV = "data/raw_records.csv"
+NORMALIZED_CSV = "data/normalized_records.csv"
+PARSING_ERRORS_CSV = "data/parsing_errors.csv"
+SCORED_CSV = "data/scored_records.csv"
+ENRICHMENT_QUEUE_CSV = "data/enrichment_queue.csv"
+DOMAIN_SEED_CSV = "data/company_domain_seed.csv"
+ENRICHED_CSV = "data/enriched_companies.csv"
+SELECTED_CSV = "data/enriched_companies_selected.csv"
+EXCLUDED_CSV = "data/enriched_companies_excluded.csv"
+CONTACTS_CSV = "data/discovered_contacts.csv"
+PATTERNS_CSV = "data/domain_email_patterns.csv"
+CANDIDATES_CSV = "data/candidates.csv"
+VERIFIED_CSV = "data/verified_contacts.csv"
+HOT_CSV = "data/sender_ready_hot.csv"
+WARM_CSV = "data/sender_ready_warm.csv"
+CATCHALL_CSV = "data/catchall_review.csv"
+QA_REPORT_JSON = "data/qa_report.json"
+HOT_PREVIEW_CSV = "data/sender_ready_hot_preview.csv"
+# Per-shard artifacts of a --shards run: jurisdictions/<unit>/ and domains/<n>/
+SHARDS_DIR = "data/shards"
 
 
 def _write_contact_stats(companies_processed, domains_found, emails_generated, emails_filtered, emails_ready_for_verification):
@@ -61,112 +103,635 @@ def _write_contact_stats(companies_processed, domains_found, emails_generated, e
     log.info("Stats → runs/contact_generation_stats.json | companies=%d domains=%d generated=%d filtered=%d ready=%d",
              companies_processed, domains_found, emails_generated, emails_filtered, emails_ready_for_verification)
 
-def main() -> None:
+def _stage_specs() -> Tuple[StageSpec, ...]:
+    return (
+        StageSpec(
+            "ingest",
+            configs=(SOURCES_YAML,),
+            outputs=(RAW_CSV,),
+            code=("src.ingest",),
+            max_age_seconds=INGEST_MAX_AGE_SECONDS,
+        ),
+        StageSpec(
+            "normalize",
+            inputs=(RAW_CSV,),
+            outputs=(NORMALIZED_CSV, PARSING_ERRORS_CSV),
+            code=("src.parse_normalize",),
+        ),
+        StageSpec(
+            "score",
+            inputs=(NORMALIZED_CSV,),
+            configs=(KEYWORDS_YAML, SCORING_YAML),
+            outputs=(SCORED_CSV, ENRICHMENT_QUEUE_CSV),
+            code=("src.score_filter",),
+        ),
+        StageSpec(
+            "resolve",
+            inputs=(ENRICHMENT_QUEUE_CSV, DOMAIN_SEED_CSV),
+            outputs=(ENRICHED_CSV,),
+            code=("src.company_resolver", "src.domain_enricher_claude"),
+        ),
+        StageSpec(
+            "select",
+            inputs=(ENRICHED_CSV,),
+            configs=(SCORING_YAML, SEND_SELECTION_YAML),
+            outputs=(SELECTED_CSV, EXCLUDED_CSV),
+            code=("src.company_selector",),
+        ),
+        StageSpec(
+            "mine",
+            inputs=(SELECTED_CSV,),
+            configs=(CRAWLER_YAML,),
+            outputs=(CONTACTS_CSV, PATTERNS_CSV),
+            code=("src.site_contact_miner",),
+        ),
+        StageSpec(
+            "build",
+            inputs=(SELECTED_CSV, CONTACTS_CSV, PATTERNS_CSV),
+            configs=(KEYWORDS_YAML,),
+            outputs=(CANDIDATES_CSV,),
+            code=("src.candidate_builder",),
+        ),
+        StageSpec(
+            "verify",
+            inputs=(SELECTED_CSV, CANDIDATES_CSV),
+            outputs=(VERIFIED_CSV,),
+            code=("src.verify_millionverifier",),
+        ),
+        StageSpec(
+            "export",
+            inputs=(SELECTED_CSV, CANDIDATES_CSV, VERIFIED_CSV),
+            configs=(SCORING_YAML, SEND_SELECTION_YAML),
+            outputs=(HOT_CSV, WARM_CSV, CATCHALL_CSV, QA_REPORT_JSON),
+            code=("src.exporter", "src.monitor", "src.sheets_exporter"),
+        ),
+    )
+
+
+STAGE_NAMES = tuple(spec.name for spec in _stage_specs())
+
+
+def _verification_candidates(selected_companies_df: pd.DataFrame, candidates_df: pd.DataFrame) -> pd.DataFrame:
+    """Only verify real domains — skip name-generated fakes to save credits."""
+    if candidates_df.empty:
+        return candidates_df
+    if "contractor_domain" in selected_companies_df.columns and "domain_resolution_source" in selected_companies_df.columns:
+        real_domains = selected_companies_df[selected_companies_df["domain_resolution_source"].isin(["seed_partial","seed","enrichment_confident"])]["contractor_domain"].dropna().unique()
+        return candidates_df[candidates_df["contractor_domain"].isin(real_domains)].copy()
+    return candidates_df
+
+
+def _parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="CraneGenius intent pipeline")
+    parser.add_argument("--from-stage", choices=STAGE_NAMES,
+                        help="Run this stage even if unchanged; reuse the artifacts of every stage before it")
+    parser.add_argument("--until-stage", choices=STAGE_NAMES, help="Stop after this stage")
+    parser.add_argument("--no-stage-cache", action="store_true",
+                        help="Run every stage regardless of its recorded fingerprint")
+    parser.add_argument("--stream", action="store_true",
+                        help="Run ingest through verify in micro-batches on bounded queues, then export")
+    parser.add_argument("--shards", type=int, default=0, metavar="N",
+                        help="Run ingest through verify in N worker processes (by jurisdiction, then by domain), then merge and export")
+    args = parser.parse_args(argv)
+    if args.shards < 0:
+        parser.error("--shards must be positive")
+    if args.stream and args.shards:
+        parser.error("--stream and --shards are separate run modes; pick one")
+    if (args.stream or args.shards) and (args.from_stage or args.until_stage):
+        parser.error("--stream/--shards always run ingest through export; drop --from-stage/--until-stage")
+    return args
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = _parse_args(argv)
     setup_logging()
     log.info("=" * 60)
     log.info("CraneGenius Intent Pipeline — Dark 30 Ventures")
     log.info("=" * 60)
 
+    stages = StageCache(
+        "pipeline",
+        _stage_specs(),
+        # a streamed or sharded run hands every stage up to verify over in memory
+        from_stage="export" if args.stream or args.shards else args.from_stage,
+        until_stage=args.until_stage,
+        enabled=STAGE_CACHE_ENABLED and not args.no_stage_cache,
+    )
+    # frames go to the next stage in memory; artifacts are written behind it
+    # and flushed to disk on the way out, also on a failure or sys.exit;
+    # per-stage telemetry lands in pipeline_state.json and data/metrics/ after that
+    with RunTelemetry("pipeline"), \
+            ArtifactWriter(on_queued=stages.record_artifact, on_written=stages.artifact_written) as writer:
+        if args.stream:
+            frames = _stream_stages(stages, writer)
+        elif args.shards:
+            frames = _shard_stages(stages, writer, args.shards)
+        else:
+            frames = {}
+        _run_stages(stages, writer, frames)
+
+
+def _concat(parts: List[pd.DataFrame], columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    if not parts:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(parts, ignore_index=True)
+
+
+def _load_thresholds() -> Tuple[int, int, Dict[str, Any]]:
+    """threshold_warm, threshold_hot and the select_companies_for_send settings, from config."""
+    scoring = load_yaml(SCORING_YAML).get("scoring", {})
+    send_selection_cfg = load_yaml(SEND_SELECTION_YAML).get("send_selection", {})
+    threshold_warm = int(scoring.get("threshold_warm", 5))
+    threshold_hot = int(scoring.get("threshold_hot", 7))
+    selection = {
+        "threshold_hot": threshold_hot,
+        "min_cost": int(send_selection_cfg.get("min_project_cost", scoring.get("min_project_cost", 2_000_000))),
+        "exclusion_terms": send_selection_cfg.get("exclude_description_terms", []),
+    }
+    return threshold_warm, threshold_hot, selection
+
+
+def _record_source_state(raw_df: pd.DataFrame) -> None:
+    if raw_df.empty:
+        return
+    sources_cfg = load_yaml(SOURCES_YAML).get("sources", [])
+    enabled_sources = [s for s in sources_cfg if s.get("enabled")]
+    save_state(update_source_state(raw_df, enabled_sources, load_state()))
+
+
+def _complete_through_verify(
+    stages: StageCache,
+    writer: ArtifactWriter,
+    frames: Dict[str, pd.DataFrame],
+    selector_metrics: Dict[str, Any],
+) -> None:
+    """Write the frames of a streamed or sharded run and record every stage before export as done."""
+    for path, df in frames.items():
+        writer.save_csv(df, path)
+    for spec in _stage_specs():
+        if spec.name != "export":
+            stages.complete(spec.name, meta={"selector_metrics": selector_metrics} if spec.name == "select" else None)
+
+
+def _stream_stages(stages: StageCache, writer: ArtifactWriter) -> Dict[str, pd.DataFrame]:
+    """
+    Streaming mode: ingest → normalize → score → resolve → select → mine →
+    build → verify run concurrently over micro-batches (stream_runner), so
+    the first sources are being resolved and mined while later ones are
+    still downloading. Each company goes downstream once, with the first
+    batch that selects it. The collected frames are then written and
+    recorded like a batch run; selection is redone over every enriched row
+    so the artifacts match what the batch stages would have produced.
+    Verified hot leads appear in data/sender_ready_hot_preview.csv as
+    batches finish — before the monitoring gates, so not for sending.
+    """
+    threshold_warm, threshold_hot, selection = _load_thresholds()
+    parts: Dict[str, List[pd.DataFrame]] = defaultdict(list)
+    seen_records: Set[str] = set()
+    forwarded_companies: Set[str] = set()
+    hot_preview: List[pd.DataFrame] = []
+
+    def normalize(raw: pd.DataFrame) -> Optional[pd.DataFrame]:
+        parts[RAW_CSV].append(raw)
+        normalized, errors = normalize_records(raw)
+        normalized = normalized[~normalized["dedupe_key"].isin(seen_records)]
+        seen_records.update(normalized["dedupe_key"])
+        parts[NORMALIZED_CSV].append(normalized)
+        parts[PARSING_ERRORS_CSV].append(errors)
+        return normalized if not normalized.empty else None
+
+    def score(normalized: pd.DataFrame) -> Optional[pd.DataFrame]:
+        scored = score_and_filter(normalized, KEYWORDS_YAML, SCORING_YAML)
+        warm = scored[scored["lift_probability_score"] >= threshold_warm].copy()
+        parts[SCORED_CSV].append(scored)
+        parts[ENRICHMENT_QUEUE_CSV].append(warm)
+        return warm if not warm.empty else None
+
+    def resolve(warm: pd.DataFrame) -> pd.DataFrame:
+        enriched = enrich_domains_with_claude(resolve_domains(warm))
+        parts[ENRICHED_CSV].append(enriched)
+        return enriched
+
+    def select(enriched: pd.DataFrame) -> Optional[pd.DataFrame]:
+        selected, _, _ = select_companies_for_send(enriched, **selection)
+        if selected.empty:
+            return None
+        fresh = selected[~selected["company_group_key"].isin(forwarded_companies)]
+        forwarded_companies.update(fresh["company_group_key"])
+        return fresh if not fresh.empty else None
+
+    def mine(selected: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+        contacts, patterns = mine_contacts(selected, CRAWLER_YAML, pool=parse_pool)
+        parts[CONTACTS_CSV].append(contacts)
+        parts[PATTERNS_CSV].append(patterns)
+        return selected, contacts, patterns
+
+    def build(mined: Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]) -> Optional[Tuple[pd.DataFrame, pd.DataFrame]]:
+        selected, contacts, patterns = mined
+        candidates = build_candidates(selected, KEYWORDS_YAML, contacts_df=contacts, patterns_df=patterns)
+        if candidates.empty:
+            return None
+        parts[CANDIDATES_CSV].append(candidates)
+        return selected, candidates
+
+    def verify(built: Tuple[pd.DataFrame, pd.DataFrame]) -> None:
+        selected, candidates = built
+        to_verify = _verification_candidates(selected, candidates)
+        if to_verify.empty:
+            return
+        verified = verify_with_millionverifier(to_verify)
+        parts[VERIFIED_CSV].append(verified)
+        hot, _, _, _ = export_sender_lists(
+            selected.merge(candidates, on="contractor_domain", how="left"),
+            verified,
+            threshold_hot=threshold_hot,
+            threshold_warm=threshold_warm,
+        )
+        if not hot.empty:
+            hot_preview.append(hot)
+            writer.save_csv(pd.concat(hot_preview, ignore_index=True), HOT_PREVIEW_CSV)
+            log.info("Hot preview: %d leads so far → %s (not gate-checked)", sum(len(h) for h in hot_preview), HOT_PREVIEW_CSV)
+
+    log.info("\n[Stream] Running ingest → verify in micro-batches...")
+    # Every micro-batch's mining shares one parse pool instead of starting its own processes.
+    with track_stage("stream") as t, load_parse_pool(CRAWLER_YAML) as parse_pool:
+        stream_stats = run_stream(
+            micro_batches(iter_source_frames(SOURCES_YAML)),
+            [
+                StreamStage("normalize", normalize),
+                StreamStage("score", score),
+                StreamStage("resolve", resolve),
+                StreamStage("select", select),
+                StreamStage("mine", mine),
+                StreamStage("build", build),
+                StreamStage("verify", verify),
+            ],
+        )
+        t.details["stream"] = {name: stats.as_dict() for name, stats in stream_stats.items()}
+        t.rows_in = sum(len(v) for v in parts[RAW_CSV])
+        t.rows_out = sum(len(v) for v in parts[VERIFIED_CSV])
+
+    raw_df = _concat(parts[RAW_CSV], RAW_COLUMNS)
+    _record_source_state(raw_df)
+    enriched_df = _concat(parts[ENRICHED_CSV])
+    selected_df, excluded_df, selector_metrics = select_companies_for_send(enriched_df, **selection)
+
+    frames = {
+        RAW_CSV: raw_df,
+        NORMALIZED_CSV: _concat(parts[NORMALIZED_CSV]),
+        SCORED_CSV: _concat(parts[SCORED_CSV]),
+        ENRICHMENT_QUEUE_CSV: _concat(parts[ENRICHMENT_QUEUE_CSV]),
+        ENRICHED_CSV: enriched_df,
+        SELECTED_CSV: selected_df,
+        CONTACTS_CSV: _concat(parts[CONTACTS_CSV]),
+        PATTERNS_CSV: _concat(parts[PATTERNS_CSV]),
+        CANDIDATES_CSV: _concat(parts[CANDIDATES_CSV]),
+        VERIFIED_CSV: _concat(parts[VERIFIED_CSV]),
+    }
+    errors_df = _concat(parts[PARSING_ERRORS_CSV])
+    if not errors_df.empty:
+        frames[PARSING_ERRORS_CSV] = errors_df
+    if not excluded_df.empty:
+        frames[EXCLUDED_CSV] = excluded_df
+    _complete_through_verify(stages, writer, frames, selector_metrics)
+    return frames
+
+
+def _ingest_unit_weights() -> Dict[str, float]:
+    """Seconds each ingest unit took in the last run that recorded it (sharded, or per-source ingest telemetry)."""
+    for record in reversed(load_state().get("run_history", [])):
+        if record.get("pipeline") != "pipeline":
+            continue
+        stages = record.get("stages", [])
+        for stage in stages:
+            unit_seconds = stage.get("details", {}).get("unit_seconds") if stage.get("stage") == "shard/jurisdictions" else None
+            if unit_seconds:
+                return {unit: float(seconds) for unit, seconds in unit_seconds.items()}
+        per_source = {
+            stage["stage"][len("ingest/"):]: float(stage.get("wall_seconds", 0.0))
+            for stage in stages
+            if str(stage.get("stage", "")).startswith("ingest/") and stage.get("status") == "ok"
+        }
+        if per_source:
+            return per_source
+    return {}
+
+
+def _jurisdiction_shard(units: List[str], shards_dir: str) -> Dict[str, float]:
+    """
+    Worker process: ingest → normalize → score → resolve, one ingest unit
+    at a time, into <shards_dir>/<unit>/. Returns each unit's wall time.
+    """
+    setup_logging()
+    threshold_warm, _, _ = _load_thresholds()
+    seconds: Dict[str, float] = {}
+    for unit in units:
+        start = time.monotonic()
+        unit_dir = os.path.join(shards_dir, shard_dir_name(unit))
+        shutil.rmtree(unit_dir, ignore_errors=True)
+        frames = {RAW_CSV: ingest_sources(SOURCES_YAML, units=[unit])}
+        if not frames[RAW_CSV].empty:
+            normalized, errors = normalize_records(frames[RAW_CSV])
+            frames.update({NORMALIZED_CSV: normalized, PARSING_ERRORS_CSV: errors})
+            if not normalized.empty:
+                scored = score_and_filter(normalized, KEYWORDS_YAML, SCORING_YAML)
+                warm = scored[scored["lift_probability_score"] >= threshold_warm].copy()
+                frames.update({SCORED_CSV: scored, ENRICHMENT_QUEUE_CSV: warm})
+                if not warm.empty:
+                    frames[ENRICHED_CSV] = enrich_domains_with_claude(resolve_domains(warm))
+        for path, df in frames.items():
+            save_csv(df, os.path.join(unit_dir, os.path.basename(path)))
+        seconds[unit] = round(time.monotonic() - start, 3)
+        log.info("[Shard] %s: %d raw rows in %.1fs", unit, len(frames[RAW_CSV]), seconds[unit])
+    return seconds
+
+
+def _domain_shard(shard_dir: str, requests_per_second: float, max_in_flight: int) -> str:
+    """Worker process: mine → build → verify for the companies in <shard_dir>/, written back there."""
+    setup_logging()
+    selected = read_csv(os.path.join(shard_dir, os.path.basename(SELECTED_CSV)))
+    contacts, patterns = mine_contacts(selected, CRAWLER_YAML)
+    candidates = build_candidates(selected, KEYWORDS_YAML, contacts_df=contacts, patterns_df=patterns)
+    frames = {CONTACTS_CSV: contacts, PATTERNS_CSV: patterns, CANDIDATES_CSV: candidates}
+    to_verify = _verification_candidates(selected, candidates)
+    if not to_verify.empty:
+        frames[VERIFIED_CSV] = verify_with_millionverifier(
+            to_verify, requests_per_second=requests_per_second, max_in_flight=max_in_flight
+        )
+    for path, df in frames.items():
+        save_csv(df, os.path.join(shard_dir, os.path.basename(path)))
+    return shard_dir
+
+
+def _read_shard_parts(dirs: Sequence[str], paths: Sequence[str]) -> Dict[str, List[pd.DataFrame]]:
+    parts: Dict[str, List[pd.DataFrame]] = defaultdict(list)
+    for shard_dir in dirs:
+        for path in paths:
+            shard_path = os.path.join(shard_dir, os.path.basename(path))
+            if os.path.exists(shard_path):
+                parts[path].append(read_csv(shard_path))
+    return parts
+
+
+def _shard_stages(stages: StageCache, writer: ArtifactWriter, shards: int) -> Dict[str, pd.DataFrame]:
+    """
+    Sharded mode, in two rounds of worker processes (shard_runner):
+
+    1. ingest → resolve by jurisdiction: the ingest units (one per enabled
+       source, one per multi-city scraper) are balanced over the shards by
+       how long each took last time;
+    2. mine → verify by a hash of the contractor domain, after selection ran
+       once over every enriched row. Each shard gets 1/N of the
+       MillionVerifier rate and in-flight budget.
+
+    The merge never depends on the shard count or assignment: round-1
+    artifacts are read back per unit in sources.yaml order and deduped on
+    dedupe_key (first appearance wins, as in one normalize over the whole
+    ingest); round-2 rows are put in the selected companies' order. The
+    merged frames are written and recorded like a batch run.
+    """
+    _, _, selection = _load_thresholds()
+    units = ingest_units(SOURCES_YAML)
+    jurisdictions_dir = os.path.join(SHARDS_DIR, "jurisdictions")
+    log.info("\n[Shards] Ingest → resolve: %d unit(s) over %d process(es)...", len(units), shards)
+    with track_stage("shard/jurisdictions") as t:
+        groups = assign_units(units, shards, _ingest_unit_weights())
+        unit_seconds: Dict[str, float] = {}
+        for result in run_shards(_jurisdiction_shard, [(group, jurisdictions_dir) for group in groups]):
+            unit_seconds.update(result)
+        t.details.update({"assignment": groups, "unit_seconds": unit_seconds})
+
+        parts = _read_shard_parts(
+            [os.path.join(jurisdictions_dir, shard_dir_name(unit)) for unit in units],
+            (RAW_CSV, NORMALIZED_CSV, PARSING_ERRORS_CSV, SCORED_CSV, ENRICHMENT_QUEUE_CSV, ENRICHED_CSV),
+        )
+        raw_df = _concat(parts[RAW_CSV], RAW_COLUMNS)
+        deduped = {}
+        for path in (NORMALIZED_CSV, SCORED_CSV, ENRICHMENT_QUEUE_CSV, ENRICHED_CSV):
+            df = _concat(parts[path])
+            deduped[path] = df.drop_duplicates(subset=["dedupe_key"]).reset_index(drop=True) if "dedupe_key" in df.columns else df
+        t.rows_out = len(deduped[ENRICHED_CSV])
+    _record_source_state(raw_df)
+    enriched_df = deduped[ENRICHED_CSV]
+    selected_df, excluded_df, selector_metrics = select_companies_for_send(enriched_df, **selection)
+
+    domains_dir = os.path.join(SHARDS_DIR, "domains")
+    shutil.rmtree(domains_dir, ignore_errors=True)
+    shard_dirs: List[str] = []
+    if not selected_df.empty and "contractor_domain" in selected_df.columns:
+        shard_of = selected_df["contractor_domain"].map(lambda d: domain_shard(d, shards))
+        for index in range(shards):
+            part = selected_df[shard_of == index]
+            if part.empty:
+                continue
+            shard_dir = os.path.join(domains_dir, str(index))
+            save_csv(part, os.path.join(shard_dir, os.path.basename(SELECTED_CSV)))
+            shard_dirs.append(shard_dir)
+    log.info("\n[Shards] Mine → verify: %d compan(ies) over %d process(es)...", len(selected_df), len(shard_dirs))
+    with track_stage("shard/domains", rows_in=len(selected_df)) as t:
+        requests_per_second = MV_REQUESTS_PER_SECOND / max(1, len(shard_dirs))
+        max_in_flight = max(1, MV_MAX_IN_FLIGHT // max(1, len(shard_dirs)))
+        run_shards(_domain_shard, [(shard_dir, requests_per_second, max_in_flight) for shard_dir in shard_dirs])
+        parts.update(_read_shard_parts(shard_dirs, (CONTACTS_CSV, PATTERNS_CSV, CANDIDATES_CSV, VERIFIED_CSV)))
+        domain_order = selected_df["contractor_domain"].tolist() if "contractor_domain" in selected_df.columns else []
+        candidates_df = in_order(_concat(parts[CANDIDATES_CSV]), "contractor_domain", domain_order)
+        email_order = candidates_df["email_candidate"].tolist() if "email_candidate" in candidates_df.columns else []
+        verified_df = in_order(_concat(parts[VERIFIED_CSV]), "email", email_order)
+        t.details["shards"] = len(shard_dirs)
+        t.rows_out = len(verified_df)
+
+    frames = {
+        RAW_CSV: raw_df,
+        NORMALIZED_CSV: deduped[NORMALIZED_CSV],
+        SCORED_CSV: deduped[SCORED_CSV],
+        ENRICHMENT_QUEUE_CSV: deduped[ENRICHMENT_QUEUE_CSV],
+        ENRICHED_CSV: enriched_df,
+        SELECTED_CSV: selected_df,
+        CONTACTS_CSV: in_order(_concat(parts[CONTACTS_CSV]), "source_domain", domain_order),
+        PATTERNS_CSV: in_order(_concat(parts[PATTERNS_CSV]), "source_domain", domain_order),
+        CANDIDATES_CSV: candidates_df,
+        VERIFIED_CSV: verified_df,
+    }
+    errors_df = _concat(parts[PARSING_ERRORS_CSV])
+    if not errors_df.empty:
+        frames[PARSING_ERRORS_CSV] = errors_df
+    if not excluded_df.empty:
+        frames[EXCLUDED_CSV] = excluded_df
+    _complete_through_verify(stages, writer, frames, selector_metrics)
+    return frames
+
+
+def _run_stages(stages: StageCache, writer: ArtifactWriter, frames: Dict[str, pd.DataFrame]) -> None:
+    def load(path: str) -> pd.DataFrame:
+        return frames[path] if path in frames else read_csv(path)
+
     scoring_cfg = load_yaml(SCORING_YAML)
     scoring = scoring_cfg.get("scoring", {})
     send_selection_cfg = load_yaml(SEND_SELECTION_YAML).get("send_selection", {})
     state = load_state()
 
     # ── STAGE 1: INGEST ───────────────────────────────────────────
-    log.info("\n[Stage 1] Ingesting sources...")
-    raw_df = ingest_sources(SOURCES_YAML)
-    save_csv(raw_df, "data/raw_records.csv")
+    with track_stage("ingest") as t:
+        if stages.should_run("ingest"):
+            log.info("\n[Stage 1] Ingesting sources...")
+            raw_df = ingest_sources(SOURCES_YAML)
+            writer.save_csv(raw_df, RAW_CSV)
+            stages.complete("ingest")
+
+            if not raw_df.empty:
+                # Update source monitoring state
+                sources_cfg = load_yaml(SOURCES_YAML).get("sources", [])
+                enabled_sources = [s for s in sources_cfg if s.get("enabled")]
+                state = update_source_state(raw_df, enabled_sources, state)
+                save_state(state)
+        else:
+            t.cached()
+            raw_df = load(RAW_CSV)
+        t.rows_out = len(raw_df)
 
     if raw_df.empty:
         log.error("No records ingested. Check config/sources.yaml — are any sources enabled?")
         sys.exit(0)  # allow pipeline to complete even with 0 records
-
-    # Update source monitoring state
-    sources_cfg = load_yaml(SOURCES_YAML).get("sources", [])
-    enabled_sources = [s for s in sources_cfg if s.get("enabled")]
-    state = update_source_state(raw_df, enabled_sources, state)
-    save_state(state)
+    if stages.stop_after("ingest"):
+        return
 
     # ── STAGE 2: NORMALIZE ────────────────────────────────────────
-    log.info("\n[Stage 2] Normalizing records...")
-    normalized_df, errors_df = normalize_records(raw_df)
-    save_csv(normalized_df, "data/normalized_records.csv")
-    if not errors_df.empty:
-        save_csv(errors_df, "data/parsing_errors.csv")
+    with track_stage("normalize", rows_in=len(raw_df)) as t:
+        if stages.should_run("normalize"):
+            log.info("\n[Stage 2] Normalizing records...")
+            normalized_df, errors_df = normalize_records(raw_df)
+            writer.save_csv(normalized_df, NORMALIZED_CSV)
+            if not errors_df.empty:
+                writer.save_csv(errors_df, PARSING_ERRORS_CSV)
+            stages.complete("normalize")
+        else:
+            t.cached()
+            normalized_df = load(NORMALIZED_CSV)
+        t.rows_out = len(normalized_df)
+    if stages.stop_after("normalize"):
+        return
 
     # ── STAGE 3: SCORE + FILTER ───────────────────────────────────
-    log.info("\n[Stage 3] Scoring records...")
-    scored_df = score_and_filter(normalized_df, KEYWORDS_YAML, SCORING_YAML)
-    save_csv(scored_df, "data/scored_records.csv")
-
     threshold_warm = int(scoring.get("threshold_warm", 5))
     threshold_hot = int(scoring.get("threshold_hot", 7))
     min_project_cost = int(send_selection_cfg.get("min_project_cost", scoring.get("min_project_cost", 2_000_000)))
     exclusion_terms = send_selection_cfg.get("exclude_description_terms", [])
 
-    enrichment_queue = scored_df[scored_df["lift_probability_score"] >= threshold_warm].copy()
-    save_csv(enrichment_queue, "data/enrichment_queue.csv")
-    log.info("Enrichment queue: %d records at score >= %d", len(enrichment_queue), threshold_warm)
+    with track_stage("score", rows_in=len(normalized_df)) as t:
+        if stages.should_run("score"):
+            log.info("\n[Stage 3] Scoring records...")
+            scored_df = score_and_filter(normalized_df, KEYWORDS_YAML, SCORING_YAML)
+            writer.save_csv(scored_df, SCORED_CSV)
+
+            enrichment_queue = scored_df[scored_df["lift_probability_score"] >= threshold_warm].copy()
+            writer.save_csv(enrichment_queue, ENRICHMENT_QUEUE_CSV)
+            log.info("Enrichment queue: %d records at score >= %d", len(enrichment_queue), threshold_warm)
+            stages.complete("score")
+        else:
+            t.cached()
+            enrichment_queue = load(ENRICHMENT_QUEUE_CSV)
+        t.rows_out = len(enrichment_queue)
 
     if enrichment_queue.empty:
         log.warning("Enrichment queue is empty — no records scored high enough. "
                     "Check keyword matches against your raw data.")
+    if stages.stop_after("score"):
+        return
 
     # ── STAGE 4: RESOLVE DOMAINS ──────────────────────────────────
-    log.info("\n[Stage 4] Resolving contractor domains...")
-    enriched_df = resolve_domains(enrichment_queue)
-    save_csv(enriched_df, "data/enriched_companies.csv")
-
-    # ── STAGE 4b: CLAUDE DOMAIN ENRICHMENT ──────────────────────
-    log.info("[Stage 4b] Enriching unresolved domains via Claude...")
-    enriched_df = enrich_domains_with_claude(enriched_df)
-    save_csv(enriched_df, "data/enriched_companies.csv")
+    with track_stage("resolve", rows_in=len(enrichment_queue)) as t:
+        if stages.should_run("resolve"):
+            log.info("\n[Stage 4] Resolving contractor domains...")
+            enriched_df = resolve_domains(enrichment_queue)
+            writer.save_csv(enriched_df, ENRICHED_CSV)
+
+            # ── STAGE 4b: CLAUDE DOMAIN ENRICHMENT ──────────────────────
+            log.info("[Stage 4b] Enriching unresolved domains via Claude...")
+            enriched_df = enrich_domains_with_claude(enriched_df)
+            writer.save_csv(enriched_df, ENRICHED_CSV)
+            stages.complete("resolve")
+        else:
+            t.cached()
+            enriched_df = load(ENRICHED_CSV)
+        t.rows_out = len(enriched_df)
+    if stages.stop_after("resolve"):
+        return
 
     # ── STAGE 4c: COMPANY-LEVEL SEND SELECTION ────────────────────
-    log.info("[Stage 4c] Company-level dedupe + send selection...")
-    selected_companies_df, excluded_companies_df, selector_metrics = select_companies_for_send(
-        enriched_df,
-        threshold_hot=threshold_hot,
-        min_cost=min_project_cost,
-        exclusion_terms=exclusion_terms,
-    )
-    save_csv(selected_companies_df, "data/enriched_companies_selected.csv")
-    if not excluded_companies_df.empty:
-        save_csv(excluded_companies_df, "data/enriched_companies_excluded.csv")
+    with track_stage("select", rows_in=len(enriched_df)) as t:
+        if stages.should_run("select"):
+            log.info("[Stage 4c] Company-level dedupe + send selection...")
+            selected_companies_df, excluded_companies_df, selector_metrics = select_companies_for_send(
+                enriched_df,
+                threshold_hot=threshold_hot,
+                min_cost=min_project_cost,
+                exclusion_terms=exclusion_terms,
+            )
+            writer.save_csv(selected_companies_df, SELECTED_CSV)
+            if not excluded_companies_df.empty:
+                writer.save_csv(excluded_companies_df, EXCLUDED_CSV)
+            stages.complete("select", meta={"selector_metrics": selector_metrics})
+        else:
+            t.cached()
+            selected_companies_df = load(SELECTED_CSV)
+            selector_metrics = stages.meta("select").get("selector_metrics", {})
+        t.rows_out = len(selected_companies_df)
+    if stages.stop_after("select"):
+        return
 
     # ── STAGE 5: MINE CONTACTS ────────────────────────────────────
-    log.info("\n[Stage 5] Mining contacts from company sites...")
-    contacts_df, patterns_df = mine_contacts(selected_companies_df, CRAWLER_YAML)
-    save_csv(contacts_df, "data/discovered_contacts.csv")
-    save_csv(patterns_df, "data/domain_email_patterns.csv")
+    with track_stage("mine", rows_in=len(selected_companies_df)) as t:
+        if stages.should_run("mine"):
+            log.info("\n[Stage 5] Mining contacts from company sites...")
+            contacts_df, patterns_df = mine_contacts(selected_companies_df, CRAWLER_YAML)
+            writer.save_csv(contacts_df, CONTACTS_CSV)
+            writer.save_csv(patterns_df, PATTERNS_CSV)
+            stages.complete("mine")
+        else:
+            t.cached()
+            contacts_df = load(CONTACTS_CSV)
+            patterns_df = load(PATTERNS_CSV)
+        t.rows_out = len(contacts_df)
+    if stages.stop_after("mine"):
+        return
 
     # ── STAGE 6: BUILD CANDIDATES ─────────────────────────────────
-    log.info("\n[Stage 6] Building email candidates...")
-    candidates_df = build_candidates(
-        selected_companies_df,
-        KEYWORDS_YAML,
-        contacts_df=contacts_df,
-        patterns_df=patterns_df,
-    )
-    save_csv(candidates_df, "data/candidates.csv")
+    with track_stage("build", rows_in=len(selected_companies_df)) as t:
+        if stages.should_run("build"):
+            log.info("\n[Stage 6] Building email candidates...")
+            candidates_df = build_candidates(
+                selected_companies_df,
+                KEYWORDS_YAML,
+                contacts_df=contacts_df,
+                patterns_df=patterns_df,
+            )
+            writer.save_csv(candidates_df, CANDIDATES_CSV)
+            stages.complete("build")
+        else:
+            t.cached()
+            candidates_df = load(CANDIDATES_CSV)
+        t.rows_out = len(candidates_df)
 
     if candidates_df.empty:
         log.warning("No candidates generated — domain resolution may have failed. "
                     "Populate data/company_domain_seed.csv and re-run.")
+    if stages.stop_after("build"):
+        return
 
     # ── STAGE 7: VERIFY ───────────────────────────────────────────
-    # Only verify real domains — skip name-generated fakes to save credits
-    if "contractor_domain" in selected_companies_df.columns and "domain_resolution_source" in selected_companies_df.columns:
-        real_domains = selected_companies_df[selected_companies_df["domain_resolution_source"].isin(["seed_partial","seed","enrichment_confident"])]["contractor_domain"].dropna().unique()
-        verify_candidates = candidates_df[candidates_df["contractor_domain"].isin(real_domains)].copy()
-        log.info("[Stage 7] Filtering candidates: %d → %d (skipping generated domains)", len(candidates_df), len(verify_candidates))
-    else:
-        verify_candidates = candidates_df
-    log.info("\n[Stage 7] Verifying emails with MillionVerifier...")
-    verified_df = verify_with_millionverifier(verify_candidates)
-    save_csv(verified_df, "data/verified_contacts.csv")
+    verify_candidates = _verification_candidates(selected_companies_df, candidates_df)
+    with track_stage("verify", rows_in=len(verify_candidates)) as t:
+        if stages.should_run("verify"):
+            log.info("[Stage 7] Filtering candidates: %d → %d (skipping generated domains)", len(candidates_df), len(verify_candidates))
+            log.info("\n[Stage 7] Verifying emails with MillionVerifier...")
+            verified_df = verify_with_millionverifier(verify_candidates)
+            writer.save_csv(verified_df, VERIFIED_CSV)
+            stages.complete("verify")
+        else:
+            t.cached()
+            verified_df = load(VERIFIED_CSV)
+        t.rows_out = len(verified_df)
 
-    # ── STAGE 8: MERGE + EXPORT ───────────────────────────────────
     # ── CONTACT GENERATION STATS ─────────────────────────────────────────
     _write_contact_stats(
         companies_processed=len(enrichment_queue) if not enrichment_queue.empty else 0,
@@ -175,59 +740,68 @@ def main() -> None:
         emails_filtered=len(candidates_df) - len(verify_candidates) if not candidates_df.empty else 0,
         emails_ready_for_verification=len(verify_candidates),
     )
+    if stages.stop_after("verify"):
+        return
 
+    # ── STAGE 8: MERGE + EXPORT ───────────────────────────────────
+    with track_stage("export", rows_in=len(candidates_df)) as t:
+        if not stages.should_run("export"):
+            t.cached()
+            log.info("Sender lists unchanged since the last run — nothing to export.")
+            return
         log.info("\n[Stage 8] Exporting sender-ready lists...")
-    if candidates_df.empty or "contractor_domain" not in selected_companies_df.columns:
-        log.warning("No candidates to export — pipeline complete with 0 sender-ready leads")
-        sys.exit(0)
-    scored_candidates = selected_companies_df.merge(
-        candidates_df, on="contractor_domain", how="left"
-    )
-
-    hot_df, warm_df, catchall_df, qa = export_sender_lists(
-        scored_candidates,
-        verified_df,
-        threshold_hot=threshold_hot,
-        threshold_warm=threshold_warm,
-    )
-
-    valid_emails_per_company = (
-        (qa.get("total_verified_valid", 0) / selector_metrics.get("send_ready_companies", 1))
-        if selector_metrics.get("send_ready_companies", 0) else 0
-    )
-
-    qa.update({
-        "total_companies": int(selected_companies_df.get("contractor_name_normalized", []).nunique() if "contractor_name_normalized" in selected_companies_df.columns else len(selected_companies_df)),
-        "unique_domains": int(selected_companies_df.get("contractor_domain", []).nunique() if "contractor_domain" in selected_companies_df.columns else 0),
-        "contacts_generated": int(len(candidates_df)),
-        "valid_email_rate": qa.get("valid_email_rate", 0),
-        "total_unique_companies": selector_metrics.get("total_unique_companies", 0),
-        "total_unique_domains": selector_metrics.get("total_unique_domains", 0),
-        "avg_rows_per_company_before_dedupe": selector_metrics.get("avg_rows_per_company_before_dedupe", 0),
-        "send_ready_companies": selector_metrics.get("send_ready_companies", 0),
-        "valid_emails_per_company": round(valid_emails_per_company, 3),
-        "excluded_residential_count": selector_metrics.get("excluded_residential_count", 0),
-    })
-
-    export_to_sheets(warm_df, hot_df, catchall_df)
-
-    # ── STAGE 9: GATE CHECK + QA ──────────────────────────────────
-    log.info("\n[Stage 9] Running monitoring gates...")
-    gate_report = check_gates(qa, scoring_cfg)
-    qa["gate_report"] = gate_report
-
-    with open("data/qa_report.json", "w", encoding="utf-8") as f:
-        json.dump(qa, f, ensure_ascii=False, indent=2)
-
-    if gate_report["halt"]:
-        log.error("Pipeline halted by monitoring gate. Sender lists NOT written.")
-        log.error("Fix the issues in qa_report.json before sending.")
-        sys.exit(0)  # gate halt is expected, not a crash
-
-    # Only write sender lists if gates passed
-    save_csv(hot_df, "data/sender_ready_hot.csv")
-    save_csv(warm_df, "data/sender_ready_warm.csv")
-    save_csv(catchall_df, "data/catchall_review.csv")
+        if candidates_df.empty or "contractor_domain" not in selected_companies_df.columns:
+            log.warning("No candidates to export — pipeline complete with 0 sender-ready leads")
+            sys.exit(0)
+        scored_candidates = selected_companies_df.merge(
+            candidates_df, on="contractor_domain", how="left"
+        )
+
+        hot_df, warm_df, catchall_df, qa = export_sender_lists(
+            scored_candidates,
+            verified_df,
+            threshold_hot=threshold_hot,
+            threshold_warm=threshold_warm,
+        )
+
+        valid_emails_per_company = (
+            (qa.get("total_verified_valid", 0) / selector_metrics.get("send_ready_companies", 1))
+            if selector_metrics.get("send_ready_companies", 0) else 0
+        )
+
+        qa.update({
+            "total_companies": int(selected_companies_df.get("contractor_name_normalized", []).nunique() if "contractor_name_normalized" in selected_companies_df.columns else len(selected_companies_df)),
+            "unique_domains": int(selected_companies_df.get("contractor_domain", []).nunique() if "contractor_domain" in selected_companies_df.columns else 0),
+            "contacts_generated": int(len(candidates_df)),
+            "valid_email_rate": qa.get("valid_email_rate", 0),
+            "total_unique_companies": selector_metrics.get("total_unique_companies", 0),
+            "total_unique_domains": selector_metrics.get("total_unique_domains", 0),
+            "avg_rows_per_company_before_dedupe": selector_metrics.get("avg_rows_per_company_before_dedupe", 0),
+            "send_ready_companies": selector_metrics.get("send_ready_companies", 0),
+            "valid_emails_per_company": round(valid_emails_per_company, 3),
+            "excluded_residential_count": selector_metrics.get("excluded_residential_count", 0),
+        })
+
+        export_to_sheets(warm_df, hot_df, catchall_df)
+
+        # ── STAGE 9: GATE CHECK + QA ──────────────────────────────────
+        log.info("\n[Stage 9] Running monitoring gates...")
+        gate_report = check_gates(qa, scoring_cfg)
+        qa["gate_report"] = gate_report
+
+        writer.save_json(qa, QA_REPORT_JSON)
+
+        if gate_report["halt"]:
+            log.error("Pipeline halted by monitoring gate. Sender lists NOT written.")
+            log.error("Fix the issues in qa_report.json before sending.")
+            sys.exit(0)  # gate halt is expected, not a crash
+
+        # Only write sender lists if gates passed
+        writer.save_csv(hot_df, HOT_CSV)
+        writer.save_csv(warm_df, WARM_CSV)
+        writer.save_csv(catchall_df, CATCHALL_CSV)
+        stages.complete("export")
+        t.rows_out = len(hot_df) + len(warm_df) + len(catchall_df)
 
     log.info("\n" + "=" * 60)
     log.info("Pipeline complete.")
@@ -0,0 +1,105 @@
+"""
+Sharded execution of pipeline work across worker processes.
+
+A normal run does every metro — ingest, parsing, resolution, crawling —
+in one interpreter, so it uses one core no matter how many the box has.
+The sharded mode splits the work over N processes, in two ways:
+
+- by ingest unit (one jurisdiction's source, or one multi-city scraper).
+  assign_units spreads the units over the shards, longest-running first by
+  their last recorded wall time, so the slowest metro does not share a
+  shard with the next-slowest;
+- by a stable hash of the domain (domain_shard), for mining through
+  verification, so every page, pattern and verification for a domain stays
+  in one process and per-domain crawl politeness still holds.
+
+run_shards makes one call per shard in a spawn-started process pool (spawn
+for the same reason as parse_pool: threads holding sqlite/logging locks)
+and returns the results in shard order; the first failure is re-raised once
+every shard has finished. CRANEGENIUS_SHARD_PROCESSES=0 runs the shards one
+after another in this process instead (debugging, tests). Merging is the
+caller's job and must not depend on which shard produced a row.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import multiprocessing
+import os
+import re
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import pandas as pd
+
+log = logging.getLogger("cranegenius.shard_runner")
+
+SHARD_USE_PROCESSES = os.environ.get("CRANEGENIUS_SHARD_PROCESSES", "1") != "0"
+
+_UNSAFE_PATH_CHARS = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+def domain_shard(domain: Any, shards: int) -> int:
+    """Stable shard for `domain` (same answer in every process and run, unlike hash())."""
+    key = str(domain or "").strip().lower()
+    return int(hashlib.sha1(key.encode("utf-8")).hexdigest()[:8], 16) % max(1, shards)
+
+
+def shard_dir_name(unit: str) -> str:
+    return _UNSAFE_PATH_CHARS.sub("_", unit) or "_"
+
+
+def assign_units(units: Sequence[str], shards: int, weights: Optional[Mapping[str, float]] = None) -> List[List[str]]:
+    """
+    Longest-processing-time-first: each unit, heaviest first, goes to the
+    shard with the least assigned weight so far (lowest index on a tie).
+    Units without a weight count as the mean known weight. Every shard keeps
+    its units in input order; empty shards are dropped.
+    """
+    weights = dict(weights or {})
+    known = [float(weights[u]) for u in units if u in weights]
+    default = sum(known) / len(known) if known else 1.0
+    cost = {u: float(weights.get(u, default)) for u in units}
+    position = {u: i for i, u in enumerate(units)}
+    loads = [0.0] * max(1, shards)
+    assigned: List[List[str]] = [[] for _ in loads]
+    for unit in sorted(units, key=lambda u: (-cost[u], position[u])):
+        target = min(range(len(loads)), key=lambda k: (loads[k], k))
+        loads[target] += cost[unit]
+        assigned[target].append(unit)
+    return [sorted(group, key=position.__getitem__) for group in assigned if group]
+
+
+def in_order(df: pd.DataFrame, column: str, order: Sequence[Any]) -> pd.DataFrame:
+    """Rows sorted (stably) by where df[column] first appears in `order`; unknown values go last."""
+    if df.empty or column not in df.columns:
+        return df.reset_index(drop=True)
+    rank: Dict[Any, int] = {}
+    for value in order:
+        rank.setdefault(value, len(rank))
+    keys = df[column].map(lambda v: rank.get(v, len(rank)))
+    return df.iloc[keys.to_numpy().argsort(kind="mergesort")].reset_index(drop=True)
+
+
+def run_shards(fn: Callable[..., Any], jobs: Sequence[Tuple[Any, ...]], processes: Optional[bool] = None) -> List[Any]:
+    """Call fn(*job) for every job, one worker process per job; results in job order."""
+    use_processes = SHARD_USE_PROCESSES if processes is None else processes
+    if not jobs:
+        return []
+    if not use_processes or len(jobs) == 1:
+        return [fn(*job) for job in jobs]
+
+    results: List[Any] = [None] * len(jobs)
+    error: Optional[BaseException] = None
+    with ProcessPoolExecutor(max_workers=len(jobs), mp_context=multiprocessing.get_context("spawn")) as pool:
+        futures: List["Future[Any]"] = [pool.submit(fn, *job) for job in jobs]
+        for index, future in enumerate(futures):
+            try:
+                results[index] = future.result()
+            except BaseException as exc:
+                log.error("Shard %d failed: %s", index, exc)
+                if error is None:
+                    error = exc
+    if error is not None:
+        raise error
+    return results
@@ -2,15 +2,20 @@ from __future__ import annotations
 
 import logging
 import re
-from collections import deque
-from typing import Any, Dict, List, Set, Tuple
-from urllib.parse import urljoin, urlparse
+from concurrent.futures import Future
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+from urllib.parse import urlparse
 
 import pandas as pd
-import requests
-from bs4 import BeautifulSoup
 
-from .utils import extract_emails, extract_phones, load_yaml, normalize_text, rate_limit_sleep, utc_now_iso
+from .crawl_checkpoint import CrawlCheckpoint
+from .crawl_frontier import YieldTarget, crawl
+from .crawl_planner import plan_domain
+from .html_document import PageLink
+from .page_cache import FetchPolicy
+from .parse_pool import EXTRACT_CONTACTS, MiningConcurrency, PageExtract, ParsePool, ParseTask, borrow_pool, map_domains
+from .site_crawl import SiteCrawl, replay_site
+from .utils import extract_emails, extract_phones, load_yaml, normalize_text, utc_now_iso
 
 log = logging.getLogger("cranegenius.miner")
 
@@ -24,64 +29,109 @@ ROLE_INBOX_PREFIXES = {
 PERSON_EMAIL_RE = re.compile(r"^[a-z]+\.[a-z]+@|^[a-z]\.[a-z]+@|^[a-z]+_[a-z]+@")
 
 
-def mine_contacts(enriched_df: pd.DataFrame, crawler_yaml: str) -> Tuple[pd.DataFrame, pd.DataFrame]:
+def mine_contacts(
+    enriched_df: pd.DataFrame,
+    crawler_yaml: str,
+    site_crawls: Optional[Dict[str, SiteCrawl]] = None,
+    pool: Optional[ParsePool] = None,
+    fetch_policy: Optional[FetchPolicy] = None,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Mine emails/phones and a per-domain email pattern; domains in `site_crawls`
+    are replayed, not crawled. Pages are parsed on `pool` (the run's pool),
+    or on one opened for this call, and fetched under `fetch_policy` (by
+    default a fresh one from `crawler_yaml`).
+    """
     cfg = load_yaml(crawler_yaml)["crawler"]
     include_keywords = [k.lower() for k in cfg["include_url_keywords"]]
     max_pages = int(cfg["max_pages_per_domain"])
     max_depth = int(cfg["max_depth"])
     timeout = int(cfg["request_timeout_seconds"])
-    rate_s = float(cfg["rate_limit_seconds"])
-    ua = cfg["user_agent"]
     exclude_exts = [e.lower() for e in cfg.get("exclude_extensions", [])]
-
-    contacts_rows: List[Dict[str, Any]] = []
-    patterns_rows: List[Dict[str, Any]] = []
+    target = YieldTarget.from_config(cfg)
+    policy = fetch_policy if fetch_policy is not None else FetchPolicy.from_config(cfg)
+    concurrency = MiningConcurrency.from_config(cfg)
 
     # Dedupe by domain — only crawl each domain once
+    domains: List[str] = []
     seen_domains: Set[str] = set()
-
-    for _, row in enriched_df.iterrows():
-        domain = normalize_text(row.get("contractor_domain")).lower()
-        if not domain or domain in seen_domains:
-            continue
-        seen_domains.add(domain)
+    for d in enriched_df.get("contractor_domain", []):
+        domain = normalize_text(d).lower()
+        if domain and domain not in seen_domains:
+            seen_domains.add(domain)
+            domains.append(domain)
+
+    checkpoint = CrawlCheckpoint("site_contact_miner", domains)
+
+    def _mine_domain(domain: str) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        if checkpoint.done(domain):
+            records = checkpoint.rows(domain)
+            return (
+                [r["row"] for r in records if r["table"] == "contacts"],
+                [r["row"] for r in records if r["table"] == "patterns"],
+            )
 
         log.info("Mining contacts: %s", domain)
-        start_url = f"https://{domain}/"
-        visited: Set[str] = set()
-        q: deque = deque([(start_url, 0)])
+        domain_contacts: List[Dict[str, Any]] = []
+        domain_patterns: List[Dict[str, Any]] = []
         found_person_emails: List[str] = []
 
-        while q and len(visited) < max_pages:
-            url, depth = q.popleft()
-            if depth > max_depth or url in visited:
-                continue
-            visited.add(url)
-
+        def _fetch_extract(url: str) -> Optional["Future[PageExtract]"]:
+            page = policy.fetch(url, timeout=timeout)
+            if page is None or page.status >= 400:
+                return None
+            return run_pool.submit(
+                ParseTask(
+                    url=page.final_url or url,
+                    html=page.body,
+                    extractors=(EXTRACT_CONTACTS,),
+                    content_hash=page.content_hash,
+                )
+            )
+
+        def _allowed(url: str) -> bool:
             # Skip excluded file extensions
             parsed_path = urlparse(url).path.lower()
             if any(parsed_path.endswith(ext) for ext in exclude_exts):
-                continue
-
-            try:
-                rate_limit_sleep(rate_s)
-                r = requests.get(url, timeout=timeout, headers={"User-Agent": ua}, allow_redirects=True)
-                if r.status_code >= 400:
-                    continue
-                html = r.text
-            except Exception as exc:
-                log.debug("Crawl error %s: %s", url, exc)
-                continue
-
-            emails = extract_emails(html)
-            phones = extract_phones(html)
+                return False
+            return plan.allowed(url)
+
+        def _follow(link: PageLink, page: PageExtract, depth: int) -> bool:
+            parsed = urlparse(link.url)
+            if parsed.scheme not in ("http", "https"):
+                return False
+            if parsed.netloc and domain not in parsed.netloc:
+                return False
+            path = (parsed.path or "").lower()
+            return any(k in path for k in include_keywords) or depth == 0
+
+        site = (site_crawls or {}).get(domain)
+        if site is not None:
+            pages: Iterator[Tuple[str, PageExtract]] = replay_site(site, run_pool)
+        else:
+            # Sitemap pages most likely to list people go first; the homepage seeds link discovery.
+            plan = plan_domain(domain, fetch_policy=policy)
+            seeds = plan.seed_urls(["/"], limit=max_pages)
+            pages = (
+                (url, page)
+                for url, page, _ in crawl(
+                    seeds,
+                    _fetch_extract,
+                    max_pages=max_pages,
+                    max_depth=max_depth,
+                    follow=_follow,
+                    allowed=_allowed,
+                    in_flight=run_pool.in_flight,
+                )
+            )
+        for url, page in pages:
+            emails = page.emails
+            phones = page.phones
 
             for e in emails:
-                local = e.split("@")[0]
-                is_role = local in ROLE_INBOX_PREFIXES or local.rstrip("s") in ROLE_INBOX_PREFIXES
-                is_person = bool(PERSON_EMAIL_RE.match(e))
+                is_role, is_person = _classify_email(e)
 
-                contacts_rows.append({
+                domain_contacts.append({
                     "source_domain": domain,
                     "source_url": url,
                     "email": e,
@@ -95,25 +145,14 @@ def mine_contacts(enriched_df: pd.DataFrame, crawler_yaml: str) -> Tuple[pd.Data
                 if is_person:
                     found_person_emails.append(e)
 
-            soup = BeautifulSoup(html, "lxml")
-            for a in soup.select("a[href]"):
-                href = a.get("href", "")
-                if not href:
-                    continue
-                next_url = urljoin(url, href)
-                parsed = urlparse(next_url)
-                if parsed.scheme not in ("http", "https"):
-                    continue
-                if parsed.netloc and domain not in parsed.netloc:
-                    continue
-                path = (parsed.path or "").lower()
-                if any(k in path for k in include_keywords) or depth == 0:
-                    q.append((next_url, depth + 1))
+            if target.met(person_emails=_pattern_support(found_person_emails)):
+                log.info("  Yield target met for %s; stopping crawl", domain)
+                break
 
         # Infer pattern from person emails found
         pattern = _infer_pattern(found_person_emails)
         if pattern:
-            patterns_rows.append({
+            domain_patterns.append({
                 "source_domain": domain,
                 "pattern": pattern,
                 "pattern_basis_emails": ",".join(sorted(set(found_person_emails))[:5]),
@@ -123,6 +162,20 @@ def mine_contacts(enriched_df: pd.DataFrame, crawler_yaml: str) -> Tuple[pd.Data
         else:
             log.info("  No person email pattern found for %s", domain)
 
+        checkpoint.record(
+            domain,
+            [{"table": "contacts", "row": r} for r in domain_contacts]
+            + [{"table": "patterns", "row": r} for r in domain_patterns],
+        )
+        return domain_contacts, domain_patterns
+
+    # Network threads crawl domains; bodies are parsed on the process pool.
+    with borrow_pool(pool, crawler_yaml) as run_pool:
+        results = map_domains(_mine_domain, domains, concurrency.fetch_workers)
+
+    contacts_rows: List[Dict[str, Any]] = [r for domain_contacts, _ in results for r in domain_contacts]
+    patterns_rows: List[Dict[str, Any]] = [r for _, domain_patterns in results for r in domain_patterns]
+
     contacts_df = pd.DataFrame(contacts_rows) if contacts_rows else pd.DataFrame(
         columns=["source_domain", "source_url", "email", "email_type", "phone",
                  "person_name", "person_role", "discovered_at_utc"]
@@ -133,29 +186,54 @@ def mine_contacts(enriched_df: pd.DataFrame, crawler_yaml: str) -> Tuple[pd.Data
 
     log.info("Contact mining complete: %d emails found across %d domains",
              len(contacts_df), len(seen_domains))
+    checkpoint.finish()
     return contacts_df, patterns_df
 
 
+def _classify_email(email: str) -> Tuple[bool, bool]:
+    """(is_role_inbox, is_person) for one address; a role inbox is never a person."""
+    local = email.split("@")[0]
+    is_role = local in ROLE_INBOX_PREFIXES or local.rstrip("s") in ROLE_INBOX_PREFIXES
+    return is_role, not is_role and bool(PERSON_EMAIL_RE.match(email))
+
+
+def _person_emails(emails: List[str], domain: str) -> List[str]:
+    """On-domain addresses that look like a person's, i.e. the ones an email pattern can be inferred from."""
+    return [e for e in emails if e.endswith(domain) and _classify_email(e)[1]]
+
+
+def _email_pattern(email: str) -> str:
+    local = email.split("@")[0]
+    # f.last before first.last: "j.smith" fits both shapes
+    if re.match(r"^[a-z]\.[a-z]+$", local):
+        return "f.last"
+    if re.match(r"^[a-z]+\.[a-z]+$", local):
+        return "first.last"
+    if re.match(r"^[a-z]+_[a-z]+$", local):
+        return "first_last"
+    if re.match(r"^[a-z][a-z]{2,}$", local) and len(local) >= 4:
+        return "flast"
+    return ""
+
+
 def _infer_pattern(person_emails: List[str]) -> str:
     if not person_emails:
         return ""
-    patterns = []
-    for e in person_emails:
-        local = e.split("@")[0]
-        if re.match(r"^[a-z]+\.[a-z]+$", local):
-            patterns.append("first.last")
-        elif re.match(r"^[a-z]+_[a-z]+$", local):
-            patterns.append("first_last")
-        elif re.match(r"^[a-z][a-z]{2,}$", local) and len(local) >= 4:
-            patterns.append("flast")
-        elif re.match(r"^[a-z]\.[a-z]+$", local):
-            patterns.append("f.last")
+    patterns = [p for p in (_email_pattern(e) for e in person_emails) if p]
     if not patterns:
         return ""
     # Return most common pattern
     return max(set(patterns), key=patterns.count)
 
 
+def _pattern_support(person_emails: List[str]) -> int:
+    """Distinct person emails that agree with the inferred domain pattern."""
+    pattern = _infer_pattern(person_emails)
+    if not pattern:
+        return 0
+    return len({e for e in person_emails if _email_pattern(e) == pattern})
+
+
 def _extract_name_examples(person_emails: List[str]) -> str:
     """Extract first/last name hints from email locals for candidate generation."""
     names = []
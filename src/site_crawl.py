@@ -0,0 +1,213 @@
+"""
+One crawl per domain for all three site miners.
+
+mine_contacts, discover_people and discover_contact_people each used to crawl
+the same domain with their own path lists, page limits and politeness. The
+site-crawl stage crawls each company domain once: seeds are the union of
+their target paths (plus sitemap pages), links are followed when any miner
+would follow them, and every page is parsed with all three extractors. The
+stage keeps only the list of URLs it visited; the miners then replay those
+pages from the page cache (no network) and the extract memo (no parsing),
+so each still produces its own output while a URL is fetched once. The
+crawl and the replays share the run's ParsePool.
+"""
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from concurrent.futures import Future
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import pandas as pd
+
+from .crawl_frontier import YieldTarget, crawl, load_yield_target
+from .crawl_planner import plan_domain
+from .html_document import PageLink
+from .page_cache import CRAWLER_YAML, FetchPolicy, get_page_cache, load_fetch_policy
+from .parse_pool import (
+    EXTRACT_CONTACT_CANDIDATES,
+    EXTRACT_CONTACTS,
+    EXTRACT_PEOPLE,
+    PageExtract,
+    ParsePool,
+    ParseTask,
+    borrow_pool,
+    load_mining_concurrency,
+    map_domains,
+)
+from .utils import load_yaml, normalize_text
+
+log = logging.getLogger("cranegenius.site_crawl")
+
+ALL_EXTRACTORS = (EXTRACT_CONTACTS, EXTRACT_PEOPLE, EXTRACT_CONTACT_CANDIDATES)
+
+
+@dataclass
+class SiteCrawl:
+    """URLs visited for one domain, in crawl order (requested URL, as the miners saw them)."""
+
+    domain: str
+    urls: List[str] = field(default_factory=list)
+    # company / domain / city / state the pages were extracted with
+    context: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class SiteCrawlSettings:
+    max_pages: int = 20
+    max_depth: int = 2
+    timeout_seconds: float = 8.0
+    include_url_keywords: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_config(cls, cfg: Dict[str, object]) -> "SiteCrawlSettings":
+        raw = cfg.get("site_crawl") or {}
+        return cls(
+            max_pages=int(raw.get("max_pages", cls.max_pages)),
+            max_depth=int(raw.get("max_depth", cls.max_depth)),
+            timeout_seconds=float(cfg.get("request_timeout_seconds", cls.timeout_seconds)),
+            include_url_keywords=tuple(k.lower() for k in cfg.get("include_url_keywords", []) or []),
+        )
+
+
+def _context(company: str, domain: str, city: str, state: str) -> Dict[str, str]:
+    return {"company": company, "domain": domain, "city": city, "state": state}
+
+
+def crawl_site(
+    company: str,
+    domain: str,
+    city: str = "",
+    state: str = "",
+    *,
+    pool: ParsePool,
+    fetch_policy: Optional[FetchPolicy] = None,
+    settings: Optional[SiteCrawlSettings] = None,
+    target: Optional[YieldTarget] = None,
+) -> SiteCrawl:
+    """Crawl one domain best-first with the union of the miners' paths and link rules."""
+    # Imported here: the miners import this module to replay crawled sites.
+    from .contact_page_finder import CONTACT_PATHS
+    from .people_discovery import DISCOVERY_PATHS, PROFILE_PATH_HINT_RE
+    from .site_contact_miner import _pattern_support, _person_emails
+
+    settings = settings or SiteCrawlSettings()
+    target = target or YieldTarget()
+    policy = fetch_policy if fetch_policy is not None else FetchPolicy()
+    domain = normalize_text(domain).lower()
+    plan = plan_domain(domain, fetch_policy=policy)
+    ctx = _context(company, domain, city, state)
+    seeds = plan.seed_urls(list(dict.fromkeys(DISCOVERY_PATHS + CONTACT_PATHS)), limit=settings.max_pages)
+
+    def _fetch_extract(url: str) -> Optional["Future[PageExtract]"]:
+        page = policy.fetch(url, timeout=settings.timeout_seconds)
+        if page is None or not page.ok or not page.body:
+            return None
+        return pool.submit(
+            ParseTask(
+                url=page.final_url or url,
+                html=page.body,
+                extractors=ALL_EXTRACTORS,
+                context=ctx,
+                content_hash=page.content_hash,
+            )
+        )
+
+    def _follow(link: PageLink, page: PageExtract, depth: int) -> bool:
+        if link.noise:
+            return False
+        parsed = urlparse(link.url)
+        if parsed.scheme not in ("http", "https") or domain not in parsed.netloc.lower():
+            return False
+        path = (parsed.path or "").lower()
+        return bool(PROFILE_PATH_HINT_RE.search(path)) or any(k in path for k in settings.include_url_keywords)
+
+    site = SiteCrawl(domain=domain, context=ctx)
+    people: List[Dict[str, object]] = []
+    person_emails: List[str] = []
+    for url, page, _ in crawl(
+        seeds,
+        _fetch_extract,
+        max_pages=settings.max_pages,
+        max_depth=settings.max_depth,
+        follow=_follow,
+        allowed=plan.allowed,
+        in_flight=pool.in_flight,
+    ):
+        site.urls.append(url)
+        people.extend(page.people)
+        # Role inboxes (info@, bids@) say nothing about the naming pattern; count person addresses only.
+        person_emails.extend(_person_emails(page.emails, domain))
+        titled = sum(1 for r in people if r.get("title_confirmed"))
+        if target.met(people_with_titles=titled, person_emails=_pattern_support(person_emails)):
+            break
+    log.info("Site crawl %s: %d pages", domain, len(site.urls))
+    return site
+
+
+def crawl_sites(
+    company_domains_df: pd.DataFrame,
+    crawler_yaml: str = CRAWLER_YAML,
+    pool: Optional[ParsePool] = None,
+    fetch_policy: Optional[FetchPolicy] = None,
+) -> Dict[str, SiteCrawl]:
+    """The site-crawl stage: one SiteCrawl per distinct domain, keyed by domain."""
+    cfg: Dict[str, object] = (load_yaml(crawler_yaml) or {}).get("crawler") or {}
+    settings = SiteCrawlSettings.from_config(cfg)
+    target = load_yield_target(crawler_yaml)
+    concurrency = load_mining_concurrency(crawler_yaml)
+    policy = fetch_policy if fetch_policy is not None else load_fetch_policy(crawler_yaml)
+
+    units: List[Tuple[str, str, str, str]] = []
+    seen: set = set()
+    for _, row in company_domains_df.iterrows():
+        domain = normalize_text(row.get("contractor_domain", "")).lower()
+        if not domain or domain in seen:
+            continue
+        seen.add(domain)
+        units.append((
+            normalize_text(row.get("contractor_name_normalized", "")).lower(),
+            domain,
+            normalize_text(row.get("project_city", "")),
+            normalize_text(row.get("project_state", "")),
+        ))
+
+    with borrow_pool(pool, crawler_yaml) as run_pool:
+        sites = map_domains(
+            lambda unit: crawl_site(*unit, pool=run_pool, fetch_policy=policy, settings=settings, target=target),
+            units,
+            concurrency.fetch_workers,
+        )
+    log.info("Site crawl stage: %d domains, %d pages", len(sites), sum(len(s.urls) for s in sites))
+    return {site.domain: site for site in sites}
+
+
+def replay_site(
+    site: SiteCrawl,
+    pool: ParsePool,
+    context: Optional[Dict[str, str]] = None,
+) -> Iterator[Tuple[str, PageExtract]]:
+    """
+    Yield (requested url, extract) for a crawled site from the page cache; a
+    miner consumes these instead of crawling. With the crawl's own context the
+    extracts come straight from the memo. Pages the cache no longer holds are
+    skipped rather than re-fetched.
+    """
+    cache = get_page_cache()
+    ctx = dict(context if context is not None else site.context, domain=site.domain)
+
+    def _tasks() -> Iterator[Tuple[str, Optional[ParseTask]]]:
+        for url in site.urls:
+            page = cache.get_stale(url)
+            if page is None or not page.ok or not page.body:
+                continue
+            yield url, ParseTask(
+                url=page.final_url or url,
+                html=page.body,
+                extractors=ALL_EXTRACTORS,
+                context=ctx,
+                content_hash=page.content_hash,
+            )
+
+    return pool.imap(_tasks())
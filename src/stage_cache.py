@@ -0,0 +1,322 @@
+"""
+Content-hash stage cache for the lead pipeline entry points.
+
+src/pipeline.py and the CLI used to recompute every stage on every
+invocation, so tweaking the export or the gates re-ran ingest, domain
+resolution and mining. Each stage now declares what it reads (upstream
+artifacts, data files, config files) and which modules implement it; the
+code version covers those modules and every module of the same package they
+import, directly or not, so an edit to a shared helper (utils, the page
+cache) re-runs the stages built on it. Its fingerprint is the sha256 of all
+of that; a finished stage records the
+fingerprint and the digests of the artifacts it wrote in a manifest. On the
+next run a stage whose fingerprint is unchanged and whose artifacts are
+still on disk as written is skipped and its artifacts are read back instead.
+
+Stages that fetch from the outside world (ingest) also carry a maximum age,
+so an unchanged config still picks up fresh data on the next day's run.
+`from_stage` forces that stage to run and reuses the artifacts of every stage
+before it as they are; `until_stage` stops the run after that stage.
+
+Artifacts handed to the background ArtifactWriter are not on disk yet when
+the next stage decides whether to run, so a queued frame is identified by a
+hash of its contents instead (record_artifact). Once the file is written the
+manifest remembers that digest for the file's size and mtime, and later runs
+see the same value without re-reading the frame.
+"""
+from __future__ import annotations
+
+import ast
+import hashlib
+import importlib
+import importlib.util
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from .telemetry import record_cache
+
+log = logging.getLogger("cranegenius.stage_cache")
+
+DATA_DIR = Path("data")
+STAGE_MANIFEST_DIR = Path(os.environ.get("CRANEGENIUS_STAGE_MANIFEST_DIR", DATA_DIR / "stage_manifests"))
+# Set to 0 to run every stage regardless of its fingerprint.
+STAGE_CACHE_ENABLED = os.environ.get("CRANEGENIUS_STAGE_CACHE", "1") != "0"
+# Ingested source data is reused for at most this long.
+INGEST_MAX_AGE_SECONDS = float(os.environ.get("CRANEGENIUS_INGEST_MAX_AGE_HOURS", "20")) * 3600
+HASH_CHUNK_BYTES = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class StageSpec:
+    name: str
+    # Files the stage reads: upstream artifacts and data files
+    inputs: Tuple[str, ...] = ()
+    configs: Tuple[str, ...] = ()
+    # Files the stage writes; ones it skips writing (empty error lists) are fine
+    outputs: Tuple[str, ...] = ()
+    # Modules whose source is part of the stage's code version
+    code: Tuple[str, ...] = ()
+    max_age_seconds: Optional[float] = None
+
+
+def _jsonable(value: Any) -> Any:
+    """numpy scalars in stage meta (selector metrics) -> plain Python."""
+    item = getattr(value, "item", None)
+    return item() if callable(item) else str(value)
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with Path(path).open("rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def frame_digest(df: pd.DataFrame) -> str:
+    """Content hash of a frame, without serializing it to CSV when pandas can hash its values."""
+    digest = hashlib.sha256()
+    digest.update(json.dumps([[str(c) for c in df.columns], [str(t) for t in df.dtypes]]).encode("utf-8"))
+    try:
+        digest.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    except TypeError:
+        # unhashable cells (lists, dicts)
+        digest.update(df.to_csv(index=False).encode("utf-8"))
+    return "frame:" + digest.hexdigest()
+
+
+def module_source_path(module: str) -> Optional[Path]:
+    try:
+        source = getattr(importlib.import_module(module), "__file__", None)
+    except ImportError:
+        return None
+    return Path(source) if source else None
+
+
+def _find_module(name: str) -> bool:
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def imported_modules(module: str, source: Path) -> List[str]:
+    """
+    Modules of `module`'s own top-level package that its source imports,
+    including imports inside functions. `from pkg import name` counts
+    pkg.name when that is a module rather than an attribute.
+    """
+    try:
+        tree = ast.parse(source.read_text(encoding="utf-8"), filename=str(source))
+    except (OSError, SyntaxError, UnicodeDecodeError):
+        return []
+    root = module.split(".")[0]
+    package = module if source.name == "__init__.py" else module.rpartition(".")[0]
+    found: List[str] = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            found.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                parts = package.split(".")
+                if node.level - 1 >= len(parts):
+                    continue
+                base = ".".join(parts[: len(parts) - (node.level - 1)])
+                base = f"{base}.{node.module}" if node.module else base
+            else:
+                base = node.module or ""
+            found.append(base)
+            found.extend(f"{base}.{alias.name}" for alias in node.names if _find_module(f"{base}.{alias.name}"))
+    return sorted({name for name in found if name == root or name.startswith(f"{root}.")})
+
+
+class StageCache:
+    """Per-entry-point manifest of finished stages and the fingerprints they ran with."""
+
+    def __init__(
+        self,
+        name: str,
+        stages: Sequence[StageSpec],
+        *,
+        from_stage: Optional[str] = None,
+        until_stage: Optional[str] = None,
+        enabled: bool = STAGE_CACHE_ENABLED,
+        manifest_dir: Optional[Path] = None,
+    ) -> None:
+        self.stages: Dict[str, StageSpec] = {s.name: s for s in stages}
+        self.order = [s.name for s in stages]
+        for stage in (from_stage, until_stage):
+            if stage is not None and stage not in self.stages:
+                raise ValueError(f"Unknown stage {stage!r}; expected one of {', '.join(self.order)}")
+        self.from_stage = from_stage
+        self.until_stage = until_stage
+        if from_stage and until_stage and self.order.index(from_stage) > self.order.index(until_stage):
+            raise ValueError(f"--from-stage {from_stage} comes after --until-stage {until_stage}")
+        self.enabled = enabled
+        directory = Path(manifest_dir) if manifest_dir is not None else STAGE_MANIFEST_DIR
+        self.path = directory / f"{name}.json"
+        self._manifest = self._load()
+        self._pending: Dict[str, str] = {}
+        # digests of artifacts queued for writing in this run, by path
+        self._staged: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, Any]:
+        if not self.path.exists():
+            return {"stages": {}, "files": {}}
+        try:
+            manifest = json.loads(self.path.read_text(encoding="utf-8"))
+        except ValueError:
+            log.warning("Ignoring unreadable stage manifest %s", self.path)
+            return {"stages": {}, "files": {}}
+        manifest.setdefault("stages", {})
+        manifest.setdefault("files", {})
+        return manifest
+
+    def save(self) -> None:
+        with self._lock:
+            self._save_locked()
+
+    def _save_locked(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(self._manifest, indent=2, sort_keys=True, default=_jsonable), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    def digest(self, path: str) -> str:
+        """
+        Content digest of `path` ("" when missing): the digest recorded when it
+        was queued this run, else its sha256, rehashed only when its size or
+        mtime moved.
+        """
+        with self._lock:
+            if path in self._staged:
+                return self._staged[path]
+        p = Path(path)
+        try:
+            st = p.stat()
+        except OSError:
+            return ""
+        with self._lock:
+            known = self._manifest["files"].get(str(p))
+        if known and known[0] == st.st_size and known[1] == st.st_mtime_ns:
+            return str(known[2])
+        sha = file_sha256(p)
+        with self._lock:
+            self._manifest["files"][str(p)] = [st.st_size, st.st_mtime_ns, sha]
+        return sha
+
+    def record_artifact(self, path: str, digest: str) -> None:
+        """`path` is queued for writing with content `digest` (frame_digest or the bytes' sha256)."""
+        with self._lock:
+            self._staged[path] = digest
+
+    def artifact_written(self, path: str) -> None:
+        """Writer callback: tie the queued digest to the file now on disk."""
+        try:
+            st = Path(path).stat()
+        except OSError:
+            return
+        with self._lock:
+            if path in self._staged:
+                self._manifest["files"][str(Path(path))] = [st.st_size, st.st_mtime_ns, self._staged[path]]
+                self._save_locked()
+
+    def _code_version(self, modules: Iterable[str]) -> Dict[str, str]:
+        """Source digests of `modules` and everything of their package they import."""
+        version: Dict[str, str] = {}
+        pending = list(modules)
+        while pending:
+            module = pending.pop()
+            if module in version:
+                continue
+            source = module_source_path(module)
+            version[module] = self.digest(str(source)) if source is not None else ""
+            if source is not None:
+                pending.extend(imported_modules(module, source))
+        return version
+
+    def fingerprint(self, name: str) -> str:
+        spec = self.stages[name]
+        payload = {
+            "inputs": {p: self.digest(p) for p in spec.inputs},
+            "configs": {p: self.digest(p) for p in spec.configs},
+            "code": self._code_version(spec.code),
+            "outputs": list(spec.outputs),
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def _position(self, name: str) -> int:
+        return self.order.index(name)
+
+    def before_window(self, name: str) -> bool:
+        return self.from_stage is not None and self._position(name) < self._position(self.from_stage)
+
+    def stop_after(self, name: str) -> bool:
+        """True once `name` is the last stage the caller asked for."""
+        return self.until_stage is not None and self._position(name) >= self._position(self.until_stage)
+
+    def _reusable(self, name: str, fingerprint: str) -> Optional[str]:
+        """Why the stored result can't be reused, or None when it can."""
+        entry = self._manifest["stages"].get(name)
+        if not entry:
+            return "no previous run"
+        if entry.get("fingerprint") != fingerprint:
+            return "inputs, config or code changed"
+        for path, sha in (entry.get("outputs") or {}).items():
+            if self.digest(path) != sha:
+                return f"{path} changed since it was written"
+        max_age = self.stages[name].max_age_seconds
+        if max_age is not None and time.time() - float(entry.get("completed_at", 0)) > max_age:
+            return "previous result is too old"
+        return None
+
+    def should_run(self, name: str) -> bool:
+        """
+        Decide whether `name` runs now. A False answer means its artifacts
+        from an earlier run are to be read back instead.
+        """
+        if self.before_window(name):
+            log.info("[stage cache] %s: before --from-stage %s, reusing its artifacts", name, self.from_stage)
+            return False
+        fingerprint = self.fingerprint(name)
+        self._pending[name] = fingerprint
+        if not self.enabled:
+            return True
+        if name == self.from_stage:
+            log.info("[stage cache] %s: forced by --from-stage", name)
+            return True
+        reason = self._reusable(name, fingerprint)
+        record_cache("stage", hits=int(reason is None), misses=int(reason is not None))
+        if reason is None:
+            log.info("[stage cache] %s: unchanged since %s, skipping", name, self._manifest["stages"][name].get("completed_iso", "?"))
+            self.save()
+            return False
+        log.info("[stage cache] %s: running (%s)", name, reason)
+        return True
+
+    def complete(self, name: str, meta: Optional[Mapping[str, Any]] = None) -> None:
+        """Record that `name` finished, with the fingerprint it ran under and what it wrote."""
+        spec = self.stages[name]
+        fingerprint = self._pending.pop(name, None) or self.fingerprint(name)
+        now = time.time()
+        self._manifest["stages"][name] = {
+            "fingerprint": fingerprint,
+            "outputs": {p: self.digest(p) for p in spec.outputs if p in self._staged or Path(p).exists()},
+            "completed_at": now,
+            "completed_iso": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now)),
+            "meta": dict(meta or {}),
+        }
+        self.save()
+
+    def meta(self, name: str) -> Dict[str, Any]:
+        """Values a skipped stage recorded alongside its artifacts last time it ran."""
+        return dict((self._manifest["stages"].get(name) or {}).get("meta") or {})
@@ -0,0 +1,163 @@
+"""
+Micro-batch stage chaining on bounded queues.
+
+The batch pipeline runs each stage over the whole dataset before the next
+one starts, so domain resolution waits for the last source and verification
+waits for the last mined domain. run_stream chains stage functions with one
+bounded queue between each pair: the caller's thread feeds batches in as its
+source yields them and every stage works on whichever batch is in front of
+it, so slow network stages overlap. A full queue blocks the stage before it,
+so no more than a few batches are ever in flight.
+
+A stage function takes one batch and returns what the next stage should
+receive, or None to forward nothing. The first exception stops the stream:
+later stages drain what is queued without processing it and run_stream
+re-raises the error once every thread has exited.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+import pandas as pd
+
+log = logging.getLogger("cranegenius.stream_runner")
+
+STREAM_BATCH_ROWS = int(os.environ.get("CRANEGENIUS_STREAM_BATCH_ROWS", "250"))
+# Batches waiting in front of each stage.
+STREAM_QUEUE_SIZE = int(os.environ.get("CRANEGENIUS_STREAM_QUEUE", "2"))
+
+_END = object()
+
+
+@dataclass
+class StreamStage:
+    name: str
+    fn: Callable[[Any], Any]
+    # Threads working this stage; >1 only for stages whose batches are independent
+    workers: int = 1
+
+
+@dataclass
+class StageStreamStats:
+    batches_in: int = 0
+    batches_out: int = 0
+    busy_seconds: float = 0.0
+    first_output_seconds: Optional[float] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def micro_batches(frames: Iterable[pd.DataFrame], rows: int = STREAM_BATCH_ROWS) -> Iterator[pd.DataFrame]:
+    """Split each incoming frame into slices of at most `rows`; empty frames are dropped."""
+    size = max(1, rows)
+    for frame in frames:
+        for start in range(0, len(frame), size):
+            yield frame.iloc[start:start + size].reset_index(drop=True)
+
+
+class _Stream:
+    def __init__(self, stages: Sequence[StreamStage], queue_size: int) -> None:
+        self.stages = list(stages)
+        self.queues: List["queue.Queue[Any]"] = [queue.Queue(maxsize=max(1, queue_size)) for _ in self.stages]
+        self.stats: Dict[str, StageStreamStats] = {s.name: StageStreamStats() for s in self.stages}
+        self.started = time.monotonic()
+        self._lock = threading.Lock()
+        self._error: Optional[BaseException] = None
+        self._workers_left = [max(1, s.workers) for s in self.stages]
+
+    @property
+    def failed(self) -> bool:
+        return self._error is not None
+
+    def fail(self, exc: BaseException) -> None:
+        with self._lock:
+            if self._error is None:
+                self._error = exc
+
+    def _forward(self, position: int, item: Any) -> None:
+        if position + 1 < len(self.queues):
+            self.queues[position + 1].put(item)
+
+    def work(self, position: int) -> None:
+        stage = self.stages[position]
+        stats = self.stats[stage.name]
+        inbox = self.queues[position]
+        while True:
+            item = inbox.get()
+            if item is _END:
+                # let sibling workers see the end too; the last one passes it on
+                inbox.put(_END)
+                with self._lock:
+                    self._workers_left[position] -= 1
+                    last = self._workers_left[position] == 0
+                if last:
+                    self._forward(position, _END)
+                return
+            if self.failed:
+                continue
+            start = time.monotonic()
+            try:
+                out = stage.fn(item)
+            except BaseException as exc:
+                log.error("Stream stage %s failed: %s", stage.name, exc)
+                self.fail(exc)
+                continue
+            with self._lock:
+                stats.batches_in += 1
+                stats.busy_seconds += time.monotonic() - start
+                if out is not None:
+                    stats.batches_out += 1
+                    if stats.first_output_seconds is None:
+                        stats.first_output_seconds = round(time.monotonic() - self.started, 3)
+            if out is not None:
+                self._forward(position, out)
+
+    def raise_error(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+
+def run_stream(
+    source: Iterable[Any],
+    stages: Sequence[StreamStage],
+    queue_size: int = STREAM_QUEUE_SIZE,
+) -> Dict[str, StageStreamStats]:
+    """Push every item of `source` through `stages` in order; returns per-stage counts and busy time."""
+    if not stages:
+        for _ in source:
+            pass
+        return {}
+    stream = _Stream(stages, queue_size)
+    threads = [
+        threading.Thread(target=stream.work, args=(position,), name=f"stream-{stage.name}-{n}", daemon=True)
+        for position, stage in enumerate(stream.stages)
+        for n in range(max(1, stage.workers))
+    ]
+    for thread in threads:
+        thread.start()
+    try:
+        for item in source:
+            if stream.failed:
+                break
+            stream.queues[0].put(item)
+    except BaseException as exc:
+        stream.fail(exc)
+    finally:
+        stream.queues[0].put(_END)
+        for thread in threads:
+            thread.join()
+
+    for name, stats in stream.stats.items():
+        log.info(
+            "Stream %s | batches in=%d out=%d busy=%.1fs first_output=%ss",
+            name, stats.batches_in, stats.batches_out, stats.busy_seconds, stats.first_output_seconds,
+        )
+    stream.raise_error()
+    return stream.stats
@@ -0,0 +1,389 @@
+"""
+Per-stage performance telemetry for the pipeline entry points.
+
+monitor.py only kept row counts and zero-run streaks, so a slow Monday run
+could not be pinned on a stage, a source or a domain. A RunTelemetry wraps
+one pipeline run and each stage inside it records:
+
+- wall time, rows in and rows out;
+- HTTP requests and time spent waiting per host, and bytes downloaded;
+- cache hits / misses (page, extract, verification, domain-verdict and
+  stage caches);
+- retries by kind;
+- the process's peak RSS when the stage ended.
+
+Network and cache counters are process-wide and bumped from wherever the
+work happens (every requests call goes through an instrumented
+HTTPAdapter.send); a stage's numbers are the counter deltas between its
+start and end, so nested stages such as ingest/<source_id> simply overlap
+their parent. On exit the run is appended to the run_history of
+data/pipeline_state.json and written as a node-exporter textfile
+(data/metrics/cranegenius_<pipeline>.prom) so regressions can be graphed
+over weeks. Outside a run, track_stage() and the record_* helpers are no-ops
+apart from the counters.
+"""
+from __future__ import annotations
+
+import calendar
+import contextlib
+import logging
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+log = logging.getLogger("cranegenius.telemetry")
+
+DATA_DIR = Path("data")
+PROM_TEXTFILE_DIR = Path(os.environ.get("CRANEGENIUS_PROM_TEXTFILE_DIR", DATA_DIR / "metrics"))
+# Hosts kept per stage, by time spent waiting on them; the rest are summed into "other".
+TOP_HOSTS = 20
+METRIC_PREFIX = "cranegenius"
+
+Key = Tuple[str, str]
+
+
+class _Counters:
+    """Process-wide monotonically increasing counters keyed by (metric, label)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._values: Dict[Key, float] = defaultdict(float)
+
+    def add(self, metric: str, label: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[(metric, label)] += amount
+
+    def snapshot(self) -> Dict[Key, float]:
+        with self._lock:
+            return dict(self._values)
+
+
+_COUNTERS = _Counters()
+_ACTIVE: Optional["RunTelemetry"] = None
+_ACTIVE_LOCK = threading.Lock()
+_HTTP_INSTRUMENTED = False
+
+
+def record_http(host: str, seconds: float, nbytes: int = 0) -> None:
+    _COUNTERS.add("http_requests", host)
+    _COUNTERS.add("http_seconds", host, seconds)
+    if nbytes:
+        _COUNTERS.add("bytes_downloaded", "", nbytes)
+
+
+def record_download(nbytes: int) -> None:
+    """Body bytes of a streamed response, read by the caller after the request returned."""
+    if nbytes:
+        _COUNTERS.add("bytes_downloaded", "", nbytes)
+
+
+def record_cache(cache: str, hits: int = 0, misses: int = 0) -> None:
+    if hits:
+        _COUNTERS.add("cache_hits", cache, hits)
+    if misses:
+        _COUNTERS.add("cache_misses", cache, misses)
+
+
+def record_retry(kind: str) -> None:
+    _COUNTERS.add("retries", kind)
+
+
+def peak_rss_bytes() -> int:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return int(peak if sys.platform == "darwin" else peak * 1024)
+
+
+def instrument_http() -> None:
+    """Count every requests call by host; streamed bodies are added via record_download."""
+    global _HTTP_INSTRUMENTED
+    if _HTTP_INSTRUMENTED:
+        return
+    from requests.adapters import HTTPAdapter
+
+    original_send = HTTPAdapter.send
+
+    def send(self: Any, request: Any, stream: bool = False, **kwargs: Any) -> Any:
+        host = (urlsplit(request.url).hostname or "").lower()
+        start = time.monotonic()
+        try:
+            resp = original_send(self, request, stream=stream, **kwargs)
+        except Exception:
+            record_http(host, time.monotonic() - start)
+            raise
+        # requests reads a non-streamed body right after send anyway
+        nbytes = 0 if stream else len(resp.content or b"")
+        record_http(host, time.monotonic() - start, nbytes)
+        return resp
+
+    HTTPAdapter.send = send
+    _HTTP_INSTRUMENTED = True
+
+
+def _by_label(delta: Dict[Key, float], metric: str) -> Dict[str, float]:
+    return {label: value for (m, label), value in delta.items() if m == metric and value}
+
+
+@dataclass
+class StageMetrics:
+    stage: str
+    status: str = "ok"
+    wall_seconds: float = 0.0
+    rows_in: Optional[int] = None
+    rows_out: Optional[int] = None
+    http_requests: Dict[str, float] = field(default_factory=dict)
+    http_seconds: Dict[str, float] = field(default_factory=dict)
+    bytes_downloaded: int = 0
+    cache_hits: Dict[str, float] = field(default_factory=dict)
+    cache_misses: Dict[str, float] = field(default_factory=dict)
+    retries: Dict[str, float] = field(default_factory=dict)
+    peak_rss_bytes: int = 0
+    # stage-specific extras, e.g. the per-step stream stats of pipeline --stream
+    details: Dict[str, Any] = field(default_factory=dict)
+
+    def cache_hit_rates(self) -> Dict[str, float]:
+        rates: Dict[str, float] = {}
+        for cache in set(self.cache_hits) | set(self.cache_misses):
+            hits = self.cache_hits.get(cache, 0)
+            total = hits + self.cache_misses.get(cache, 0)
+            rates[cache] = round(hits / total, 4) if total else 0.0
+        return rates
+
+    def top_hosts(self, limit: int = TOP_HOSTS) -> List[Dict[str, Any]]:
+        hosts = sorted(self.http_requests, key=lambda h: (-self.http_seconds.get(h, 0.0), h))
+        top = [
+            {"host": h, "requests": int(self.http_requests[h]), "seconds": round(self.http_seconds.get(h, 0.0), 3)}
+            for h in hosts[:limit]
+        ]
+        rest = hosts[limit:]
+        if rest:
+            top.append({
+                "host": "other",
+                "requests": int(sum(self.http_requests[h] for h in rest)),
+                "seconds": round(sum(self.http_seconds.get(h, 0.0) for h in rest), 3),
+            })
+        return top
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "stage": self.stage,
+            "status": self.status,
+            "wall_seconds": round(self.wall_seconds, 3),
+            "rows_in": self.rows_in,
+            "rows_out": self.rows_out,
+            "http_requests": int(sum(self.http_requests.values())),
+            "http_hosts": self.top_hosts(),
+            "bytes_downloaded": int(self.bytes_downloaded),
+            "cache_hits": {k: int(v) for k, v in self.cache_hits.items()},
+            "cache_misses": {k: int(v) for k, v in self.cache_misses.items()},
+            "cache_hit_rates": self.cache_hit_rates(),
+            "retries": {k: int(v) for k, v in self.retries.items()},
+            "peak_rss_bytes": self.peak_rss_bytes,
+            **({"details": self.details} if self.details else {}),
+        }
+
+
+class StageRecorder:
+    """Handle for the stage in progress: set rows_in / rows_out, or mark it cached."""
+
+    def __init__(self, metrics: StageMetrics) -> None:
+        self.metrics = metrics
+
+    @property
+    def rows_in(self) -> Optional[int]:
+        return self.metrics.rows_in
+
+    @rows_in.setter
+    def rows_in(self, value: Optional[int]) -> None:
+        self.metrics.rows_in = None if value is None else int(value)
+
+    @property
+    def rows_out(self) -> Optional[int]:
+        return self.metrics.rows_out
+
+    @rows_out.setter
+    def rows_out(self, value: Optional[int]) -> None:
+        self.metrics.rows_out = None if value is None else int(value)
+
+    @property
+    def details(self) -> Dict[str, Any]:
+        return self.metrics.details
+
+    def cached(self) -> None:
+        """The stage was skipped and its artifacts reused."""
+        self.metrics.status = "cached"
+
+
+class RunTelemetry:
+    """Telemetry for one run of `pipeline`; use as a context manager around the run."""
+
+    def __init__(self, pipeline: str, textfile_dir: Optional[Path] = None) -> None:
+        self.pipeline = pipeline
+        self.textfile_dir = Path(textfile_dir) if textfile_dir is not None else PROM_TEXTFILE_DIR
+        self.stages: List[StageMetrics] = []
+        self.extra: Dict[str, Any] = {}
+        self.status = "ok"
+        self.started_at = time.time()
+        self._start = time.monotonic()
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "RunTelemetry":
+        global _ACTIVE
+        instrument_http()
+        with _ACTIVE_LOCK:
+            _ACTIVE = self
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        global _ACTIVE
+        with _ACTIVE_LOCK:
+            if _ACTIVE is self:
+                _ACTIVE = None
+        if exc_type is SystemExit:
+            self.status = "exited" if not getattr(exc, "code", None) else "failed"
+        elif exc_type is not None:
+            self.status = "failed"
+        try:
+            self.persist()
+        except Exception as persist_exc:  # telemetry must never fail the run
+            log.warning("Could not write run telemetry: %s", persist_exc)
+
+    @contextlib.contextmanager
+    def stage(self, name: str, rows_in: Optional[int] = None) -> Iterator[StageRecorder]:
+        metrics = StageMetrics(stage=name, rows_in=None if rows_in is None else int(rows_in))
+        before = _COUNTERS.snapshot()
+        start = time.monotonic()
+        try:
+            yield StageRecorder(metrics)
+        except BaseException as exc:
+            if not isinstance(exc, SystemExit) or getattr(exc, "code", None):
+                metrics.status = "failed"
+            raise
+        finally:
+            metrics.wall_seconds = time.monotonic() - start
+            after = _COUNTERS.snapshot()
+            delta = {k: v - before.get(k, 0.0) for k, v in after.items()}
+            metrics.http_requests = _by_label(delta, "http_requests")
+            metrics.http_seconds = _by_label(delta, "http_seconds")
+            metrics.bytes_downloaded = int(delta.get(("bytes_downloaded", ""), 0))
+            metrics.cache_hits = _by_label(delta, "cache_hits")
+            metrics.cache_misses = _by_label(delta, "cache_misses")
+            metrics.retries = _by_label(delta, "retries")
+            metrics.peak_rss_bytes = peak_rss_bytes()
+            with self._lock:
+                self.stages.append(metrics)
+            log.info(
+                "[telemetry] %s %s | %.1fs rows %s→%s http=%d bytes=%d peak_rss=%.0fMB",
+                self.pipeline, name, metrics.wall_seconds, metrics.rows_in, metrics.rows_out,
+                int(sum(metrics.http_requests.values())), metrics.bytes_downloaded, metrics.peak_rss_bytes / 2**20,
+            )
+
+    def record(self) -> Dict[str, Any]:
+        return {
+            "pipeline": self.pipeline,
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(self.started_at)),
+            "status": self.status,
+            "wall_seconds": round(time.monotonic() - self._start, 3),
+            "peak_rss_bytes": peak_rss_bytes(),
+            "stages": [s.as_dict() for s in self.stages],
+            **self.extra,
+        }
+
+    def persist(self) -> None:
+        # Imported here: monitor pulls in pandas, which the counters above do not need.
+        from .monitor import append_run_history, load_state, save_state
+
+        record = self.record()
+        save_state(append_run_history(load_state(), record))
+        path = write_textfile(record, self.textfile_dir)
+        log.info("[telemetry] %s run %s in %.1fs → %s", self.pipeline, self.status, record["wall_seconds"], path)
+
+
+@contextlib.contextmanager
+def track_stage(name: str, rows_in: Optional[int] = None) -> Iterator[StageRecorder]:
+    """A stage of the active run, or a throwaway recorder when no run is active."""
+    run = _ACTIVE
+    if run is None:
+        yield StageRecorder(StageMetrics(stage=name))
+        return
+    with run.stage(name, rows_in=rows_in) as recorder:
+        yield recorder
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(**labels: Any) -> str:
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def render_textfile(record: Dict[str, Any]) -> str:
+    """The run as Prometheus text exposition format (node-exporter textfile collector)."""
+    pipeline = record["pipeline"]
+    metrics: Dict[str, Tuple[str, str, List[str]]] = {}
+
+    def add(name: str, kind: str, help_text: str, labels: Dict[str, Any], value: Any) -> None:
+        full = f"{METRIC_PREFIX}_{name}"
+        entry = metrics.setdefault(full, (kind, help_text, []))
+        entry[2].append(f"{full}{_labels(pipeline=pipeline, **labels)} {float(value or 0):g}")
+
+    add("run_duration_seconds", "gauge", "Wall time of the last run.", {}, record["wall_seconds"])
+    add("run_success", "gauge", "1 when the last run finished without failing.", {}, int(record["status"] != "failed"))
+    add("run_timestamp_seconds", "gauge", "Unix time the last run started.", {},
+        calendar.timegm(time.strptime(record["started_at"], "%Y-%m-%dT%H:%M:%SZ")))
+    add("run_peak_rss_bytes", "gauge", "Peak resident set size of the last run.", {}, record["peak_rss_bytes"])
+    for s in record["stages"]:
+        st = {"stage": s["stage"]}
+        add("stage_duration_seconds", "gauge", "Wall time of the stage.", st, s["wall_seconds"])
+        add("stage_cached", "gauge", "1 when the stage reused its previous artifacts.", st, int(s["status"] == "cached"))
+        if s["rows_in"] is not None:
+            add("stage_rows_in", "gauge", "Rows the stage received.", st, s["rows_in"])
+        if s["rows_out"] is not None:
+            add("stage_rows_out", "gauge", "Rows the stage produced.", st, s["rows_out"])
+        add("stage_http_requests", "gauge", "HTTP requests made during the stage.", st, s["http_requests"])
+        add("stage_bytes_downloaded", "gauge", "Response body bytes downloaded during the stage.", st, s["bytes_downloaded"])
+        add("stage_peak_rss_bytes", "gauge", "Process peak RSS when the stage ended.", st, s["peak_rss_bytes"])
+        for host in s["http_hosts"]:
+            labels = {**st, "host": host["host"]}
+            add("stage_host_requests", "gauge", "HTTP requests per host (top hosts by wait time).", labels, host["requests"])
+            add("stage_host_seconds", "gauge", "Seconds waiting on each host (top hosts by wait time).", labels, host["seconds"])
+        for cache in sorted(set(s["cache_hits"]) | set(s["cache_misses"])):
+            labels = {**st, "cache": cache}
+            add("stage_cache_hits", "gauge", "Cache hits during the stage.", labels, s["cache_hits"].get(cache, 0))
+            add("stage_cache_misses", "gauge", "Cache misses during the stage.", labels, s["cache_misses"].get(cache, 0))
+            add("stage_cache_hit_ratio", "gauge", "Cache hit ratio during the stage.", labels, s["cache_hit_rates"].get(cache, 0))
+        for kind, n in sorted(s["retries"].items()):
+            add("stage_retries", "gauge", "Retries during the stage.", {**st, "kind": kind}, n)
+        for step, stream in s.get("details", {}).get("stream", {}).items():
+            labels = {**st, "step": step}
+            add("stream_step_busy_seconds", "gauge", "Seconds a streamed step spent processing batches.", labels, stream["busy_seconds"])
+            add("stream_step_batches", "gauge", "Batches a streamed step processed.", labels, stream["batches_in"])
+
+    lines: List[str] = []
+    for name, (kind, help_text, samples) in metrics.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        lines.extend(samples)
+    return "\n".join(lines) + "\n"
+
+
+def write_textfile(record: Dict[str, Any], directory: Path = PROM_TEXTFILE_DIR) -> Path:
+    """Atomically replace <directory>/cranegenius_<pipeline>.prom so the collector never reads half a file."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{METRIC_PREFIX}_{record['pipeline']}.prom"
+    tmp = path.with_suffix(".prom.tmp")
+    tmp.write_text(render_textfile(record), encoding="utf-8")
+    os.replace(tmp, path)
+    return path
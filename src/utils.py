@@ -47,7 +47,11 @@ def read_csv(path: str) -> pd.DataFrame:
     if not os.path.exists(path):
         log.warning("File not found: %s — returning empty DataFrame", path)
         return pd.DataFrame()
-    return pd.read_csv(path)
+    try:
+        return pd.read_csv(path)
+    except pd.errors.EmptyDataError:
+        # save_csv of a frame without columns writes an empty file
+        return pd.DataFrame()
 
 
 def normalize_text(s: Optional[Any]) -> str:
@@ -56,6 +60,38 @@ def normalize_text(s: Optional[Any]) -> str:
     return WHITESPACE_RE.sub(" ", str(s)).strip()
 
 
+def first_unclaimed_mask(df: pd.DataFrame, group_col: str, value_col: str, limit: int) -> pd.Series:
+    """
+    Mask over `df` (ordered as it would be walked row by row) of the rows a
+    loop keeping a global seen-set would emit: per group, the first `limit`
+    values no earlier row emitted. A value lost to an earlier row does not
+    use up one of the group's slots. Only groups sharing a value with
+    another group need the in-order pass; the rest are capped with a
+    grouped cumulative count.
+    """
+    repeated = df[value_col].duplicated(keep=False)
+    own_repeat = df[repeated].duplicated(subset=[group_col, value_col])
+    candidates = df.drop(index=own_repeat.index[own_repeat.to_numpy()])
+    shared = repeated[candidates.index] & candidates[value_col].duplicated(keep=False)
+    contested = candidates[group_col].isin(candidates.loc[shared, group_col])
+    take = pd.Series(False, index=df.index)
+    free = candidates[~contested]
+    take[free.index[free.groupby(group_col, sort=False).cumcount().to_numpy() < limit]] = True
+    if contested.any():
+        seen: set = set()
+        emitted: Dict[Any, int] = {}
+        taken: List[Any] = []
+        rows = candidates[contested]
+        for idx, group, value in zip(rows.index, rows[group_col], rows[value_col]):
+            if emitted.get(group, 0) >= limit or value in seen:
+                continue
+            seen.add(value)
+            emitted[group] = emitted.get(group, 0) + 1
+            taken.append(idx)
+        take[taken] = True
+    return take
+
+
 def domain_from_url(url: str) -> str:
     ext = tldextract.extract(url)
     if not ext.domain or not ext.suffix:
@@ -0,0 +1,311 @@
+"""
+Local email verification store shared by every verifier.
+
+src/verify_millionverifier.py, contact_intelligence's
+verify_emails_millionverifier.py and enrich_outbound_quality.py used to ask
+the provider (or a private JSON file) separately, so the same address was
+paid for again a few days later. Results now live in one SQLite table keyed
+by the lowercase email. A stored result is reused until its status TTL runs
+out: definitive answers (valid / invalid) are kept for months, catch-all for
+a month, and unknown / error results only long enough to ride out a
+provider hiccup.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+import pandas as pd
+
+from .telemetry import record_cache
+from .utils import normalize_text
+
+log = logging.getLogger("cranegenius.verification_cache")
+
+DAY_SECONDS = 24 * 3600
+DATA_DIR = Path("data")
+VERIFICATION_CACHE_PATH = Path(
+    os.environ.get("CRANEGENIUS_VERIFICATION_CACHE", DATA_DIR / "verification_cache.sqlite3")
+)
+# How long a stored result is trusted, by email_verification_status.
+STATUS_TTL_SECONDS: Dict[str, float] = {
+    "valid": 90 * DAY_SECONDS,
+    "invalid": 180 * DAY_SECONDS,
+    "catchall": 30 * DAY_SECONDS,
+    "unknown": 1 * DAY_SECONDS,
+    "error": 3600,
+}
+# Any other provider status (risky, disposable, ...).
+DEFAULT_TTL_SECONDS = 7 * DAY_SECONDS
+# Per-domain catch-all verdicts from catchall_probe; mail setups change rarely.
+DOMAIN_VERDICT_TTL_SECONDS = 30 * DAY_SECONDS
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS verifications (
+    email TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    is_catchall INTEGER NOT NULL DEFAULT 0,
+    quality_score TEXT,
+    provider TEXT NOT NULL DEFAULT '',
+    raw_result TEXT NOT NULL DEFAULT '',
+    verified_at REAL NOT NULL
+)
+"""
+
+_DOMAINS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS domain_verdicts (
+    domain TEXT PRIMARY KEY,
+    is_catchall INTEGER NOT NULL,
+    checked_at REAL NOT NULL
+)
+"""
+
+
+_PATTERNS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pattern_evidence (
+    email TEXT PRIMARY KEY,
+    domain TEXT NOT NULL,
+    pattern TEXT NOT NULL,
+    hit INTEGER NOT NULL,
+    recorded_at REAL NOT NULL
+)
+"""
+
+
+def cache_key(email: Any) -> str:
+    return normalize_text(email).lower()
+
+
+@dataclass
+class VerificationRecord:
+    email: str
+    # Normalized status: valid / catchall / invalid / unknown / error / provider value
+    status: str
+    is_catchall: bool = False
+    quality_score: Optional[str] = None
+    provider: str = ""
+    raw_result: str = ""
+    verified_at: float = 0.0
+
+    def ttl_seconds(self, ttls: Mapping[str, float]) -> float:
+        return float(ttls.get(self.status, DEFAULT_TTL_SECONDS))
+
+    def fresh(self, ttls: Mapping[str, float], now: Optional[float] = None) -> bool:
+        now = time.time() if now is None else now
+        return now - self.verified_at <= self.ttl_seconds(ttls)
+
+
+class VerificationCache:
+    """SQLite-backed verification results; safe to share between threads."""
+
+    def __init__(self, path: Path = VERIFICATION_CACHE_PATH, ttls: Optional[Mapping[str, float]] = None) -> None:
+        self.path = Path(path)
+        self.ttls: Dict[str, float] = dict(STATUS_TTL_SECONDS if ttls is None else ttls)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+            conn.execute(_SCHEMA)
+            conn.execute(_DOMAINS_SCHEMA)
+            conn.execute(_PATTERNS_SCHEMA)
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get(self, email: str) -> Optional[VerificationRecord]:
+        """The stored result for `email` while its status TTL has not run out."""
+        return self.get_many([email]).get(cache_key(email))
+
+    def get_many(self, emails: Iterable[str], include_stale: bool = False) -> Dict[str, VerificationRecord]:
+        """Fresh (or, with include_stale, any) results keyed by lowercase email; misses are absent."""
+        keys = list(dict.fromkeys(k for k in (cache_key(e) for e in emails) if k))
+        found: Dict[str, VerificationRecord] = {}
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            # stay under SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                rows = conn.execute(
+                    "SELECT email, status, is_catchall, quality_score, provider, raw_result, verified_at "
+                    f"FROM verifications WHERE email IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+                for email, status, is_catchall, quality, provider, raw_result, verified_at in rows:
+                    record = VerificationRecord(
+                        email=email,
+                        status=status,
+                        is_catchall=bool(is_catchall),
+                        quality_score=quality,
+                        provider=provider,
+                        raw_result=raw_result,
+                        verified_at=float(verified_at),
+                    )
+                    if include_stale or record.fresh(self.ttls, now):
+                        found[email] = record
+        if not include_stale:
+            record_cache("verification", hits=len(found), misses=len(keys) - len(found))
+        return found
+
+    def put(self, record: VerificationRecord) -> None:
+        self.put_many([record])
+
+    def put_many(self, records: Iterable[VerificationRecord]) -> None:
+        now = time.time()
+        payload: List[tuple] = [
+            (
+                cache_key(r.email),
+                normalize_text(r.status).lower() or "unknown",
+                int(bool(r.is_catchall)),
+                None if r.quality_score is None else normalize_text(r.quality_score),
+                r.provider,
+                r.raw_result,
+                float(r.verified_at or now),
+            )
+            for r in records
+            if cache_key(r.email)
+        ]
+        if not payload:
+            return
+        with self._lock:
+            conn = self._connect()
+            conn.executemany(
+                "INSERT OR REPLACE INTO verifications "
+                "(email, status, is_catchall, quality_score, provider, raw_result, verified_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                payload,
+            )
+            conn.commit()
+
+    def get_domain_verdicts(self, domains: Iterable[str]) -> Dict[str, bool]:
+        """Catch-all verdicts younger than DOMAIN_VERDICT_TTL_SECONDS, keyed by lowercase domain."""
+        keys = list(dict.fromkeys(k for k in (cache_key(d) for d in domains) if k))
+        cutoff = time.time() - DOMAIN_VERDICT_TTL_SECONDS
+        found: Dict[str, bool] = {}
+        with self._lock:
+            conn = self._connect()
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                rows = conn.execute(
+                    "SELECT domain, is_catchall FROM domain_verdicts "
+                    f"WHERE checked_at >= ? AND domain IN ({','.join('?' * len(chunk))})",
+                    [cutoff, *chunk],
+                ).fetchall()
+                found.update((domain, bool(is_catchall)) for domain, is_catchall in rows)
+        record_cache("domain_verdict", hits=len(found), misses=len(keys) - len(found))
+        return found
+
+    def put_domain_verdicts(self, verdicts: Mapping[str, bool]) -> None:
+        now = time.time()
+        payload = [(cache_key(d), int(bool(v)), now) for d, v in verdicts.items() if cache_key(d)]
+        if not payload:
+            return
+        with self._lock:
+            conn = self._connect()
+            conn.executemany(
+                "INSERT OR REPLACE INTO domain_verdicts (domain, is_catchall, checked_at) VALUES (?, ?, ?)", payload
+            )
+            conn.commit()
+
+    def put_pattern_evidence(self, outcomes: Iterable[Tuple[str, str, str, bool]]) -> None:
+        """
+        (email, domain, pattern, hit) for generated candidates with a
+        definitive verification answer; one row per address, latest wins.
+        """
+        now = time.time()
+        payload = [
+            (cache_key(email), cache_key(domain), normalize_text(pattern), int(bool(hit)), now)
+            for email, domain, pattern, hit in outcomes
+            if cache_key(email) and cache_key(domain) and normalize_text(pattern)
+        ]
+        if not payload:
+            return
+        with self._lock:
+            conn = self._connect()
+            conn.executemany(
+                "INSERT OR REPLACE INTO pattern_evidence (email, domain, pattern, hit, recorded_at) VALUES (?, ?, ?, ?, ?)",
+                payload,
+            )
+            conn.commit()
+
+    def pattern_evidence(self) -> pd.DataFrame:
+        """Hit and miss counts per (domain, pattern) over every stored address."""
+        with self._lock:
+            conn = self._connect()
+            rows = conn.execute(
+                "SELECT domain, pattern, SUM(hit), SUM(1 - hit) FROM pattern_evidence GROUP BY domain, pattern"
+            ).fetchall()
+        return pd.DataFrame(rows, columns=["domain", "pattern", "hits", "misses"])
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_DEFAULT_CACHE: Optional[VerificationCache] = None
+_DEFAULT_CACHE_LOCK = threading.Lock()
+
+
+def get_verification_cache() -> VerificationCache:
+    """Process-wide verification store used when callers do not pass their own."""
+    global _DEFAULT_CACHE
+    with _DEFAULT_CACHE_LOCK:
+        if _DEFAULT_CACHE is None:
+            _DEFAULT_CACHE = VerificationCache()
+        return _DEFAULT_CACHE
+
+
+def import_legacy_json(cache: VerificationCache, path: Path) -> int:
+    """
+    Seed the store from the old runs/mv_verification_cache.json
+    ({email: {"result": ..., "error": ...}}), dated by the file's mtime.
+    Addresses the store already holds a result for are left alone.
+    """
+    # Imported here: verify_millionverifier itself reads and writes this store.
+    from .verify_millionverifier import classify_result
+
+    path = Path(path)
+    if not path.exists():
+        return 0
+    try:
+        legacy = json.loads(path.read_text(encoding="utf-8"))
+    except ValueError:
+        log.warning("Ignoring unreadable legacy verification cache %s", path)
+        return 0
+    if not isinstance(legacy, dict):
+        return 0
+    known = cache.get_many(legacy.keys(), include_stale=True)
+    verified_at = path.stat().st_mtime
+    records: List[VerificationRecord] = []
+    for email, entry in legacy.items():
+        if cache_key(email) in known or not isinstance(entry, dict):
+            continue
+        raw_result = normalize_text(entry.get("result")).lower()
+        status, is_catchall = ("error", False) if entry.get("error") else classify_result(raw_result)
+        records.append(
+            VerificationRecord(
+                email=email,
+                status=status,
+                is_catchall=is_catchall,
+                quality_score=(entry.get("raw") or {}).get("quality"),
+                provider="millionverifier",
+                raw_result=raw_result,
+                verified_at=verified_at,
+            )
+        )
+    cache.put_many(records)
+    if records:
+        log.info("Imported %d verification results from %s", len(records), path)
+    return len(records)
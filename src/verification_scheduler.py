@@ -0,0 +1,203 @@
+"""
+Expected-value ordering of email verification.
+
+generate_email_candidates_for_people emits several pattern variants per
+person and every one of them used to be sent to the verifier. The scheduler
+verifies in waves instead: each wave holds the single most probable
+remaining candidate of every person still unresolved, most probable first.
+Probability is the pattern's prior (pattern_confidence) updated with what
+earlier waves learned about the same domain. Between waves:
+
+- a person whose candidate verified valid (or catch-all, where every variant
+  would verify the same) gets no further candidates;
+- a domain with CONFIRMED_PATTERN_HITS valid hits on one pattern has every
+  other pattern pruned for all of its people.
+"""
+from __future__ import annotations
+
+import logging
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+log = logging.getLogger("cranegenius.verification_scheduler")
+
+# Pseudo-observations behind a pattern's prior; small so a domain's own results dominate quickly.
+PRIOR_STRENGTH = 2.0
+DEFAULT_PRIOR = 0.5
+CONFIRMED_PATTERN_HITS = 2
+HIT_STATUSES = {"valid"}
+PERSON_DONE_STATUSES = {"valid", "catchall"}
+MISS_STATUSES = {"invalid"}
+
+RESULT_COLUMNS = [
+    "email",
+    "email_verification_status",
+    "email_is_catchall",
+    "email_quality_score",
+    "email_verification_provider",
+]
+
+Verifier = Callable[[pd.DataFrame], pd.DataFrame]
+
+
+@dataclass
+class ScheduleStats:
+    candidates: int = 0
+    verified: int = 0
+    waves: int = 0
+    skipped_person_resolved: int = 0
+    pruned_domain_pattern: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+
+class DomainPatternModel:
+    """Per-domain pattern evidence from this run's results, smoothed toward the generator's prior."""
+
+    def __init__(self, prior_strength: float = PRIOR_STRENGTH) -> None:
+        self.prior_strength = prior_strength
+        self._hits: Dict[Tuple[str, str], int] = defaultdict(int)
+        self._misses: Dict[Tuple[str, str], int] = defaultdict(int)
+        self._domain_hits: Dict[str, int] = defaultdict(int)
+
+    def probability(self, domain: str, pattern: str, prior: float) -> float:
+        hits = self._hits[(domain, pattern)]
+        # a hit on another pattern is evidence against this one
+        others = self._domain_hits[domain] - hits
+        k = self.prior_strength
+        return (prior * k + hits) / (k + hits + others + self._misses[(domain, pattern)])
+
+    def observe(self, domain: str, pattern: str, status: str) -> None:
+        if status in HIT_STATUSES:
+            self._hits[(domain, pattern)] += 1
+            self._domain_hits[domain] += 1
+        elif status in MISS_STATUSES:
+            self._misses[(domain, pattern)] += 1
+
+    def confirmed_pattern(self, domain: str, min_hits: int = CONFIRMED_PATTERN_HITS) -> Optional[str]:
+        best = max(
+            ((pattern, n) for (d, pattern), n in self._hits.items() if d == domain),
+            key=lambda item: item[1],
+            default=None,
+        )
+        return best[0] if best is not None and best[1] >= min_hits else None
+
+
+def _column(df: pd.DataFrame, name: str, default: object = "") -> pd.Series:
+    if name in df.columns:
+        return df[name]
+    return pd.Series([default] * len(df), index=df.index)
+
+
+def schedule_verification(
+    candidates_df: pd.DataFrame,
+    verify: Verifier,
+    *,
+    max_wave_size: int = 0,
+    confirmed_pattern_hits: int = CONFIRMED_PATTERN_HITS,
+) -> Tuple[pd.DataFrame, ScheduleStats]:
+    """
+    Verify `candidates_df` (email_candidate, contractor_domain, first_name,
+    last_name, email_pattern, pattern_confidence) through `verify` in
+    expected-value waves. Returns the concatenated verifier rows, one per
+    email actually sent, plus counts of what was skipped.
+    """
+    stats = ScheduleStats(candidates=int(len(candidates_df)))
+    if candidates_df.empty:
+        return pd.DataFrame(columns=RESULT_COLUMNS), stats
+
+    emails = _column(candidates_df, "email_candidate" if "email_candidate" in candidates_df.columns else "email")
+    work = pd.DataFrame({
+        "email": emails.fillna("").astype(str).str.strip().str.lower(),
+        "domain": _column(candidates_df, "contractor_domain").fillna("").astype(str).str.strip().str.lower(),
+        "first": _column(candidates_df, "first_name").fillna("").astype(str).str.strip().str.lower(),
+        "last": _column(candidates_df, "last_name").fillna("").astype(str).str.strip().str.lower(),
+        "pattern": _column(candidates_df, "email_pattern").fillna("").astype(str).str.strip(),
+        "prior": pd.to_numeric(_column(candidates_df, "pattern_confidence", DEFAULT_PRIOR), errors="coerce").fillna(DEFAULT_PRIOR),
+    })
+    work["position"] = range(len(work))
+    work = work[work["email"] != ""].drop_duplicates(subset=["email"])
+    # candidates without a name each stand alone, so nothing is skipped on their behalf
+    unnamed = (work["first"] == "") | (work["last"] == "")
+    work["person"] = work["domain"] + "|" + work["first"] + "|" + work["last"]
+    work.loc[unnamed, "person"] = "email|" + work.loc[unnamed, "email"]
+    work.loc[work["pattern"] == "", "pattern"] = "email:" + work["email"]
+
+    pending: Dict[str, List[Dict[str, object]]] = defaultdict(list)
+    for record in work.to_dict("records"):
+        pending[str(record["person"])].append(record)
+    source_rows = candidates_df.assign(_email=emails.fillna("").astype(str).str.strip().str.lower())
+    source_rows = source_rows.drop_duplicates(subset=["_email"]).set_index("_email")
+
+    model = DomainPatternModel()
+    results: List[pd.DataFrame] = []
+    while pending:
+        confirmed: Dict[str, Optional[str]] = {}
+        wave: List[Tuple[float, int, Dict[str, object]]] = []
+        for person in list(pending):
+            options = pending[person]
+            domain = str(options[0]["domain"])
+            if domain not in confirmed:
+                confirmed[domain] = model.confirmed_pattern(domain, confirmed_pattern_hits)
+            if confirmed[domain] is not None:
+                kept = [c for c in options if c["pattern"] == confirmed[domain]]
+                stats.pruned_domain_pattern += len(options) - len(kept)
+                options = pending[person] = kept
+            if not options:
+                del pending[person]
+                continue
+            best = max(
+                options,
+                key=lambda c: (model.probability(domain, str(c["pattern"]), float(c["prior"])), -int(c["position"])),
+            )
+            options.remove(best)
+            if not options:
+                del pending[person]
+            p = model.probability(domain, str(best["pattern"]), float(best["prior"]))
+            wave.append((p, int(best["position"]), best))
+        if not wave:
+            break
+
+        wave.sort(key=lambda item: (-item[0], item[1]))
+        if max_wave_size and len(wave) > max_wave_size:
+            # the overflow goes back to its people for the next wave
+            for _, _, candidate in wave[max_wave_size:]:
+                pending[str(candidate["person"])].append(candidate)
+            wave = wave[:max_wave_size]
+
+        wave_emails = [str(c["email"]) for _, _, c in wave]
+        verified = verify(source_rows.loc[wave_emails].reset_index(drop=True))
+        stats.waves += 1
+        stats.verified += len(wave_emails)
+        if verified is None or verified.empty:
+            continue
+        verified = verified[verified["email"].fillna("").astype(str).str.lower().isin(set(wave_emails))]
+        results.append(verified)
+        status_by_email = dict(
+            zip(
+                verified["email"].fillna("").astype(str).str.lower(),
+                verified["email_verification_status"].fillna("").astype(str).str.lower(),
+            )
+        )
+        for _, _, candidate in wave:
+            status = status_by_email.get(str(candidate["email"]), "")
+            model.observe(str(candidate["domain"]), str(candidate["pattern"]), status)
+            person = str(candidate["person"])
+            if status in PERSON_DONE_STATUSES and person in pending:
+                stats.skipped_person_resolved += len(pending.pop(person))
+
+    log.info(
+        "Verification schedule | candidates=%d verified=%d waves=%d skipped_person_resolved=%d pruned_domain_pattern=%d",
+        stats.candidates,
+        stats.verified,
+        stats.waves,
+        stats.skipped_person_resolved,
+        stats.pruned_domain_pattern,
+    )
+    if not results:
+        return pd.DataFrame(columns=RESULT_COLUMNS), stats
+    return pd.concat(results, ignore_index=True).drop_duplicates(subset=["email"]), stats
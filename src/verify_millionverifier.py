@@ -1,36 +1,308 @@
 from __future__ import annotations
 
+import io
 import logging
 import os
-from typing import Any, Dict, List
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, List, Optional, Tuple
 
 import pandas as pd
 import requests
-from tenacity import retry, stop_after_attempt, wait_exponential
+from tenacity import RetryCallState, retry, stop_after_attempt, wait_exponential
 
+from .telemetry import record_retry
 from .utils import normalize_text
+from .verification_cache import VerificationCache, VerificationRecord, get_verification_cache
 
 log = logging.getLogger("cranegenius.verify")
 
-MV_API_URL = "https://api.millionverifier.com/api/v3/"
+MV_API_URL = os.environ.get("MILLIONVERIFIER_API_URL", "https://api.millionverifier.com/api/v3/")
+# Bulk file API: upload a CSV of addresses, poll fileinfo, download the report.
+MV_BULK_URL = os.environ.get("MILLIONVERIFIER_BULK_URL", "https://bulkapi.millionverifier.com/bulkapi/v2/")
+# Batches smaller than this are verified one request per address.
+BULK_MIN_EMAILS = int(os.environ.get("MILLIONVERIFIER_BULK_MIN_EMAILS", "200"))
+BULK_POLL_SECONDS = 10.0
+BULK_TIMEOUT_SECONDS = 2 * 60 * 60
+# Per-email mode: provider request rate across all threads, and requests in flight at once.
+MV_REQUESTS_PER_SECOND = float(os.environ.get("MILLIONVERIFIER_RPS", "10"))
+MV_MAX_IN_FLIGHT = int(os.environ.get("MILLIONVERIFIER_MAX_IN_FLIGHT", "8"))
+# Longest Retry-After honoured on a 429 before retrying.
+MAX_RETRY_AFTER_SECONDS = 60.0
 
 # MillionVerifier result values that mean "safe to send"
 VALID_STATUSES = {"ok", "valid", "verified", "deliverable", "good"}
 CATCHALL_STATUSES = {"catchall", "catch_all", "accept_all"}
+INVALID_STATUSES = {"invalid", "bad", "undeliverable"}
+# fileinfo `status` values once a bulk file will make no further progress
+BULK_DONE_STATUSES = {"finished"}
+BULK_FAILED_STATUSES = {"error", "canceled", "cancelled"}
 
 
-@retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=8))
-def _verify_one(api_key: str, email: str) -> Dict[str, Any]:
+class RateLimiter:
+    """Spaces calls at least 1/rps apart across threads; pause() holds everyone back."""
+
+    def __init__(self, requests_per_second: float) -> None:
+        self.interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self) -> None:
+        with self._lock:
+            slot = max(time.monotonic(), self._next)
+            self._next = slot + self.interval
+        delay = slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            self._next = max(self._next, time.monotonic() + seconds)
+
+
+def _retry_after_seconds(resp: Optional[requests.Response]) -> Optional[float]:
+    """Retry-After of a 429 (delta-seconds or HTTP date), capped; None when absent."""
+    if resp is None or resp.status_code != 429:
+        return None
+    raw = normalize_text(resp.headers.get("Retry-After"))
+    if not raw:
+        return None
+    try:
+        seconds = float(raw)
+    except ValueError:
+        try:
+            seconds = parsedate_to_datetime(raw).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER_SECONDS)
+
+
+_backoff = wait_exponential(multiplier=1, min=2, max=8)
+
+
+def _wait_for_retry(retry_state: RetryCallState) -> float:
+    """Exponential backoff, or the provider's Retry-After when it sent a 429."""
+    exc = retry_state.outcome.exception() if retry_state.outcome else None
+    record_retry("millionverifier")
+    retry_after = _retry_after_seconds(getattr(exc, "response", None))
+    return retry_after if retry_after is not None else _backoff(retry_state)
+
+
+@retry(stop=stop_after_attempt(3), wait=_wait_for_retry)
+def _verify_one(api_key: str, email: str, limiter: Optional[RateLimiter] = None) -> Dict[str, Any]:
+    if limiter is not None:
+        limiter.wait()
     resp = requests.get(
         MV_API_URL,
         params={"api": api_key, "email": email},
         timeout=25,
     )
+    retry_after = _retry_after_seconds(resp)
+    if retry_after is not None and limiter is not None:
+        # Throttled: hold back the other threads too, not just this retry.
+        limiter.pause(retry_after)
     resp.raise_for_status()
     return resp.json()
 
 
-def verify_with_millionverifier(candidates_df: pd.DataFrame) -> pd.DataFrame:
+def classify_result(raw_result: Any) -> Tuple[str, bool]:
+    """Provider result value -> (email_verification_status, email_is_catchall)."""
+    raw_result = normalize_text(raw_result).lower()
+    if raw_result in VALID_STATUSES:
+        return "valid", False
+    if raw_result in CATCHALL_STATUSES:
+        return "catchall", True
+    if raw_result in INVALID_STATUSES:
+        return "invalid", False
+    return raw_result or "unknown", False
+
+
+def _result_row(email: str, status: str, is_catchall: bool, quality_score: Any) -> Dict[str, Any]:
+    return {
+        "email": email,
+        "email_verification_status": status,
+        "email_is_catchall": is_catchall,
+        "email_quality_score": quality_score,
+        "email_verification_provider": "millionverifier",
+    }
+
+
+def _record(row: Dict[str, Any]) -> VerificationRecord:
+    return VerificationRecord(
+        email=row["email"],
+        status=row["email_verification_status"],
+        is_catchall=bool(row["email_is_catchall"]),
+        quality_score=row["email_quality_score"],
+        provider=row["email_verification_provider"],
+    )
+
+
+def _verify_single(
+    api_key: str,
+    emails: List[str],
+    requests_per_second: Optional[float] = None,
+    max_in_flight: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """One request per address on up to max_in_flight threads; rows keep `emails` order."""
+    limiter = RateLimiter(MV_REQUESTS_PER_SECOND if requests_per_second is None else requests_per_second)
+    workers = max(1, MV_MAX_IN_FLIGHT if max_in_flight is None else int(max_in_flight))
+
+    def _check(email: str) -> Dict[str, Any]:
+        try:
+            data = _verify_one(api_key, email, limiter)
+            status, is_catchall = classify_result(data.get("result") or data.get("result_code") or "")
+            quality_score = data.get("quality")
+        except Exception as exc:
+            log.debug("Verification failed for %s: %s", email, exc)
+            status, is_catchall, quality_score = "error", False, None
+        return _result_row(email, status, is_catchall, quality_score)
+
+    rows: List[Dict[str, Any]] = []
+    total = len(emails)
+    with ThreadPoolExecutor(max_workers=min(workers, max(1, total)), thread_name_prefix="verify") as executor:
+        for i, row in enumerate(executor.map(_check, emails)):
+            if i % 20 == 0:
+                log.info("  Verified %d/%d...", i, total)
+            rows.append(row)
+    return rows
+
+
+def _bulk_request(method: str, endpoint: str, **kwargs: Any) -> requests.Response:
+    resp = requests.request(method, MV_BULK_URL.rstrip("/") + "/" + endpoint, timeout=60, **kwargs)
+    resp.raise_for_status()
+    return resp
+
+
+# fileinfo / download only read a file, so they are retried; an upload is not
+# (see _bulk_upload).
+@retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=8))
+def _bulk_call(method: str, endpoint: str, **kwargs: Any) -> requests.Response:
+    return _bulk_request(method, endpoint, **kwargs)
+
+
+def _bulk_upload(api_key: str, emails: List[str]) -> str:
+    """
+    Create a bulk file and return its file_id. Not retried: an upload the
+    server accepted but whose response was lost would be created, and
+    billed, a second time.
+    """
+    body = ("email\n" + "\n".join(emails) + "\n").encode("utf-8")
+    resp = _bulk_request(
+        "POST",
+        "upload",
+        params={"key": api_key},
+        files={"file_contents": ("cranegenius_candidates.csv", body, "text/csv")},
+    )
+    data = resp.json()
+    file_id = normalize_text(data.get("file_id"))
+    if not file_id:
+        raise RuntimeError(f"MillionVerifier bulk upload returned no file_id: {data.get('error') or data}")
+    return file_id
+
+
+def _bulk_wait(api_key: str, file_id: str, poll_seconds: float, timeout_seconds: float) -> None:
+    deadline = time.monotonic() + timeout_seconds
+    while True:
+        info = _bulk_call("GET", "fileinfo", params={"key": api_key, "file_id": file_id}).json()
+        status = normalize_text(info.get("status")).lower()
+        if status in BULK_DONE_STATUSES:
+            return
+        if status in BULK_FAILED_STATUSES or info.get("error"):
+            raise RuntimeError(f"MillionVerifier bulk file {file_id} failed: {info.get('error') or status}")
+        if time.monotonic() >= deadline:
+            raise TimeoutError(f"MillionVerifier bulk file {file_id} not finished after {timeout_seconds:.0f}s")
+        log.info("  Bulk file %s: %s (%s%%)", file_id, status or "pending", info.get("percent", "?"))
+        time.sleep(poll_seconds)
+
+
+def _bulk_download(api_key: str, file_id: str) -> pd.DataFrame:
+    resp = _bulk_call("GET", "download", params={"key": api_key, "file_id": file_id, "filter": "all"})
+    report = pd.read_csv(io.StringIO(resp.content.decode("utf-8-sig")), dtype=str, keep_default_na=False)
+    report.columns = [normalize_text(c).lower() for c in report.columns]
+    return report
+
+
+def _verify_bulk(
+    api_key: str,
+    emails: List[str],
+    poll_seconds: Optional[float] = None,
+    timeout_seconds: Optional[float] = None,
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    One upload for the whole batch; rows come back in `emails` order. None
+    when the upload itself failed: nothing was billed, so the caller can
+    check the addresses one by one. An uploaded file is already paid for,
+    so if its report cannot be waited for or read the rows come back as
+    "error" and the file_id is logged for downloading the report later.
+    """
+    try:
+        file_id = _bulk_upload(api_key, emails)
+    except Exception as exc:
+        log.warning("MillionVerifier bulk upload failed (%s); falling back to per-email", exc)
+        return None
+    log.info("Uploaded %d addresses to MillionVerifier bulk file %s", len(emails), file_id)
+    try:
+        return _bulk_report_rows(api_key, emails, file_id, poll_seconds, timeout_seconds)
+    except Exception as exc:
+        log.error(
+            "MillionVerifier bulk file %s was uploaded but its report could not be read (%s); "
+            "leaving %d addresses unverified, download that file's report instead of re-verifying",
+            file_id,
+            exc,
+            len(emails),
+        )
+        return [_result_row(email, "error", False, None) for email in emails]
+
+
+def _bulk_report_rows(
+    api_key: str,
+    emails: List[str],
+    file_id: str,
+    poll_seconds: Optional[float],
+    timeout_seconds: Optional[float],
+) -> List[Dict[str, Any]]:
+    _bulk_wait(
+        api_key,
+        file_id,
+        BULK_POLL_SECONDS if poll_seconds is None else poll_seconds,
+        BULK_TIMEOUT_SECONDS if timeout_seconds is None else timeout_seconds,
+    )
+    report = _bulk_download(api_key, file_id)
+    if "email" not in report.columns or "result" not in report.columns:
+        raise RuntimeError(f"MillionVerifier bulk report has unexpected columns: {list(report.columns)}")
+
+    by_email: Dict[str, Tuple[str, Optional[str]]] = {}
+    quality = report["quality"] if "quality" in report.columns else pd.Series("", index=report.index)
+    for email, result, q in zip(report["email"], report["result"], quality):
+        by_email[normalize_text(email).lower()] = (result, normalize_text(q) or None)
+
+    rows: List[Dict[str, Any]] = []
+    for email in emails:
+        if email not in by_email:
+            rows.append(_result_row(email, "unknown", False, None))
+            continue
+        result, q = by_email[email]
+        status, is_catchall = classify_result(result)
+        rows.append(_result_row(email, status, is_catchall, q))
+    return rows
+
+
+def verify_with_millionverifier(
+    candidates_df: pd.DataFrame,
+    bulk_min_emails: Optional[int] = None,
+    requests_per_second: Optional[float] = None,
+    max_in_flight: Optional[int] = None,
+    cache: Optional[VerificationCache] = None,
+) -> pd.DataFrame:
+    """
+    Verify `email_candidate` addresses. Addresses with a fresh result in the
+    verification cache are not sent again. Of the rest, batches of at least
+    `bulk_min_emails` go through the bulk file API; smaller batches, or a
+    bulk upload that is rejected, use concurrent per-address requests under
+    the requests_per_second limit. Rows follow first-seen input order.
+    """
     if candidates_df.empty:
         log.info("No candidates to verify — skipping MillionVerifier")
         return candidates_df
@@ -41,50 +313,41 @@ def verify_with_millionverifier(candidates_df: pd.DataFrame) -> pd.DataFrame:
             "Add it as a GitHub Secret."
         )
 
-    rows: List[Dict[str, Any]] = []
-    total = len(candidates_df)
-    log.info("Verifying %d email candidates with MillionVerifier...", total)
-
-    for i, (_, r) in enumerate(candidates_df.iterrows()):
-        email = normalize_text(r.get("email_candidate")).lower()
-        if not email:
-            continue
-
-        if i % 20 == 0:
-            log.info("  Verified %d/%d...", i, total)
-
-        status = "unknown"
-        is_catchall = False
-        quality_score = None
-
-        try:
-            data = _verify_one(api_key, email)
-            raw_result = normalize_text(data.get("result") or data.get("result_code") or "").lower()
-            quality_score = data.get("quality")
-
-            if raw_result in VALID_STATUSES:
-                status = "valid"
-            elif raw_result in CATCHALL_STATUSES:
-                status = "catchall"
-                is_catchall = True
-            elif raw_result in {"invalid", "bad", "undeliverable"}:
-                status = "invalid"
-            else:
-                status = raw_result or "unknown"
+    emails = [normalize_text(e).lower() for e in candidates_df.get("email_candidate", pd.Series(dtype=str))]
+    emails = list(dict.fromkeys(e for e in emails if e))
+    cache = cache if cache is not None else get_verification_cache()
+    cached = cache.get_many(emails)
+    pending = [e for e in emails if e not in cached]
+    total = len(pending)
+    bulk_min = BULK_MIN_EMAILS if bulk_min_emails is None else bulk_min_emails
+    log.info(
+        "Verifying %d email candidates with MillionVerifier (%d more from the verification cache)...",
+        total,
+        len(cached),
+    )
 
-        except Exception as exc:
-            log.debug("Verification failed for %s: %s", email, exc)
-            status = "error"
+    fresh_rows: Optional[List[Dict[str, Any]]] = None
+    if total and bulk_min > 0 and total >= bulk_min:
+        fresh_rows = _verify_bulk(api_key, pending)
+    if fresh_rows is None:
+        fresh_rows = _verify_single(api_key, pending, requests_per_second, max_in_flight) if total else []
+    cache.put_many(_record(row) for row in fresh_rows)
 
-        rows.append({
-            "email": email,
-            "email_verification_status": status,
-            "email_is_catchall": is_catchall,
-            "email_quality_score": quality_score,
-            "email_verification_provider": "millionverifier",
-        })
+    by_email = {row["email"]: row for row in fresh_rows}
+    for email, record in cached.items():
+        by_email[email] = _result_row(email, record.status, record.is_catchall, record.quality_score)
+    rows = [by_email[e] for e in emails if e in by_email]
 
-    result_df = pd.DataFrame(rows).drop_duplicates(subset=["email"])
+    result_df = pd.DataFrame(
+        rows,
+        columns=[
+            "email",
+            "email_verification_status",
+            "email_is_catchall",
+            "email_quality_score",
+            "email_verification_provider",
+        ],
+    ).drop_duplicates(subset=["email"])
 
     # Log verification summary
     valid_count = (result_df["email_verification_status"] == "valid").sum() if "email_verification_status" in result_df.columns else 0
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+from src.artifact_writer import ArtifactWriter
+from src.stage_cache import StageCache, StageSpec, frame_digest
+from src.utils import save_csv
+
+
+class TestArtifactWriter(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self._tmp.name)
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_background_write_matches_save_csv_and_ignores_later_mutation(self) -> None:
+        df = pd.DataFrame({"email": ["a@x.com", None], "score": [1.5, 2.0]})
+        save_csv(df, str(self.dir / "sync.csv"))
+        with ArtifactWriter(max_pending=1) as writer:
+            writer.save_csv(df, str(self.dir / "nested" / "async.csv"))
+            df.loc[0, "email"] = "changed@x.com"
+            writer.save_json({"n": 1}, str(self.dir / "qa.json"))
+        self.assertEqual((self.dir / "nested" / "async.csv").read_bytes(), (self.dir / "sync.csv").read_bytes())
+        self.assertEqual((self.dir / "qa.json").read_text(encoding="utf-8"), '{\n  "n": 1\n}')
+        self.assertFalse((self.dir / "nested" / "async.csv.tmp").exists())
+
+    def test_write_error_surfaces_on_flush(self) -> None:
+        blocker = self.dir / "file"
+        blocker.write_text("", encoding="utf-8")
+        writer = ArtifactWriter()
+        writer.save_csv(pd.DataFrame({"a": [1]}), str(blocker / "out.csv"))
+        with self.assertRaises(OSError):
+            writer.flush()
+        writer.close()
+
+    def test_failure_in_block_still_flushes_queued_artifacts(self) -> None:
+        path = self.dir / "raw.csv"
+        with self.assertRaises(SystemExit):
+            with ArtifactWriter() as writer:
+                writer.save_csv(pd.DataFrame({"a": [1, 2]}), str(path))
+                raise SystemExit(0)
+        self.assertEqual(pd.read_csv(path)["a"].tolist(), [1, 2])
+
+    def test_stage_cache_sees_queued_frame_digest_across_runs(self) -> None:
+        raw = str(self.dir / "raw.csv")
+        specs = (StageSpec("ingest", outputs=(raw,)), StageSpec("normalize", inputs=(raw,)))
+        df = pd.DataFrame({"a": [1, 2]})
+        cache = StageCache("t", specs, manifest_dir=self.dir)
+        with ArtifactWriter(on_queued=cache.record_artifact, on_written=cache.artifact_written) as writer:
+            cache.should_run("ingest")
+            writer.save_csv(df, raw)
+            cache.complete("ingest")
+            fingerprint = cache.fingerprint("normalize")
+
+        # next run reads raw.csv back from disk and still arrives at the same fingerprint
+        again = StageCache("t", specs, manifest_dir=self.dir)
+        self.assertFalse(again.should_run("ingest"))
+        self.assertEqual(again.digest(raw), frame_digest(df))
+        self.assertEqual(again.fingerprint("normalize"), fingerprint)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from unittest.mock import patch
+from pathlib import Path
+
+import pandas as pd
+
+from src.candidate_builder import OUTPUT_COLUMNS, build_candidates
+
+
+class TestBuildCandidates(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.keywords = str(Path(self._tmp.name) / "keywords.yaml")
+        Path(self.keywords).write_text("role_inboxes:\n  - '@sales'\n  - info\n", encoding="utf-8")
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_each_domain_once_with_first_rows_fields(self) -> None:
+        enriched = pd.DataFrame({
+            "contractor_domain": ["Acme.com | beta.com", "beta.com", None, "gamma.com|"],
+            "contractor_name_normalized": ["acme", "beta", "none", "gamma"],
+            "score": [9, 5, 1, 3],
+        })
+        out = build_candidates(enriched, self.keywords)
+        self.assertEqual(list(out.columns), OUTPUT_COLUMNS)
+        self.assertEqual(
+            out["email_candidate"].tolist(),
+            ["estimating@acme.com", "bids@acme.com", "estimating@beta.com", "bids@beta.com", "estimating@gamma.com", "bids@gamma.com"],
+        )
+        self.assertEqual(out["contractor_name_normalized"].tolist(), ["acme"] * 4 + ["gamma"] * 2)
+        self.assertEqual(out["score"].tolist(), [9, 9, 9, 9, 3, 3])
+        self.assertEqual(out["jurisdiction"].tolist(), [""] * 6)
+        self.assertTrue((out["generation_method"] == "role_inbox").all())
+
+    def test_inbox_taken_by_earlier_person_email_is_skipped(self) -> None:
+        enriched = pd.DataFrame({"contractor_domain": ["acme.com", "beta.com"]})
+        contacts = pd.DataFrame({
+            "source_domain": ["acme.com", "acme.com"],
+            "email": ["Bids@Beta.com", "jane@acme.com"],
+            "email_type": ["person", "person"],
+        })
+        with patch("src.candidate_builder.MAX_CANDIDATES_PER_DOMAIN", 8):
+            out = build_candidates(enriched, self.keywords, contacts_df=contacts)
+        acme = out[out["contractor_domain"] == "acme.com"]["email_candidate"].tolist()
+        beta = out[out["contractor_domain"] == "beta.com"]["email_candidate"].tolist()
+        self.assertEqual(acme[-2:], ["bids@beta.com", "jane@acme.com"])
+        self.assertEqual(
+            beta, ["estimating@beta.com", "projects@beta.com", "operations@beta.com", "info@beta.com", "sales@beta.com"]
+        )
+
+    def test_person_emails_fill_after_inboxes(self) -> None:
+        enriched = pd.DataFrame({"contractor_domain": ["acme.com"]})
+        contacts = pd.DataFrame({"source_domain": ["acme.com"], "email": ["jane@acme.com"], "email_type": ["person"]})
+        with patch("src.candidate_builder.MAX_CANDIDATES_PER_DOMAIN", 8):
+            out = build_candidates(enriched, self.keywords, contacts_df=contacts)
+        self.assertEqual(out["email_candidate"].tolist()[-3:], ["info@acme.com", "sales@acme.com", "jane@acme.com"])
+        self.assertEqual(out["contact_role_bucket"].tolist()[-1], "person_discovered")
+        self.assertEqual(out["generation_method"].tolist()[-1], "site_discovered")
+
+    def test_no_domains_gives_empty_frame(self) -> None:
+        self.assertTrue(build_candidates(pd.DataFrame({"contractor_domain": ["", None]}), self.keywords).empty)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+from typing import List
+
+import pandas as pd
+
+from src.catchall_probe import detect_catchall_domains, split_catchall_candidates
+from src.verification_cache import VerificationCache
+
+
+class TestCatchallProbe(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.cache = VerificationCache(Path(self._tmp.name) / "verify.sqlite3")
+        self.calls: List[List[str]] = []
+
+    def tearDown(self) -> None:
+        self.cache.close()
+        self._tmp.cleanup()
+
+    def _verify(self, df: pd.DataFrame) -> pd.DataFrame:
+        emails = list(df["email_candidate"])
+        self.calls.append(emails)
+        status = {"acme.com": "catchall", "bolt.com": "invalid", "down.com": "unknown"}
+        return pd.DataFrame({
+            "email": emails,
+            "email_verification_status": [status[e.split("@")[1]] for e in emails],
+        })
+
+    def test_one_probe_per_domain_and_verdicts_are_cached(self) -> None:
+        verdicts = detect_catchall_domains(["acme.com", "bolt.com", "ACME.com", "down.com"], self._verify, self.cache)
+        self.assertEqual(verdicts, {"acme.com": True, "bolt.com": False})
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(sorted(e.split("@")[1] for e in self.calls[0]), ["acme.com", "bolt.com", "down.com"])
+
+        again = detect_catchall_domains(["acme.com", "bolt.com", "down.com"], self._verify, self.cache)
+        self.assertEqual(again, verdicts)
+        # only the unjudged domain is probed again
+        self.assertEqual([e.split("@")[1] for e in self.calls[1]], ["down.com"])
+
+    def test_split_keeps_top_pattern_per_person_on_catchall_domains(self) -> None:
+        candidates = pd.DataFrame([
+            {"email_candidate": "jdoe@acme.com", "contractor_domain": "acme.com", "first_name": "Jane",
+             "last_name": "Doe", "pattern_rank": 2, "pattern_confidence": 0.93},
+            {"email_candidate": "jane.doe@acme.com", "contractor_domain": "acme.com", "first_name": "Jane",
+             "last_name": "Doe", "pattern_rank": 1, "pattern_confidence": 0.96},
+            {"email_candidate": "john.roe@acme.com", "contractor_domain": "acme.com", "first_name": "John",
+             "last_name": "Roe", "pattern_rank": 1, "pattern_confidence": 0.96},
+            {"email_candidate": "mary.poe@bolt.com", "contractor_domain": "bolt.com", "first_name": "Mary",
+             "last_name": "Poe", "pattern_rank": 1, "pattern_confidence": 0.96},
+        ])
+        remaining, marked, dropped = split_catchall_candidates(candidates, {"acme.com": True, "bolt.com": False})
+        self.assertEqual(list(remaining["email_candidate"]), ["mary.poe@bolt.com"])
+        self.assertEqual(sorted(marked["email"]), ["jane.doe@acme.com", "john.roe@acme.com"])
+        self.assertTrue(marked["email_is_catchall"].all())
+        self.assertEqual(set(marked["email_verification_status"]), {"catchall"})
+        self.assertEqual(dropped, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
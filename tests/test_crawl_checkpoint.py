@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+
+from src.contact_page_finder import discover_contact_people
+from src.crawl_checkpoint import CrawlCheckpoint, run_key
+from src.crawl_planner import CrawlPlan
+from src.page_cache import CachedPage
+from src.parse_pool import MiningConcurrency
+
+
+class TestCrawlCheckpoint(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self._tmp.name)
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_run_key_ignores_order_and_duplicates(self) -> None:
+        self.assertEqual(run_key(["b.com", "a.com"]), run_key(["a.com", "b.com", "a.com"]))
+        self.assertNotEqual(run_key(["a.com"]), run_key(["a.com", "b.com"]))
+
+    def test_resume_replays_rows_and_skips_torn_line(self) -> None:
+        first = CrawlCheckpoint("stage", ["a.com", "b.com"], directory=self.dir)
+        first.record("a.com", [{"email": "jane.doe@a.com", "title_confirmed": True}])
+        with first.path.open("a", encoding="utf-8") as f:
+            f.write('{"unit": "b.com", "rows": [')
+
+        resumed = CrawlCheckpoint("stage", ["b.com", "a.com"], directory=self.dir)
+        self.assertTrue(resumed.done("a.com"))
+        self.assertFalse(resumed.done("b.com"))
+        self.assertEqual(resumed.rows("a.com"), [{"email": "jane.doe@a.com", "title_confirmed": True}])
+
+        resumed.finish()
+        self.assertFalse(resumed.path.exists())
+
+    def test_contact_finder_skips_finished_domains_on_rerun(self) -> None:
+        df = pd.DataFrame(
+            [
+                {"contractor_name_normalized": "acme", "contractor_domain": "acme.com", "domain_valid": True},
+                {"contractor_name_normalized": "bolt", "contractor_domain": "bolt.com", "domain_valid": True},
+            ]
+        )
+        page = "<p>Project Manager Jane Doe jane.doe@{d}</p>"
+        fetched = []
+
+        def _fetch(url: str, policy):
+            fetched.append(url)
+            domain = url.split("/")[2]
+            if domain == "bolt.com":
+                raise KeyboardInterrupt
+            return CachedPage(url=url, final_url=url, status=200, body=page.format(d=domain))
+
+        plans = lambda domain, **kwargs: CrawlPlan(domain=domain)  # noqa: E731
+        with patch("src.crawl_checkpoint.CHECKPOINT_DIR", self.dir), patch(
+            "src.contact_page_finder.plan_domain", side_effect=plans
+        ), patch("src.contact_page_finder.load_mining_concurrency", return_value=MiningConcurrency()):
+            with patch("src.contact_page_finder._fetch", side_effect=_fetch):
+                with self.assertRaises(KeyboardInterrupt):
+                    discover_contact_people(df)
+            acme_fetches = len([u for u in fetched if "acme.com" in u])
+            self.assertGreater(acme_fetches, 0)
+
+            fetched.clear()
+            with patch(
+                "src.contact_page_finder._fetch",
+                side_effect=lambda url, policy: fetched.append(url)
+                or CachedPage(url=url, final_url=url, status=200, body=page.format(d=url.split("/")[2])),
+            ):
+                out = discover_contact_people(df)
+
+        self.assertFalse([u for u in fetched if "acme.com" in u])
+        self.assertEqual(sorted(out["contractor_domain"].unique()), ["acme.com", "bolt.com"])
+        self.assertEqual(list(self.dir.glob("*.jsonl")), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Dict, List, Optional
+from unittest.mock import patch
+
+import pandas as pd
+
+from src.crawl_frontier import CrawlFrontier, YieldTarget, crawl
+from src.crawl_planner import CrawlPlan
+from src.html_document import ParsedPage
+from src.page_cache import CachedPage
+from src.site_contact_miner import mine_contacts
+
+SITE = {
+    "https://acme.com/": '<a href="/blog/crane-tips">Blog</a><a href="/gallery">Projects</a><a href="/our-team">Our team</a>',
+    "https://acme.com/our-team": '<p>jane.doe@acme.com</p><p>john.smith@acme.com</p><a href="/contact">Contact</a>',
+    "https://acme.com/contact": "<p>mary.jones@acme.com</p>",
+    "https://acme.com/blog/crane-tips": "<p>No people here.</p>",
+    "https://acme.com/gallery": "<p>Pictures.</p>",
+}
+
+
+class TestCrawlFrontier(unittest.TestCase):
+    def test_pops_best_first_and_dedupes(self) -> None:
+        frontier = CrawlFrontier(max_depth=2)
+        frontier.push("https://acme.com/blog", 1, 1.0)
+        frontier.push("https://acme.com/team", 1, 10.0)
+        self.assertFalse(frontier.push("https://acme.com/team/", 1, 10.0))
+        self.assertFalse(frontier.push("https://acme.com/deep", 3, 50.0))
+        self.assertEqual(frontier.pop(), ("https://acme.com/team", 1))
+        self.assertEqual(frontier.pop(), ("https://acme.com/blog", 1))
+        self.assertIsNone(frontier.pop())
+
+    def test_size_cap_keeps_highest_scores(self) -> None:
+        frontier = CrawlFrontier(max_depth=1, max_size=5)
+        for i in range(20):
+            frontier.push(f"https://acme.com/p{i}", 1, float(i))
+        self.assertLessEqual(len(frontier), 10)
+        self.assertEqual(frontier.pop(), ("https://acme.com/p19", 1))
+
+    def test_crawl_streams_pages_best_first_and_stops_when_caller_breaks(self) -> None:
+        fetched: List[str] = []
+
+        def _fetch(url: str) -> Optional[ParsedPage]:
+            fetched.append(url)
+            return ParsedPage(SITE[url], url) if url in SITE else None
+
+        visited = []
+        for url, _doc, _depth in crawl(
+            ["https://acme.com/"], _fetch, max_pages=10, max_depth=2, follow=lambda link, doc, depth: True
+        ):
+            visited.append(url)
+            if url.endswith("/our-team"):
+                break
+        self.assertEqual(visited, ["https://acme.com/", "https://acme.com/our-team"])
+        self.assertEqual(fetched, visited)
+
+    def test_crawl_keeps_parses_in_flight_while_fetching(self) -> None:
+        fetched: List[str] = []
+
+        def _fetch(url: str) -> "Optional[Future[ParsedPage]]":
+            fetched.append(url)
+            if url not in SITE:
+                return None
+            fut: "Future[ParsedPage]" = Future()
+            fut.set_result(ParsedPage(SITE[url], url))
+            return fut
+
+        seeds = ["https://acme.com/", "https://acme.com/our-team", "https://acme.com/contact"]
+        crawled = crawl(seeds, _fetch, max_pages=10, max_depth=0, follow=lambda link, doc, depth: True, in_flight=2)
+        first_url, _doc, _depth = next(crawled)
+        # the next-best URL was fetched before the best one was collected
+        self.assertEqual(fetched, ["https://acme.com/our-team", "https://acme.com/contact"])
+        self.assertEqual(first_url, "https://acme.com/our-team")
+        self.assertEqual([url for url, _, _ in crawled], ["https://acme.com/contact", "https://acme.com/"])
+
+
+class TestYieldTarget(unittest.TestCase):
+    def test_from_config_and_met(self) -> None:
+        target = YieldTarget.from_config({"yield_target": {"people_with_titles": 2, "person_emails": 0}})
+        self.assertTrue(target.met(people_with_titles=2))
+        self.assertFalse(target.met(people_with_titles=1, person_emails=50))
+
+
+class TestMinerEarlyStop(unittest.TestCase):
+    def test_miner_stops_once_pattern_is_confirmed(self) -> None:
+        fetched: Dict[str, int] = {}
+
+        def _fetch_page(url: str, **kwargs) -> Optional[CachedPage]:
+            fetched[url] = fetched.get(url, 0) + 1
+            body = SITE.get(url)
+            return CachedPage(url=url, final_url=url, status=200 if body else 404, body=body or "")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            cfg = Path(tmp) / "crawler.yaml"
+            cfg.write_text(
+                "crawler:\n"
+                "  max_pages_per_domain: 10\n  max_depth: 2\n  request_timeout_seconds: 1\n"
+                "  rate_limit_seconds: 0\n  user_agent: test\n"
+                "  include_url_keywords: [team, contact, blog, gallery]\n"
+                "  yield_target: {people_with_titles: 0, person_emails: 2}\n",
+                encoding="utf-8",
+            )
+            with patch("src.page_cache.fetch_page", side_effect=_fetch_page), patch(
+                "src.site_contact_miner.plan_domain", return_value=CrawlPlan(domain="acme.com")
+            ):
+                contacts, patterns = mine_contacts(pd.DataFrame([{"contractor_domain": "acme.com"}]), str(cfg))
+
+        self.assertEqual(list(fetched), ["https://acme.com/", "https://acme.com/our-team"])
+        self.assertEqual(patterns.iloc[0]["pattern"], "first.last")
+        self.assertEqual(len(contacts), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
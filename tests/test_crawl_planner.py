@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import unittest
+from typing import Dict, Optional
+from unittest.mock import patch
+
+from src import crawl_planner
+from src.crawl_planner import plan_domain, score_url
+from src.page_cache import CachedPage, FetchPolicy
+
+ROBOTS = """User-agent: *
+Disallow: /private/
+Sitemap: https://acme.com/sitemap_index.xml
+"""
+
+SITEMAP_INDEX = """<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <sitemap><loc>https://acme.com/post-sitemap.xml</loc></sitemap>
+  <sitemap><loc>https://acme.com/page-sitemap.xml</loc></sitemap>
+</sitemapindex>
+"""
+
+PAGE_SITEMAP = """<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <url><loc>https://acme.com/projects/bridge-gallery</loc></url>
+  <url><loc>https://acme.com/blog/2023/05/crane-safety</loc></url>
+  <url><loc>https://acme.com/our-team</loc></url>
+  <url><loc>https://acme.com/private/staff</loc></url>
+  <url><loc>https://acme.com/contact-us</loc></url>
+  <url><loc>https://acme.com/brochure.pdf</loc></url>
+</urlset>
+"""
+
+POST_SITEMAP = """<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <url><loc>https://acme.com/news/groundbreaking</loc></url>
+</urlset>
+"""
+
+
+class TestScoreUrl(unittest.TestCase):
+    def test_people_pages_outrank_content(self) -> None:
+        self.assertGreater(score_url("https://acme.com/leadership"), score_url("https://acme.com/"))
+        self.assertGreater(score_url("https://acme.com/contact"), score_url("https://acme.com/blog/crane-tips"))
+        self.assertGreater(score_url("https://acme.com/x", "Meet our team"), score_url("https://acme.com/x"))
+
+
+class TestPlanDomain(unittest.TestCase):
+    def setUp(self) -> None:
+        crawl_planner._PLANS.clear()
+        self.fetched: Dict[str, int] = {}
+
+    def tearDown(self) -> None:
+        crawl_planner._PLANS.clear()
+
+    def _fake_fetch(self, pages: Dict[str, str]):
+        def _fetch(url: str, *args, **kwargs) -> Optional[CachedPage]:
+            self.fetched[url] = self.fetched.get(url, 0) + 1
+            body = pages.get(url)
+            status = 200 if body is not None else 404
+            return CachedPage(url=url, final_url=url, status=status, body=body or "")
+        return _fetch
+
+    def test_ranks_sitemap_urls_and_skips_disallowed(self) -> None:
+        pages = {
+            "https://acme.com/robots.txt": ROBOTS,
+            "https://acme.com/sitemap_index.xml": SITEMAP_INDEX,
+            "https://acme.com/page-sitemap.xml": PAGE_SITEMAP,
+            "https://acme.com/post-sitemap.xml": POST_SITEMAP,
+        }
+        with patch("src.page_cache.fetch_page", side_effect=self._fake_fetch(pages)):
+            plan = plan_domain("Acme.com")
+            seeds = plan.seed_urls(["/", "/about"], limit=4)
+            again = plan_domain("acme.com")
+
+        self.assertIs(again, plan)
+        self.assertEqual(seeds[:2], ["https://acme.com/our-team", "https://acme.com/contact-us"])
+        self.assertEqual(seeds[2], "https://acme.com/about")
+        self.assertNotIn("https://acme.com/private/staff", plan.seed_urls(["/"]))
+        self.assertNotIn("https://acme.com/brochure.pdf", plan.seed_urls(["/"]))
+        self.assertFalse(plan.allowed("https://acme.com/private/staff"))
+        self.assertTrue(all(count == 1 for count in self.fetched.values()))
+
+    def test_missing_robots_and_sitemap_fall_back_to_guessed_paths(self) -> None:
+        with patch("src.page_cache.fetch_page", side_effect=self._fake_fetch({})):
+            plan = plan_domain("acme.com")
+        self.assertIsNone(plan.robots)
+        self.assertEqual(plan.seed_urls(["/", "/team"]), ["https://acme.com/team", "https://acme.com/"])
+        self.assertIn("https://acme.com/sitemap.xml", self.fetched)
+
+    def test_robots_rules_are_checked_for_the_fetching_agent(self) -> None:
+        robots = "User-agent: CraneGeniusLeadBot\nDisallow: /team\n\nUser-agent: *\nDisallow:\n"
+        agents = []
+
+        def _fetch(url: str, *args, **kwargs) -> Optional[CachedPage]:
+            agents.append(kwargs["user_agent"])
+            body = robots if url.endswith("/robots.txt") else None
+            return CachedPage(url=url, final_url=url, status=200 if body else 404, body=body or "")
+
+        with patch("src.page_cache.fetch_page", side_effect=_fetch):
+            lead = plan_domain("acme.com", fetch_policy=FetchPolicy(user_agent="CraneGeniusLeadBot/1.0 (+ops)"))
+            other = plan_domain("acme.com", fetch_policy=FetchPolicy(user_agent="OtherBot/2.0"))
+
+        self.assertFalse(lead.allowed("https://acme.com/team"))
+        self.assertTrue(other.allowed("https://acme.com/team"))
+        self.assertEqual(set(agents), {"CraneGeniusLeadBot/1.0 (+ops)", "OtherBot/2.0"})
+
+
+if __name__ == "__main__":
+    unittest.main()
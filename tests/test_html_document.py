@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import unittest
+from unittest.mock import patch
+
+from bs4 import BeautifulSoup, Tag
+
+from src.html_document import ParsedPage
+from src.people_discovery import _extract_from_page
+from src.utils import normalize_text
+
+TEAM_HTML = """
+<html><head>
+<script type="application/ld+json">
+{"@context": "https://schema.org", "@graph": [
+  {"@type": "Organization", "name": "Acme Builders",
+   "employee": [{"@type": "Person", "name": "Maria Lopez", "jobTitle": "Senior Estimator", "email": "mailto:mlopez@acme.com"}]}
+]}
+</script></head>
+<body>
+  <a href="/team">Team</a>
+  <a href="mailto:info@acme.com?subject=hi">Email us</a>
+  <a href="tel:+15551234567">Call</a>
+  <div itemscope itemtype="https://schema.org/Person">
+    <span itemprop="name">Dan Whitaker</span><span itemprop="jobTitle">Superintendent</span>
+  </div>
+</body></html>
+"""
+
+
+class TestParsedPage(unittest.TestCase):
+    def test_views_are_built_from_a_single_parse(self) -> None:
+        doc = ParsedPage(TEAM_HTML, "https://acme.com/about")
+        with patch("src.html_document.BeautifulSoup", wraps=BeautifulSoup) as soup_cls:
+            _ = doc.text, doc.links, doc.mailto_links, doc.tel_links, doc.json_ld, doc.person_blocks
+            _ = doc.text, doc.links, doc.person_blocks
+        self.assertEqual(soup_cls.call_count, 1)
+
+    def test_links_and_anchors(self) -> None:
+        doc = ParsedPage(TEAM_HTML, "https://acme.com/about")
+        self.assertIn("https://acme.com/team", [link.url for link in doc.links])
+        self.assertEqual([link.href for link in doc.mailto_links], ["mailto:info@acme.com?subject=hi"])
+        self.assertEqual([link.href for link in doc.tel_links], ["tel:+15551234567"])
+        self.assertIn("mlopez@acme.com", doc.emails)
+
+    def test_person_blocks_from_json_ld_and_microdata(self) -> None:
+        blocks = ParsedPage(TEAM_HTML).person_blocks
+        self.assertEqual(blocks[0], {"name": "Maria Lopez", "job_title": "Senior Estimator", "email": "mlopez@acme.com"})
+        self.assertEqual(blocks[1]["name"], "Dan Whitaker")
+        self.assertEqual(blocks[1]["job_title"], "Superintendent")
+
+    def test_text_index_matches_get_text_for_every_element(self) -> None:
+        html = "<div><p>Jane <b>Doe</b>, <i>Project\n Manager</i></p><script>var x = 1;</script><ul><li> A </li><li></li></ul></div>"
+        doc = ParsedPage(html)
+        self.assertEqual(doc.text, normalize_text(doc.soup.get_text(" ", strip=True)))
+        for el in doc.soup.find_all(True):
+            self.assertEqual(doc.element_text(el), normalize_text(el.get_text(" ", strip=True)), el.name)
+        self.assertEqual(doc.text_index.tags, doc.soup.find_all(True))
+
+    def test_people_extraction_does_not_reserialize_subtrees(self) -> None:
+        blocks = "".join(
+            f"<div><section><p>Person {i}</p><p>Jane Doe{i} Project Manager</p></section></div>" for i in range(30)
+        )
+        doc = ParsedPage(f"<html><body>{blocks}</body></html>", "https://acme.com/team")
+        _ = doc.text_index
+        with patch.object(Tag, "get_text", autospec=True, side_effect=Tag.get_text) as get_text:
+            _extract_from_page(doc, "https://acme.com/team", "acme builders", "acme.com", "", "")
+        self.assertEqual(get_text.call_count, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
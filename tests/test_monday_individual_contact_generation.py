@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import unittest
+
+import pandas as pd
+
+from src.monday_individual_contact_generation import (
+    ROLE_BUCKETS,
+    _individual_candidates,
+    _placeholder_name,
+    _role_candidates,
+    _role_grid,
+)
+
+
+class TestMondayIndividualContactGeneration(unittest.TestCase):
+    def setUp(self) -> None:
+        companies = pd.DataFrame({"company_name": ["Acme Cranes", "Beta Lift"], "domain": ["acme.com", "beta.com"]})
+        self.grid = _role_grid(companies)
+
+    def test_grid_is_company_major_with_placeholder_names(self) -> None:
+        self.assertEqual(len(self.grid), 2 * len(ROLE_BUCKETS))
+        self.assertEqual(self.grid["company_name"].tolist()[: len(ROLE_BUCKETS)], ["Acme Cranes"] * len(ROLE_BUCKETS))
+        first, last = _placeholder_name("Beta Lift", "estimator")
+        row = self.grid[(self.grid["company_name"] == "Beta Lift") & (self.grid["contact_role_bucket"] == "estimator")]
+        self.assertEqual((row["first"].item(), row["last"].item()), (first.lower(), last.lower()))
+
+    def test_individual_candidates_follow_grid_then_pattern_order(self) -> None:
+        out = _individual_candidates(self.grid)
+        self.assertEqual(len(out), 3 * len(self.grid))
+        first, last = _placeholder_name("Acme Cranes", "project_manager")
+        f, l = first.lower(), last.lower()
+        self.assertEqual(out["email_candidate"].tolist()[:3], [f"{f}.{l}@acme.com", f"{f}@acme.com", f"{f[0]}_{l}@acme.com"])
+        self.assertEqual(
+            out["generation_method"].tolist()[:3],
+            ["placeholder_pattern_first_last", "placeholder_pattern_first", "placeholder_pattern_first_initial_last"],
+        )
+        self.assertEqual(out["contact_role_bucket"].tolist()[3], "estimator")
+
+    def test_role_candidates_one_inbox_per_bucket(self) -> None:
+        out = _role_candidates(self.grid)
+        self.assertEqual(
+            out["email_candidate"].tolist()[: len(ROLE_BUCKETS)],
+            ["projects@acme.com", "estimating@acme.com", "preconstruction@acme.com", "operations@acme.com"],
+        )
+        self.assertTrue((out["generation_method"] == "role_inbox").all())
+
+
+if __name__ == "__main__":
+    unittest.main()
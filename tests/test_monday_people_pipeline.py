@@ -6,7 +6,26 @@ import pandas as pd
 
 from unittest.mock import patch
 
-from src.monday_people_pipeline import _apply_clean_company_names, _filter_people_for_personal_generation, _person_source_confidence, _prepare_candidates_for_verification, _verify
+import itertools
+import time
+
+from src.monday_people_pipeline import (
+    _apply_clean_company_names,
+    _disposable_domain_mask,
+    _filter_people_for_personal_generation,
+    _has_single_at_sign,
+    _has_strong_person_evidence,
+    _is_disposable_domain,
+    _is_valid_local_part,
+    _malformed_email_mask,
+    _meets_verification_confidence_gate,
+    _person_source_confidence,
+    _person_source_confidence_labels,
+    _prepare_candidates_for_verification,
+    _strong_person_evidence_mask,
+    _verification_confidence_mask,
+    _verify,
+)
 
 
 class TestVerificationGate(unittest.TestCase):
@@ -119,8 +138,10 @@ class TestVerificationExecutionState(unittest.TestCase):
         self.assertEqual(len(out), 1)
         self.assertEqual(counts["filtered_low_domain_confidence"], 0)
 
+    @patch("src.monday_people_pipeline.get_verification_cache")
     @patch("src.monday_people_pipeline.verify_with_millionverifier")
-    def test_successful_verification_sets_attempted_true(self, mock_verify) -> None:
+    def test_successful_verification_sets_attempted_true(self, mock_verify, mock_cache) -> None:
+        mock_cache.return_value.get_domain_verdicts.return_value = {}
         mock_verify.return_value = pd.DataFrame([{
             "email": "john.doe@acme.com",
             "email_verification_status": "valid",
@@ -136,6 +157,20 @@ class TestVerificationExecutionState(unittest.TestCase):
         self.assertEqual(meta["total_verified_rows_returned"], 1)
         self.assertEqual(meta["valid_count"], 1)
 
+    @patch("src.monday_people_pipeline.get_verification_cache")
+    @patch("src.monday_people_pipeline.verify_with_millionverifier")
+    def test_catchall_domain_is_marked_without_candidate_calls(self, mock_verify, mock_cache) -> None:
+        mock_cache.return_value.get_domain_verdicts.return_value = {"acme.com": True}
+        candidates = pd.concat([self._candidate(), self._candidate().assign(
+            email="johndoe@acme.com", email_pattern="firstlast", pattern_rank=3, pattern_confidence=0.91
+        )], ignore_index=True)
+        with patch.dict("os.environ", {"MILLIONVERIFIER_API_KEY": "x"}, clear=True):
+            _v, catchall, _i, meta = _verify(candidates, self._domains())
+        mock_verify.assert_not_called()
+        self.assertEqual(list(catchall["email"]), ["john.doe@acme.com"])
+        self.assertEqual(meta["verification_schedule"]["catchall_marked"], 1)
+        self.assertEqual(meta["verification_schedule"]["catchall_dropped"], 1)
+
 
 
     def test_weak_domain_confidence_does_not_proceed_to_verifier_input(self) -> None:
@@ -162,6 +197,73 @@ class TestVerificationExecutionState(unittest.TestCase):
         self.assertGreaterEqual(counts["filtered_low_confidence"], 1)
 
 
+class TestVectorizedGates(unittest.TestCase):
+    """The column-wise gates must match the row gates they replaced, row for row."""
+
+    def _frame(self) -> pd.DataFrame:
+        values = itertools.product(
+            ["John", "", None],
+            [True, False, float("nan"), None],
+            ["", "j@acme.com", None],
+            [
+                "https://acme.com/team",
+                "https://www.acme.com/",
+                "https://jobs.acme.com/about/x",
+                "https://other.com/staff",
+                "",
+                "acme.com/contact",
+                None,
+            ],
+            [0.96, 0.91, 0.87, 0.5, "", None, float("nan"), "0.95"],
+            [None, True, 0],
+        )
+        rows = [
+            {
+                "first_name": first,
+                "last_name": "Doe",
+                "title_confirmed": title,
+                "found_email": found,
+                "source_url": url,
+                "pattern_confidence": confidence,
+                "contractor_domain": " ACME.com ",
+                "person_context_signal": context,
+            }
+            for first, title, found, url, confidence, context in values
+        ]
+        return pd.DataFrame(rows)
+
+    def test_person_gates_match_row_versions(self) -> None:
+        df = self._frame()
+        self.assertEqual(list(_strong_person_evidence_mask(df)), list(df.apply(_has_strong_person_evidence, axis=1)))
+        self.assertEqual(list(_verification_confidence_mask(df)), list(df.apply(_meets_verification_confidence_gate, axis=1)))
+        self.assertEqual(list(_person_source_confidence_labels(df)), list(df.apply(_person_source_confidence, axis=1)))
+        # columns the rows do not carry at all read as their defaults
+        bare = df[["first_name", "last_name"]]
+        self.assertEqual(list(_strong_person_evidence_mask(bare)), list(bare.apply(_has_strong_person_evidence, axis=1)))
+        self.assertEqual(list(_verification_confidence_mask(bare)), list(bare.apply(_meets_verification_confidence_gate, axis=1)))
+
+    def test_email_and_domain_gates_match_row_versions(self) -> None:
+        emails = pd.Series([
+            "john.doe@acme.com", "@acme.com", "john@", "a@b@c.com", "john..doe@acme.com", ".john@acme.com",
+            "john.@acme.com", "j@acme.com", "", "john doe@acme.com", "jo_hn-d.oe@acme.com", "x" * 70 + "@acme.com",
+            "john @acme.com", " john@acme.com", "john@ ", "John.Doe@Acme.com", "a..@acme.com",
+        ])
+        local = emails.str.split("@").str[0].fillna("")
+        expected = (~emails.map(_has_single_at_sign)) | (~local.map(_is_valid_local_part))
+        self.assertEqual(list(_malformed_email_mask(emails)), list(expected))
+
+        domains = pd.Series(["mailinator.com", "x.mailinator.com", "notmailinator.com", " YOPMAIL.com. ", "", None, "acme.com"])
+        self.assertEqual(list(_disposable_domain_mask(domains)), list(domains.map(_is_disposable_domain)))
+
+    def test_gating_a_large_frame_is_fast(self) -> None:
+        df = pd.concat([self._frame()] * (100_000 // len(self._frame()) + 1), ignore_index=True).head(100_000)
+        start = time.perf_counter()
+        _verification_confidence_mask(df)
+        _person_source_confidence_labels(df)
+        _malformed_email_mask(df["found_email"].fillna("").astype(str))
+        self.assertLess(time.perf_counter() - start, 3.0)
+
+
 class TestPeopleSourceGating(unittest.TestCase):
     def test_weak_person_source_is_deferred_before_generation(self) -> None:
         people = pd.DataFrame([{
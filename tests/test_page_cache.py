@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from typing import Dict, List, Optional
+from unittest.mock import MagicMock, patch
+
+from src.page_cache import (
+    SKIPPED_HEADER,
+    TRUNCATED_HEADER,
+    CachedPage,
+    FetchLimits,
+    FetchPolicy,
+    HostRateLimiter,
+    content_hash,
+    PageCache,
+    fetch_page,
+    load_fetch_policy,
+    normalize_url,
+)
+
+
+def _response(
+    text: str,
+    status: int = 200,
+    url: str = "https://acme.com/team",
+    headers: Optional[Dict[str, str]] = None,
+    chunks: Optional[List[bytes]] = None,
+) -> MagicMock:
+    resp = MagicMock()
+    resp.__enter__.return_value = resp
+    resp.iter_content.return_value = chunks if chunks is not None else [text.encode("utf-8")]
+    resp.status_code = status
+    resp.url = url
+    resp.headers = headers if headers is not None else {"Content-Type": "text/html"}
+    return resp
+
+
+class TestNormalizeUrl(unittest.TestCase):
+    def test_equivalent_urls_share_a_key(self) -> None:
+        self.assertEqual(normalize_url("HTTPS://Acme.com:443/team/#bios"), "https://acme.com/team")
+        self.assertEqual(normalize_url("https://acme.com"), "https://acme.com/")
+
+
+class TestPageCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.cache = PageCache(Path(self._tmp.name) / "pages.sqlite3")
+
+    def tearDown(self) -> None:
+        self.cache.close()
+        self._tmp.cleanup()
+
+    def test_round_trip_preserves_page(self) -> None:
+        self.cache.put(CachedPage(url="https://acme.com/team", final_url="https://www.acme.com/team", status=200, headers={"ETag": "x"}, body="<p>Hi</p>", fetched_at=time.time()))
+        page = self.cache.get("https://acme.com/team/")
+        self.assertIsNotNone(page)
+        self.assertTrue(page.from_cache)
+        self.assertEqual(page.body, "<p>Hi</p>")
+        self.assertEqual(page.headers["ETag"], "x")
+        self.assertEqual(page.final_url, "https://www.acme.com/team")
+
+    def test_stale_page_is_not_returned(self) -> None:
+        self.cache.put(CachedPage(url="https://acme.com/", final_url="https://acme.com/", status=200, body="old", fetched_at=time.time() - 3600))
+        self.assertIsNone(self.cache.get("https://acme.com/", max_age_seconds=60))
+
+    @patch("src.page_cache.requests.get")
+    def test_fetch_page_downloads_once_per_window(self, mock_get) -> None:
+        mock_get.return_value = _response("<html>team</html>")
+        first = fetch_page("https://acme.com/team", timeout=5, user_agent="t", cache=self.cache)
+        second = fetch_page("https://acme.com/team/", timeout=5, user_agent="t", cache=self.cache)
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertFalse(first.from_cache)
+        self.assertTrue(second.from_cache)
+        self.assertEqual(second.body, "<html>team</html>")
+
+    @patch("src.page_cache.requests.get")
+    def test_stale_page_is_revalidated_with_conditional_request(self, mock_get) -> None:
+        self.cache.put(CachedPage(
+            url="https://acme.com/team", final_url="https://acme.com/team", status=200,
+            headers={"etag": '"v1"', "Last-Modified": "Mon, 05 Oct 2026 10:00:00 GMT"},
+            body="<p>Jane Doe</p>", fetched_at=time.time() - 3600,
+        ))
+        mock_get.return_value = _response("", status=304)
+        page = fetch_page("https://acme.com/team", timeout=5, user_agent="t", cache=self.cache, max_age_seconds=60)
+
+        sent = mock_get.call_args.kwargs["headers"]
+        self.assertEqual(sent["If-None-Match"], '"v1"')
+        self.assertEqual(sent["If-Modified-Since"], "Mon, 05 Oct 2026 10:00:00 GMT")
+        mock_get.return_value.iter_content.assert_not_called()
+        self.assertTrue(page.unchanged)
+        self.assertEqual(page.body, "<p>Jane Doe</p>")
+        self.assertIsNotNone(self.cache.get("https://acme.com/team", max_age_seconds=60))
+
+    @patch("src.page_cache.requests.get")
+    def test_same_body_is_flagged_unchanged(self, mock_get) -> None:
+        self.cache.put(CachedPage(url="https://acme.com/", final_url="https://acme.com/", status=200, body="same", fetched_at=time.time() - 3600))
+        mock_get.return_value = _response("same", url="https://acme.com/")
+        page = fetch_page("https://acme.com/", timeout=5, user_agent="t", cache=self.cache, max_age_seconds=60)
+        self.assertTrue(page.unchanged)
+        self.assertEqual(page.content_hash, content_hash("same"))
+
+    @patch("src.page_cache.requests.get", side_effect=ConnectionError("boom"))
+    def test_network_errors_are_not_cached(self, mock_get) -> None:
+        self.assertIsNone(fetch_page("https://down.example/", timeout=5, user_agent="t", cache=self.cache))
+        self.assertIsNone(self.cache.get("https://down.example/"))
+
+
+class TestFetchLimits(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.cache = PageCache(Path(self._tmp.name) / "pages.sqlite3")
+        self.policy = FetchPolicy(limits=FetchLimits(max_body_bytes=10, max_domain_bytes=25, deadline_seconds=5))
+
+    def tearDown(self) -> None:
+        self.cache.close()
+        self._tmp.cleanup()
+
+    def _fetch(self, url: str):
+        return self.policy.fetch(url, timeout=5, cache=self.cache)
+
+    @patch("src.page_cache.requests.get")
+    def test_disallowed_content_type_is_not_read(self, mock_get) -> None:
+        resp = _response("", headers={"Content-Type": "application/pdf"})
+        mock_get.return_value = resp
+        page = self._fetch("https://acme.com/brochure")
+        self.assertEqual(page.body, "")
+        self.assertEqual(page.headers[SKIPPED_HEADER], "content-type")
+        resp.iter_content.assert_not_called()
+        self.assertTrue(mock_get.call_args.kwargs["stream"])
+
+    @patch("src.page_cache.requests.get")
+    def test_body_is_cut_at_max_bytes(self, mock_get) -> None:
+        mock_get.return_value = _response("", chunks=[b"0123456", b"789abcdef"])
+        page = self._fetch("https://acme.com/long")
+        self.assertEqual(page.body, "0123456789")
+        self.assertEqual(page.headers[TRUNCATED_HEADER], "max-body-bytes")
+
+    @patch("src.page_cache.requests.get")
+    def test_deadline_stops_slow_servers_and_is_not_cached(self, mock_get) -> None:
+        mock_get.return_value = _response("", chunks=[b"ab", b"cd", b"ef"])
+        with patch("src.page_cache.time.monotonic", side_effect=[0.0, 1.0, 6.0, 7.0]):
+            page = self._fetch("https://acme.com/drip")
+        self.assertEqual(page.body, "abcd")
+        self.assertEqual(page.headers[TRUNCATED_HEADER], "deadline")
+        self.assertIsNone(self.cache.get("https://acme.com/drip"))
+
+    @patch("src.page_cache.requests.get")
+    def test_domain_byte_budget_stops_further_fetches(self, mock_get) -> None:
+        mock_get.side_effect = lambda *a, **k: _response("x" * 10)
+        for path in ("a", "b"):
+            self.assertIsNotNone(self._fetch(f"https://acme.com/{path}"))
+        self.assertIsNotNone(self._fetch("https://www.acme.com/c"))
+        self.assertIsNone(self._fetch("https://acme.com/d"))
+        self.assertEqual(mock_get.call_count, 3)
+        self.assertIsNotNone(self._fetch("https://other.com/"))
+
+        # the budget belongs to the run: the next run's policy starts empty
+        self.policy = FetchPolicy(limits=self.policy.limits)
+        self.assertIsNotNone(self._fetch("https://acme.com/d"))
+
+    def test_policy_reads_the_callers_crawler_config(self) -> None:
+        cfg = Path(self._tmp.name) / "crawler.yaml"
+        cfg.write_text(
+            "crawler:\n  page_cache_max_age_hours: 2\n  rate_limit_seconds: 0.5\n"
+            "  fetch_limits:\n    max_body_bytes: 123\n",
+            encoding="utf-8",
+        )
+        policy = load_fetch_policy(str(cfg))
+        self.assertEqual(policy.limits.max_body_bytes, 123)
+        self.assertEqual(policy.max_age_seconds, 7200)
+        self.assertEqual(policy.rate_limiter.interval, 0.5)
+        missing = load_fetch_policy(str(Path(self._tmp.name) / "missing.yaml"))
+        self.assertEqual(missing.limits, FetchLimits())
+
+    @patch("src.page_cache.requests.get")
+    def test_politeness_wait_is_per_host_and_skipped_on_cache_hits(self, mock_get) -> None:
+        mock_get.side_effect = lambda *a, **k: _response("ok")
+        self.policy.rate_limiter = MagicMock(spec=HostRateLimiter)
+        for url in ("https://acme.com/a", "https://www.acme.com/a", "https://acme.com/a", "https://other.com/"):
+            self._fetch(url)
+        waited = [c.args[0] for c in self.policy.rate_limiter.wait.call_args_list]
+        self.assertEqual(waited, ["acme.com", "acme.com", "other.com"])
+
+    def test_host_rate_limiter_spaces_requests_per_host(self) -> None:
+        limiter = HostRateLimiter(10)
+        with patch("src.page_cache.time.monotonic", return_value=100.0), patch("src.page_cache.time.sleep") as sleep:
+            limiter.wait("acme.com")
+            limiter.wait("other.com")
+            limiter.wait("acme.com")
+        self.assertEqual([c.args[0] for c in sleep.call_args_list], [10.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
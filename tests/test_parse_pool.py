@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import tempfile
+import threading
+import time
+import unittest
+from dataclasses import replace
+from pathlib import Path
+from typing import List
+from unittest.mock import patch
+
+from src.parse_pool import (
+    EXTRACT_CONTACT_CANDIDATES,
+    EXTRACT_CONTACTS,
+    EXTRACT_PEOPLE,
+    MiningConcurrency,
+    ParsePool,
+    ParseTask,
+    extract_page,
+    map_domains,
+)
+from src.page_cache import PageCache, content_hash
+
+PAGE = """
+<html><body>
+  <nav><a href="/about">About</a></nav>
+  <div class="bio"><h3>Maria Lopez</h3><p>Senior Estimator</p></div>
+  <p>Call 555-123-4567 or email Dan Whitaker dwhitaker@acme.com</p>
+  <a href="/our-team">Meet the team</a>
+</body></html>
+"""
+
+
+def _task() -> ParseTask:
+    return ParseTask(
+        url="https://acme.com/team",
+        html=PAGE,
+        extractors=(EXTRACT_CONTACTS, EXTRACT_PEOPLE, EXTRACT_CONTACT_CANDIDATES),
+        context={"company": "acme builders", "domain": "acme.com"},
+    )
+
+
+class TestParsePool(unittest.TestCase):
+    def test_process_pool_matches_inline_extraction(self) -> None:
+        with ParsePool(workers=0) as inline:
+            expected = inline.parse(_task())
+        with ParsePool(workers=2, max_pending=2) as pool:
+            futures = [pool.submit(_task()) for _ in range(4)]
+            results = [f.result() for f in futures]
+
+        self.assertIn("dwhitaker@acme.com", expected.emails)
+        self.assertTrue(expected.people)
+        self.assertTrue(expected.contact_candidates)
+        noise = {link.url: link.noise for link in expected.links}
+        self.assertTrue(noise["https://acme.com/about"])
+        self.assertFalse(noise["https://acme.com/our-team"])
+        for got in results:
+            self.assertEqual(got, expected)
+
+    def test_unchanged_content_is_not_reparsed(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            memo = PageCache(Path(tmp) / "pages.sqlite3")
+            task = _task()
+            task.content_hash = content_hash(task.html)
+            with patch("src.parse_pool.extract_page", wraps=extract_page) as parse:
+                with ParsePool(workers=0, memo=memo) as pool:
+                    first = pool.parse(task)
+                    again = pool.parse(task)
+                    other_company = pool.parse(replace(task, context={"company": "bolt", "domain": "acme.com"}))
+            memo.close()
+        self.assertEqual(parse.call_count, 2)
+        self.assertEqual(again, first)
+        self.assertNotEqual(other_company.people, first.people)
+
+    def test_imap_fetches_ahead_and_yields_in_order(self) -> None:
+        produced: List[int] = []
+
+        def _tasks():
+            for n in range(5):
+                produced.append(n)
+                yield n, (None if n == 2 else replace(_task(), url=f"https://acme.com/p{n}"))
+
+        with ParsePool(workers=0) as pool:
+            pool.in_flight = 3
+            seen = []
+            for key, extract in pool.imap(_tasks()):
+                seen.append((key, extract.url, len(produced)))
+        self.assertEqual([key for key, _, _ in seen], [0, 1, 3, 4])
+        # three parses were pending (the skipped fetch does not count) before the first was collected
+        self.assertEqual(seen[0], (0, "https://acme.com/p0", 4))
+
+    def test_concurrency_config(self) -> None:
+        cfg = MiningConcurrency.from_config({"concurrency": {"fetch_workers": 3, "parse_workers": "auto"}})
+        self.assertEqual(cfg.fetch_workers, 3)
+        self.assertGreaterEqual(cfg.parse_workers, 1)
+        self.assertEqual(MiningConcurrency.from_config({}).parse_workers, 0)
+        self.assertEqual(cfg.pages_in_flight, 4)
+        self.assertEqual(ParsePool(workers=0, pages_in_flight=8).in_flight, 1)
+
+    def test_map_domains_runs_concurrently_and_keeps_order(self) -> None:
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def _work(n: int) -> int:
+            with lock:
+                active.append(n)
+                peak.append(len(active))
+            time.sleep(0.02)
+            with lock:
+                active.remove(n)
+            return n * n
+
+        self.assertEqual(map_domains(_work, range(8), workers=4), [n * n for n in range(8)])
+        self.assertGreater(max(peak), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
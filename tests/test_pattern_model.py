@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+from src.pattern_model import (
+    MIN_PATTERN_PROBABILITY,
+    PatternModel,
+    detect_patterns,
+    load_ci_observations,
+    load_pattern_model,
+    observations_from_mined_patterns,
+    observations_from_people,
+    record_verification_outcomes,
+    size_band,
+)
+from src.people_email_generator import generate_email_candidates_for_people
+from src.verification_cache import VerificationCache
+
+SCHEMA = Path(__file__).resolve().parents[1] / "contact_intelligence" / "schema" / "create_tables.sql"
+
+
+def _obs(rows: list) -> pd.DataFrame:
+    return pd.DataFrame(rows, columns=["domain", "pattern", "hits", "misses"])
+
+
+class TestPatternModel(unittest.TestCase):
+    def test_detect_patterns_from_names(self) -> None:
+        names = pd.DataFrame({
+            "first_name": ["John", "John", "Ann", "", "Bo"],
+            "last_name": ["Doe", "Doe", "Lee", "", "Li"],
+            "full_name": ["", "", "", "Mary Smith", ""],
+        })
+        emails = pd.Series(["john.doe@a.com", "JDoe@a.com", "info@a.com", "msmith@a.com", None])
+        self.assertEqual(detect_patterns(emails, names).tolist(), ["first.last", "flast", "", "flast", ""])
+
+    def test_domain_evidence_dominates_prior(self) -> None:
+        model = PatternModel.fit(_obs([("acme.com", "flast", 3, 0), ("acme.com", "first.last", 0, 2)]))
+        ranked = model.ranked("acme.com")
+        self.assertEqual(ranked[0][0], "flast")
+        self.assertGreater(ranked[0][1], 0.5)
+        probs = model.probabilities("acme.com")
+        self.assertLess(probs["first.last"], probs["firstlast"])
+        # no evidence: the global shares, led by the pattern seen most
+        self.assertEqual(model.ranked("other.com")[0][0], "flast")
+
+    def test_segment_prior_for_unseen_domain(self) -> None:
+        segments = {"a.com": ("crane rental", "mid"), "b.com": ("crane rental", "mid"), "c.com": ("crane rental", "mid")}
+        obs = _obs([
+            ("a.com", "first_last", 4, 0),
+            ("b.com", "first_last", 4, 0),
+            ("x.com", "first.last", 5, 0),
+            ("y.com", "first.last", 5, 0),
+        ])
+        model = PatternModel.fit(obs, segments)
+        self.assertEqual(model.ranked("c.com")[0][0], "first_last")
+        self.assertEqual(model.ranked("z.com")[0][0], "first.last")
+
+    def test_size_band(self) -> None:
+        self.assertEqual([size_band(v) for v in (None, "", 12, "120", 5000)], ["", "", "small", "mid", "large"])
+
+    def test_observations_from_people_and_mined_patterns(self) -> None:
+        people = pd.DataFrame({
+            "first_name": ["John", "Ann", "Ann"],
+            "last_name": ["Doe", "Lee", "Lee"],
+            "contractor_domain": ["acme.com", "acme.com", "acme.com"],
+            "found_email": ["jdoe@acme.com", "ann@gmail.com", "info@acme.com"],
+        })
+        self.assertEqual(observations_from_people(people)[["domain", "pattern"]].values.tolist(), [["acme.com", "flast"]])
+
+        mined = pd.DataFrame({
+            "source_domain": ["Acme.com", "bolt.com", "cord.com", "dune.com"],
+            "pattern": ["first.last", "first.last", "flast", "flast"],
+            "pattern_basis_emails": ["j.doe@acme.com,a.lee@acme.com,jsmith@acme.com", "", "john.doe@cord.com,ann_lee@cord.com", ""],
+        })
+        obs = observations_from_mined_patterns(mined)
+        # each basis email counts under its own shape; bare local parts and a bare "flast" count for nothing
+        self.assertEqual(
+            obs[["domain", "pattern", "hits", "misses"]].values.tolist(),
+            [
+                ["acme.com", "f.lastname", 2.0, 0.0],
+                ["bolt.com", "first.last", 1.0, 0.0],
+                ["cord.com", "first_last", 1.0, 0.0],
+                ["cord.com", "first.last", 1.0, 0.0],
+            ],
+        )
+
+    def test_first_name_domain_keeps_first_above_cutoff(self) -> None:
+        mined = pd.DataFrame({
+            "source_domain": ["acme.com"],
+            "pattern": ["flast"],
+            "pattern_basis_emails": ["john@acme.com,mike@acme.com,sara@acme.com,bob@acme.com"],
+        })
+        model = PatternModel.fit(observations_from_mined_patterns(mined))
+        self.assertGreaterEqual(model.probabilities("acme.com")["first"], MIN_PATTERN_PROBABILITY)
+        people = pd.DataFrame([{"first_name": "Dana", "last_name": "Reyes", "contractor_domain": "acme.com"}])
+        out = generate_email_candidates_for_people(people, max_patterns_per_person=8, pattern_model=model)
+        self.assertIn("dana@acme.com", out["email"].tolist())
+
+
+class TestPatternEvidenceSources(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self._tmp.name)
+        self.cache = VerificationCache(self.dir / "verify.sqlite3")
+
+    def tearDown(self) -> None:
+        self.cache.close()
+        self._tmp.cleanup()
+
+    def _ci_db(self) -> Path:
+        path = self.dir / "ci.db"
+        conn = sqlite3.connect(str(path))
+        conn.executescript(SCHEMA.read_text(encoding="utf-8"))
+        conn.execute("INSERT INTO companies (company_id, company_name, domain, industry, employee_count) VALUES (1, 'Acme', 'acme.com', 'Crane Rental', 80)")
+        conn.execute("INSERT INTO contacts (contact_id, company_id, first_name, last_name) VALUES (1, 1, 'John', 'Doe')")
+        conn.execute("INSERT INTO contact_patterns (domain, pattern_template, verified_count, bounce_count) VALUES ('acme.com', '{first_initial}{last}', 3, 0)")
+        conn.execute("INSERT INTO contact_patterns (domain, pattern_template, verified_count) VALUES ('acme.com', '{first}{last_initial}', 9)")
+        conn.execute("INSERT INTO feedback_outcomes (contact_id, email_tested, outcome_type) VALUES (1, 'john.doe@acme.com', 'bounce')")
+        conn.commit()
+        conn.close()
+        return path
+
+    def test_contact_intelligence_counts_feedback_and_segments(self) -> None:
+        obs, segments = load_ci_observations(self._ci_db())
+        self.assertEqual(segments, {"acme.com": ("crane rental", "mid")})
+        # templates the generator has no pattern for are left out
+        self.assertEqual(
+            obs[["pattern", "hits", "misses"]].values.tolist(), [["flast", 3.0, 0.0], ["first.last", 0.0, 1.0]]
+        )
+        self.assertEqual(load_ci_observations(self.dir / "missing.db")[1], {})
+
+    def test_verification_outcomes_are_stored_per_address(self) -> None:
+        verified = pd.DataFrame({
+            "email": ["jdoe@acme.com", "john.doe@acme.com", "ann@acme.com"],
+            "contractor_domain": ["acme.com"] * 3,
+            "email_pattern": ["flast", "first.last", "first"],
+            "email_verification_status": ["valid", "invalid", "catchall"],
+        })
+        self.assertEqual(record_verification_outcomes(verified, cache=self.cache), 2)
+        # verified again next run: replaces, does not double count
+        record_verification_outcomes(verified, cache=self.cache)
+        evidence = self.cache.pattern_evidence().sort_values("pattern")
+        self.assertEqual(evidence[["pattern", "hits", "misses"]].values.tolist(), [["first.last", 0, 1], ["flast", 1, 0]])
+
+        model = load_pattern_model(cache=self.cache, ci_db_path=self._ci_db())
+        self.assertEqual(model.ranked("acme.com")[0][0], "flast")
+
+
+class TestGeneratorWithPatternModel(unittest.TestCase):
+    def _people(self) -> pd.DataFrame:
+        return pd.DataFrame([
+            {"first_name": "John", "last_name": "Martinez", "contractor_name_normalized": "acme construction", "contractor_domain": "acmeconstruction.com"},
+            {"first_name": "Ann", "last_name": "Lee", "contractor_name_normalized": "zeta", "contractor_domain": "zeta.com"},
+        ])
+
+    def test_emits_only_probable_patterns_in_model_order(self) -> None:
+        model = PatternModel.fit(_obs([("acmeconstruction.com", "first_last", 6, 0)]))
+        out = generate_email_candidates_for_people(
+            self._people(), max_patterns_per_person=8, pattern_model=model, min_pattern_probability=0.2
+        )
+        acme = out[out["contractor_domain"] == "acmeconstruction.com"]
+        self.assertEqual(acme["email"].tolist(), ["john_martinez@acmeconstruction.com"])
+        self.assertEqual(acme["pattern_rank"].tolist(), [1])
+        self.assertAlmostEqual(acme["pattern_confidence"].iloc[0], model.probabilities("acmeconstruction.com")["first_last"], places=4)
+        # no domain evidence: still the most probable pattern at least
+        zeta = out[out["contractor_domain"] == "zeta.com"]
+        self.assertEqual(zeta["email_pattern"].tolist()[0], "first_last")
+        self.assertTrue((zeta["pattern_confidence"] >= 0.2).iloc[1:].all())
+
+    def test_top_k_still_applies(self) -> None:
+        model = PatternModel.fit(_obs([]))
+        out = generate_email_candidates_for_people(self._people(), max_patterns_per_person=2, pattern_model=model, min_pattern_probability=0.0)
+        self.assertEqual(out.groupby("contractor_domain").size().tolist(), [2, 2])
+        # with no evidence at all the shares follow the PATTERN_SPECS confidences
+        self.assertEqual(out["email_pattern"].tolist()[:2], ["first.last", "flast"])
+
+
+if __name__ == "__main__":
+    unittest.main()
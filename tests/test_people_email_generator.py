@@ -88,6 +88,61 @@ class TestPeopleEmailGenerator(unittest.TestCase):
         self.assertIn("john_martinez@acmeconstruction.com", emails)
         self.assertIn("martinez.john@acmeconstruction.com", emails)
 
+    def test_address_taken_by_earlier_person_does_not_use_a_slot(self) -> None:
+        df = pd.DataFrame(
+            [
+                {"first_name": "John", "last_name": "Martinez", "contractor_name_normalized": "acme construction", "contractor_domain": "acmeconstruction.com"},
+                {"first_name": "John", "last_name": "Martinez", "contractor_name_normalized": "acme construction co", "contractor_domain": "acmeconstruction.com"},
+                {"first_name": "Ann", "last_name": "Lee", "contractor_name_normalized": "acme construction", "contractor_domain": "acmeconstruction.com"},
+            ]
+        )
+        out = generate_email_candidates_for_people(df)
+        self.assertEqual(
+            out["email"].tolist(),
+            [
+                "john.martinez@acmeconstruction.com",
+                "jmartinez@acmeconstruction.com",
+                "johnmartinez@acmeconstruction.com",
+                "j.martinez@acmeconstruction.com",
+                "ann.lee@acmeconstruction.com",
+                "alee@acmeconstruction.com",
+            ],
+        )
+        self.assertEqual(out["pattern_rank"].tolist(), [1, 2, 3, 4, 1, 2])
+        self.assertEqual(out["contractor_name_normalized"].tolist()[2], "acme construction co")
+
+    def test_batch_keeps_columns_ordering_and_scores(self) -> None:
+        df = pd.DataFrame(
+            [
+                {"full_name": "Robert  Smith Jr", "contractor_name_normalized": "Best Crane Rental", "contractor_domain": "https://BCR.com/about", "title_confirmed": None},
+                {"first_name": "", "last_name": "", "full_name": "Cher", "contractor_domain": "solo.com"},
+                {"first_name": "Mary-Jo", "last_name": "O'Neil", "contractor_name_normalized": "zeta", "contractor_domain": "zeta.com", "title": " Site  Super ", "title_confirmed": True},
+            ]
+        )
+        out = generate_email_candidates_for_people(df, max_patterns_per_person=3)
+        self.assertEqual(
+            list(out.columns),
+            [
+                "first_name", "last_name", "full_name", "contractor_name_normalized", "contractor_domain", "email",
+                "email_pattern", "pattern_rank", "pattern_confidence", "title", "title_confirmed", "found_email",
+                "source_url", "is_role_inbox",
+            ],
+        )
+        # bcr.com spells the company's initials, so flast is ranked first; the suffix is skipped
+        self.assertEqual(
+            out["email"].tolist()[:3],
+            ["rsmith@bcr.com", "robert.smith@bcr.com", "robertsmith@bcr.com"],
+        )
+        self.assertEqual(out["pattern_rank"].tolist()[:3], [1, 2, 3])
+        self.assertEqual(out["pattern_confidence"].tolist()[:3], [0.93, 0.96, 0.91])
+        self.assertEqual(out["full_name"].iloc[0], "Robert Smith Jr")
+        self.assertEqual(out["first_name"].iloc[0], "Robert")
+        self.assertEqual(out["contractor_domain"].tolist()[3:], ["zeta.com"] * 3)
+        self.assertEqual(out["email"].iloc[3], "maryjo.oneil@zeta.com")
+        self.assertEqual(out["full_name"].iloc[3], "Maryjo Oneil")
+        self.assertEqual(out["title"].iloc[3], "Site Super")
+        self.assertEqual(out["title_confirmed"].tolist(), [False] * 3 + [True] * 3)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,11 +1,24 @@
 from __future__ import annotations
 
 import json
+import logging
+import sys
 import tempfile
+import threading
 import unittest
 from pathlib import Path
 
-from scripts.run_mvp_pipeline import StageDefinition, build_stages, compute_stage_metrics, validate_stage_outputs
+from scripts.run_mvp_pipeline import (
+    StageDefinition,
+    build_stages,
+    compute_stage_metrics,
+    run_stage,
+    run_stage_graph,
+    validate_dag,
+    validate_stage_outputs,
+)
+
+LOG = logging.getLogger("test.mvp_pipeline")
 
 
 class TestMvpPipelineHelpers(unittest.TestCase):
@@ -72,6 +85,67 @@ class TestMvpPipelineHelpers(unittest.TestCase):
             self.assertTrue(stages[-1].required_outputs)
             self.assertTrue(any("top_project_candidates.json" in str(path) for path in stages[-1].required_outputs))
 
+    def test_build_stages_form_a_valid_dag_with_parallel_scrapes(self) -> None:
+        root = Path("/tmp/unused")
+        stages = {s.name: s for s in build_stages(root / "ci.db", root / "j.json", root / "p.json", root / "e", root / "json")}
+        validate_dag(list(stages.values()))
+        self.assertEqual(stages["scrape_permits"].depends_on, [])
+        self.assertEqual(stages["scrape_jobs"].depends_on, [])
+        self.assertEqual(set(stages["normalize_match"].depends_on), {"init_db", "scrape_permits", "scrape_jobs"})
+
+
+def _stage(name: str, *deps: str) -> StageDefinition:
+    return StageDefinition(name=name, command=[name], depends_on=list(deps))
+
+
+class TestStageGraph(unittest.TestCase):
+    def test_independent_stages_run_concurrently_and_dependents_wait(self) -> None:
+        both_scrapes = threading.Barrier(2, timeout=5)
+        order = []
+
+        def execute(stage: StageDefinition):
+            if stage.name.startswith("scrape"):
+                both_scrapes.wait()  # deadlocks unless the two scrapes overlap
+            order.append(stage.name)
+            return {"name": stage.name, "status": "success"}
+
+        stages = [_stage("scrape_a"), _stage("scrape_b"), _stage("merge", "scrape_a", "scrape_b")]
+        results = run_stage_graph(stages, execute, LOG, max_workers=2)
+        self.assertEqual([r["name"] for r in results], ["scrape_a", "scrape_b", "merge"])
+        self.assertEqual(order[-1], "merge")
+
+    def test_failure_cancels_dependents_only(self) -> None:
+        def execute(stage: StageDefinition):
+            return {"name": stage.name, "status": "failed" if stage.name == "a" else "success"}
+
+        stages = [_stage("a"), _stage("b", "a"), _stage("c", "b"), _stage("d")]
+        results = {r["name"]: r for r in run_stage_graph(stages, execute, LOG, max_workers=1)}
+        self.assertEqual(results["b"]["status"], "cancelled")
+        self.assertEqual(results["c"]["status"], "cancelled")
+        self.assertIn("dependency b", results["c"]["failure_reason"])
+        self.assertEqual(results["d"]["status"], "success")
+
+    def test_cycles_and_unknown_dependencies_are_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            validate_dag([_stage("a", "b"), _stage("b", "a")])
+        with self.assertRaises(ValueError):
+            validate_dag([_stage("a", "missing")])
+
+    def test_run_stage_streams_output_into_stage_log(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            stage = StageDefinition(
+                name="echo",
+                command=[sys.executable, "-c", "import sys; print('one'); print('two'); print('warn', file=sys.stderr)"],
+            )
+            with self.assertLogs(LOG, level="INFO") as logs:
+                result = run_stage(stage, LOG, root / "db", root / "j", root / "p", root / "e", root / "json", stage_log_path=root / "stages" / "echo.log")
+            self.assertEqual(result["status"], "success")
+            self.assertEqual(result["stdout"], "one\ntwo")
+            self.assertEqual(result["stderr"], "warn")
+            self.assertIn("INFO:test.mvp_pipeline:[echo] one", logs.output)
+            self.assertEqual(sorted((root / "stages" / "echo.log").read_text(encoding="utf-8").split()), ["one", "two", "warn"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+
+from src import pipeline
+from src.shard_runner import assign_units, domain_shard, in_order, run_shards
+
+
+class TestShardRunner(unittest.TestCase):
+    def test_assign_units_balances_longest_first_and_keeps_input_order(self) -> None:
+        weights = {"phoenix": 10.0, "dallas": 6.0, "chicago": 5.0, "nyc": 4.0}
+        groups = assign_units(["phoenix", "dallas", "chicago", "nyc", "BidBoardScraper"], 2, weights)
+        # BidBoardScraper has no history and counts as the mean (6.25)
+        self.assertEqual(groups, [["phoenix", "chicago"], ["dallas", "nyc", "BidBoardScraper"]])
+        self.assertEqual(assign_units(["a", "b"], 4), [["a"], ["b"]])
+
+    def test_domain_shard_is_stable_and_case_insensitive(self) -> None:
+        self.assertEqual(domain_shard("Acme.com", 7), domain_shard("acme.com ", 7))
+        self.assertEqual({domain_shard(f"d{i}.com", 3) for i in range(50)}, {0, 1, 2})
+
+    def test_in_order_follows_reference_and_puts_unknown_last(self) -> None:
+        df = pd.DataFrame({"d": ["b", "x", "a", "b"], "n": [1, 2, 3, 4]})
+        self.assertEqual(in_order(df, "d", ["a", "b", "a"])["n"].tolist(), [3, 1, 4, 2])
+
+    def test_processes_return_in_job_order_and_raise_the_first_error(self) -> None:
+        self.assertEqual(run_shards(pow, [(2, 5), (3, 2)], processes=True), [32, 9])
+        with self.assertRaises(TypeError):
+            run_shards(pow, [(2, 1), (2, "x")], processes=True)
+
+
+class TestPipelineShardMode(unittest.TestCase):
+    UNITS = {
+        "phoenix_permits": pd.DataFrame({"record": ["r1", "r2"], "company": ["acme", "bolt"]}),
+        "dallas_permits": pd.DataFrame({"record": ["r2", "r3", "r4"], "company": ["bolt", "crane", "dune"]}),
+        "BidBoardScraper": pd.DataFrame({"record": ["r5"], "company": ["acme"]}),
+    }
+
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self._cwd = os.getcwd()
+        os.chdir(self._tmp.name)
+        Path("config").mkdir()
+        for cfg in ("sources", "keywords", "scoring", "crawler", "send_selection"):
+            Path(f"config/{cfg}.yaml").write_text(f"{cfg}: {{}}\n", encoding="utf-8")
+
+    def tearDown(self) -> None:
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+
+    def _run(self, shards: int) -> dict:
+        def select(df, **_):
+            out = df.assign(company_group_key=df["contractor_domain"]).drop_duplicates("company_group_key")
+            return out, pd.DataFrame(), {"send_ready_companies": len(out)}
+
+        mocks = {
+            "ingest_units": MagicMock(return_value=list(self.UNITS)),
+            "ingest_sources": MagicMock(side_effect=lambda path, units: self.UNITS[units[0]].copy()),
+            "normalize_records": MagicMock(side_effect=lambda raw: (raw.assign(dedupe_key=raw["record"]), pd.DataFrame())),
+            "score_and_filter": MagicMock(side_effect=lambda df, *a: df.assign(lift_probability_score=8)),
+            "resolve_domains": MagicMock(side_effect=lambda df: df.assign(contractor_domain=df["company"] + ".com", domain_resolution_source="seed")),
+            "enrich_domains_with_claude": MagicMock(side_effect=lambda df: df),
+            "select_companies_for_send": MagicMock(side_effect=select),
+            "mine_contacts": MagicMock(side_effect=lambda df, cfg: (pd.DataFrame({"source_domain": df["contractor_domain"]}), pd.DataFrame())),
+            "build_candidates": MagicMock(side_effect=lambda sel, *a, **k: pd.DataFrame({"contractor_domain": sel["contractor_domain"], "email_candidate": "info@" + sel["contractor_domain"]})),
+            "verify_with_millionverifier": MagicMock(side_effect=lambda df, **_: pd.DataFrame({"email": df["email_candidate"]})),
+            "export_sender_lists": MagicMock(return_value=(pd.DataFrame({"e": [1]}), pd.DataFrame(), pd.DataFrame(), {})),
+            "export_to_sheets": MagicMock(),
+            "check_gates": MagicMock(return_value={"halt": False}),
+        }
+        with patch.multiple("src.pipeline", **mocks), patch("src.shard_runner.SHARD_USE_PROCESSES", False), \
+                patch("src.pipeline.update_source_state", side_effect=lambda df, s, state: state):
+            pipeline.main(["--shards", str(shards), "--no-stage-cache"])
+        return {name: Path(path).read_bytes() for name, path in (
+            ("normalized", pipeline.NORMALIZED_CSV), ("selected", pipeline.SELECTED_CSV),
+            ("contacts", pipeline.CONTACTS_CSV), ("candidates", pipeline.CANDIDATES_CSV), ("verified", pipeline.VERIFIED_CSV),
+        )}
+
+    def test_shards_merge_deterministically_with_global_dedupe(self) -> None:
+        sharded = self._run(3)
+        self.assertTrue(Path(pipeline.SHARDS_DIR, "jurisdictions", "dallas_permits", "raw_records.csv").exists())
+        self.assertTrue(any(Path(pipeline.SHARDS_DIR, "domains").iterdir()))
+        # r2 came from two jurisdictions and is kept once, in sources.yaml order
+        self.assertEqual(pd.read_csv(pipeline.NORMALIZED_CSV)["record"].tolist(), ["r1", "r2", "r3", "r4", "r5"])
+        self.assertEqual(pd.read_csv(pipeline.VERIFIED_CSV)["email"].tolist(), ["info@acme.com", "info@bolt.com", "info@crane.com", "info@dune.com"])
+        self.assertTrue(Path(pipeline.HOT_CSV).exists())
+        # the merged artifacts do not depend on how many shards ran
+        self.assertEqual(self._run(1), sharded)
+
+    def test_shards_cannot_combine_with_stream_or_stage_window(self) -> None:
+        for argv in (["--shards", "2", "--stream"], ["--shards", "2", "--from-stage", "mine"]):
+            with self.assertRaises(SystemExit), patch("sys.stderr"):
+                pipeline.main(argv)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from collections import Counter
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+
+from src.contact_page_finder import discover_contact_people
+from src.crawl_frontier import YieldTarget
+from src.crawl_planner import CrawlPlan
+from src.page_cache import PageCache
+from src.parse_pool import MiningConcurrency, ParsePool
+from src.people_discovery import discover_people
+from src.site_contact_miner import mine_contacts
+from src.site_crawl import crawl_site, crawl_sites
+
+SITE = {
+    "https://acme.com/": '<a href="/our-team">Our team</a><a href="/contact">Contact</a>',
+    "https://acme.com/our-team": "<div><h3>Maria Lopez</h3><p>Senior Estimator</p></div>",
+    "https://acme.com/contact": "<p>Reach Dan Whitaker dan.whitaker@acme.com or info@acme.com</p>",
+}
+
+
+def _get(url, **kwargs):
+    resp = MagicMock()
+    resp.__enter__.return_value = resp
+    body = SITE.get(url)
+    resp.status_code = 200 if body is not None else 404
+    resp.url = url
+    resp.headers = {"Content-Type": "text/html"}
+    resp.iter_content.return_value = [(body or "").encode("utf-8")]
+    return resp
+
+
+class TestSiteCrawlStage(unittest.TestCase):
+    def test_each_url_is_fetched_once_for_all_three_miners(self) -> None:
+        domains = pd.DataFrame([
+            {"contractor_name_normalized": "acme builders", "contractor_domain": "acme.com", "domain_valid": True}
+        ])
+        inline = MiningConcurrency()
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = PageCache(Path(tmp) / "pages.sqlite3")
+            cfg = Path(tmp) / "crawler.yaml"
+            cfg.write_text(
+                "crawler:\n  max_pages_per_domain: 3\n  max_depth: 2\n  request_timeout_seconds: 1\n"
+                "  rate_limit_seconds: 0\n  user_agent: test\n  include_url_keywords: [contact, team]\n",
+                encoding="utf-8",
+            )
+            with patch("src.page_cache._DEFAULT_CACHE", cache), \
+                    patch("src.page_cache.requests.get", side_effect=_get) as get, \
+                    patch("src.crawl_checkpoint.CHECKPOINT_DIR", Path(tmp) / "checkpoints"), \
+                    patch("src.site_crawl.plan_domain", side_effect=lambda d, **k: CrawlPlan(domain=d)), \
+                    patch("src.people_discovery.load_mining_concurrency", return_value=inline), \
+                    patch("src.contact_page_finder.load_mining_concurrency", return_value=inline), \
+                    patch("src.people_discovery._linkedin_fallback", return_value=[]):
+                sites = crawl_sites(domains, str(cfg))
+                fetched_by_crawl = get.call_count
+                people = discover_people(domains, site_crawls=sites)
+                contacts = discover_contact_people(domains, site_crawls=sites)
+                mined, patterns = mine_contacts(domains, str(cfg), site_crawls=sites)
+            cache.close()
+
+        self.assertEqual(get.call_count, fetched_by_crawl)
+        fetched = Counter(call.args[0] for call in get.call_args_list)
+        self.assertTrue(all(n == 1 for n in fetched.values()))
+        self.assertIn("https://acme.com/our-team", sites["acme.com"].urls)
+        self.assertIn(("maria", "lopez"), set(zip(people["first_name"].str.lower(), people["last_name"].str.lower())))
+        self.assertIn("dan.whitaker@acme.com", set(contacts["found_email"]))
+        self.assertIn("info@acme.com", set(mined["email"]))
+
+    def test_role_inboxes_do_not_meet_the_email_target(self) -> None:
+        site = {
+            "https://acme.com/": '<p>info@acme.com office@acme.com</p><a href="/our-team">Our team</a>',
+            "https://acme.com/our-team": "<p>dan.whitaker@acme.com</p>",
+        }
+
+        def _get_site(url, **kwargs):
+            resp = _get(url, **kwargs)
+            body = site.get(url)
+            resp.status_code = 200 if body is not None else 404
+            resp.iter_content.return_value = [(body or "").encode("utf-8")]
+            return resp
+
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = PageCache(Path(tmp) / "pages.sqlite3")
+            with patch("src.page_cache._DEFAULT_CACHE", cache), \
+                    patch("src.page_cache.requests.get", side_effect=_get_site), \
+                    patch("src.site_crawl.plan_domain", side_effect=lambda d, **k: CrawlPlan(domain=d)), \
+                    patch("src.contact_page_finder.CONTACT_PATHS", []), \
+                    patch("src.people_discovery.DISCOVERY_PATHS", ["/"]):
+                crawled = crawl_site(
+                    "acme builders", "acme.com", pool=ParsePool(), target=YieldTarget(people_with_titles=0, person_emails=2)
+                )
+            cache.close()
+
+        self.assertEqual(crawled.urls, ["https://acme.com/", "https://acme.com/our-team"])
+
+
+if __name__ == "__main__":
+    unittest.main()
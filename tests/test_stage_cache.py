@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+
+from src import pipeline
+from src.stage_cache import StageCache, StageSpec
+
+
+class TestStageCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self._tmp.name)
+        self.raw = str(self.dir / "raw.csv")
+        self.out = str(self.dir / "out.csv")
+        self.cfg = str(self.dir / "cfg.yaml")
+        Path(self.cfg).write_text("a: 1\n", encoding="utf-8")
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _cache(self, **kwargs) -> StageCache:
+        specs = (
+            StageSpec("ingest", configs=(self.cfg,), outputs=(self.raw,), code=("src.stage_cache",)),
+            StageSpec("build", inputs=(self.raw,), outputs=(self.out,)),
+            StageSpec("export", inputs=(self.out,)),
+        )
+        return StageCache("test", specs, manifest_dir=self.dir / "manifests", **kwargs)
+
+    def _run(self, cache: StageCache, stage: str, path: str, content: str) -> bool:
+        ran = cache.should_run(stage)
+        if ran:
+            Path(path).write_text(content, encoding="utf-8")
+            cache.complete(stage, meta={"rows": 2})
+        return ran
+
+    def test_unchanged_stages_are_skipped_until_an_input_changes(self) -> None:
+        cache = self._cache()
+        self.assertTrue(self._run(cache, "ingest", self.raw, "x\n1\n"))
+        self.assertTrue(self._run(cache, "build", self.out, "y\n1\n"))
+
+        again = self._cache()
+        self.assertFalse(again.should_run("ingest"))
+        self.assertFalse(again.should_run("build"))
+        self.assertEqual(again.meta("build"), {"rows": 2})
+
+        # a config edit re-runs ingest; identical output then lets build be skipped
+        Path(self.cfg).write_text("a: 2\n", encoding="utf-8")
+        edited = self._cache()
+        self.assertTrue(self._run(edited, "ingest", self.raw, "x\n1\n"))
+        self.assertFalse(edited.should_run("build"))
+        Path(self.raw).write_text("x\n2\n", encoding="utf-8")
+        self.assertTrue(edited.should_run("build"))
+
+    def test_output_changed_on_disk_is_not_reused(self) -> None:
+        cache = self._cache()
+        self._run(cache, "ingest", self.raw, "x\n1\n")
+        Path(self.raw).write_text("x\n9\n", encoding="utf-8")
+        self.assertTrue(self._cache().should_run("ingest"))
+
+    def test_max_age_expires_result(self) -> None:
+        spec = StageSpec("ingest", outputs=(self.raw,), max_age_seconds=60)
+        cache = StageCache("aged", (spec,), manifest_dir=self.dir)
+        self._run(cache, "ingest", self.raw, "x\n")
+        self.assertFalse(StageCache("aged", (spec,), manifest_dir=self.dir).should_run("ingest"))
+        with patch("src.stage_cache.time.time", return_value=time.time() + 120):
+            self.assertTrue(StageCache("aged", (spec,), manifest_dir=self.dir).should_run("ingest"))
+
+    def test_editing_an_imported_module_invalidates_the_stage(self) -> None:
+        pkg = self.dir / "stagepkg"
+        (pkg / "helpers").mkdir(parents=True)
+        (pkg / "__init__.py").write_text("", encoding="utf-8")
+        (pkg / "helpers" / "__init__.py").write_text("", encoding="utf-8")
+        (pkg / "stage.py").write_text("def run():\n    from .helpers import text\n    return text.clean()\n", encoding="utf-8")
+        (pkg / "helpers" / "text.py").write_text("def clean():\n    return 1\n", encoding="utf-8")
+        sys.path.insert(0, str(self.dir))
+        self.addCleanup(sys.path.remove, str(self.dir))
+        for name in ("stagepkg", "stagepkg.stage", "stagepkg.helpers", "stagepkg.helpers.text"):
+            self.addCleanup(sys.modules.pop, name, None)
+
+        spec = StageSpec("build", outputs=(self.out,), code=("stagepkg.stage",))
+        cache = StageCache("code", (spec,), manifest_dir=self.dir / "manifests")
+        self._run(cache, "build", self.out, "y\n")
+        self.assertFalse(StageCache("code", (spec,), manifest_dir=self.dir / "manifests").should_run("build"))
+
+        (pkg / "helpers" / "text.py").write_text("def clean():\n    return 2  # changed\n", encoding="utf-8")
+        self.assertTrue(StageCache("code", (spec,), manifest_dir=self.dir / "manifests").should_run("build"))
+
+    def test_from_and_until_stage(self) -> None:
+        cache = self._cache()
+        self._run(cache, "ingest", self.raw, "x\n")
+        self._run(cache, "build", self.out, "y\n")
+
+        resumed = self._cache(from_stage="build", until_stage="build")
+        self.assertFalse(resumed.should_run("ingest"))
+        self.assertTrue(resumed.should_run("build"))
+        self.assertTrue(resumed.stop_after("build"))
+        self.assertFalse(resumed.stop_after("ingest"))
+
+        self.assertTrue(self._cache(enabled=False).should_run("ingest"))
+        with self.assertRaises(ValueError):
+            self._cache(from_stage="mining")
+        with self.assertRaises(ValueError):
+            self._cache(from_stage="export", until_stage="ingest")
+
+
+class TestPipelineStageReuse(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self._cwd = os.getcwd()
+        os.chdir(self._tmp.name)
+        for cfg in ("sources", "keywords", "scoring", "crawler", "send_selection"):
+            Path("config").mkdir(exist_ok=True)
+            Path(f"config/{cfg}.yaml").write_text(f"{cfg}: {{}}\n", encoding="utf-8")
+
+    def tearDown(self) -> None:
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+
+    def _run(self, *argv: str) -> dict:
+        companies = pd.DataFrame({
+            "contractor_name_normalized": ["acme"],
+            "contractor_domain": ["acme.com"],
+            "lift_probability_score": [8],
+        })
+        candidates = pd.DataFrame({"contractor_domain": ["acme.com"], "email_candidate": ["info@acme.com"]})
+        mocks = {
+            "ingest_sources": MagicMock(return_value=pd.DataFrame({"record": ["r1"]})),
+            "normalize_records": MagicMock(return_value=(pd.DataFrame({"record": ["r1"]}), pd.DataFrame())),
+            "score_and_filter": MagicMock(return_value=companies),
+            "resolve_domains": MagicMock(return_value=companies),
+            "enrich_domains_with_claude": MagicMock(side_effect=lambda df: df),
+            "select_companies_for_send": MagicMock(return_value=(companies, pd.DataFrame(), {"send_ready_companies": 1})),
+            "mine_contacts": MagicMock(return_value=(pd.DataFrame({"email": ["info@acme.com"]}), pd.DataFrame({"domain": ["acme.com"]}))),
+            "build_candidates": MagicMock(return_value=candidates),
+            "verify_with_millionverifier": MagicMock(return_value=pd.DataFrame({"email": ["info@acme.com"]})),
+            "export_sender_lists": MagicMock(return_value=(pd.DataFrame({"e": [1]}), pd.DataFrame({"e": [2]}), pd.DataFrame(), {})),
+            "export_to_sheets": MagicMock(),
+            "check_gates": MagicMock(return_value={"halt": False}),
+        }
+        with patch.multiple("src.pipeline", **mocks), patch("src.pipeline.update_source_state", side_effect=lambda df, s, state: state):
+            pipeline.main(list(argv))
+        return mocks
+
+    def test_second_run_reuses_everything_and_from_stage_reruns_export_only(self) -> None:
+        first = self._run()
+        self.assertEqual(first["ingest_sources"].call_count, 1)
+        self.assertEqual(first["check_gates"].call_count, 1)
+
+        second = self._run()
+        self.assertEqual(sum(m.call_count for m in second.values()), 0)
+
+        export_only = self._run("--from-stage", "export")
+        self.assertEqual(export_only["export_sender_lists"].call_count, 1)
+        self.assertEqual(export_only["check_gates"].call_count, 1)
+        for name in ("ingest_sources", "resolve_domains", "mine_contacts", "verify_with_millionverifier"):
+            self.assertEqual(export_only[name].call_count, 0, name)
+        # selector metrics come back from the manifest for the QA report
+        qa = export_only["check_gates"].call_args[0][0]
+        self.assertEqual(qa["send_ready_companies"], 1)
+
+    def test_until_stage_stops_early(self) -> None:
+        mocks = self._run("--until-stage", "mine")
+        self.assertEqual(mocks["mine_contacts"].call_count, 1)
+        self.assertEqual(mocks["build_candidates"].call_count, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+
+from src import pipeline
+from src.stream_runner import StreamStage, micro_batches, run_stream
+
+
+class TestRunStream(unittest.TestCase):
+    def test_micro_batches_split_and_drop_empty(self) -> None:
+        frames = [pd.DataFrame({"a": range(5)}), pd.DataFrame({"a": []}), pd.DataFrame({"a": [9]})]
+        self.assertEqual([b["a"].tolist() for b in micro_batches(frames, rows=2)], [[0, 1], [2, 3], [4], [9]])
+
+    def test_stages_overlap_and_keep_order(self) -> None:
+        seen = []
+        second_started = threading.Event()
+
+        def slow_first(n: int) -> int:
+            if n == 1:
+                # the second stage is already working on batch 0 while batch 1 is still here
+                self.assertTrue(second_started.wait(5))
+            return n * 10
+
+        def second(n: int) -> None:
+            second_started.set()
+            seen.append(n)
+
+        stats = run_stream(iter([0, 1, 2]), [StreamStage("first", slow_first), StreamStage("second", second)], queue_size=1)
+        self.assertEqual(seen, [0, 10, 20])
+        self.assertEqual((stats["first"].batches_in, stats["first"].batches_out), (3, 3))
+        self.assertEqual(stats["second"].batches_out, 0)
+
+    def test_none_forwards_nothing_and_workers_share_a_stage(self) -> None:
+        out = []
+        lock = threading.Lock()
+
+        def keep_even(n: int):
+            time.sleep(0.001)
+            return n if n % 2 == 0 else None
+
+        def collect(n: int) -> None:
+            with lock:
+                out.append(n)
+
+        run_stream(range(20), [StreamStage("filter", keep_even, workers=3), StreamStage("collect", collect)])
+        self.assertEqual(sorted(out), list(range(0, 20, 2)))
+
+    def test_first_error_stops_the_stream_and_is_raised(self) -> None:
+        processed = []
+
+        def boom(n: int) -> int:
+            if n == 2:
+                raise ValueError("bad batch")
+            return n
+
+        with self.assertRaises(ValueError):
+            run_stream(range(100), [StreamStage("boom", boom), StreamStage("sink", processed.append)], queue_size=1)
+        self.assertLess(len(processed), 100)
+
+
+class TestPipelineStreamMode(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self._cwd = os.getcwd()
+        os.chdir(self._tmp.name)
+        Path("config").mkdir()
+        for cfg in ("sources", "keywords", "scoring", "crawler", "send_selection"):
+            Path(f"config/{cfg}.yaml").write_text(f"{cfg}: {{}}\n", encoding="utf-8")
+
+    def tearDown(self) -> None:
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+
+    def test_stream_runs_every_batch_once_per_company_then_exports(self) -> None:
+        sources = [
+            pd.DataFrame({"record": ["r1", "r2"], "company": ["acme", "bolt"]}),
+            pd.DataFrame({"record": ["r2", "r3"], "company": ["bolt", "acme"]}),
+        ]
+
+        def normalize(raw):
+            return raw.assign(dedupe_key=raw["record"]), pd.DataFrame()
+
+        def resolve(df):
+            return df.assign(contractor_domain=df["company"] + ".com", domain_resolution_source="seed")
+
+        def select(df, **_):
+            out = df.assign(company_group_key=df["contractor_domain"]).drop_duplicates("company_group_key")
+            return out, pd.DataFrame(), {"send_ready_companies": len(out)}
+
+        def build(selected, *_, **__):
+            return pd.DataFrame({"contractor_domain": selected["contractor_domain"], "email_candidate": "info@" + selected["contractor_domain"]})
+
+        mocks = {
+            "iter_source_frames": MagicMock(return_value=iter(sources)),
+            "normalize_records": MagicMock(side_effect=normalize),
+            "score_and_filter": MagicMock(side_effect=lambda df, *a: df.assign(lift_probability_score=8)),
+            "resolve_domains": MagicMock(side_effect=resolve),
+            "enrich_domains_with_claude": MagicMock(side_effect=lambda df: df),
+            "select_companies_for_send": MagicMock(side_effect=select),
+            "mine_contacts": MagicMock(side_effect=lambda df, cfg, pool=None: (df[["contractor_domain"]], pd.DataFrame())),
+            "build_candidates": MagicMock(side_effect=build),
+            "verify_with_millionverifier": MagicMock(side_effect=lambda df: pd.DataFrame({"email": df["email_candidate"]})),
+            "export_sender_lists": MagicMock(return_value=(pd.DataFrame({"e": [1]}), pd.DataFrame(), pd.DataFrame(), {})),
+            "export_to_sheets": MagicMock(),
+            "check_gates": MagicMock(return_value={"halt": False}),
+            "ingest_sources": MagicMock(),
+        }
+        with patch.multiple("src.pipeline", **mocks), patch("src.pipeline.update_source_state", side_effect=lambda df, s, state: state):
+            pipeline.main(["--stream"])
+
+        self.assertEqual(mocks["ingest_sources"].call_count, 0)
+        # the duplicate r2 is dropped; acme and bolt are each mined once
+        self.assertEqual(pd.read_csv("data/normalized_records.csv")["record"].tolist(), ["r1", "r2", "r3"])
+        mined = [d for call in mocks["mine_contacts"].call_args_list for d in call[0][0]["contractor_domain"]]
+        self.assertEqual(sorted(mined), ["acme.com", "bolt.com"])
+        self.assertEqual(sorted(pd.read_csv("data/verified_contacts.csv")["email"]), ["info@acme.com", "info@bolt.com"])
+        self.assertTrue(Path(pipeline.HOT_PREVIEW_CSV).exists())
+        self.assertTrue(Path(pipeline.HOT_CSV).exists())
+        # one per micro-batch, plus the final selection over every enriched row
+        self.assertEqual(mocks["select_companies_for_send"].call_count, 3)
+
+        # the streamed stages are recorded: a batch re-run only redoes the export
+        with patch.multiple("src.pipeline", **{k: MagicMock(side_effect=AssertionError(k)) for k in ("ingest_sources", "mine_contacts", "verify_with_millionverifier")}), \
+                patch.multiple("src.pipeline", export_sender_lists=mocks["export_sender_lists"], export_to_sheets=MagicMock(), check_gates=mocks["check_gates"]):
+            pipeline.main(["--from-stage", "export"])
+
+
+if __name__ == "__main__":
+    unittest.main()
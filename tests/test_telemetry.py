@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+from unittest.mock import patch
+
+import requests
+
+from src import monitor
+from src.telemetry import RunTelemetry, record_cache, record_http, record_retry, track_stage
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        body = b"x" * 1000
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class TestRunTelemetry(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self._tmp.name)
+        self._state = patch.object(monitor, "STATE_FILE", str(self.dir / "pipeline_state.json"))
+        self._state.start()
+
+    def tearDown(self) -> None:
+        self._state.stop()
+        self._tmp.cleanup()
+
+    def test_stage_deltas_nest_and_land_in_history_and_textfile(self) -> None:
+        record_cache("page", hits=5)  # before the run: not counted
+        with RunTelemetry("demo", textfile_dir=self.dir) as run:
+            with track_stage("ingest") as outer:
+                with track_stage("ingest/permits") as inner:
+                    record_http("permits.example.gov", 0.5, nbytes=2048)
+                    record_retry("millionverifier")
+                    inner.rows_out = 3
+                record_cache("page", hits=3, misses=1)
+                outer.rows_out = 3
+            with track_stage("normalize", rows_in=3) as t:
+                t.cached()
+
+        history = json.loads(Path(monitor.STATE_FILE).read_text(encoding="utf-8"))["run_history"]
+        self.assertEqual(len(history), 1)
+        stages = {s["stage"]: s for s in history[0]["stages"]}
+        self.assertEqual(history[0]["status"], "ok")
+        self.assertEqual(stages["ingest/permits"]["http_hosts"], [{"host": "permits.example.gov", "requests": 1, "seconds": 0.5}])
+        self.assertEqual(stages["ingest/permits"]["retries"], {"millionverifier": 1})
+        self.assertEqual(stages["ingest"]["bytes_downloaded"], 2048)
+        self.assertEqual(stages["ingest"]["cache_hit_rates"], {"page": 0.75})
+        self.assertEqual(stages["normalize"]["status"], "cached")
+        self.assertGreater(stages["normalize"]["peak_rss_bytes"], 0)
+        self.assertEqual(run.stages[0].stage, "ingest/permits")
+
+        prom = (self.dir / "cranegenius_demo.prom").read_text(encoding="utf-8")
+        self.assertIn("# TYPE cranegenius_stage_duration_seconds gauge", prom)
+        self.assertIn('cranegenius_stage_rows_out{pipeline="demo",stage="ingest/permits"} 3', prom)
+        self.assertIn('cranegenius_stage_cache_hits{pipeline="demo",stage="ingest",cache="page"} 3', prom)
+        self.assertIn('cranegenius_stage_cached{pipeline="demo",stage="normalize"} 1', prom)
+        self.assertIn('cranegenius_run_success{pipeline="demo"} 1', prom)
+
+    def test_failed_run_is_recorded_and_history_is_capped(self) -> None:
+        monitor.save_state({"run_history": [{"pipeline": "old"}] * 3})
+        with patch.object(monitor, "MAX_RUN_HISTORY", 2), self.assertRaises(RuntimeError):
+            with RunTelemetry("demo", textfile_dir=self.dir):
+                with track_stage("mine"):
+                    raise RuntimeError("boom")
+        history = monitor.load_state()["run_history"]
+        self.assertEqual([h["pipeline"] for h in history], ["old", "demo"])
+        self.assertEqual(history[-1]["status"], "failed")
+        self.assertEqual(history[-1]["stages"][0]["status"], "failed")
+        self.assertIn('cranegenius_run_success{pipeline="demo"} 0', (self.dir / "cranegenius_demo.prom").read_text(encoding="utf-8"))
+
+    def test_requests_are_counted_by_host(self) -> None:
+        server = HTTPServer(("127.0.0.1", 0), _Handler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            with RunTelemetry("http", textfile_dir=self.dir) as run:
+                with track_stage("fetch"):
+                    for _ in range(2):
+                        requests.get(f"http://127.0.0.1:{server.server_port}/", timeout=5)
+        finally:
+            server.shutdown()
+        fetch = run.stages[0].as_dict()
+        self.assertEqual(fetch["http_hosts"][0]["host"], "127.0.0.1")
+        self.assertEqual(fetch["http_requests"], 2)
+        self.assertEqual(fetch["bytes_downloaded"], 2000)
+
+    def test_track_stage_without_a_run_is_a_no_op(self) -> None:
+        with track_stage("loose") as t:
+            t.rows_out = 1
+        self.assertFalse(Path(monitor.STATE_FILE).exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
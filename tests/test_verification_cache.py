@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from src.verification_cache import DAY_SECONDS, VerificationCache, VerificationRecord, import_legacy_json
+
+
+class TestVerificationCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self._tmp.name)
+        self.cache = VerificationCache(self.dir / "verify.sqlite3")
+
+    def tearDown(self) -> None:
+        self.cache.close()
+        self._tmp.cleanup()
+
+    def test_keyed_by_lowercase_email(self) -> None:
+        self.cache.put(VerificationRecord(email=" Jane.Doe@Acme.com ", status="valid", quality_score="good"))
+        record = self.cache.get("jane.doe@acme.com")
+        self.assertIsNotNone(record)
+        self.assertEqual(record.status, "valid")
+        self.assertEqual(record.quality_score, "good")
+        self.assertEqual(set(self.cache.get_many(["JANE.DOE@ACME.COM", "x@acme.com"])), {"jane.doe@acme.com"})
+
+    def test_ttl_depends_on_status(self) -> None:
+        ten_days_ago = time.time() - 10 * DAY_SECONDS
+        self.cache.put_many([
+            VerificationRecord(email="ok@acme.com", status="valid", verified_at=ten_days_ago),
+            VerificationRecord(email="bad@acme.com", status="invalid", verified_at=ten_days_ago),
+            VerificationRecord(email="maybe@acme.com", status="unknown", verified_at=ten_days_ago),
+            VerificationRecord(email="timeout@acme.com", status="error", verified_at=time.time() - 7200),
+        ])
+        fresh = self.cache.get_many(["ok@acme.com", "bad@acme.com", "maybe@acme.com", "timeout@acme.com"])
+        self.assertEqual(sorted(fresh), ["bad@acme.com", "ok@acme.com"])
+
+    def test_import_legacy_json(self) -> None:
+        legacy = self.dir / "mv_verification_cache.json"
+        legacy.write_text(json.dumps({
+            "a@acme.com": {"result": "ok", "raw": {"quality": "good"}},
+            "b@acme.com": {"result": "catch_all"},
+            "c@acme.com": {"result": "unknown", "error": "timed out"},
+        }), encoding="utf-8")
+        self.cache.put(VerificationRecord(email="b@acme.com", status="invalid"))
+
+        self.assertEqual(import_legacy_json(self.cache, legacy), 2)
+        fresh = self.cache.get_many(["a@acme.com", "b@acme.com", "c@acme.com"])
+        self.assertEqual(fresh["a@acme.com"].status, "valid")
+        self.assertEqual(fresh["a@acme.com"].raw_result, "ok")
+        self.assertEqual(fresh["b@acme.com"].status, "invalid")
+        self.assertEqual(fresh["c@acme.com"].status, "error")
+
+        self.assertEqual(import_legacy_json(self.cache, legacy), 0)
+
+    def test_legacy_entries_age_from_file_mtime(self) -> None:
+        legacy = self.dir / "mv_verification_cache.json"
+        legacy.write_text(json.dumps({"c@acme.com": {"result": "unknown"}}), encoding="utf-8")
+        os.utime(legacy, (time.time() - 2 * DAY_SECONDS,) * 2)
+        self.assertEqual(import_legacy_json(self.cache, legacy), 1)
+        self.assertNotIn("c@acme.com", self.cache.get_many(["c@acme.com"]))
+        self.assertIn("c@acme.com", self.cache.get_many(["c@acme.com"], include_stale=True))
+
+
+if __name__ == "__main__":
+    unittest.main()
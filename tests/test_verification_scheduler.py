@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import unittest
+from typing import Dict, List
+
+import pandas as pd
+
+from src.verification_scheduler import DomainPatternModel, schedule_verification
+
+PATTERNS = [("first.last", 0.96), ("flast", 0.93), ("firstlast", 0.91)]
+
+
+def _candidates(people: Dict[str, List[str]]) -> pd.DataFrame:
+    rows = []
+    for domain, names in people.items():
+        for name in names:
+            first, last = name.split()
+            local = {"first.last": f"{first}.{last}", "flast": f"{first[0]}{last}", "firstlast": f"{first}{last}"}
+            for rank, (pattern, confidence) in enumerate(PATTERNS, start=1):
+                rows.append({
+                    "email_candidate": f"{local[pattern]}@{domain}",
+                    "contractor_domain": domain,
+                    "first_name": first.title(),
+                    "last_name": last.title(),
+                    "email_pattern": pattern,
+                    "pattern_rank": rank,
+                    "pattern_confidence": confidence,
+                })
+    return pd.DataFrame(rows)
+
+
+class _Verifier:
+    """Valid only for addresses in `mailboxes`; records each call's emails."""
+
+    def __init__(self, mailboxes: List[str], catchall_domains: List[str] = ()) -> None:
+        self.mailboxes = set(mailboxes)
+        self.catchall_domains = set(catchall_domains)
+        self.calls: List[List[str]] = []
+
+    def __call__(self, df: pd.DataFrame) -> pd.DataFrame:
+        emails = list(df["email_candidate"])
+        self.calls.append(emails)
+        rows = []
+        for email in emails:
+            if email.split("@")[1] in self.catchall_domains:
+                status = "catchall"
+            else:
+                status = "valid" if email in self.mailboxes else "invalid"
+            rows.append({"email": email, "email_verification_status": status})
+        return pd.DataFrame(rows)
+
+    @property
+    def sent(self) -> List[str]:
+        return [e for call in self.calls for e in call]
+
+
+class TestVerificationScheduler(unittest.TestCase):
+    def test_stops_person_after_valid_and_prunes_domain_after_two_hits(self) -> None:
+        names = ["jane doe", "john roe", "mary poe", "paul low"]
+        mailboxes = ["jdoe@acme.com", "jroe@acme.com", "mpoe@acme.com", "plow@acme.com"]
+        verifier = _Verifier(mailboxes)
+        out, stats = schedule_verification(_candidates({"acme.com": names}), verifier, max_wave_size=2)
+
+        found = set(out.loc[out["email_verification_status"] == "valid", "email"])
+        self.assertEqual(found, set(mailboxes))
+        # waves of two: first.last misses, flast hits twice, then only flast is tried
+        self.assertEqual(verifier.calls[0], ["jane.doe@acme.com", "john.roe@acme.com"])
+        self.assertEqual(verifier.calls[1], ["jdoe@acme.com", "jroe@acme.com"])
+        self.assertEqual(verifier.calls[2], ["mpoe@acme.com", "plow@acme.com"])
+        self.assertEqual(len(verifier.sent), 6)
+        self.assertEqual(stats.candidates, 12)
+        self.assertEqual(stats.verified, 6)
+        self.assertGreater(stats.pruned_domain_pattern, 0)
+        self.assertEqual(len(out), 6)
+
+    def test_finds_everything_exhaustive_verification_finds(self) -> None:
+        people = {"acme.com": ["jane doe", "john roe"], "bolt.com": ["mary poe", "paul low", "ann lee"]}
+        mailboxes = ["jane.doe@acme.com", "johnroe@acme.com", "mpoe@bolt.com", "plow@bolt.com", "alee@bolt.com"]
+        candidates = _candidates(people)
+
+        exhaustive = _Verifier(mailboxes)(candidates)
+        verifier = _Verifier(mailboxes)
+        out, _ = schedule_verification(candidates, verifier)
+
+        expected = set(exhaustive.loc[exhaustive["email_verification_status"] == "valid", "email"])
+        self.assertEqual(set(out.loc[out["email_verification_status"] == "valid", "email"]), expected)
+        self.assertLess(len(verifier.sent), len(candidates))
+
+    def test_catchall_result_resolves_the_person(self) -> None:
+        verifier = _Verifier([], catchall_domains=["acme.com"])
+        out, stats = schedule_verification(_candidates({"acme.com": ["jane doe"]}), verifier)
+        self.assertEqual(verifier.sent, ["jane.doe@acme.com"])
+        self.assertEqual(stats.skipped_person_resolved, 2)
+        self.assertEqual(list(out["email_verification_status"]), ["catchall"])
+
+    def test_domain_evidence_reorders_patterns(self) -> None:
+        model = DomainPatternModel()
+        self.assertGreater(model.probability("acme.com", "first.last", 0.96), model.probability("acme.com", "flast", 0.93))
+        model.observe("acme.com", "flast", "valid")
+        model.observe("acme.com", "first.last", "invalid")
+        self.assertGreater(model.probability("acme.com", "flast", 0.93), model.probability("acme.com", "first.last", 0.96))
+        self.assertIsNone(model.confirmed_pattern("acme.com"))
+        model.observe("acme.com", "flast", "valid")
+        self.assertEqual(model.confirmed_pattern("acme.com"), "flast")
+
+    def test_empty_input_makes_no_calls(self) -> None:
+        verifier = _Verifier([])
+        out, stats = schedule_verification(pd.DataFrame(columns=["email_candidate"]), verifier)
+        self.assertTrue(out.empty)
+        self.assertEqual(verifier.calls, [])
+        self.assertIn("email_verification_status", out.columns)
+
+
+if __name__ == "__main__":
+    unittest.main()
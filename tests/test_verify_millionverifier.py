@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import io
+import json
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+import requests
+
+from src import verify_millionverifier as mv
+from src.verification_cache import VerificationCache
+
+RESULTS = {"ok": "good", "catchall": "medium", "invalid": "bad"}
+
+
+class _StandIn(BaseHTTPRequestHandler):
+    """Minimal MillionVerifier: api/v3 single checks and the bulkapi/v2 file flow."""
+
+    uploads: Dict[str, List[str]] = {}
+    posts: List[str] = []
+    polls: Dict[str, int] = {}
+    single_calls: List[str] = []
+    throttled: List[str] = []
+    in_flight = 0
+    peak_in_flight = 0
+    lock = threading.Lock()
+
+    def log_message(self, *args: object) -> None:
+        pass
+
+    def _send(self, body: bytes, content_type: str = "application/json") -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    @staticmethod
+    def _result(email: str) -> str:
+        return email.split("@")[0].split(".")[0]
+
+    def do_POST(self) -> None:
+        body = self.rfile.read(int(self.headers["Content-Length"])).decode("utf-8")
+        self.posts.append(self.path)
+        if not self.path.startswith("/bulkapi/v2/upload"):
+            self.send_error(404)
+            return
+        # multipart body: keep the uploaded CSV's address lines
+        lines = [line.strip() for line in body.splitlines() if "@" in line]
+        file_id = str(len(self.uploads) + 1)
+        self.uploads[file_id] = lines
+        self._send(json.dumps({"file_id": file_id}).encode())
+
+    def _single(self, email: str) -> None:
+        cls = type(self)
+        with cls.lock:
+            cls.single_calls.append(email)
+            # "throttle" addresses get one 429 before they are answered
+            if email.startswith("throttle") and email not in cls.throttled:
+                cls.throttled.append(email)
+                self.send_response(429)
+                self.send_header("Retry-After", "0")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            cls.in_flight += 1
+            cls.peak_in_flight = max(cls.peak_in_flight, cls.in_flight)
+        time.sleep(0.02)
+        with cls.lock:
+            cls.in_flight -= 1
+        result = self._result(email)
+        self._send(json.dumps({"result": result, "quality": RESULTS.get(result, "")}).encode())
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        q = {k: v[0] for k, v in parse_qs(url.query).items()}
+        if url.path.endswith("/api/v3/"):
+            self._single(q["email"])
+        elif url.path.endswith("/fileinfo"):
+            n = self.polls[q["file_id"]] = self.polls.get(q["file_id"], 0) + 1
+            status = "finished" if n >= 2 else "in_progress"
+            self._send(json.dumps({"file_id": q["file_id"], "status": status, "percent": 50 * n}).encode())
+        elif url.path.endswith("/download"):
+            out = io.StringIO()
+            out.write('"email","quality","result","free","role"\r\n')
+            # Reversed, and the last address dropped, to check mapping by email.
+            for email in reversed(self.uploads[q["file_id"]][:-1]):
+                result = self._result(email)
+                out.write(f'"{email.upper()}","{RESULTS.get(result, "")}","{result}","no","no"\r\n')
+            self._send(out.getvalue().encode("utf-8"), "text/csv")
+        else:
+            self.send_error(404)
+
+
+class TestBulkVerification(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _StandIn)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self) -> None:
+        _StandIn.uploads.clear()
+        _StandIn.posts.clear()
+        _StandIn.polls.clear()
+        _StandIn.single_calls.clear()
+        _StandIn.throttled.clear()
+        _StandIn.peak_in_flight = 0
+        self._tmp = tempfile.TemporaryDirectory()
+        self.cache = VerificationCache(Path(self._tmp.name) / "verify.sqlite3")
+        self._patches = [
+            patch.object(mv, "get_verification_cache", return_value=self.cache),
+            patch.dict("os.environ", {"MILLIONVERIFIER_API_KEY": "k"}),
+            patch.object(mv, "MV_API_URL", f"{self.base}/api/v3/"),
+            patch.object(mv, "MV_BULK_URL", f"{self.base}/bulkapi/v2/"),
+            patch.object(mv, "BULK_POLL_SECONDS", 0.01),
+        ]
+        for p in self._patches:
+            p.start()
+
+    def tearDown(self) -> None:
+        for p in self._patches:
+            p.stop()
+        self.cache.close()
+        self._tmp.cleanup()
+
+    def _candidates(self) -> pd.DataFrame:
+        emails = ["ok.a@acme.com", "catchall.b@acme.com", "invalid.c@acme.com", "OK.A@acme.com", "ok.d@acme.com"]
+        return pd.DataFrame({"email_candidate": emails})
+
+    def test_bulk_upload_poll_download_maps_by_email(self) -> None:
+        out = mv.verify_with_millionverifier(self._candidates(), bulk_min_emails=2)
+
+        self.assertEqual(len(_StandIn.uploads), 1)
+        self.assertEqual(_StandIn.single_calls, [])
+        self.assertEqual(_StandIn.polls["1"], 2)
+        self.assertEqual(
+            list(out["email"]), ["ok.a@acme.com", "catchall.b@acme.com", "invalid.c@acme.com", "ok.d@acme.com"]
+        )
+        self.assertEqual(list(out["email_verification_status"]), ["valid", "catchall", "invalid", "unknown"])
+        self.assertEqual(list(out["email_is_catchall"]), [False, True, False, False])
+        self.assertEqual(out["email_quality_score"].iloc[0], "good")
+
+    def test_small_batch_matches_per_email_mode(self) -> None:
+        single = mv.verify_with_millionverifier(self._candidates().head(3), bulk_min_emails=10)
+        self.assertEqual(len(_StandIn.uploads), 0)
+        self.assertEqual(len(_StandIn.single_calls), 3)
+
+        # the stand-in drops the last uploaded address from its report
+        padded = pd.concat([self._candidates().head(3), pd.DataFrame({"email_candidate": ["x@acme.com"]})])
+        bulk = mv.verify_with_millionverifier(padded, bulk_min_emails=1)
+        self.assertEqual(len(_StandIn.uploads), 1)
+        pd.testing.assert_frame_equal(single, bulk.head(3))
+
+    def test_rejected_upload_falls_back_to_per_email(self) -> None:
+        with patch.object(mv, "MV_BULK_URL", f"{self.base}/missing/"):
+            out = mv.verify_with_millionverifier(self._candidates(), bulk_min_emails=1)
+        # the upload is not retried: a lost response would mean a second billed file
+        self.assertEqual(_StandIn.posts, ["/missing/upload?key=k"])
+        self.assertEqual(len(_StandIn.single_calls), 4)
+        self.assertEqual(list(out["email_verification_status"]), ["valid", "catchall", "invalid", "valid"])
+
+    def test_uploaded_file_is_not_verified_again_when_its_report_is_late(self) -> None:
+        with patch.object(mv, "BULK_TIMEOUT_SECONDS", 0), self.assertLogs("cranegenius.verify", "ERROR") as logs:
+            out = mv.verify_with_millionverifier(self._candidates(), bulk_min_emails=1)
+        self.assertEqual(len(_StandIn.uploads), 1)
+        self.assertEqual(_StandIn.single_calls, [])
+        self.assertEqual(set(out["email_verification_status"]), {"error"})
+        self.assertIn("bulk file 1 ", logs.output[0])
+
+    def test_concurrent_per_email_keeps_order_and_bounds_in_flight(self) -> None:
+        emails = [f"{r}.{i}@acme.com" for i in range(12) for r in ("ok", "invalid", "catchall")]
+        emails.insert(5, "throttle.x@acme.com")
+        out = mv.verify_with_millionverifier(
+            pd.DataFrame({"email_candidate": emails}), bulk_min_emails=0, requests_per_second=0, max_in_flight=4
+        )
+
+        self.assertEqual(list(out["email"]), emails)
+        self.assertEqual(out["email_verification_status"].iloc[0], "valid")
+        self.assertEqual(out["email_verification_status"].iloc[1], "invalid")
+        # the 429 was retried, not recorded as an error
+        self.assertEqual(_StandIn.throttled, ["throttle.x@acme.com"])
+        self.assertEqual(out["email_verification_status"].iloc[5], "throttle")
+        self.assertLessEqual(_StandIn.peak_in_flight, 4)
+        self.assertGreater(_StandIn.peak_in_flight, 1)
+
+    def test_cached_results_are_not_sent_again(self) -> None:
+        first = mv.verify_with_millionverifier(self._candidates().head(3), bulk_min_emails=0)
+        self.assertEqual(len(_StandIn.single_calls), 3)
+
+        _StandIn.single_calls.clear()
+        second = mv.verify_with_millionverifier(self._candidates(), bulk_min_emails=0)
+        self.assertEqual(_StandIn.single_calls, ["ok.d@acme.com"])
+        pd.testing.assert_frame_equal(first, second.head(3))
+        self.assertEqual(list(second["email"])[-1], "ok.d@acme.com")
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_spaces_calls_across_threads(self) -> None:
+        limiter = mv.RateLimiter(100)
+        start = time.monotonic()
+        threads = [threading.Thread(target=limiter.wait) for _ in range(11)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+
+    def test_pause_delays_next_call(self) -> None:
+        limiter = mv.RateLimiter(0)
+        limiter.pause(0.05)
+        start = time.monotonic()
+        limiter.wait()
+        self.assertGreaterEqual(time.monotonic() - start, 0.04)
+
+    def test_retry_after_seconds(self) -> None:
+        resp = requests.Response()
+        resp.status_code = 429
+        resp.headers["Retry-After"] = "3"
+        self.assertEqual(mv._retry_after_seconds(resp), 3.0)
+        resp.headers["Retry-After"] = "9999"
+        self.assertEqual(mv._retry_after_seconds(resp), mv.MAX_RETRY_AFTER_SECONDS)
+        resp.status_code = 503
+        self.assertIsNone(mv._retry_after_seconds(resp))
+
+
+if __name__ == "__main__":
+    unittest.main()